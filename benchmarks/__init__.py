@@ -0,0 +1 @@
+"""Performance benchmarks for the Campus Resource Hub (run with ``python -m benchmarks.<name>``)."""
@@ -0,0 +1,313 @@
+"""
+Concierge latency benchmark.
+
+Replays a corpus of realistic questions through ``ConciergeService.answer``
+with a stub LLM of configurable latency, then reports p50/p95/p99 per
+pipeline stage and overall throughput under concurrency.
+
+Usage:
+    python -m benchmarks.concierge_benchmark --iterations 5 --concurrency 4 \
+        --llm-latency-ms 150 --extra-resources 2000
+
+By default a throwaway database (demo fixtures plus ``--extra-resources``
+synthetic rows) is used so the catalog can be grown to spot retrieval
+regressions. Pass ``--database`` to benchmark a copy of a real database.
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import math
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from src.config import Config
+from src.services.concierge_service import ConciergeService
+
+
+STAGES = ('keywords', 'resources', 'documents', 'insights', 'prompt', 'llm', 'total')
+
+DEFAULT_QUESTIONS = (
+    'Where can I find a quiet study room near the library?',
+    'Which spaces support 3D printing?',
+    'I need a podcast studio with microphones for Friday afternoon',
+    'Is there a conference room that fits 40 people for a club meeting?',
+    'What lab equipment can undergraduates book for a chemistry project?',
+    'Can I reserve a projector and speakers for a presentation?',
+    'Where can our student group host an evening event?',
+    'Are there tutoring sessions for calculus this week?',
+    'Which rooms have whiteboards and large displays?',
+    'How far in advance can I book the auditorium?',
+    'Do any study spaces stay open late during finals?',
+    'I want to record a video interview, what do you recommend?',
+    'Is there a quiet place for group study in the Wells Library?',
+    'What are the most popular resources on campus?',
+    'Hello!',
+    'Can I borrow a camera for a journalism assignment?',
+    'Where can I practice a presentation with a projector?',
+    'Which event spaces are accessible for wheelchair users?',
+)
+
+
+class StubLLMClient:
+    """LLM stand-in that sleeps for a configurable latency and returns canned text."""
+
+    provider = 'stub'
+    model = 'benchmark-stub'
+    base_url = 'stub://'
+
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, *, seed: int = 0) -> None:
+        self.latency_ms = max(0.0, latency_ms)
+        self.jitter_ms = max(0.0, jitter_ms)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def chat(self, messages: Sequence[Dict[str, str]]) -> str:
+        with self._lock:
+            jitter = self._random.uniform(-self.jitter_ms, self.jitter_ms) if self.jitter_ms else 0.0
+        time.sleep(max(0.0, self.latency_ms + jitter) / 1000.0)
+        return 'Here are a few campus resources that should help with your request.'
+
+
+class TimedConciergeService(ConciergeService):
+    """ConciergeService that records wall time spent in each pipeline stage."""
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        if self.llm_client is not None:
+            self.llm_client = _TimedLLMClient(self.llm_client, self)
+        self.samples: List[Dict[str, float]] = []
+        self._current: Optional[Dict[str, float]] = None
+
+    def answer(self, question: str, **kwargs) -> Dict:
+        self._current = {stage: 0.0 for stage in STAGES}
+        started = time.perf_counter()
+        try:
+            return super().answer(question, **kwargs)
+        finally:
+            self._current['total'] = time.perf_counter() - started
+            self.samples.append(self._current)
+            self._current = None
+
+    def _timed(self, stage: str, func, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if self._current is not None:
+                self._current[stage] += time.perf_counter() - started
+
+    def _extract_keywords(self, text: str) -> List[str]:
+        return self._timed('keywords', super()._extract_keywords, text)
+
+    def _resource_matches(self, *args, **kwargs) -> List:
+        return self._timed('resources', super()._resource_matches, *args, **kwargs)
+
+    def _context_matches(self, *args, **kwargs):
+        return self._timed('documents', super()._context_matches, *args, **kwargs)
+
+    def _build_insights(self) -> Dict:
+        return self._timed('insights', super()._build_insights)
+
+    def _format_context_block(self, *args, **kwargs) -> str:
+        return self._timed('prompt', super()._format_context_block, *args, **kwargs)
+
+    def _build_messages(self, *args, **kwargs) -> List[Dict]:
+        return self._timed('prompt', ConciergeService._build_messages, *args, **kwargs)
+
+
+class _TimedLLMClient:
+    """Proxy that charges ``chat`` calls to the ``llm`` stage of the owning service."""
+
+    def __init__(self, client, service: TimedConciergeService) -> None:
+        self._client = client
+        self._service = service
+
+    def chat(self, messages: Sequence[Dict[str, str]]) -> str:
+        return self._service._timed('llm', self._client.chat, messages)
+
+    def __getattr__(self, name: str):
+        return getattr(self._client, name)
+
+
+def percentile(values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile; returns 0.0 for an empty sample."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples: Sequence[Dict[str, float]], elapsed: float) -> Dict:
+    """Aggregate per-question stage timings into millisecond percentiles."""
+    stages = {}
+    for stage in STAGES:
+        values = [sample[stage] * 1000.0 for sample in samples]
+        stages[stage] = {
+            'p50': percentile(values, 50),
+            'p95': percentile(values, 95),
+            'p99': percentile(values, 99),
+            'mean': sum(values) / len(values) if values else 0.0
+        }
+    return {
+        'requests': len(samples),
+        'elapsed_seconds': elapsed,
+        'throughput_rps': len(samples) / elapsed if elapsed > 0 else 0.0,
+        'stages': stages
+    }
+
+
+def run_benchmark(app, questions: Sequence[str], *, iterations: int = 1, concurrency: int = 1,
+                  llm_latency_ms: float = 0.0, llm_jitter_ms: float = 0.0) -> Dict:
+    """Replay ``questions`` ``iterations`` times across ``concurrency`` worker threads."""
+    workload = [question for _ in range(max(1, iterations)) for question in questions]
+    llm_client = StubLLMClient(llm_latency_ms, llm_jitter_ms)
+    local = threading.local()
+    services: List[TimedConciergeService] = []
+    services_lock = threading.Lock()
+
+    def worker(question: str) -> None:
+        with app.app_context():
+            service = getattr(local, 'service', None)
+            if service is None:
+                service = TimedConciergeService(llm_client=llm_client)
+                local.service = service
+                with services_lock:
+                    services.append(service)
+            service.answer(question)
+
+    with app.app_context():
+        # Warm the catalog snapshot and markdown chunks so the first request is not an outlier
+        ConciergeService(llm_client=llm_client)._prepare(
+            questions[0], category=None, published_only=True
+        )
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        list(executor.map(worker, workload))
+    elapsed = time.perf_counter() - started
+
+    samples = [sample for service in services for sample in service.samples]
+    report = summarize(samples, elapsed)
+    report.update(
+        concurrency=max(1, concurrency),
+        iterations=max(1, iterations),
+        llm_latency_ms=llm_latency_ms
+    )
+    return report
+
+
+def seed_extra_resources(count: int, *, seed: int = 0) -> None:
+    """Insert ``count`` synthetic published resources so retrieval cost can be measured at scale."""
+    from src.data_access import get_db
+    from src.data_access.entity_version_dal import EntityVersionDAL
+
+    if count <= 0:
+        return
+    rng = random.Random(seed)
+    categories = ['Study Room', 'Lab Equipment', 'Event Space', 'AV Equipment', 'Tutoring']
+    adjectives = ['Quiet', 'Bright', 'Collaborative', 'Compact', 'Modern', 'Accessible']
+    nouns = ['Study Pod', 'Media Lab', 'Seminar Room', 'Maker Space', 'Recording Booth', 'Lounge']
+    buildings = ['Wells Library', 'Luddy Hall', 'Kelley School', 'IMU', 'Jacobs School', 'Ballantine Hall']
+    equipment = ['whiteboard', 'projector', '3D printer', 'microphones', 'display screen', 'video camera']
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        owner = cursor.execute('SELECT user_id FROM users ORDER BY user_id LIMIT 1').fetchone()
+        owner_id = owner['user_id'] if owner else None
+        rows = []
+        for index in range(count):
+            building = rng.choice(buildings)
+            rows.append((
+                owner_id,
+                f'{rng.choice(adjectives)} {rng.choice(nouns)} {index}',
+                f'Benchmark resource in {building} with {rng.choice(equipment)}.',
+                rng.choice(categories),
+                building,
+                rng.randint(1, 80),
+                ', '.join(rng.sample(equipment, 2)),
+                'published'
+            ))
+        cursor.executemany('''
+            INSERT INTO resources (owner_id, title, description, category, location,
+                                   capacity, equipment, status)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', rows)
+        EntityVersionDAL.bump('resources', cursor)
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Requests: {report['requests']}  concurrency: {report['concurrency']}  "
+        f"stub LLM latency: {report['llm_latency_ms']:.0f} ms",
+        f"Elapsed: {report['elapsed_seconds']:.2f} s  throughput: {report['throughput_rps']:.1f} req/s",
+        '',
+        f"{'stage':<12}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}"
+    ]
+    for stage in STAGES:
+        stats = report['stages'][stage]
+        lines.append(
+            f"{stage:<12}{stats['p50']:>10.2f}{stats['p95']:>10.2f}{stats['p99']:>10.2f}{stats['mean']:>10.2f}"
+        )
+    return '\n'.join(lines)
+
+
+def _load_questions(path: Optional[str]) -> List[str]:
+    if not path:
+        return list(DEFAULT_QUESTIONS)
+    with open(path, encoding='utf-8') as handle:
+        return [line.strip() for line in handle if line.strip() and not line.startswith('#')]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark the AI Resource Concierge pipeline.')
+    parser.add_argument('--questions', help='File with one question per line (defaults to a built-in corpus)')
+    parser.add_argument('--iterations', type=int, default=3, help='Times to replay the corpus')
+    parser.add_argument('--concurrency', type=int, default=4, help='Worker threads issuing questions')
+    parser.add_argument('--llm-latency-ms', type=float, default=100.0, help='Stub LLM latency per call')
+    parser.add_argument('--llm-jitter-ms', type=float, default=0.0, help='Uniform +/- jitter on the stub latency')
+    parser.add_argument('--extra-resources', type=int, default=0,
+                        help='Synthetic resources added to the throwaway database')
+    parser.add_argument('--database', help='Benchmark an existing SQLite file instead of a throwaway one')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    workdir = tempfile.TemporaryDirectory(prefix='concierge-bench-')
+    try:
+        Config.DATABASE_PATH = args.database or os.path.join(workdir.name, 'benchmark.db')
+        Config.UPLOAD_FOLDER = os.path.join(workdir.name, 'uploads')
+        # Every question must reach the (stub) LLM, so the response cache stays off
+        Config.CONCIERGE_CACHE_ENABLED = False
+        Config.SEED_SAMPLE_DATA = not args.database
+
+        from src.app import create_app
+        app = create_app()
+        if not args.database:
+            seed_extra_resources(args.extra_resources)
+
+        report = run_benchmark(
+            app,
+            _load_questions(args.questions),
+            iterations=args.iterations,
+            concurrency=args.concurrency,
+            llm_latency_ms=args.llm_latency_ms,
+            llm_jitter_ms=args.llm_jitter_ms
+        )
+    finally:
+        workdir.cleanup()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,481 @@
+"""
+Synthetic large-dataset generator.
+
+Fills a database with a campus-sized (or much larger) population for
+benchmarks and query-plan tests. A seeded RNG makes every run
+reproducible. The shape of the data is meant to look like real use:
+
+* resource popularity is Zipfian, so a few rooms take most bookings;
+* booking dates follow the academic calendar: busy in term, busier at
+  midterms and finals, quiet over breaks and summer, light on weekends;
+* a share of bookings are weekly series (``FREQ=WEEKLY;COUNT=n``);
+* past bookings are mostly completed, future ones approved or pending;
+* message threads between students and resource owners, and reviews
+  whose ratings cluster around a per-resource quality.
+
+Rows are written with explicit ids through ``executemany`` on one
+connection. Foreign-key checks, rollup triggers and secondary indexes are
+switched off for the load, then the indexes and triggers are recreated,
+the analytics rollups and epoch shadow columns filled in and ``ANALYZE`` run. On one core that
+comes to roughly 100k rows per second including the rebuild, so tens of
+millions of rows take a few minutes.
+
+Usage:
+    python -m benchmarks.data_generator --database /tmp/scale.db \
+        --users 100000 --resources 10000 --bookings 10000000 --threads 200000 --reviews 500000
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import date, datetime, timedelta
+import itertools
+import json
+import random
+import sqlite3
+import sys
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.config import Config
+
+CATEGORIES = ('Study Room', 'Lab Equipment', 'Event Space', 'AV Equipment', 'Tutoring')
+CATEGORY_WEIGHTS = (40, 15, 20, 15, 10)
+CAPACITY_RANGES = {
+    'Study Room': (2, 12), 'Lab Equipment': (1, 4), 'Event Space': (20, 300),
+    'AV Equipment': (1, 2), 'Tutoring': (1, 8),
+}
+BUILDINGS = ('Wells Library', 'Luddy Hall', 'Kelley School', 'IMU', 'Jacobs School', 'Ballantine Hall')
+DEPARTMENTS = ('Informatics', 'Business', 'Music', 'Biology', 'Journalism', 'Mathematics')
+ADJECTIVES = ('Quiet', 'Bright', 'Collaborative', 'Compact', 'Modern', 'Accessible')
+NOUNS = ('Study Pod', 'Media Lab', 'Seminar Room', 'Maker Space', 'Recording Booth', 'Lounge')
+EQUIPMENT = ('whiteboard', 'projector', '3D printer', 'microphones', 'display screen', 'video camera')
+SCHEDULES = (None, 'business', 'extended', 'academic', '24/7')
+SCHEDULE_WEIGHTS = (40, 25, 15, 15, 5)
+
+MESSAGES = (
+    'Is this space free next week for a study group?',
+    'Yes, it is open most afternoons. Book through the calendar.',
+    'Does the room have a working projector?',
+    'Thanks! Can we stay an extra half hour?',
+    'Please remember to return the equipment to the front desk.',
+    'Could I pick up the key the day before?',
+)
+REVIEW_COMMENTS = (
+    'Great space, quiet and clean.', 'Booking was easy and the room was ready.',
+    'Wi-Fi was spotty in the afternoon.', 'Perfect for our group project.',
+    'Equipment worked well.', 'A bit noisy during lunch hours.', None,
+)
+
+# Day-of-week multipliers, Monday first
+WEEKDAY_WEIGHTS = (1.0, 1.05, 1.05, 1.0, 0.7, 0.35, 0.5)
+# Start hours 8:00-20:00 (an up-to-three-hour booking still ends before midnight)
+HOUR_WEIGHTS = (3, 6, 9, 10, 9, 8, 10, 10, 9, 7, 5, 3, 2)
+# Bookings start on the hour three times out of four, otherwise at half past
+START_SLOTS = tuple(slot for hour in range(8, 21) for slot in (hour * 2, hour * 2 + 1))
+START_SLOT_WEIGHTS = tuple(share * weight for weight in HOUR_WEIGHTS for share in (0.75, 0.25))
+# Booking length in 30-minute steps
+DURATION_STEPS = (1, 2, 3, 4, 6)
+DURATION_WEIGHTS = (10, 45, 15, 20, 10)
+RATING_WEIGHTS = (5, 7, 13, 30, 45)
+
+_CLOCK = tuple(f'T{slot // 2:02d}:{30 * (slot % 2):02d}:00' for slot in range(48))
+_BULK_TABLES = ('users', 'resources', 'bookings', 'message_threads', 'messages', 'reviews')
+_BATCH = 20_000
+
+
+def term_weight(day: date) -> float:
+    """Relative booking demand for ``day`` on a Bloomington-style academic calendar."""
+    md = (day.month, day.day)
+    if (8, 25) <= md <= (12, 12):
+        if (11, 22) <= md <= (11, 29):
+            weight = 0.3   # Thanksgiving break
+        elif (12, 8) <= md:
+            weight = 1.7   # Fall finals
+        elif (10, 6) <= md <= (10, 17):
+            weight = 1.3   # Fall midterms
+        else:
+            weight = 1.0
+    elif (1, 12) <= md <= (5, 1):
+        if (3, 14) <= md <= (3, 22):
+            weight = 0.3   # Spring break
+        elif (4, 27) <= md:
+            weight = 1.7   # Spring finals
+        elif (2, 23) <= md <= (3, 6):
+            weight = 1.3   # Spring midterms
+        else:
+            weight = 1.0
+    elif (5, 11) <= md <= (8, 7):
+        weight = 0.35      # Summer sessions
+    else:
+        weight = 0.1       # Between terms
+    return weight * WEEKDAY_WEIGHTS[day.weekday()]
+
+
+def zipf_cum_weights(count: int, exponent: float) -> List[float]:
+    """Cumulative weights for ranks 1..count with P(rank) proportional to 1 / rank**exponent."""
+    return list(itertools.accumulate(1.0 / (rank ** exponent) for rank in range(1, count + 1)))
+
+
+def _chunks(rows: Iterable, size: int = _BATCH):
+    iterator = iter(rows)
+    while True:
+        batch = list(itertools.islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class DatasetGenerator:
+    """Writes one synthetic dataset into an initialized database."""
+
+    def __init__(self, conn: sqlite3.Connection, *, seed: int = 0, today: Optional[date] = None,
+                 history_days: int = 365, future_days: int = 120, zipf_exponent: float = 1.1,
+                 email_domain: str = 'synthetic.iu.edu', password: str = 'SyntheticPass1',
+                 rounds: int = 4) -> None:
+        self.conn = conn
+        self.rng = random.Random(seed)
+        self.today = today or date.today()
+        self.zipf_exponent = zipf_exponent
+        self.email_domain = email_domain
+        self.password = password
+        self.rounds = rounds
+        first_day = self.today - timedelta(days=history_days)
+        self.days = [(first_day + timedelta(days=offset)).isoformat()
+                     for offset in range(history_days + future_days + 1)]
+        self.today_index = history_days
+        self.day_cum_weights = list(itertools.accumulate(
+            term_weight(first_day + timedelta(days=offset)) for offset in range(len(self.days))
+        ))
+        self._past_days = range(self.today_index + 1)
+        self._past_cum_weights = self.day_cum_weights[:self.today_index + 1]
+        self.student_ids: List[int] = []
+        self.staff_ids: List[int] = []
+        self.resource_ids: List[int] = []
+        self.resource_owners: Dict[int, int] = {}
+        self.resource_cum_weights: List[float] = []
+        self.student_cum_weights: List[float] = []
+        self.counts: Dict[str, int] = {}
+        self.timings: Dict[str, float] = {}
+
+    def _next_id(self, table: str, column: str) -> int:
+        return (self.conn.execute(f'SELECT MAX({column}) FROM {table}').fetchone()[0] or 0) + 1
+
+    def _insert(self, table: str, columns: Sequence[str], rows: Iterable[tuple]) -> int:
+        started = time.perf_counter()
+        statement = f'INSERT INTO {table} ({", ".join(columns)}) VALUES ({", ".join("?" * len(columns))})'
+        written = 0
+        for batch in _chunks(rows):
+            self.conn.executemany(statement, batch)
+            written += len(batch)
+        self.counts[table] = self.counts.get(table, 0) + written
+        self.timings[table] = self.timings.get(table, 0.0) + time.perf_counter() - started
+        return written
+
+    def _timestamp(self, day_index: int, hour: Optional[int] = None) -> str:
+        # random() is several times cheaper than randint() and this runs once per row
+        hour = 7 + int(self.rng.random() * 16) if hour is None else hour
+        return f'{self.days[max(0, day_index)]} {hour:02d}:{int(self.rng.random() * 60):02d}:00'
+
+    def _past_day(self) -> int:
+        return self.rng.choices(self._past_days, cum_weights=self._past_cum_weights)[0]
+
+    def users(self, count: int) -> None:
+        """Students plus about one staff owner per 25 accounts and one admin per thousand."""
+        from src.utils.passwords import hash_password
+
+        password_hash = hash_password(self.password, self.rounds)  # shared; bcrypt per row would dominate
+        first_id = self._next_id('users', 'user_id')
+        admins = max(1, count // 1000) if count >= 100 else 0
+        staff = max(1, count // 25)
+
+        def generate():
+            for offset in range(count):
+                user_id = first_id + offset
+                if offset < admins:
+                    role = 'admin'
+                elif offset < admins + staff:
+                    role = 'staff'
+                    self.staff_ids.append(user_id)
+                else:
+                    role = 'student'
+                    self.student_ids.append(user_id)
+                yield (user_id, f'Synthetic User {offset}', f'user{offset}@{self.email_domain}', password_hash,
+                       role, self.rng.choice(DEPARTMENTS), 1, self._timestamp(self._past_day()))
+
+        self._insert('users', ('user_id', 'name', 'email', 'password_hash', 'role', 'department',
+                               'email_verified', 'created_at'), generate())
+        if not self.staff_ids:
+            self.staff_ids = [row[0] for row in self.conn.execute(
+                "SELECT user_id FROM users WHERE role IN ('staff', 'admin') ORDER BY user_id"
+            )]
+        self.student_ids = self.student_ids or list(self.staff_ids)
+        # A few very active students, a long tail of occasional ones
+        self.rng.shuffle(self.student_ids)
+        self.student_cum_weights = zipf_cum_weights(len(self.student_ids), 0.6)
+
+    def resources(self, count: int) -> None:
+        from src.utils.availability import SCHEDULE_TEMPLATES
+
+        first_id = self._next_id('resources', 'resource_id')
+        schedules = {key: json.dumps(SCHEDULE_TEMPLATES[key]['schedule']) if key else None for key in SCHEDULES}
+
+        def generate():
+            for offset in range(count):
+                resource_id = first_id + offset
+                owner_id = self.rng.choice(self.staff_ids)
+                category = self.rng.choices(CATEGORIES, CATEGORY_WEIGHTS)[0]
+                building, noun = self.rng.choice(BUILDINGS), self.rng.choice(NOUNS)
+                status = self.rng.choices(('published', 'draft', 'archived'), (90, 7, 3))[0]
+                if status == 'published':
+                    self.resource_ids.append(resource_id)
+                    self.resource_owners[resource_id] = owner_id
+                yield (resource_id, owner_id, f'{self.rng.choice(ADJECTIVES)} {noun} {offset}',
+                       f'{noun} in {building} for study, meetings and projects.', category, building,
+                       self.rng.randint(*CAPACITY_RANGES[category]), ', '.join(self.rng.sample(EQUIPMENT, 2)),
+                       status, schedules[self.rng.choices(SCHEDULES, SCHEDULE_WEIGHTS)[0]],
+                       self._timestamp(self._past_day()))
+
+        self._insert('resources', ('resource_id', 'owner_id', 'title', 'description', 'category', 'location',
+                                   'capacity', 'equipment', 'status', 'availability_schedule', 'created_at'),
+                     generate())
+        # Popularity rank is independent of id order
+        self.rng.shuffle(self.resource_ids)
+        self.resource_cum_weights = zipf_cum_weights(len(self.resource_ids), self.zipf_exponent)
+
+    def _pick_resources(self, k: int) -> List[int]:
+        return self.rng.choices(self.resource_ids, cum_weights=self.resource_cum_weights, k=k)
+
+    def _pick_students(self, k: int) -> List[int]:
+        return self.rng.choices(self.student_ids, cum_weights=self.student_cum_weights, k=k)
+
+    def bookings(self, count: int, *, recurring_share: float = 0.05) -> None:
+        """``count`` booking rows; ``recurring_share`` of the series are weekly, 4-12 occurrences."""
+        if not self.resource_ids or count <= 0:
+            return
+        # Hot loop: one iteration per row, so lookups are hoisted and times come from tables
+        rng = self.rng
+        random_ = rng.random
+        days = self.days
+        owners = self.resource_owners
+        today_index = self.today_index
+        last_day = len(days) - 1
+
+        def generate():
+            produced = 0
+            while produced < count:
+                size = min(_BATCH, count - produced)
+                batch = zip(
+                    self._pick_resources(size),
+                    self._pick_students(size),
+                    rng.choices(range(len(days)), cum_weights=self.day_cum_weights, k=size),
+                    rng.choices(START_SLOTS, START_SLOT_WEIGHTS, k=size),
+                    rng.choices(DURATION_STEPS, DURATION_WEIGHTS, k=size),
+                )
+                for resource_id, requester_id, day, slot, step in batch:
+                    if produced >= count:
+                        return
+                    occurrences, rule = 1, None
+                    if random_() < recurring_share:
+                        occurrences = min(rng.randint(4, 12), (last_day - day) // 7 + 1, count - produced)
+                        rule = f'FREQ=WEEKLY;COUNT={occurrences}' if occurrences > 1 else None
+                    created_at = self._timestamp(min(day - int(rng.expovariate(1 / 7.0)), today_index))
+                    owner_id = owners[resource_id]
+                    start_clock, end_clock = _CLOCK[slot], _CLOCK[slot + step]
+                    for day_index in range(day, day + 7 * occurrences, 7):
+                        roll = random_()
+                        if day_index < today_index:
+                            status = 'completed' if roll < 0.82 else 'cancelled' if roll < 0.94 else 'rejected'
+                        else:
+                            status = 'approved' if roll < 0.65 else 'pending' if roll < 0.95 else 'cancelled'
+                        decided = status != 'cancelled' and status != 'pending'
+                        day_text = days[day_index]
+                        yield (
+                            resource_id, requester_id, day_text + start_clock, day_text + end_clock, status, rule,
+                            owner_id if decided else None, created_at if decided else None, created_at, created_at,
+                        )
+                    produced += occurrences
+
+        self._insert('bookings', ('resource_id', 'requester_id', 'start_datetime', 'end_datetime', 'status',
+                                  'recurrence_rule', 'decision_by', 'decision_timestamp', 'created_at',
+                                  'updated_at'), generate())
+
+    def threads(self, count: int, *, messages_per_thread: float = 4.0) -> None:
+        """Student-to-owner conversations about a resource, each with a geometric number of messages."""
+        if not self.resource_ids or count <= 0:
+            return
+        thread_id = self._next_id('message_threads', 'thread_id')
+        seen = {row[0] for row in self.conn.execute('SELECT thread_key FROM message_threads')}
+        threads: List[tuple] = []
+        messages: List[tuple] = []
+        continue_probability = 1.0 - 1.0 / max(1.0, messages_per_thread)
+        written = attempts = 0
+        while written < count and attempts < count * 5:
+            attempts += 1
+            resource_id = self._pick_resources(1)[0]
+            student_id = self._pick_students(1)[0]
+            owner_id = self.resource_owners[resource_id]
+            first, second = sorted((student_id, owner_id))
+            key = f'{first}:{second}:{resource_id}'
+            if student_id == owner_id or key in seen:
+                continue
+            seen.add(key)
+            day = self._past_day()
+            created_at = self._timestamp(day)
+            threads.append((thread_id, key, student_id, owner_id, resource_id, created_at))
+            written += 1
+            sender, receiver = student_id, owner_id
+            moment = datetime.fromisoformat(created_at)
+            while True:
+                messages.append((thread_id, sender, receiver, self.rng.choice(MESSAGES),
+                                 moment.strftime('%Y-%m-%d %H:%M:%S')))
+                if self.rng.random() >= continue_probability:
+                    break
+                sender, receiver = receiver, sender
+                moment += timedelta(minutes=int(self.rng.expovariate(1 / 180.0)) + 1)
+            thread_id += 1
+            if len(messages) >= _BATCH:
+                self._flush_threads(threads, messages)
+        self._flush_threads(threads, messages)
+
+    def _flush_threads(self, threads: List[tuple], messages: List[tuple]) -> None:
+        self._insert('message_threads', ('thread_id', 'thread_key', 'owner_id', 'participant_id', 'resource_id',
+                                         'created_at'), threads)
+        self._insert('messages', ('thread_id', 'sender_id', 'receiver_id', 'content', 'timestamp'), messages)
+        threads.clear()
+        messages.clear()
+
+    def reviews(self, count: int) -> None:
+        """Reviews follow popularity; ratings scatter around a per-resource quality."""
+        if not self.resource_ids or count <= 0:
+            return
+        quality = {resource_id: self.rng.gauss(0.0, 0.8) for resource_id in self.resource_ids}
+        base_ratings = self.rng.choices(range(1, 6), RATING_WEIGHTS, k=count)
+        reviewers = self._pick_students(count)
+        resources = self._pick_resources(count)
+
+        def generate():
+            for resource_id, reviewer_id, base in zip(resources, reviewers, base_ratings):
+                rating = min(5, max(1, round(base + quality[resource_id])))
+                yield (resource_id, reviewer_id, rating, self.rng.choice(REVIEW_COMMENTS),
+                       self._timestamp(self._past_day()))
+
+        self._insert('reviews', ('resource_id', 'reviewer_id', 'rating', 'comment', 'timestamp'), generate())
+
+
+def generate_dataset(database_path: Optional[str] = None, *, users: int = 1_000, resources: int = 100,
+                     bookings: int = 10_000, threads: int = 0, reviews: int = 0, messages_per_thread: float = 4.0,
+                     recurring_share: float = 0.05, zipf_exponent: float = 1.1, history_days: int = 365,
+                     future_days: int = 120, seed: int = 0, today: Optional[date] = None,
+                     email_domain: str = 'synthetic.iu.edu', password: str = 'SyntheticPass1',
+                     rounds: int = 4, progress: Optional[Callable[[str], None]] = None) -> Dict:
+    """
+    Append a synthetic dataset to an initialized database (Config.DATABASE_PATH by default).
+
+    Returns rows written and seconds spent per table, plus the time taken to
+    rebuild indexes, triggers and rollups afterwards.
+    """
+    from src.data_access import backfill_epoch_columns, drop_side_structures
+    from src.data_access.analytics_rollup_dal import AnalyticsRollupDAL
+    from src.data_access.entity_version_dal import EntityVersionDAL
+
+    report = progress or (lambda message: None)
+    started = time.perf_counter()
+    conn = sqlite3.connect(database_path or Config.DATABASE_PATH, timeout=30.0, isolation_level=None)
+    try:
+        conn.execute('PRAGMA foreign_keys = OFF')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('PRAGMA cache_size = -262144')  # 256 MiB
+        conn.execute('BEGIN')
+        recreate = drop_side_structures(conn, _BULK_TABLES)
+        generator = DatasetGenerator(conn, seed=seed, today=today, history_days=history_days,
+                                     future_days=future_days, zipf_exponent=zipf_exponent,
+                                     email_domain=email_domain, password=password, rounds=rounds)
+        generator.users(users)
+        report(f'users: {generator.counts.get("users", 0)}')
+        generator.resources(resources)
+        report(f'resources: {generator.counts.get("resources", 0)}')
+        generator.bookings(bookings, recurring_share=recurring_share)
+        report(f'bookings: {generator.counts.get("bookings", 0)}')
+        generator.threads(threads, messages_per_thread=messages_per_thread)
+        report(f'threads: {generator.counts.get("message_threads", 0)}, messages: {generator.counts.get("messages", 0)}')
+        generator.reviews(reviews)
+        report(f'reviews: {generator.counts.get("reviews", 0)}')
+
+        finishing = time.perf_counter()
+        cursor = conn.cursor()
+        for statement in recreate:
+            cursor.execute(statement)
+        AnalyticsRollupDAL.rebuild(cursor)
+        backfill_epoch_columns(cursor, _BULK_TABLES)
+        for entity in ('resources', 'bookings', 'reviews'):
+            EntityVersionDAL.bump(entity, cursor)
+        conn.execute('COMMIT')
+        conn.execute('PRAGMA analysis_limit = 1000')  # sampled statistics are plenty for the planner
+        conn.execute('ANALYZE')
+        report('indexes, triggers and rollups rebuilt')
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute('ROLLBACK')
+        raise
+    finally:
+        conn.close()
+
+    elapsed = time.perf_counter() - started
+    rows = sum(generator.counts.values())
+    return {
+        'seed': seed,
+        'rows': generator.counts,
+        'seconds': {table: round(value, 3) for table, value in generator.timings.items()},
+        'finish_seconds': round(time.perf_counter() - finishing, 3),
+        'elapsed_seconds': round(elapsed, 3),
+        'rows_per_second': round(rows / elapsed) if elapsed else 0,
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [f"{'table':<18}{'rows':>12}{'seconds':>10}"]
+    for table, count in report['rows'].items():
+        lines.append(f"{table:<18}{count:>12,}{report['seconds'].get(table, 0.0):>10.1f}")
+    lines.extend([
+        '',
+        f"Indexes, triggers, rollups and ANALYZE: {report['finish_seconds']:.1f}s",
+        f"Total: {report['elapsed_seconds']:.1f}s ({report['rows_per_second']:,} rows/s, seed {report['seed']})",
+    ])
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Generate a large synthetic dataset for benchmarks.')
+    parser.add_argument('--database', required=True, help='Database file to fill (created if missing)')
+    parser.add_argument('--users', type=int, default=10_000)
+    parser.add_argument('--resources', type=int, default=1_000)
+    parser.add_argument('--bookings', type=int, default=1_000_000)
+    parser.add_argument('--threads', type=int, default=20_000, help='Message threads')
+    parser.add_argument('--messages-per-thread', type=float, default=4.0, help='Mean messages per thread')
+    parser.add_argument('--reviews', type=int, default=50_000)
+    parser.add_argument('--recurring-share', type=float, default=0.05,
+                        help='Share of booking series that repeat weekly (each adds 4-12 rows)')
+    parser.add_argument('--zipf', type=float, default=1.1, help='Resource popularity exponent')
+    parser.add_argument('--history-days', type=int, default=365)
+    parser.add_argument('--future-days', type=int, default=120)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    from src.data_access import init_database
+
+    Config.DATABASE_PATH = args.database
+    init_database()
+    report = generate_dataset(
+        users=args.users, resources=args.resources, bookings=args.bookings, threads=args.threads,
+        reviews=args.reviews, messages_per_thread=args.messages_per_thread,
+        recurring_share=args.recurring_share, zipf_exponent=args.zipf, history_days=args.history_days,
+        future_days=args.future_days, seed=args.seed,
+        progress=None if args.json else lambda message: print(f'  {message}', file=sys.stderr)
+    )
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,146 @@
+"""
+Datetime rendering benchmark.
+
+Renders a column of stored timestamps the way a list page does (every value
+through ``datetime_format``, ``relative_time`` and ``humanize_datetime``) and
+compares the historical per-value path, which built ``ZoneInfo`` objects and
+re-parsed the ISO string each time, with the cached helpers in
+``src.utils.datetime_helpers``. Listing pages repeat
+a limited set of values, so ``--distinct`` controls how many unique
+timestamps the column holds.
+
+Usage:
+    python -m benchmarks.datetime_benchmark --values 50000 --distinct 2000 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+from datetime import datetime, timedelta
+import json
+import random
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.config import Config
+from src.utils import datetime_helpers
+from src.utils.datetime_helpers import format_local, humanize_datetime, to_local
+
+DISPLAY_FORMAT = '%B %d, %Y at %I:%M %p'
+
+
+def legacy_localize(value) -> Optional[datetime]:
+    """The pre-cache ``_parse_datetime`` filter helper."""
+    from zoneinfo import ZoneInfo
+
+    if isinstance(value, datetime):
+        dt = value
+    elif isinstance(value, str):
+        try:
+            dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+        except ValueError:
+            return None
+    else:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=ZoneInfo('UTC'))
+    return dt.astimezone(ZoneInfo(Config.TIMEZONE))
+
+
+def legacy_render(values: Sequence[str]) -> List[tuple]:
+    from zoneinfo import ZoneInfo
+
+    rendered = []
+    for value in values:
+        dt = legacy_localize(value)
+        age = datetime.now(ZoneInfo(Config.TIMEZONE)) - dt
+        rendered.append((dt.strftime(DISPLAY_FORMAT), age.days, legacy_localize(value).strftime('%B %d, %Y %I:%M %p')))
+    return rendered
+
+
+def cached_render(values: Sequence[str]) -> List[tuple]:
+    rendered = []
+    for value in values:
+        age = datetime.now(datetime_helpers.local_timezone()) - to_local(value)
+        rendered.append((format_local(value, DISPLAY_FORMAT), age.days, humanize_datetime(value)))
+    return rendered
+
+
+MODES: Dict[str, Callable[[Sequence[str]], List[tuple]]] = {
+    'legacy': legacy_render,
+    'cached': cached_render,
+}
+
+
+def build_values(count: int, distinct: int, seed: int = 7) -> List[str]:
+    """``count`` naive UTC timestamps drawn from ``distinct`` values, stored-string format."""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, 8, 0)
+    pool = [(base + timedelta(minutes=30 * rng.randrange(17520))).isoformat(sep=' ')
+            for _ in range(max(1, distinct))]
+    return [rng.choice(pool) for _ in range(count)]
+
+
+def clear_caches() -> None:
+    for cached in (datetime_helpers.parse_iso, datetime_helpers._localize_iso, datetime_helpers._format_iso):
+        cached.cache_clear()
+
+
+def run_benchmark(values: int = 50_000, distinct: int = 2_000, repeat: int = 3,
+                  modes: Optional[Sequence[str]] = None) -> Dict:
+    sample = build_values(values, distinct)
+    report = {'values': values, 'distinct': distinct, 'repeat': repeat, 'modes': {}}
+    expected = None
+    for mode in modes or MODES:
+        render = MODES[mode]
+        best = float('inf')
+        for _ in range(max(1, repeat)):
+            # Every repetition starts cold so the cost of filling the caches is counted
+            clear_caches()
+            started = time.perf_counter()
+            rendered = render(sample)
+            best = min(best, time.perf_counter() - started)
+        if expected is None:
+            expected = rendered
+        report['modes'][mode] = {
+            'seconds': best,
+            'values_per_second': values / best if best else 0.0,
+            'matches': rendered == expected,
+        }
+    baseline = report['modes'].get('legacy')
+    if baseline:
+        for stats in report['modes'].values():
+            stats['speedup'] = baseline['seconds'] / stats['seconds'] if stats['seconds'] else 0.0
+    return report
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Values: {report['values']}  distinct: {report['distinct']}  (best of {report['repeat']})",
+        '',
+        f"{'mode':<8}{'ms':>10}{'values/s':>14}{'speedup':>10}{'output':>9}"
+    ]
+    for mode, stats in report['modes'].items():
+        lines.append(
+            f"{mode:<8}{stats['seconds'] * 1000:>10.1f}{stats['values_per_second']:>14,.0f}"
+            f"{stats.get('speedup', 1.0):>9.2f}x{'same' if stats['matches'] else 'DIFFERS':>9}"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark datetime parsing, localization and formatting.')
+    parser.add_argument('--values', type=int, default=50_000, help='Timestamps rendered per run')
+    parser.add_argument('--distinct', type=int, default=2_000, help='Unique timestamps among them')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    parser.add_argument('--modes', nargs='*', choices=sorted(MODES), help='Limit to these modes')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(values=args.values, distinct=args.distinct, repeat=args.repeat, modes=args.modes)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,432 @@
+"""
+End-to-end HTTP load test.
+
+Seeds a scaled dataset with ``benchmarks.data_generator``, then runs
+concurrent virtual users against the app. Each user logs in and repeats a
+weighted mix of flows: browse, search, resource detail, dashboard, booking
+and messaging. The report gives throughput, error counts and p50/p95/p99 per
+flow, plus the mean SQL statements per request taken from the
+``Server-Timing`` header. Save a report with ``--output`` and pass it back
+with ``--baseline`` on the next release to fail on regressions.
+
+By default every virtual user drives the app in-process through its own
+Flask test client. Pass ``--base-url`` to drive a running server (e.g.
+gunicorn) instead. Start it against the same database and with
+``BCRYPT_ROUNDS`` equal to ``--rounds``, so logins do not trigger rehashing,
+and drive it from an address in its ``METRICS_ALLOWED_IPS`` so responses
+carry ``Server-Timing``.
+
+Usage:
+    python -m benchmarks.load_test --scale small --virtual-users 8 --iterations 50
+    python -m benchmarks.load_test --database /tmp/load.db --scale large --seed-only
+    python -m benchmarks.load_test --database /tmp/load.db --base-url http://127.0.0.1:8000 \
+        --virtual-users 32 --duration 120 --output release.json --baseline previous.json
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import contextlib
+from datetime import datetime, timedelta
+import json
+import logging
+import os
+import random
+import re
+import sys
+import tempfile
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from benchmarks.concierge_benchmark import percentile
+from benchmarks.data_generator import CATEGORIES, generate_dataset
+from src.config import Config
+
+PASSWORD = 'LoadTestPass1'
+EMAIL_DOMAIN = 'load.iu.edu'
+
+# users, resources, bookings
+SCALES = {
+    'tiny': (200, 40, 2_000),
+    'small': (2_000, 200, 20_000),
+    'medium': (20_000, 2_000, 200_000),
+    'large': (100_000, 10_000, 1_000_000),
+}
+
+FLOW_WEIGHTS = {
+    'browse': 30,
+    'search': 25,
+    'detail': 20,
+    'dashboard': 10,
+    'book': 10,
+    'message': 5,
+}
+
+SEARCH_TERMS = ('study', 'lab', 'quiet', 'projector', 'room', 'studio', 'library', 'maker')
+
+_CSRF_INPUT = re.compile(r'name="csrf_token" value="([^"]+)"')
+_SERVER_TIMING_QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+
+def seed_dataset(*, users: int, resources: int, bookings: int, rounds: int = 4, seed: int = 0) -> Dict:
+    """Generate load-test accounts, resources, bookings, threads and reviews in Config.DATABASE_PATH."""
+    report = generate_dataset(
+        users=users, resources=resources, bookings=bookings, threads=users // 10, reviews=resources * 5,
+        seed=seed, email_domain=EMAIL_DOMAIN, password=PASSWORD, rounds=rounds
+    )
+    return {'users': users, 'resources': resources, 'bookings': bookings,
+            'seed_seconds': report['elapsed_seconds']}
+
+
+def load_catalog(database_path: str) -> Dict[str, List]:
+    """Account emails, resource ids and owner ids the virtual users pick from."""
+    import sqlite3
+
+    conn = sqlite3.connect(database_path)
+    try:
+        pattern = (f'%@{EMAIL_DOMAIN}',)
+        emails = [row[0] for row in conn.execute(
+            "SELECT email FROM users WHERE email LIKE ? AND role = 'student' ORDER BY user_id", pattern
+        )]
+        resources = conn.execute('''
+            SELECT resource_id, owner_id FROM resources
+            WHERE status = 'published' AND owner_id IN (SELECT user_id FROM users WHERE email LIKE ?)
+            ORDER BY resource_id
+        ''', pattern).fetchall()
+    finally:
+        conn.close()
+    return {'emails': emails, 'resources': resources}
+
+
+class FlaskSession:
+    """One virtual user's cookie jar on an in-process test client."""
+
+    def __init__(self, app) -> None:
+        self.client = app.test_client()
+
+    def request(self, method: str, path: str, data: Optional[Dict] = None) -> Tuple[int, str, Dict]:
+        response = self.client.open(path, method=method, data=data)
+        return response.status_code, response.get_data(as_text=True), response.headers
+
+
+class HTTPSession:
+    """One virtual user's cookie jar against a running server."""
+
+    def __init__(self, base_url: str, timeout: float = 30.0) -> None:
+        import requests
+
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def request(self, method: str, path: str, data: Optional[Dict] = None) -> Tuple[int, str, Dict]:
+        response = self.session.request(method, self.base_url + path, data=data,
+                                        allow_redirects=False, timeout=self.timeout)
+        return response.status_code, response.text, response.headers
+
+
+class VirtualUser:
+    """Logs in once, then runs weighted flows and records one sample per flow."""
+
+    def __init__(self, session, email: str, catalog: Dict[str, List], rng: random.Random,
+                 record: Callable[[str, float, int, int, bool], None]) -> None:
+        self.session = session
+        self.email = email
+        self.resources = catalog['resources']
+        self.rng = rng
+        self.record = record
+        self.flows = {
+            'browse': self.browse, 'search': self.search, 'detail': self.detail,
+            'dashboard': self.dashboard, 'book': self.book, 'message': self.message,
+        }
+        self._names = list(FLOW_WEIGHTS)
+        self._weights = [FLOW_WEIGHTS[name] for name in self._names]
+
+    def _get(self, path: str) -> Tuple[int, str, Dict]:
+        return self.session.request('GET', path)
+
+    def _post(self, path: str, form_page: str, data: Dict) -> Tuple[int, str, Dict]:
+        match = _CSRF_INPUT.search(form_page)
+        if match:
+            data = dict(data, csrf_token=match.group(1))
+        return self.session.request('POST', path, data)
+
+    def _run(self, name: str, steps: Callable[[], List[Tuple[int, str, Dict]]]) -> List[Tuple[int, str, Dict]]:
+        started = time.perf_counter()
+        try:
+            responses = steps()
+        except Exception:
+            self.record(name, (time.perf_counter() - started) * 1000.0, 1, 0, False)
+            return []
+        elapsed = (time.perf_counter() - started) * 1000.0
+        queries = 0
+        for _, _, headers in responses:
+            match = _SERVER_TIMING_QUERIES.search(headers.get('Server-Timing', ''))
+            queries += int(match.group(1)) if match else 0
+        ok = all(status < 400 for status, _, _ in responses)
+        self.record(name, elapsed, len(responses), queries, ok)
+        return responses
+
+    def login(self) -> bool:
+        responses = self._run('login', self._login_steps)
+        return bool(responses) and responses[-1][0] == 302
+
+    def _login_steps(self):
+        form = self._get('/auth/login')
+        return [form, self._post('/auth/login', form[1], {'email': self.email, 'password': PASSWORD})]
+
+    def run_once(self) -> None:
+        name = self.rng.choices(self._names, self._weights)[0]
+        self._run(name, self.flows[name])
+
+    def _resource(self) -> Tuple[int, int]:
+        return self.rng.choice(self.resources)
+
+    def browse(self):
+        return [self._get(f'/resources/?page={self.rng.randint(1, 5)}')]
+
+    def search(self):
+        term = self.rng.choice(SEARCH_TERMS)
+        category = self.rng.choice(CATEGORIES + ('',))
+        return [self._get(f'/resources/?keyword={term}&category={category.replace(" ", "+")}&sort=recent')]
+
+    def detail(self):
+        return [self._get(f'/resources/{self._resource()[0]}')]
+
+    def dashboard(self):
+        return [self._get('/dashboard')]
+
+    def book(self):
+        resource_id, _ = self._resource()
+        form = self._get(f'/bookings/create/{resource_id}')
+        start = (datetime.now() + timedelta(days=self.rng.randint(2, 60))).replace(
+            hour=self.rng.randint(8, 17), minute=0, second=0, microsecond=0
+        )
+        end = start + timedelta(hours=1)
+        submitted = self._post(f'/bookings/create/{resource_id}', form[1], {
+            'start_datetime': start.strftime('%Y-%m-%dT%H:%M'),
+            'end_datetime': end.strftime('%Y-%m-%dT%H:%M'),
+            'recurrence_frequency': 'none',
+            'request_action': 'book',
+        })
+        return [form, submitted]
+
+    def message(self):
+        resource_id, owner_id = self._resource()
+        path = f'/messages/send/{owner_id}?resource_id={resource_id}'
+        form = self._get(path)
+        sent = self._post(path, form[1], {'content': 'Is this space free next week for a study group?'})
+        responses = [form, sent]
+        location = sent[2].get('Location', '')
+        if sent[0] == 302 and '/messages/thread/' in location:
+            responses.append(self._get(location[location.index('/messages/thread/'):]))
+        return responses
+
+
+def summarize(samples: Dict[str, List[Tuple[float, int, int, bool]]], elapsed: float) -> Dict:
+    flows = {}
+    total_requests = 0
+    total_errors = 0
+    for name, entries in sorted(samples.items()):
+        latencies = [entry[0] for entry in entries]
+        requests = sum(entry[1] for entry in entries)
+        queries = sum(entry[2] for entry in entries)
+        errors = sum(1 for entry in entries if not entry[3])
+        total_requests += requests
+        total_errors += errors
+        flows[name] = {
+            'count': len(entries),
+            'errors': errors,
+            'requests': requests,
+            'p50': round(percentile(latencies, 50), 3),
+            'p95': round(percentile(latencies, 95), 3),
+            'p99': round(percentile(latencies, 99), 3),
+            'queries_per_request': round(queries / requests, 2) if requests else 0.0,
+        }
+    return {
+        'elapsed_seconds': round(elapsed, 3),
+        'requests': total_requests,
+        'errors': total_errors,
+        'throughput_rps': round(total_requests / elapsed, 2) if elapsed else 0.0,
+        'flows': flows,
+    }
+
+
+def run_load(session_factory: Callable[[], object], catalog: Dict[str, List], *, virtual_users: int = 8,
+             iterations: int = 50, duration: float = 0.0, seed: int = 0) -> Dict:
+    """Run ``virtual_users`` concurrent users, each for ``iterations`` flows or ``duration`` seconds."""
+    if not catalog['emails'] or not catalog['resources']:
+        raise ValueError('The database has no load-test accounts or resources; seed it first.')
+    samples: Dict[str, List[Tuple[float, int, int, bool]]] = {}
+    lock = threading.Lock()
+
+    def record(name: str, ms: float, requests: int, queries: int, ok: bool) -> None:
+        with lock:
+            samples.setdefault(name, []).append((ms, requests, queries, ok))
+
+    def user_loop(index: int) -> None:
+        rng = random.Random(seed * 1_000_003 + index)
+        email = catalog['emails'][index % len(catalog['emails'])]
+        user = VirtualUser(session_factory(), email, catalog, rng, record)
+        if not user.login():
+            return
+        deadline = time.perf_counter() + duration if duration > 0 else None
+        count = 0
+        while (time.perf_counter() < deadline) if deadline else count < iterations:
+            user.run_once()
+            count += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=virtual_users) as pool:
+        list(pool.map(user_loop, range(virtual_users)))
+    report = summarize(samples, time.perf_counter() - started)
+    report['virtual_users'] = virtual_users
+    return report
+
+
+def run_benchmark(*, users: int = 200, resources: int = 40, bookings: int = 2_000, virtual_users: int = 4,
+                  iterations: int = 20, duration: float = 0.0, rounds: int = 4, seed: int = 0,
+                  base_url: Optional[str] = None, seed_data: bool = True) -> Dict:
+    """Seed Config.DATABASE_PATH (unless ``seed_data`` is False) and load-test it."""
+    dataset = None
+    saved_rounds = Config.BCRYPT_ROUNDS
+    Config.BCRYPT_ROUNDS = rounds
+    try:
+        if seed_data:
+            dataset = seed_dataset(users=users, resources=resources, bookings=bookings, rounds=rounds, seed=seed)
+        catalog = load_catalog(Config.DATABASE_PATH)
+        if base_url:
+            factory = lambda: HTTPSession(base_url)  # noqa: E731
+        else:
+            from src.app import create_app
+            from src.utils.passwords import reset_password_executor
+
+            reset_password_executor()
+            app = create_app()
+            app.config.update(BCRYPT_ROUNDS=rounds)
+            factory = lambda: FlaskSession(app)  # noqa: E731
+        report = run_load(factory, catalog, virtual_users=virtual_users, iterations=iterations,
+                          duration=duration, seed=seed)
+    finally:
+        Config.BCRYPT_ROUNDS = saved_rounds
+        if not base_url:
+            from src.utils.passwords import reset_password_executor
+            reset_password_executor()
+    report['target'] = base_url or 'in-process'
+    report['dataset'] = dataset or {'users': len(catalog['emails']), 'resources': len(catalog['resources'])}
+    return report
+
+
+def compare_reports(baseline: Dict, current: Dict, *, tolerance: float = 0.2) -> List[str]:
+    """Regressions of ``current`` against ``baseline``: slower p95, lower throughput or new errors."""
+    problems = []
+    base_rps, rps = baseline.get('throughput_rps', 0.0), current.get('throughput_rps', 0.0)
+    if base_rps and rps < base_rps * (1 - tolerance):
+        problems.append(f'throughput fell from {base_rps:.1f} to {rps:.1f} req/s')
+    for name, flow in current.get('flows', {}).items():
+        before = baseline.get('flows', {}).get(name)
+        if not before:
+            continue
+        if before['p95'] and flow['p95'] > before['p95'] * (1 + tolerance):
+            problems.append(f"{name}: p95 rose from {before['p95']:.1f} to {flow['p95']:.1f} ms")
+        before_rate = before['errors'] / before['count'] if before['count'] else 0.0
+        rate = flow['errors'] / flow['count'] if flow['count'] else 0.0
+        if rate > before_rate + 0.01:
+            problems.append(f'{name}: error rate rose from {before_rate:.1%} to {rate:.1%}')
+        if flow['queries_per_request'] > before['queries_per_request'] * (1 + tolerance) + 0.5:
+            problems.append(
+                f"{name}: queries per request rose from {before['queries_per_request']} "
+                f"to {flow['queries_per_request']}"
+            )
+    return problems
+
+
+def format_report(report: Dict) -> str:
+    dataset = report['dataset']
+    lines = [
+        f"Target: {report['target']}  virtual users: {report['virtual_users']}  "
+        f"elapsed: {report['elapsed_seconds']:.1f}s",
+        f"Dataset: {dataset.get('users', 0)} users, {dataset.get('resources', 0)} resources"
+        + (f", {dataset['bookings']} bookings (seeded in {dataset['seed_seconds']:.1f}s)"
+           if 'bookings' in dataset else ''),
+        f"Requests: {report['requests']}  throughput: {report['throughput_rps']:.1f} req/s  "
+        f"failed flows: {report['errors']}",
+        '',
+        f"{'flow':<11}{'count':>7}{'errors':>8}{'p50':>9}{'p95':>9}{'p99':>9}{'queries/req':>13}",
+    ]
+    for name, flow in report['flows'].items():
+        lines.append(
+            f"{name:<11}{flow['count']:>7}{flow['errors']:>8}{flow['p50']:>9.1f}"
+            f"{flow['p95']:>9.1f}{flow['p99']:>9.1f}{flow['queries_per_request']:>13.1f}"
+        )
+    lines.extend(['', 'Flow latencies in milliseconds (a flow may issue several requests).'])
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Load-test the app end to end with concurrent virtual users.')
+    parser.add_argument('--scale', choices=sorted(SCALES), default='tiny', help='Dataset size preset')
+    parser.add_argument('--users', type=int, help='Accounts to seed (overrides --scale)')
+    parser.add_argument('--resources', type=int, help='Resources to seed (overrides --scale)')
+    parser.add_argument('--bookings', type=int, help='Bookings to seed (overrides --scale)')
+    parser.add_argument('--database', help='Database to seed and test (default: a throwaway file)')
+    parser.add_argument('--seed-only', action='store_true', help='Seed --database and exit')
+    parser.add_argument('--base-url', help='Drive a running server instead of an in-process client')
+    parser.add_argument('--virtual-users', type=int, default=8, help='Concurrent virtual users')
+    parser.add_argument('--iterations', type=int, default=50, help='Flows per virtual user')
+    parser.add_argument('--duration', type=float, default=0.0, help='Run for this many seconds instead')
+    parser.add_argument('--rounds', type=int, default=4, help='bcrypt work factor for seeded accounts')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for data and flow choice')
+    parser.add_argument('--output', help='Write the JSON report here')
+    parser.add_argument('--baseline', help='Earlier JSON report to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='Allowed relative slowdown (0.2 = 20%%)')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    parser.add_argument('--verbose', action='store_true', help="Keep the app's stdout logging")
+    args = parser.parse_args(argv)
+
+    users, resources, bookings = SCALES[args.scale]
+    users = args.users if args.users is not None else users
+    resources = args.resources if args.resources is not None else resources
+    bookings = args.bookings if args.bookings is not None else bookings
+    logging.getLogger('src.data_access.query_profiler').setLevel(logging.ERROR)
+
+    with tempfile.TemporaryDirectory(prefix='load-test-') as workdir:
+        from src.data_access import init_database
+
+        Config.DATABASE_PATH = args.database or os.path.join(workdir, 'load.db')
+        Config.UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+        Config.IMAGE_STAGING_FOLDER = os.path.join(workdir, 'staging')
+        init_database()
+        seed_data = not load_catalog(Config.DATABASE_PATH)['emails']
+        if args.seed_only:
+            if seed_data:
+                dataset = seed_dataset(users=users, resources=resources, bookings=bookings,
+                                       rounds=args.rounds, seed=args.seed)
+                print(json.dumps(dataset, indent=2))
+            else:
+                print(f'{Config.DATABASE_PATH} already holds load-test data.')
+            return 0
+        # Notification delivery prints every message; keep the report readable
+        with open(os.devnull, 'w') as devnull, \
+                contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+            report = run_benchmark(users=users, resources=resources, bookings=bookings,
+                                   virtual_users=args.virtual_users, iterations=args.iterations,
+                                   duration=args.duration, rounds=args.rounds, seed=args.seed,
+                                   base_url=args.base_url, seed_data=seed_data)
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as handle:
+            json.dump(report, handle, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as handle:
+            problems = compare_reports(json.load(handle), report, tolerance=args.tolerance)
+        for problem in problems:
+            print(f'REGRESSION {problem}', file=sys.stderr)
+        return 1 if problems else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,152 @@
+"""
+Login throughput benchmark.
+
+Replays a burst of concurrent logins through ``UserDAL.verify_password``
+twice: once with bcrypt running inline on the request threads and once
+through the process pool. For each mode it reports logins per second,
+p50/p95 login latency, and the latency of a cheap "probe" query issued
+alongside the burst. The probe stands in for the other requests a worker
+serves while a login storm is going on.
+
+Usage:
+    python -m benchmarks.login_benchmark --logins 200 --threads 16 --workers 4 --rounds 12
+"""
+from __future__ import annotations
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+from benchmarks.concierge_benchmark import percentile
+from src.config import Config
+from src.data_access import init_database
+from src.data_access.user_dal import UserDAL
+from src.utils import passwords
+
+PASSWORD = 'BenchmarkPass1'
+_OVERRIDES = ('BCRYPT_ROUNDS', 'PASSWORD_HASH_WORKERS', 'PASSWORD_HASH_MAX_PENDING', 'PASSWORD_HASH_QUEUE_TIMEOUT')
+
+
+def _configure(rounds: int, workers: int, max_pending: int) -> None:
+    Config.BCRYPT_ROUNDS = rounds
+    Config.PASSWORD_HASH_WORKERS = workers
+    Config.PASSWORD_HASH_MAX_PENDING = max_pending
+    Config.PASSWORD_HASH_QUEUE_TIMEOUT = 600.0
+    passwords.reset_password_executor()
+
+
+def _latency_stats(values: Sequence[float]) -> Dict[str, float]:
+    return {'p50': percentile(values, 50), 'p95': percentile(values, 95)}
+
+
+def run_mode(emails: Sequence[str], *, logins: int, threads: int, workers: int, rounds: int) -> Dict:
+    """Run one login burst; ``workers=0`` keeps bcrypt on the request threads."""
+    # Inline mode lets every request thread hash at once, as before the executor existed
+    _configure(rounds, workers, max_pending=workers or threads)
+    hasher = passwords.get_password_executor()
+    hasher.check(PASSWORD, hasher.hash(PASSWORD))  # start the pool outside the timed window
+
+    login_ms: List[float] = []
+    probe_ms: List[float] = []
+    lock = threading.Lock()
+    done = threading.Event()
+
+    def login(index: int) -> None:
+        started = time.perf_counter()
+        user = UserDAL.verify_password(emails[index % len(emails)], PASSWORD)
+        elapsed = (time.perf_counter() - started) * 1000.0
+        assert user is not None
+        with lock:
+            login_ms.append(elapsed)
+
+    def probe() -> None:
+        while not done.is_set():
+            started = time.perf_counter()
+            UserDAL.get_user_by_email(emails[0])
+            probe_ms.append((time.perf_counter() - started) * 1000.0)
+            time.sleep(0.005)
+
+    prober = threading.Thread(target=probe, daemon=True)
+    prober.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - started
+    done.set()
+    prober.join()
+    passwords.reset_password_executor()
+
+    return {
+        'workers': workers,
+        'logins_per_second': logins / elapsed if elapsed else 0.0,
+        'login_ms': _latency_stats(login_ms),
+        'probe_ms': _latency_stats(probe_ms),
+    }
+
+
+def run_benchmark(*, users: int = 20, logins: int = 100, threads: int = 8,
+                  workers: int = 0, rounds: int = 10) -> Dict:
+    """Seed ``users`` accounts at ``rounds`` and compare inline against pooled logins."""
+    workers = workers or (os.cpu_count() or 1)
+    saved = {name: getattr(Config, name) for name in _OVERRIDES}
+    try:
+        _configure(rounds, 0, max_pending=threads)
+        emails = [f'login-bench-{index}@iu.edu' for index in range(max(1, users))]
+        for index, email in enumerate(emails):
+            UserDAL.create_user(name=f'Login Bench {index}', email=email, password=PASSWORD)
+        modes = {
+            'inline': run_mode(emails, logins=logins, threads=threads, workers=0, rounds=rounds),
+            'pooled': run_mode(emails, logins=logins, threads=threads, workers=workers, rounds=rounds),
+        }
+    finally:
+        for name, value in saved.items():
+            setattr(Config, name, value)
+        passwords.reset_password_executor()
+    return {'logins': logins, 'threads': threads, 'rounds': rounds, 'cpus': os.cpu_count() or 1, 'modes': modes}
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Logins: {report['logins']}  threads: {report['threads']}  "
+        f"bcrypt rounds: {report['rounds']}  CPUs: {report['cpus']}",
+        '',
+        f"{'mode':<10}{'workers':>8}{'logins/s':>11}{'login p50':>11}{'login p95':>11}{'probe p50':>11}{'probe p95':>11}"
+    ]
+    for name, mode in report['modes'].items():
+        lines.append(
+            f"{name:<10}{mode['workers']:>8}{mode['logins_per_second']:>11.1f}"
+            f"{mode['login_ms']['p50']:>11.1f}{mode['login_ms']['p95']:>11.1f}"
+            f"{mode['probe_ms']['p50']:>11.2f}{mode['probe_ms']['p95']:>11.2f}"
+        )
+    lines.extend(['', 'Latencies in milliseconds.'])
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Compare inline and pooled bcrypt login throughput.')
+    parser.add_argument('--users', type=int, default=20, help='Accounts to seed')
+    parser.add_argument('--logins', type=int, default=100, help='Logins per mode')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent request threads')
+    parser.add_argument('--workers', type=int, default=0, help='Pool processes (defaults to CPU count)')
+    parser.add_argument('--rounds', type=int, default=10, help='bcrypt work factor')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory(prefix='login-bench-') as workdir:
+        Config.DATABASE_PATH = os.path.join(workdir, 'benchmark.db')
+        Config.UPLOAD_FOLDER = os.path.join(workdir, 'uploads')
+        init_database()
+        report = run_benchmark(users=args.users, logins=args.logins, threads=args.threads,
+                               workers=args.workers, rounds=args.rounds)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
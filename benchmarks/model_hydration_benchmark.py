@@ -0,0 +1,173 @@
+"""
+Model hydration benchmark.
+
+Fetches large result sets shaped like the real ``users``, ``resources``,
+``bookings``, ``messages`` and ``reviews`` tables and compares the historical
+``Model(**dict(row))`` construction of ``__dict__``-backed objects with the
+slotted models built through ``Model.from_rows``. Reports wall time (best of
+``--repeat``) and the memory retained by the hydrated list.
+
+Usage:
+    python -m benchmarks.model_hydration_benchmark --rows 100000 --repeat 3
+"""
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import logging
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.config import Config
+from src.data_access import EPOCH_COLUMNS
+from src.models.models import Booking, Message, Resource, Review, User
+
+
+MODELS = {
+    'users': User,
+    'resources': Resource,
+    'bookings': Booking,
+    'messages': Message,
+    'reviews': Review,
+}
+
+
+def legacy_model(model):
+    """Return a ``__dict__``-backed twin of ``model`` sharing its constructor."""
+    return type(f'Legacy{model.__name__}', (), {'__init__': model.__init__})
+
+
+def legacy_hydrate(model) -> Callable[[Sequence[sqlite3.Row]], List]:
+    """The pre-mapper path: copy each row into a dict and splat it as kwargs."""
+    legacy = legacy_model(model)
+
+    def hydrate(rows):
+        return [legacy(**dict(row)) for row in rows]
+    return hydrate
+
+
+def table_columns(schema_db: str, table: str) -> List[tuple]:
+    """Return ``(name, declared type)`` for each column of ``table`` in schema order."""
+    conn = sqlite3.connect(schema_db)
+    try:
+        return [(row[1], (row[2] or '').upper()) for row in conn.execute(f'PRAGMA table_info({table})')]
+    finally:
+        conn.close()
+
+
+def _sample_value(name: str, declared: str, index: int):
+    if 'INT' in declared or 'BOOL' in declared:
+        return index if name.endswith('_id') else index % 2
+    if 'TIMESTAMP' in declared or 'DATETIME' in declared or name.endswith(('_at', '_datetime')):
+        return f'2024-{index % 12 + 1:02d}-{index % 28 + 1:02d} {index % 24:02d}:00:00'
+    return f'{name} {index}'
+
+
+def build_rows(columns: Sequence[tuple], count: int) -> List[sqlite3.Row]:
+    """Materialise ``count`` ``sqlite3.Row`` objects with the given column layout."""
+    conn = sqlite3.connect(':memory:')
+    conn.row_factory = sqlite3.Row
+    names = [name for name, _ in columns]
+    conn.execute(f'CREATE TABLE bench ({", ".join(names)})')
+    conn.executemany(
+        f'INSERT INTO bench VALUES ({", ".join("?" for _ in names)})',
+        ([_sample_value(name, declared, index) for name, declared in columns] for index in range(count))
+    )
+    rows = conn.execute('SELECT * FROM bench').fetchall()
+    conn.close()
+    return rows
+
+
+def measure(hydrate: Callable, rows: Sequence[sqlite3.Row], repeat: int) -> Dict[str, float]:
+    """Best-of-``repeat`` hydration time plus the bytes the resulting list keeps alive."""
+    best = float('inf')
+    for _ in range(max(1, repeat)):
+        gc.collect()
+        started = time.perf_counter()
+        hydrate(rows)
+        best = min(best, time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        result = hydrate(rows)
+        retained = tracemalloc.get_traced_memory()[0] - baseline
+    finally:
+        tracemalloc.stop()
+    del result
+    return {'seconds': best, 'bytes': retained}
+
+
+def run_benchmark(schema_db: str, rows: int = 100_000, repeat: int = 3,
+                  tables: Optional[Sequence[str]] = None) -> Dict:
+    report = {'rows': rows, 'repeat': repeat, 'models': {}}
+    for table in tables or MODELS:
+        model = MODELS[table]
+        # The legacy **kwargs path predates the epoch shadow columns (the row mapper skips them)
+        shadows = {shadow for _, shadow in EPOCH_COLUMNS.get(table, ())}
+        columns = [column for column in table_columns(schema_db, table) if column[0] not in shadows]
+        if table == 'bookings':
+            # Listing queries join the requester name onto each booking
+            columns.append(('requester_name', 'TEXT'))
+        sample = build_rows(columns, rows)
+        legacy = measure(legacy_hydrate(model), sample, repeat)
+        slotted = measure(model.from_rows, sample, repeat)
+        report['models'][model.__name__] = {
+            'legacy': legacy,
+            'slotted': slotted,
+            'speedup': legacy['seconds'] / slotted['seconds'] if slotted['seconds'] else 0.0,
+            'memory_ratio': slotted['bytes'] / legacy['bytes'] if legacy['bytes'] else 0.0,
+        }
+        del sample
+    return report
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Rows per model: {report['rows']}  (best of {report['repeat']})",
+        '',
+        f"{'model':<10}{'legacy ms':>12}{'slotted ms':>12}{'speedup':>10}"
+        f"{'legacy MB':>12}{'slotted MB':>12}{'memory':>9}"
+    ]
+    for name, stats in report['models'].items():
+        lines.append(
+            f"{name:<10}{stats['legacy']['seconds'] * 1000:>12.1f}{stats['slotted']['seconds'] * 1000:>12.1f}"
+            f"{stats['speedup']:>9.2f}x"
+            f"{stats['legacy']['bytes'] / 1e6:>12.1f}{stats['slotted']['bytes'] / 1e6:>12.1f}"
+            f"{stats['memory_ratio'] * 100:>8.0f}%"
+        )
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark row-to-model hydration.')
+    parser.add_argument('--rows', type=int, default=100_000, help='Rows fetched per model')
+    parser.add_argument('--repeat', type=int, default=3, help='Timing repetitions (best is reported)')
+    parser.add_argument('--tables', nargs='*', choices=sorted(MODELS), help='Limit to these tables')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    workdir = tempfile.TemporaryDirectory(prefix='hydration-bench-')
+    try:
+        # Build the real schema once so row shapes match production column order
+        Config.DATABASE_PATH = os.path.join(workdir.name, 'schema.db')
+        from src.data_access import init_database
+        init_database()
+        report = run_benchmark(Config.DATABASE_PATH, rows=args.rows, repeat=args.repeat, tables=args.tables)
+    finally:
+        workdir.cleanup()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Application startup benchmark.
+
+Starts fresh interpreters and times ``import src.app`` and ``create_app()``
+separately, then reports min/median/max over ``--runs``. Each run also lists
+which of the lazily imported integrations (Google client, requests, bleach,
+python-magic, Pillow) were loaded anyway, so an eager import creeping back in shows up
+in the report.
+
+Usage:
+    python -m benchmarks.startup_benchmark --runs 5
+    python -m benchmarks.startup_benchmark --runs 5 --seed   # include demo fixture seeding
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List, Optional, Sequence
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+DEFERRED_MODULES = ('googleapiclient', 'google_auth_oauthlib', 'google.oauth2', 'requests', 'bleach', 'magic', 'PIL')
+
+_CHILD = '''
+import json, sys, time
+started = time.perf_counter()
+import src.app
+imported = time.perf_counter()
+from src.config import Config
+Config.DATABASE_PATH, Config.UPLOAD_FOLDER = sys.argv[1], sys.argv[2]
+Config.SEED_SAMPLE_DATA = sys.argv[3] == '1'
+src.app.create_app()
+built = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000.0,
+    'factory_ms': (built - imported) * 1000.0,
+    'loaded': [name for name in json.loads(sys.argv[4]) if name in sys.modules],
+}))
+'''
+
+
+def measure_once(database: str, uploads: str, seed: bool) -> Dict:
+    """Run one cold start in a child interpreter and return its timings."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE='1')
+    output = subprocess.run(
+        [sys.executable, '-c', _CHILD, database, uploads, '1' if seed else '0', json.dumps(DEFERRED_MODULES)],
+        cwd=PROJECT_ROOT, env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _stats(values: Sequence[float]) -> Dict[str, float]:
+    return {'min': min(values), 'median': statistics.median(values), 'max': max(values)}
+
+
+def run_benchmark(runs: int = 5, seed: bool = False, workdir: Optional[str] = None) -> Dict:
+    """Time ``runs`` cold starts against a database that already has its schema."""
+    with tempfile.TemporaryDirectory(prefix='startup-bench-', dir=workdir) as tmp:
+        database = os.path.join(tmp, 'startup.db')
+        uploads = os.path.join(tmp, 'uploads')
+        # First start creates the schema (and fixtures), which is not what we are timing
+        measure_once(database, uploads, seed)
+        samples: List[Dict] = [measure_once(database, uploads, seed) for _ in range(max(1, runs))]
+
+    imports = [sample['import_ms'] for sample in samples]
+    factories = [sample['factory_ms'] for sample in samples]
+    return {
+        'runs': len(samples),
+        'seed': seed,
+        'import_ms': _stats(imports),
+        'factory_ms': _stats(factories),
+        'total_ms': _stats([i + f for i, f in zip(imports, factories)]),
+        'deferred_loaded': sorted({name for sample in samples for name in sample['loaded']}),
+    }
+
+
+def format_report(report: Dict) -> str:
+    lines = [
+        f"Cold starts: {report['runs']}  fixture seeding: {'on' if report['seed'] else 'off'}",
+        '',
+        f"{'phase':<12}{'min ms':>10}{'median ms':>12}{'max ms':>10}"
+    ]
+    for phase in ('import', 'factory', 'total'):
+        stats = report[f'{phase}_ms']
+        lines.append(f"{phase:<12}{stats['min']:>10.1f}{stats['median']:>12.1f}{stats['max']:>10.1f}")
+    loaded = ', '.join(report['deferred_loaded']) or 'none'
+    lines.extend(['', f'Deferred integrations loaded at startup: {loaded}'])
+    return '\n'.join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='Benchmark application import and factory time.')
+    parser.add_argument('--runs', type=int, default=5, help='Timed cold starts')
+    parser.add_argument('--seed', action='store_true', help='Enable SEED_SAMPLE_DATA for every start')
+    parser.add_argument('--json', action='store_true', help='Print the report as JSON')
+    args = parser.parse_args(argv)
+
+    report = run_benchmark(runs=args.runs, seed=args.seed)
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,76 @@
+-- Integer epoch shadow columns for index-friendly range filters, sorts and month buckets.
+-- Execute each statement individually; ignore "duplicate column" errors if re-running.
+
+ALTER TABLE bookings ADD COLUMN start_epoch INTEGER;
+ALTER TABLE bookings ADD COLUMN end_epoch INTEGER;
+ALTER TABLE bookings ADD COLUMN created_epoch INTEGER;
+ALTER TABLE messages ADD COLUMN timestamp_epoch INTEGER;
+ALTER TABLE notifications ADD COLUMN created_epoch INTEGER;
+ALTER TABLE resources ADD COLUMN created_epoch INTEGER;
+ALTER TABLE users ADD COLUMN created_epoch INTEGER;
+
+CREATE INDEX IF NOT EXISTS idx_bookings_resource_epoch ON bookings (resource_id, start_epoch, end_epoch);
+CREATE INDEX IF NOT EXISTS idx_bookings_status_created_epoch ON bookings (status, created_epoch);
+CREATE INDEX IF NOT EXISTS idx_bookings_created_epoch ON bookings (created_epoch);
+CREATE INDEX IF NOT EXISTS idx_messages_receiver_epoch ON messages (receiver_id, timestamp_epoch);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_epoch ON notifications (user_id, created_epoch);
+CREATE INDEX IF NOT EXISTS idx_resources_owner_epoch ON resources (owner_id, status, created_epoch);
+CREATE INDEX IF NOT EXISTS idx_users_created_epoch ON users (created_epoch);
+
+-- Keep the shadows current on every write path
+CREATE TRIGGER IF NOT EXISTS trg_bookings_epoch_insert AFTER INSERT ON bookings
+BEGIN
+    UPDATE bookings SET start_epoch = CAST(strftime('%s', NEW.start_datetime) AS INTEGER), end_epoch = CAST(strftime('%s', NEW.end_datetime) AS INTEGER), created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_bookings_epoch_update AFTER UPDATE OF start_datetime, end_datetime, created_at ON bookings
+BEGIN
+    UPDATE bookings SET start_epoch = CAST(strftime('%s', NEW.start_datetime) AS INTEGER), end_epoch = CAST(strftime('%s', NEW.end_datetime) AS INTEGER), created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_messages_epoch_insert AFTER INSERT ON messages
+BEGIN
+    UPDATE messages SET timestamp_epoch = CAST(strftime('%s', NEW.timestamp) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_messages_epoch_update AFTER UPDATE OF timestamp ON messages
+BEGIN
+    UPDATE messages SET timestamp_epoch = CAST(strftime('%s', NEW.timestamp) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notifications_epoch_insert AFTER INSERT ON notifications
+BEGIN
+    UPDATE notifications SET created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_notifications_epoch_update AFTER UPDATE OF created_at ON notifications
+BEGIN
+    UPDATE notifications SET created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_resources_epoch_insert AFTER INSERT ON resources
+BEGIN
+    UPDATE resources SET created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_resources_epoch_update AFTER UPDATE OF created_at ON resources
+BEGIN
+    UPDATE resources SET created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_users_epoch_insert AFTER INSERT ON users
+BEGIN
+    UPDATE users SET created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_users_epoch_update AFTER UPDATE OF created_at ON users
+BEGIN
+    UPDATE users SET created_epoch = CAST(strftime('%s', NEW.created_at) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+-- Backfill existing rows
+UPDATE bookings SET start_epoch = CAST(strftime('%s', start_datetime) AS INTEGER), end_epoch = CAST(strftime('%s', end_datetime) AS INTEGER), created_epoch = CAST(strftime('%s', created_at) AS INTEGER) WHERE (start_epoch IS NULL AND start_datetime IS NOT NULL) OR (end_epoch IS NULL AND end_datetime IS NOT NULL) OR (created_epoch IS NULL AND created_at IS NOT NULL);
+UPDATE messages SET timestamp_epoch = CAST(strftime('%s', timestamp) AS INTEGER) WHERE (timestamp_epoch IS NULL AND timestamp IS NOT NULL);
+UPDATE notifications SET created_epoch = CAST(strftime('%s', created_at) AS INTEGER) WHERE (created_epoch IS NULL AND created_at IS NOT NULL);
+UPDATE resources SET created_epoch = CAST(strftime('%s', created_at) AS INTEGER) WHERE (created_epoch IS NULL AND created_at IS NOT NULL);
+UPDATE users SET created_epoch = CAST(strftime('%s', created_at) AS INTEGER) WHERE (created_epoch IS NULL AND created_at IS NOT NULL);
@@ -0,0 +1,20 @@
+-- Epoch shadows and an interval index for waitlist promotion.
+-- Execute each statement individually; ignore "duplicate column" errors if re-running.
+
+ALTER TABLE waitlist_entries ADD COLUMN start_epoch INTEGER;
+ALTER TABLE waitlist_entries ADD COLUMN end_epoch INTEGER;
+
+-- Only active entries are ever searched by interval
+CREATE INDEX IF NOT EXISTS idx_waitlist_active_interval ON waitlist_entries (resource_id, start_epoch, end_epoch) WHERE status = 'active';
+
+CREATE TRIGGER IF NOT EXISTS trg_waitlist_entries_epoch_insert AFTER INSERT ON waitlist_entries
+BEGIN
+    UPDATE waitlist_entries SET start_epoch = CAST(strftime('%s', NEW.start_datetime) AS INTEGER), end_epoch = CAST(strftime('%s', NEW.end_datetime) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_waitlist_entries_epoch_update AFTER UPDATE OF start_datetime, end_datetime ON waitlist_entries
+BEGIN
+    UPDATE waitlist_entries SET start_epoch = CAST(strftime('%s', NEW.start_datetime) AS INTEGER), end_epoch = CAST(strftime('%s', NEW.end_datetime) AS INTEGER) WHERE rowid = NEW.rowid;
+END;
+
+UPDATE waitlist_entries SET start_epoch = CAST(strftime('%s', start_datetime) AS INTEGER), end_epoch = CAST(strftime('%s', end_datetime) AS INTEGER) WHERE (start_epoch IS NULL AND start_datetime IS NOT NULL) OR (end_epoch IS NULL AND end_datetime IS NOT NULL);
@@ -2,8 +2,11 @@
 Main Flask Application
 Campus Resource Hub
 """
+import json
+import logging
 import os
 import sys
+import time
 
 # Avoid writing to /dev/shm when the environment disallows it by forcing
 # multiprocessing arenas to use the fallback temp directory instead.
@@ -18,13 +21,16 @@ PROJECT_ROOT = os.path.dirname(os.path.abspath(os.path.join(__file__, os.pardir)
 if PROJECT_ROOT not in sys.path:
     sys.path.append(PROJECT_ROOT)
 
-from flask import Flask, render_template, redirect, url_for, flash
+import click
+from flask import Flask, g, render_template, redirect, request, url_for, flash
 from flask_login import LoginManager, current_user, logout_user
 from flask_wtf import CSRFProtect
 from datetime import datetime
 from src.config import Config
-from src.data_access import init_database
+from src.data_access import init_database, query_profiler
 from src.data_access.user_dal import UserDAL
+from src.data_access.analytics_rollup_dal import AnalyticsRollupDAL
+from src.data_access.import_dal import IMPORT_BATCH_SIZE, IMPORT_DATASETS, ImportDAL
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.booking_dal import BookingDAL
 from src.data_access.review_dal import ReviewDAL
@@ -41,10 +47,18 @@ from src.controllers import (
     calendar_bp,
     accessibility_bp,
     notification_bp,
-    concierge_bp
+    concierge_bp,
+    metrics_bp
 )
 from src.utils.calendar_sync import GOOGLE_PROVIDER
+from src.utils.datetime_helpers import format_local, local_timezone, to_local
+from src.utils.importers import IMPORT_FORMATS, iter_records
 from src.services.notification_center import NotificationCenter
+from src.services import user_cache
+from src.services.request_metrics import get_request_metrics
+from src.services.fragment_cache import FragmentCacheExtension, deferred
+from src.services.static_assets import AssetManifest, send_static_asset
+from src.services.image_pipeline import get_image_pipeline, is_generated_file, resource_image_url
 
 def create_app():
     """Application factory"""
@@ -53,6 +67,7 @@ def create_app():
     template_folder = os.path.abspath(os.path.join(os.path.dirname(__file__), 'views'))
     app = Flask(__name__, template_folder=template_folder, static_folder=static_folder)
     app.config.from_object(Config)
+    app.jinja_env.add_extension(FragmentCacheExtension)
 
     # Configure caching based on environment
     # In production, cache static files for 1 year (31536000 seconds)
@@ -60,15 +75,92 @@ def create_app():
     is_production = app.config.get('ENV') == 'production' or os.environ.get('FLASK_ENV') == 'production'
     app.config['SEND_FILE_MAX_AGE_DEFAULT'] = 31536000 if is_production else 0
 
+    # Static URLs carry a hash of the file, so they only change when the file does
+    static_assets = AssetManifest(static_folder, auto_reload=not is_production)
+    app.view_functions['static'] = send_static_asset
+
+    @app.url_defaults
+    def fingerprint_static_urls(endpoint, values):
+        if endpoint == 'static' and 'v' not in values:
+            version = static_assets.version(values.get('filename', ''))
+            if version:
+                values['v'] = version
+
+    # Metrics and SQL profiling hooks go in before CSRFProtect so that requests it
+    # rejects are still counted and timed
+    @app.before_request
+    def start_request_metrics():
+        """Count the request as in flight (first hook, so early-returning hooks cannot skip it)."""
+        metrics = get_request_metrics()
+        if metrics is None or request.endpoint == 'metrics.export':
+            return
+        g.metrics_labels = (request.blueprint or 'app', request.endpoint or 'unmatched')
+        g.metrics_started = time.perf_counter()
+        metrics.request_started(*g.metrics_labels)
+
+    @app.after_request
+    def capture_metrics_status(response):
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_request_metrics(exc):
+        """Record latency and status; runs even when the view raised."""
+        started = g.pop('metrics_started', None)
+        metrics = get_request_metrics()
+        if started is None or metrics is None:
+            return
+        status = 500 if exc is not None else g.get('metrics_status', 500)
+        metrics.request_finished(*g.metrics_labels, request.method, status, time.perf_counter() - started)
+
+    @app.before_request
+    def start_query_profile():
+        """Time every SQL statement this request issues (registered first so it sees them all)."""
+        if app.config.get('QUERY_PROFILER_ENABLED'):
+            query_profiler.start_profile()
+
+    @app.after_request
+    def report_query_profile(response):
+        """Log the request's SQL profile; Server-Timing only in debug or for METRICS_ALLOWED_IPS."""
+        profile = query_profiler.stop_profile()
+        if profile is None:
+            return response
+        summary = profile.summary(
+            slow_ms=float(app.config.get('QUERY_SLOW_MS', 100)),
+            n_plus_one=int(app.config.get('QUERY_N_PLUS_ONE_THRESHOLD', 10)),
+            top=int(app.config.get('QUERY_PROFILER_TOP', 5))
+        )
+        if app.debug or request.remote_addr in (app.config.get('METRICS_ALLOWED_IPS') or ()):
+            response.headers.add('Server-Timing', query_profiler.server_timing(summary))
+        if summary['queries']:
+            level = logging.WARNING if summary['slow_queries'] or summary['n_plus_one'] else logging.INFO
+            query_profiler.logger.log(level, json.dumps({
+                'event': 'request_sql',
+                'method': request.method,
+                'path': request.path,
+                'endpoint': request.endpoint,
+                'status': response.status_code,
+                **summary
+            }))
+        return response
+
+    @app.teardown_request
+    def discard_query_profile(exc):
+        # after_request is skipped when a view raises; never leak a profile into the next request
+        query_profiler.stop_profile()
+
     # Enable CSRF protection for forms
     CSRFProtect(app)
     
-    # Ensure upload folder exists
+    # Ensure upload folder exists and finish any uploads a previous process left staged
     os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
+    with app.app_context():
+        get_image_pipeline().resume_pending()
     
-    # Initialize database and load demo fixtures
+    # Initialize database; demo fixtures are opt-in so production workers start fast
     init_database()
-    ensure_sample_content()
+    if app.config.get('SEED_SAMPLE_DATA'):
+        ensure_sample_content()
     
     # Setup Flask-Login
     login_manager = LoginManager()
@@ -79,9 +171,8 @@ def create_app():
     
     @login_manager.user_loader
     def load_user(user_id):
-        """Load user for Flask-Login"""
-        user = UserDAL.get_user_by_id(int(user_id))
-        return user
+        """Load user for Flask-Login (cached until the user's write counter moves)"""
+        return user_cache.load_user(int(user_id))
     
     # Register blueprints
     app.register_blueprint(auth_bp)
@@ -94,6 +185,7 @@ def create_app():
     app.register_blueprint(accessibility_bp)
     app.register_blueprint(notification_bp)
     app.register_blueprint(concierge_bp)
+    app.register_blueprint(metrics_bp)
 
     @app.before_request
     def enforce_account_health():
@@ -103,11 +195,22 @@ def create_app():
             flash('Your account is currently suspended. Please contact an administrator.', 'danger')
             return redirect(url_for('auth.login'))
 
-    @app.context_processor
-    def inject_cache_bust():
-        """Add cache busting timestamp to templates."""
-        import time
-        return dict(cache_bust=int(time.time()))
+    @app.after_request
+    def cache_immutable_static(response):
+        """Content-hashed uploads and fingerprinted assets never change, so browsers may keep them forever."""
+        if request.endpoint != 'static' or response.status_code != 200:
+            return response
+        filename = (request.view_args or {}).get('filename', '')
+        if request.path.startswith('/static/uploads/'):
+            immutable = is_generated_file(request.path.rsplit('/', 1)[-1])
+        else:
+            version = request.args.get('v')
+            immutable = bool(version) and version == static_assets.version(filename)
+        if immutable:
+            response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+        return response
+
+    app.add_template_global(resource_image_url)
 
     @app.context_processor
     def inject_nav_notifications():
@@ -125,26 +228,28 @@ def create_app():
     @app.route('/')
     def index():
         """Homepage"""
-        featured_resources = ResourceDAL.get_all_resources(status='published', limit=6)
-        resources_with_ratings = []
-        top_rated_threshold = 4.5
-        for resource in featured_resources:
-            stats = ReviewDAL.get_resource_rating_stats(resource.resource_id)
-            avg_rating = stats['avg_rating'] if stats and stats['avg_rating'] else 0
-            total_reviews = stats['total_reviews'] if stats else 0
-            resources_with_ratings.append({
-                'resource': resource,
-                'avg_rating': round(avg_rating, 1),
-                'total_reviews': total_reviews,
-                'is_top_rated': avg_rating >= top_rated_threshold and total_reviews >= 3
-            })
+        def load_featured_resources():
+            featured_resources = ResourceDAL.get_all_resources(status='published', limit=6)
+            resources_with_ratings = []
+            top_rated_threshold = 4.5
+            for resource in featured_resources:
+                stats = ReviewDAL.get_resource_rating_stats(resource.resource_id)
+                avg_rating = stats['avg_rating'] if stats and stats['avg_rating'] else 0
+                total_reviews = stats['total_reviews'] if stats else 0
+                resources_with_ratings.append({
+                    'resource': resource,
+                    'avg_rating': round(avg_rating, 1),
+                    'total_reviews': total_reviews,
+                    'is_top_rated': avg_rating >= top_rated_threshold and total_reviews >= 3
+                })
+            return resources_with_ratings
 
-        # Get total count of published resources for homepage stats
-        all_resources = ResourceDAL.get_all_resources(status='published')
-        total_resources_count = len(all_resources) if all_resources else 0
+        # Lazy result set: len() issues a COUNT instead of loading every resource
+        total_resources_count = len(ResourceDAL.get_all_resources(status='published'))
 
+        # Only runs when the cached featured grid has to be rendered again
         return render_template('index.html',
-                               featured_resources=resources_with_ratings,
+                               load_featured_resources=deferred(load_featured_resources),
                                total_resources_count=total_resources_count)
     
     @app.route('/dashboard')
@@ -276,46 +381,24 @@ def create_app():
     # Template filters
     def _parse_datetime(value):
         """Convert ISO strings or datetimes into datetime objects, and convert from UTC to local timezone."""
-        from zoneinfo import ZoneInfo
-        
-        if isinstance(value, datetime):
-            dt = value
-        elif isinstance(value, str):
-            try:
-                normalized = value.replace('Z', '+00:00')
-                dt = datetime.fromisoformat(normalized)
-            except ValueError:
-                return None
-        else:
-            return None
-        
-        # If datetime is naive (no timezone), assume it's UTC (from database)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=ZoneInfo('UTC'))
-        
-        # Convert to local timezone for display
-        local_tz = ZoneInfo(Config.TIMEZONE)
-        dt_local = dt.astimezone(local_tz)
-        
-        return dt_local
+        # Repeated values hit the parse/localize caches in datetime_helpers
+        return to_local(value)
 
     @app.template_filter('datetime_format')
     def datetime_format(value, format='%B %d, %Y at %I:%M %p'):
         """Format datetime for display in local timezone"""
-        dt_val = _parse_datetime(value)
-        return dt_val.strftime(format) if dt_val else (value or '')
+        text = format_local(value, format)
+        return text if text is not None else (value or '')
 
     @app.template_filter('relative_time')
     def relative_time(value):
         """Return a short relative time string such as '2h ago'."""
-        from zoneinfo import ZoneInfo
-        
         dt_val = _parse_datetime(value)
         if dt_val is None:
             return ''
         
         # Get current time in local timezone
-        now = datetime.now(ZoneInfo(Config.TIMEZONE))
+        now = datetime.now(local_timezone())
         delta = now - dt_val
         seconds = delta.total_seconds()
         
@@ -355,6 +438,53 @@ def create_app():
         text = str(value)
         text = re.sub(r'\*\*(.+?)\*\*', r'<strong>\1</strong>', text)
         return text
+
+    @app.cli.command('compact-rollups')
+    @click.option('--rebuild', is_flag=True, help='Recompute every rollup from the base tables.')
+    def compact_rollups(rebuild):
+        """Compact (or rebuild) the admin analytics rollup tables; safe to run from cron."""
+        if rebuild:
+            AnalyticsRollupDAL.rebuild()
+            click.echo('Rebuilt analytics rollups from base tables.')
+        removed = AnalyticsRollupDAL.compact()
+        click.echo(f'Removed {removed} empty rollup rows.')
+
+    @app.cli.command('seed-sample-data')
+    def seed_sample_data():
+        """Create or refresh the demo users, resources, bookings and reviews."""
+        ensure_sample_content()
+        click.echo('Sample content is in place.')
+
+    @app.cli.command('bulk-import')
+    @click.argument('dataset', type=click.Choice(IMPORT_DATASETS))
+    @click.argument('path', type=click.Path(exists=True, dir_okay=False))
+    @click.option('--format', 'fmt', type=click.Choice(IMPORT_FORMATS), help='Defaults to the file extension.')
+    @click.option('--batch-size', type=int, default=IMPORT_BATCH_SIZE, show_default=True,
+                  help='Rows validated and written per transaction.')
+    @click.option('--workers', type=int, default=None,
+                  help='Processes used to bcrypt-hash passwords (0 hashes in-process; defaults to CPU count).')
+    @click.option('--keep-indexes', is_flag=True, help='Maintain indexes and rollup triggers row by row.')
+    @click.option('--dry-run', is_flag=True, help='Validate the file without writing anything.')
+    def bulk_import(dataset, path, fmt, batch_size, workers, keep_indexes, dry_run):
+        """Load users, resources or bookings from a CSV or JSON Lines file."""
+        try:
+            records = iter_records(path, fmt)
+            report = ImportDAL.import_records(
+                dataset, records, batch_size=batch_size, workers=workers,
+                defer_indexes=not keep_indexes, dry_run=dry_run
+            )
+        except ValueError as exc:
+            raise click.ClickException(str(exc))
+        for line_number, message in report.errors:
+            click.echo(f'  line {line_number}: {message}', err=True)
+        if report.rejected > len(report.errors):
+            click.echo(f'  ... {report.rejected - len(report.errors)} more rejected rows', err=True)
+        verb = 'Validated' if dry_run else 'Imported'
+        click.echo(
+            f'{verb} {report.read - report.rejected if dry_run else report.inserted} of {report.read} '
+            f'{dataset} rows ({report.rejected} rejected) in {report.elapsed_seconds:.2f}s '
+            f'- {report.rows_per_second:,.0f} rows/s'
+        )
     
     return app
 
@@ -375,6 +505,8 @@ def _can_enable_debug():
 
 
 if __name__ == '__main__':
+    # Running the module directly is a development workflow, so seed demo data unless told otherwise
+    Config.SEED_SAMPLE_DATA = os.environ.get('SEED_SAMPLE_DATA', 'True').lower() == 'true'
     app = create_app()
     debug_env = os.environ.get('FLASK_DEBUG')
     debug_mode = True if debug_env is None else debug_env == '1'
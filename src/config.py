@@ -19,11 +19,17 @@ class Config:
     # Database configuration
     BASE_DIR = BASE_DIR
     DATABASE_PATH = os.path.join(BASE_DIR, '..', 'campus_hub.db')
+    # Demo users/resources are only loaded on request (development, demos, tests)
+    SEED_SAMPLE_DATA = os.environ.get('SEED_SAMPLE_DATA', 'False').lower() == 'true'
 
     # File upload configuration
     UPLOAD_FOLDER = os.path.join(BASE_DIR, 'static', 'uploads')
     MAX_CONTENT_LENGTH = 5 * 1024 * 1024  # 5MB max file size
     ALLOWED_EXTENSIONS = {'png', 'jpg', 'jpeg', 'gif'}
+    # Raw uploads wait here (outside /static) until the image pipeline has
+    # stripped metadata and written the thumb/medium variants
+    IMAGE_STAGING_FOLDER = os.environ.get('IMAGE_STAGING_FOLDER') or os.path.join(BASE_DIR, '..', 'instance', 'upload-staging')
+    IMAGE_PIPELINE_WORKERS = int(os.environ.get('IMAGE_PIPELINE_WORKERS', 1))
     
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=24)
@@ -32,6 +38,50 @@ class Config:
     SESSION_COOKIE_HTTPONLY = True
     SESSION_COOKIE_SAMESITE = 'Lax'
 
+    # Password hashing: bcrypt work factor (existing hashes are upgraded on login)
+    # and the bounded executor that keeps bcrypt off the request threads.
+    # PASSWORD_HASH_WORKERS=0 hashes on the calling thread.
+    BCRYPT_ROUNDS = int(os.environ.get('BCRYPT_ROUNDS', 12))
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS', 0))
+    PASSWORD_HASH_MAX_PENDING = int(os.environ.get('PASSWORD_HASH_MAX_PENDING', 32))
+    PASSWORD_HASH_QUEUE_TIMEOUT = float(os.environ.get('PASSWORD_HASH_QUEUE_TIMEOUT', 5.0))
+
+    # Per-worker cache for the Flask-Login user loader; any write to a user
+    # bumps its entity_versions counter, so changes apply on the next request
+    USER_CACHE_ENABLED = os.environ.get('USER_CACHE_ENABLED', 'True').lower() == 'true'
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 300))
+    USER_CACHE_MAX_ENTRIES = int(os.environ.get('USER_CACHE_MAX_ENTRIES', 1024))
+
+    # Per-request SQL profiling: one JSON log line per request (WARNING when a
+    # statement is slower than QUERY_SLOW_MS or one statement shape runs
+    # QUERY_N_PLUS_ONE_THRESHOLD+ times), plus a Server-Timing header in debug
+    # mode or for METRICS_ALLOWED_IPS
+    QUERY_PROFILER_ENABLED = os.environ.get('QUERY_PROFILER_ENABLED', 'True').lower() == 'true'
+    QUERY_SLOW_MS = float(os.environ.get('QUERY_SLOW_MS', 100))
+    QUERY_N_PLUS_ONE_THRESHOLD = int(os.environ.get('QUERY_N_PLUS_ONE_THRESHOLD', 10))
+    QUERY_PROFILER_TOP = int(os.environ.get('QUERY_PROFILER_TOP', 5))
+
+    # Prometheus /metrics endpoint (served to METRICS_ALLOWED_IPS only). Set
+    # METRICS_STORE_PATH under gunicorn so every worker's samples are aggregated.
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'True').lower() == 'true'
+    METRICS_STORE_PATH = os.environ.get('METRICS_STORE_PATH') or None
+    METRICS_FLUSH_INTERVAL = float(os.environ.get('METRICS_FLUSH_INTERVAL', 1.0))
+    METRICS_ALLOWED_IPS = {
+        ip.strip() for ip in os.environ.get('METRICS_ALLOWED_IPS', '127.0.0.1,::1').split(',') if ip.strip()
+    }
+
+    # {% cache %} template fragments: per-worker LRU, plus a SQLite file shared by
+    # all workers when FRAGMENT_CACHE_STORE_PATH is set. Resource, booking and
+    # review writes bump the entity_versions tags the fragments are keyed on.
+    FRAGMENT_CACHE_ENABLED = os.environ.get('FRAGMENT_CACHE_ENABLED', 'True').lower() == 'true'
+    FRAGMENT_CACHE_TTL = int(os.environ.get('FRAGMENT_CACHE_TTL', 300))
+    FRAGMENT_CACHE_MAX_ENTRIES = int(os.environ.get('FRAGMENT_CACHE_MAX_ENTRIES', 512))
+    FRAGMENT_CACHE_STORE_PATH = os.environ.get('FRAGMENT_CACHE_STORE_PATH') or None
+
+    # ETags on the browse/detail pages and the notification/message feeds, built
+    # from entity_versions counters so a 304 costs a few indexed lookups
+    CONDITIONAL_GET_ENABLED = os.environ.get('CONDITIONAL_GET_ENABLED', 'True').lower() == 'true'
+
     # WTForms CSRF protection
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None  # No time limit for CSRF tokens
@@ -84,6 +134,20 @@ class Config:
     LOCAL_LLM_PROVIDER = os.environ.get('LOCAL_LLM_PROVIDER', 'ollama')
     LOCAL_LLM_API_KEY = os.environ.get('LOCAL_LLM_API_KEY')
     LOCAL_LLM_TIMEOUT = int(os.environ.get('LOCAL_LLM_TIMEOUT', 30))
+    LOCAL_LLM_POOL_SIZE = int(os.environ.get('LOCAL_LLM_POOL_SIZE', 10))
+    # In-flight generations per worker; extra requests wait LOCAL_LLM_QUEUE_TIMEOUT
+    # seconds for a slot before falling back to the retrieval-only summary.
+    LOCAL_LLM_MAX_CONCURRENCY = int(os.environ.get('LOCAL_LLM_MAX_CONCURRENCY', 4))
+    LOCAL_LLM_QUEUE_TIMEOUT = float(os.environ.get('LOCAL_LLM_QUEUE_TIMEOUT', 0.25))
+    # Skip the LLM for LOCAL_LLM_BREAKER_COOLDOWN seconds after this many consecutive timeouts
+    LOCAL_LLM_BREAKER_THRESHOLD = int(os.environ.get('LOCAL_LLM_BREAKER_THRESHOLD', 3))
+    LOCAL_LLM_BREAKER_COOLDOWN = float(os.environ.get('LOCAL_LLM_BREAKER_COOLDOWN', 30))
 
     # Concierge inputs
     CONCIERGE_CONTEXT_DIR = os.environ.get('CONCIERGE_CONTEXT_DIR')
+
+    # Concierge answer cache (in-process LRU backed by a shared SQLite tier)
+    CONCIERGE_CACHE_ENABLED = os.environ.get('CONCIERGE_CACHE_ENABLED', 'True').lower() == 'true'
+    CONCIERGE_CACHE_TTL = int(os.environ.get('CONCIERGE_CACHE_TTL', 3600))
+    CONCIERGE_CACHE_MAX_ENTRIES = int(os.environ.get('CONCIERGE_CACHE_MAX_ENTRIES', 256))
+    CONCIERGE_SNAPSHOT_TTL = int(os.environ.get('CONCIERGE_SNAPSHOT_TTL', 300))
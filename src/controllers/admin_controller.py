@@ -2,16 +2,28 @@
 Admin Controller
 Handles administrative functions and dashboard
 """
-from flask import Blueprint, render_template, request, redirect, url_for, flash
+from flask import Blueprint, Response, render_template, request, redirect, url_for, flash, stream_with_context
 from flask_login import login_required, current_user
 from functools import wraps
-from datetime import datetime
-from src.data_access.user_dal import UserDAL
-from src.data_access.resource_dal import ResourceDAL
-from src.data_access.booking_dal import BookingDAL
-from src.data_access.review_dal import ReviewDAL
+from datetime import datetime, timedelta
+from src.data_access.user_dal import UserDAL, USER_SORTS
+from src.data_access.resource_dal import ResourceDAL, RESOURCE_SORTS
+from src.data_access.booking_dal import BookingDAL, BOOKING_SORTS
+from src.data_access.review_dal import ReviewDAL, REVIEW_SORTS
 from src.data_access.message_dal import MessageDAL
 from src.data_access.admin_log_dal import AdminLogDAL
+from src.data_access.analytics_rollup_dal import AnalyticsRollupDAL
+from src.data_access.pagination import DEFAULT_PAGE_SIZE, clamp_page_size
+from src.data_access.export_dal import (
+    ExportDAL,
+    BOOKING_EXPORT_COLUMNS,
+    BOOKING_EXPORT_STATUSES,
+    USER_EXPORT_COLUMNS,
+    USER_EXPORT_STATUSES,
+    REVIEW_EXPORT_COLUMNS,
+    REVIEW_EXPORT_STATUSES
+)
+from src.utils.exporters import EXPORT_MIMETYPES, iter_export
 from src.utils.notifications import NotificationService
 from src.utils.validators import Validator
 
@@ -51,36 +63,64 @@ def parse_datetime(value):
     except ValueError:
         return None
 
+def listing_params(sort_options, default_sort):
+    """Read search/sort/cursor query args shared by the paginated admin listings."""
+    sort = request.args.get('sort', default_sort)
+    if sort not in sort_options:
+        sort = default_sort
+    return {
+        'search': (request.args.get('q') or '').strip() or None,
+        'sort': sort,
+        'descending': request.args.get('dir', 'desc') != 'asc',
+        'limit': clamp_page_size(request.args.get('per_page')),
+        'after': request.args.get('after') or None,
+        'before': request.args.get('before') or None
+    }
+
+
+def page_args(params, **filters):
+    """Query args that must survive when following a pager link."""
+    args = {
+        'q': params['search'],
+        'sort': params['sort'],
+        'dir': 'desc' if params['descending'] else 'asc',
+        'per_page': params['limit'] if params['limit'] != DEFAULT_PAGE_SIZE else None
+    }
+    args.update(filters)
+    return {key: value for key, value in args.items() if value}
+
 @admin_bp.route('/')
 @login_required
 @admin_required
 def dashboard():
     """Admin dashboard"""
-    users = UserDAL.get_all_users()
-    all_resources = ResourceDAL.get_all_resources(status=None)
-    pending_bookings = BookingDAL.get_pending_bookings()
-    booking_trend = BookingDAL.monthly_booking_trend(months=6)
-    user_trend = UserDAL.monthly_registration_trend(months=6)
-    booking_status_rows = BookingDAL.booking_status_breakdown()
-    category_summary = ResourceDAL.category_distribution(limit=6)
-    
+    # Counts and trends come from the rollup tables; only the short lists hit base tables
+    users = UserDAL.get_all_users(limit=10)
+    draft_resources = ResourceDAL.get_all_resources(status='draft', limit=6)
+    pending_bookings = BookingDAL.get_pending_bookings(limit=8)
+    booking_trend = AnalyticsRollupDAL.monthly_booking_trend(months=6)
+    user_trend = AnalyticsRollupDAL.monthly_registration_trend(months=6)
+    booking_status_rows = AnalyticsRollupDAL.booking_status_breakdown()
+    category_summary = AnalyticsRollupDAL.category_distribution(limit=6)
+    role_counts = AnalyticsRollupDAL.user_role_counts()
+    resource_counts = AnalyticsRollupDAL.resource_status_counts()
+
     stats = {
-        'total_users': len(users),
-        'total_resources': len(all_resources),
-        'pending_bookings': len(pending_bookings),
-        'students': len([u for u in users if u.role == 'student']),
-        'staff': len([u for u in users if u.role == 'staff']),
-        'admins': len([u for u in users if u.role == 'admin'])
+        'total_users': sum(role_counts.values()),
+        'total_resources': sum(resource_counts.values()),
+        'pending_bookings': sum(row['total'] for row in booking_status_rows if row['status'] == 'pending'),
+        'students': role_counts.get('student', 0),
+        'staff': role_counts.get('staff', 0),
+        'admins': role_counts.get('admin', 0)
     }
     status_counts = {
-        'draft': len([r for r in all_resources if r.status == 'draft']),
-        'published': len([r for r in all_resources if r.status == 'published']),
-        'archived': len([r for r in all_resources if r.status == 'archived'])
+        'draft': resource_counts.get('draft', 0),
+        'published': resource_counts.get('published', 0),
+        'archived': resource_counts.get('archived', 0)
     }
-    department_usage = BookingDAL.summarize_by_department()
+    department_usage = AnalyticsRollupDAL.summarize_by_department()
     department_total = sum(row.get('total', 0) for row in department_usage)
-    resource_lookup = {resource.resource_id: resource for resource in all_resources}
-    draft_resources = [resource for resource in all_resources if resource.status == 'draft']
+    resource_lookup = ResourceDAL.get_resources_by_ids(booking.resource_id for booking in pending_bookings)
 
     def month_sequence(window=6):
         base = datetime.utcnow().replace(day=1)
@@ -209,9 +249,9 @@ def dashboard():
         resource_status=status_counts,
         department_usage=department_usage,
         department_total=department_total,
-        users=users[:10],
-        draft_resources=draft_resources[:6],
-        pending_bookings=pending_bookings[:8],
+        users=users,
+        draft_resources=draft_resources,
+        pending_bookings=pending_bookings,
         chart_data=chart_data,
         insights=insights,
         resource_lookup=resource_lookup
@@ -222,8 +262,22 @@ def dashboard():
 @admin_required
 def manage_users():
     """Manage all users"""
-    users = UserDAL.get_all_users()
-    return render_template('admin/users.html', users=users)
+    params = listing_params(USER_SORTS, 'created_at')
+    valid_roles = ['student', 'staff', 'admin']
+    role_filter = request.args.get('role') if request.args.get('role') in valid_roles else None
+    status_filter = request.args.get('status') if request.args.get('status') in ('active', 'suspended') else None
+
+    users = UserDAL.page_users(role=role_filter, status=status_filter, **params)
+    return render_template(
+        'admin/users.html',
+        users=users,
+        page_args=page_args(params, role=role_filter, status=status_filter),
+        sort_options=[('created_at', 'Joined'), ('name', 'Name'), ('email', 'Email')],
+        filter_selects=[
+            ('role', 'Any role', [(role, role.title()) for role in valid_roles], role_filter),
+            ('status', 'Any status', [('active', 'Active'), ('suspended', 'Suspended')], status_filter)
+        ]
+    )
 
 @admin_bp.route('/users/<int:user_id>/delete', methods=['POST'])
 @login_required
@@ -253,20 +307,15 @@ def manage_resources():
     if status_filter not in valid_statuses:
         status_filter = None
 
-    resources = ResourceDAL.get_all_resources(status=status_filter if status_filter else None)
-    owner_map = {}
-    if resources:
-        owner_ids = {resource.owner_id for resource in resources}
-        owner_map = {
-            owner_id: UserDAL.get_user_by_id(owner_id)
-            for owner_id in owner_ids
-        }
+    params = listing_params(RESOURCE_SORTS, 'created_at')
+    resources = ResourceDAL.page_resources(status=status_filter, **params)
     return render_template(
         'admin/resources.html',
         resources=resources,
         selected_status=status_filter,
         valid_statuses=valid_statuses,
-        owners=owner_map
+        page_args=page_args(params, status=status_filter),
+        sort_options=[('created_at', 'Created'), ('title', 'Title')]
     )
 
 @admin_bp.route('/resources/<int:resource_id>/status', methods=['POST'])
@@ -298,13 +347,16 @@ def manage_bookings():
     if status_filter not in valid_statuses:
         status_filter = None
 
-    bookings = BookingDAL.get_bookings_with_details(status=status_filter if status_filter else None)
+    params = listing_params(BOOKING_SORTS, 'start_datetime')
+    bookings = BookingDAL.page_bookings(status=status_filter, **params)
     return render_template(
         'admin/bookings.html',
         bookings=bookings,
         selected_status=status_filter,
         valid_statuses=valid_statuses,
-        format_datetime=format_datetime
+        format_datetime=format_datetime,
+        page_args=page_args(params, status=status_filter),
+        sort_options=[('start_datetime', 'Start time'), ('created_at', 'Requested')]
     )
 
 @admin_bp.route('/bookings/<int:booking_id>/status', methods=['POST'])
@@ -398,8 +450,19 @@ def admin_update_booking_status(booking_id):
 @admin_required
 def manage_reviews():
     """Moderate reviews"""
-    reviews = ReviewDAL.get_all_reviews()
-    return render_template('admin/reviews.html', reviews=reviews, format_datetime=format_datetime)
+    params = listing_params(REVIEW_SORTS, 'timestamp')
+    status_filter = request.args.get('status') if request.args.get('status') in ('visible', 'flagged', 'hidden') else None
+    reviews = ReviewDAL.page_reviews(status=status_filter, **params)
+    return render_template(
+        'admin/reviews.html',
+        reviews=reviews,
+        format_datetime=format_datetime,
+        page_args=page_args(params, status=status_filter),
+        sort_options=[('timestamp', 'Submitted'), ('rating', 'Rating')],
+        filter_selects=[
+            ('status', 'Any status', [('visible', 'Visible'), ('flagged', 'Flagged'), ('hidden', 'Hidden')], status_filter)
+        ]
+    )
 
 @admin_bp.route('/reviews/<int:review_id>/delete', methods=['POST'])
 @login_required
@@ -498,12 +561,26 @@ def admin_delete_message(message_id):
 @admin_required
 def moderation_reports():
     """Dashboard for flagged reviews/messages."""
-    flagged_reviews = ReviewDAL.get_flagged_reviews()
-    flagged_messages = MessageDAL.get_flagged_messages()
+    limit = clamp_page_size(request.args.get('per_page'))
+    cursors = {
+        name: request.args.get(name) or None
+        for name in ('review_after', 'review_before', 'message_after', 'message_before')
+    }
+    flagged_reviews = ReviewDAL.page_flagged_reviews(
+        limit=limit, after=cursors['review_after'], before=cursors['review_before']
+    )
+    flagged_messages = MessageDAL.page_flagged_messages(
+        limit=limit, after=cursors['message_after'], before=cursors['message_before']
+    )
+    # Each queue's pager keeps the other queue's position
     return render_template(
         'admin/reports.html',
         flagged_reviews=flagged_reviews,
-        flagged_messages=flagged_messages
+        flagged_messages=flagged_messages,
+        flagged_review_total=ReviewDAL.count_flagged_reviews(),
+        flagged_message_total=MessageDAL.count_flagged_messages(),
+        review_page_args={key: value for key, value in cursors.items() if value and key.startswith('message_')},
+        message_page_args={key: value for key, value in cursors.items() if value and key.startswith('review_')}
     )
 
 @admin_bp.route('/users/<int:user_id>/suspend', methods=['POST'])
@@ -529,3 +606,53 @@ def toggle_user_suspension(user_id):
         flash('Unable to update user status.', 'danger')
 
     return redirect(url_for('admin.manage_users'))
+
+# dataset -> (row streamer, columns, accepted status filters, admin page to return to)
+EXPORT_DATASETS = {
+    'bookings': (ExportDAL.stream_bookings, BOOKING_EXPORT_COLUMNS, BOOKING_EXPORT_STATUSES, 'admin.manage_bookings'),
+    'users': (ExportDAL.stream_users, USER_EXPORT_COLUMNS, USER_EXPORT_STATUSES, 'admin.manage_users'),
+    'reviews': (ExportDAL.stream_reviews, REVIEW_EXPORT_COLUMNS, REVIEW_EXPORT_STATUSES, 'admin.manage_reviews'),
+}
+
+@admin_bp.route('/exports/<dataset>.<fmt>')
+@login_required
+@admin_required
+def export_dataset(dataset, fmt):
+    """Stream a full CSV/JSONL export with optional ?start=&end= (YYYY-MM-DD) and ?status= filters."""
+    if dataset not in EXPORT_DATASETS or fmt not in EXPORT_MIMETYPES:
+        flash('Unknown export requested.', 'danger')
+        return redirect(url_for('admin.dashboard'))
+    streamer, columns, statuses, return_endpoint = EXPORT_DATASETS[dataset]
+
+    status = request.args.get('status', '').strip() or None
+    if status and status not in statuses:
+        flash(f'Invalid status filter. Choose one of: {", ".join(statuses)}.', 'danger')
+        return redirect(url_for(return_endpoint))
+    try:
+        start = request.args.get('start', '').strip()
+        end = request.args.get('end', '').strip()
+        start_date = datetime.strptime(start, '%Y-%m-%d').date() if start else None
+        end_date = datetime.strptime(end, '%Y-%m-%d').date() if end else None
+    except ValueError:
+        flash('Export dates must use the YYYY-MM-DD format.', 'danger')
+        return redirect(url_for(return_endpoint))
+    if start_date and end_date and end_date < start_date:
+        flash('Export end date must be on or after the start date.', 'danger')
+        return redirect(url_for(return_endpoint))
+
+    rows = streamer(
+        status=status,
+        start_date=start_date.isoformat() if start_date else None,
+        # The end date is inclusive, so filter on "before the following day"
+        end_before=(end_date + timedelta(days=1)).isoformat() if end_date else None
+    )
+    AdminLogDAL.record(
+        current_user.user_id, 'export_data', dataset,
+        f'format={fmt} status={status or "any"} start={start or "-"} end={end or "-"}'
+    )
+    filename = f"{dataset}-export-{datetime.utcnow().strftime('%Y%m%d')}.{fmt}"
+    return Response(
+        stream_with_context(iter_export(rows, columns, fmt)),
+        mimetype=EXPORT_MIMETYPES[fmt],
+        headers={'Content-Disposition': f'attachment; filename={filename}'}
+    )
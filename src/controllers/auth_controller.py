@@ -7,6 +7,7 @@ from flask_login import login_user, logout_user, login_required, current_user
 from src.data_access.user_dal import UserDAL
 from src.utils.validators import Validator
 from src.utils.email_verification import EmailVerificationService
+from src.utils.passwords import PasswordHasherBusyError
 
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 
@@ -115,7 +116,11 @@ def login():
             flash('Please enter a valid email address.', 'danger')
             return render_template('auth/login.html')
         
-        user = UserDAL.verify_password(email, password)
+        try:
+            user = UserDAL.verify_password(email, password)
+        except PasswordHasherBusyError as exc:
+            flash(str(exc), 'warning')
+            return render_template('auth/login.html'), 503
         if user:
             # Check if account is suspended
             if getattr(user, 'is_suspended', False):
@@ -20,15 +20,16 @@ from datetime import datetime, timedelta
 from src.data_access.booking_dal import BookingDAL
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.waitlist_dal import WaitlistDAL
-from src.data_access.user_dal import UserDAL
 from src.utils.validators import Validator
 from src.utils.notifications import NotificationService
+from src.services.waitlist_promotion import promote_freed_interval
 from src.utils.datetime_helpers import (
     utc_now_naive,
     build_booking_calendar,
     humanize_datetime,
     describe_recurrence,
     parse_datetime,
+    parse_many,
 )
 from src.utils.availability import (
     parse_schedule,
@@ -45,74 +46,14 @@ booking_bp = Blueprint('booking', __name__, url_prefix='/bookings')
 DEFAULT_RECURRENCE_COUNT = 3
 
 
-def _promote_waitlist_for_resource(resource):
-    """Scan for active waitlist entries and convert any that no longer conflict."""
-    if not resource:
-        return
-    active_entries = WaitlistDAL.get_entries_for_resource(resource.resource_id, statuses=['active'])
-    if not active_entries:
-        return
-
-    for entry in active_entries:
-        start_dt = parse_datetime(entry.start_datetime)
-        end_dt = parse_datetime(entry.end_datetime)
-        if not start_dt or not end_dt:
-            continue
-        if BookingDAL.check_booking_conflict(resource.resource_id, start_dt, end_dt):
-            continue
-        requester = UserDAL.get_user_by_id(entry.requester_id)
-        if not requester:
-            WaitlistDAL.cancel_entry(entry.entry_id)
-            continue
-
-        requires_manual_approval = (
-            resource.is_restricted and
-            resource.owner_id != requester.user_id and
-            requester.role != 'admin'
-        )
-        status = 'pending' if requires_manual_approval else 'approved'
-
-        try:
-            booking = BookingDAL.create_booking(
-                resource_id=resource.resource_id,
-                requester_id=requester.user_id,
-                start_datetime=start_dt,
-                end_datetime=end_dt,
-                status=status,
-                recurrence_rule=entry.recurrence_rule
-            )
-        except Exception as exc:
-            current_app.logger.error(f"[Waitlist] Failed to create booking for entry {entry.entry_id}: {exc}")
-            continue
-
-        WaitlistDAL.mark_promoted(entry.entry_id, booking.booking_id)
-
-        NotificationService.send_notification(
-            user_id=requester.user_id,
-            subject='Waitlist slot available',
-            body=(
-                f'Good news! Your waitlist request for "{resource.title}" '
-                f'on {humanize_datetime(start_dt)} – {humanize_datetime(end_dt)} has been '
-                f'{"confirmed" if status == "approved" else "converted to a pending request"}. '
-                'Visit your dashboard to review the details.'
-            )
-        )
-
-        if resource.owner_id != requester.user_id:
-            owner_subject = (
-                'Waitlist booking confirmed' if status == 'approved'
-                else 'Waitlist request awaiting review'
-            )
-            owner_body = (
-                f'The waitlist entry for "{resource.title}" requested by {requester.name or f"User #{requester.user_id}"} '
-                f'({humanize_datetime(start_dt)} – {humanize_datetime(end_dt)}) '
-                f'has been {"automatically approved" if status == "approved" else "queued for your review"}.'
-            )
-            NotificationService.send_notification(
-                user_id=resource.owner_id,
-                subject=owner_subject,
-                body=owner_body
-            )
+def _promote_waitlist_for_resource(resource, freed_start=None, freed_end=None):
+    """Promote waitlist entries that fit the interval freed on ``resource`` (every active entry without one)."""
+    try:
+        return promote_freed_interval(resource, freed_start, freed_end)
+    except Exception as exc:
+        # The cancellation/rejection itself already succeeded
+        current_app.logger.error(f"[Waitlist] Promotion failed for resource {getattr(resource, 'resource_id', None)}: {exc}")
+        return None
 
 @booking_bp.route('/my-bookings')
 @login_required
@@ -124,16 +65,17 @@ def my_bookings():
         requested_filter = 'upcoming'
 
     all_bookings = BookingDAL.get_bookings_by_requester(current_user.user_id)
+    now = utc_now_naive()
+    upcoming_bookings = [
+        b for b, start_dt in zip(all_bookings, parse_many(b.start_datetime for b in all_bookings))
+        if b.status in ['approved', 'pending'] and start_dt and start_dt >= now
+    ]
 
     # Filter bookings based on selected filter
     if requested_filter == 'upcoming':
-        now = utc_now_naive()
-        filtered_bookings = [
-            b for b in all_bookings
-            if b.status in ['approved', 'pending'] and parse_datetime(b.start_datetime) and parse_datetime(b.start_datetime) >= now
-        ]
+        filtered_bookings = upcoming_bookings
     elif requested_filter == 'all':
-        filtered_bookings = all_bookings
+        filtered_bookings = list(all_bookings)
     else:
         filtered_bookings = [b for b in all_bookings if b.status == requested_filter]
 
@@ -153,7 +95,7 @@ def my_bookings():
 
     # Count bookings by status for filter badges
     status_counts = {
-        'upcoming': len([b for b in all_bookings if b.status in ['approved', 'pending'] and parse_datetime(b.start_datetime) and parse_datetime(b.start_datetime) >= utc_now_naive()]),
+        'upcoming': len(upcoming_bookings),
         'pending': len([b for b in all_bookings if b.status == 'pending']),
         'approved': len([b for b in all_bookings if b.status == 'approved']),
         'completed': len([b for b in all_bookings if b.status == 'completed']),
@@ -622,7 +564,7 @@ def reject(booking_id):
                 f'booking_id={booking.booking_id};resource_owner={resource.owner_id}'
             )
         flash('Booking rejected', 'info')
-        _promote_waitlist_for_resource(resource)
+        _promote_waitlist_for_resource(resource, booking.start_datetime, booking.end_datetime)
     except Exception as e:
         flash(f'Error rejecting booking: {str(e)}', 'danger')
     
@@ -673,7 +615,7 @@ def cancel(booking_id):
                 body=owner_message
             )
         flash('Booking cancelled', 'info')
-        _promote_waitlist_for_resource(resource)
+        _promote_waitlist_for_resource(resource, booking.start_datetime, booking.end_datetime)
     except Exception as e:
         flash(f'Error cancelling booking: {str(e)}', 'danger')
     
@@ -1,7 +1,9 @@
 """
 Routes for the AI Resource Concierge experience.
 """
-from flask import Blueprint, current_app, render_template, request
+import json
+
+from flask import Blueprint, Response, current_app, render_template, request, stream_with_context
 
 from src.services.concierge_service import ConciergeService
 
@@ -46,3 +48,34 @@ def index():
         error_message=error_message,
         doc_sources=doc_sources
     )
+
+
+@concierge_bp.route('/stream', methods=['POST'])
+def stream():
+    """Stream the concierge answer as server-sent events."""
+    question = (request.form.get('question') or '').strip()
+    service = ConciergeService()
+
+    def generate():
+        try:
+            for event, payload in service.stream_answer(question, category=None, published_only=True):
+                if event == 'done':
+                    payload = {key: value for key, value in payload.items() if key != 'context_block'}
+                yield _sse(event, payload)
+        except ValueError as exc:
+            yield _sse('error', {'message': str(exc)})
+        except Exception as exc:  # pragma: no cover - defensive path
+            current_app.logger.exception('Concierge stream failed: %s', exc)
+            yield _sse('error', {
+                'message': 'Something went wrong while contacting the concierge. Please try again.'
+            })
+
+    response = Response(stream_with_context(generate()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Disable proxy buffering (nginx) so tokens reach the browser immediately
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+
+def _sse(event, payload):
+    return f"event: {event}\ndata: {json.dumps(payload)}\n\n"
@@ -8,6 +8,7 @@ from flask_login import login_required, current_user
 from src.data_access.message_dal import MessageDAL
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.user_dal import UserDAL
+from src.services.conditional_get import conditional, entity_versions
 from src.utils.validators import Validator
 
 message_bp = Blueprint('message', __name__, url_prefix='/messages')
@@ -137,8 +138,20 @@ def send(receiver_id):
 
     return render_template('messages/send.html', receiver=receiver, resource=resource, form_data={})
 
+def _thread_feed_version(thread_id):
+    """Thread and other participant counters; None lets the view answer 403/404."""
+    thread = MessageDAL.get_thread_by_id(thread_id)
+    if not thread:
+        return None
+    owner_id, participant_id = _thread_participants(thread)
+    if current_user.user_id not in (owner_id, participant_id):
+        return None
+    other_user_id = participant_id if owner_id == current_user.user_id else owner_id
+    return entity_versions(MessageDAL.thread_version_key(thread_id), UserDAL.version_key(other_user_id))
+
 @message_bp.route('/thread/<int:thread_id>/messages/feed')
 @login_required
+@conditional(_thread_feed_version, nav=False)
 def thread_feed(thread_id):
     """Return JSON payload of new messages for a thread"""
     thread = MessageDAL.get_thread_by_id(thread_id)
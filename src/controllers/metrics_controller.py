@@ -0,0 +1,18 @@
+"""Prometheus scrape endpoint for request latency metrics."""
+from flask import Blueprint, Response, abort, current_app, request
+
+from src.services.request_metrics import get_request_metrics
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+@metrics_bp.route('/metrics')
+def export():
+    """Serve aggregated metrics to local scrapers only (loopback or METRICS_ALLOWED_IPS)."""
+    metrics = get_request_metrics()
+    allowed = current_app.config.get('METRICS_ALLOWED_IPS') or ()
+    if metrics is None or request.remote_addr not in allowed:
+        abort(404)
+    return Response(metrics.render(), mimetype=None, content_type=PROMETHEUS_CONTENT_TYPE)
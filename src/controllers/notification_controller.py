@@ -7,6 +7,7 @@ from flask import Blueprint, jsonify
 from flask_login import login_required, current_user
 
 from src.data_access.notification_dal import NotificationDAL
+from src.services.conditional_get import conditional
 from src.services.notification_center import NotificationCenter
 
 notification_bp = Blueprint('notification', __name__, url_prefix='/notifications')
@@ -14,6 +15,7 @@ notification_bp = Blueprint('notification', __name__, url_prefix='/notifications
 
 @notification_bp.route('/feed')
 @login_required
+@conditional(lambda: ())  # The viewer's notification version covers the whole payload
 def feed():
     """Return JSON payload for the notification dropdown."""
     payload = NotificationCenter.build_for_user(current_user)
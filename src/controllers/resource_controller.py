@@ -6,14 +6,10 @@ from flask import Blueprint, render_template, request, redirect, url_for, flash,
 from flask_login import login_required, current_user
 from werkzeug.utils import secure_filename
 import os
-from datetime import datetime, timedelta
+import time
+from datetime import timedelta
 from collections import defaultdict
 from urllib.parse import urlencode
-try:
-    import magic
-    HAS_MAGIC = True
-except ImportError:
-    HAS_MAGIC = False
 from src.data_access.resource_dal import ResourceDAL
 from src.data_access.review_dal import ReviewDAL
 from src.data_access.booking_dal import BookingDAL
@@ -21,6 +17,9 @@ from src.data_access.user_dal import UserDAL
 from src.utils.validators import Validator
 from src.utils.permissions import user_has_role, can_manage_resource, is_admin, owns_resource
 from src.data_access.admin_log_dal import AdminLogDAL
+from src.services.image_pipeline import discard_failed_image, generated_files, get_image_pipeline
+from src.services.conditional_get import conditional, entity_versions
+from src.services.fragment_cache import deferred
 from src.utils.datetime_helpers import build_booking_calendar, utc_now_naive, parse_datetime
 from src.utils.availability import (
     SCHEDULE_TEMPLATES, get_template_schedule, parse_schedule,
@@ -29,6 +28,7 @@ from src.utils.availability import (
 import json
 
 resource_bp = Blueprint('resource', __name__, url_prefix='/resources')
+_magic = None  # python-magic once imported, False when unavailable
 RESOURCE_CATEGORIES = ['Study Room', 'Lab Equipment', 'Event Space', 'AV Equipment', 'Tutoring', 'Other']
 BROWSE_PAGE_SIZE = 9
 BROWSE_SORT_OPTIONS = {
@@ -45,13 +45,24 @@ def allowed_file(filename):
     """Check if file extension is allowed"""
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in current_app.config['ALLOWED_EXTENSIONS']
 
+def _load_magic():
+    """Import python-magic on the first upload; returns None when it is not installed"""
+    global _magic
+    if _magic is None:
+        try:
+            import magic
+            _magic = magic
+        except ImportError:
+            _magic = False
+    return _magic or None
+
 def save_uploaded_images(files, existing_paths=None):
     """
-    Persist uploaded images safely with MIME type validation.
-    Returns combined list of filenames.
+    Validate uploads and hand them to the background image pipeline.
+    Returns combined list of content-hashed filenames.
     """
     saved_files = list(existing_paths) if existing_paths else []
-    upload_dir = os.path.abspath(current_app.config['UPLOAD_FOLDER'])
+    pipeline = get_image_pipeline()
 
     # Allowed MIME types for images
     allowed_mimes = {
@@ -74,7 +85,8 @@ def save_uploaded_images(files, existing_paths=None):
             raise ValueError('Invalid file name.')
 
         # MIME type validation (if python-magic is available)
-        if HAS_MAGIC:
+        magic = _load_magic()
+        if magic is not None:
             file.seek(0)  # Reset file pointer
             file_content = file.read(2048)  # Read first 2KB for MIME detection
             file.seek(0)  # Reset again for saving
@@ -87,22 +99,26 @@ def save_uploaded_images(files, existing_paths=None):
                 current_app.logger.warning(f'MIME type validation failed: {e}')
                 # Continue with extension-only validation if magic fails
 
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        safe_name = f"{timestamp}_{filename}"
-        target_path = os.path.abspath(os.path.join(upload_dir, safe_name))
-
-        # Ensure the resolved path stays within the upload directory
-        if not target_path.startswith(upload_dir + os.sep):
-            raise ValueError('Invalid file path detected.')
-
-        file.save(target_path)
+        # Metadata stripping and thumbnails happen off the request thread
+        file.seek(0)
+        safe_name = pipeline.stage(file.read(), filename)
 
         if safe_name not in saved_files:
             saved_files.append(safe_name)
 
     return saved_files
 
+def discard_failed_uploads(image_paths):
+    """Drop uploads the pipeline already rejected from the saved resource and tell the uploader."""
+    failed = get_image_pipeline().failed(image_paths)
+    for name in failed:
+        discard_failed_image(name)
+    if failed:
+        flash(f'{len(failed)} uploaded file(s) could not be read as images and were removed.', 'warning')
+
 @resource_bp.route('/')
+# Next-available badges are relative to now, so the ETag also turns over every minute
+@conditional(lambda: entity_versions('resources', 'bookings', 'reviews') + (int(time.time() // 60),))
 def list_resources():
     """List all published resources with enriched filters, sorting, and pagination."""
     args = request.args.to_dict(flat=True)
@@ -180,23 +196,7 @@ def list_resources():
         )
         total_pages = max((total_results + BROWSE_PAGE_SIZE - 1) // BROWSE_PAGE_SIZE, 1)
 
-    resource_ids = [resource.resource_id for resource in resources]
-    upcoming_bookings = BookingDAL.get_bookings_for_resources(resource_ids, statuses=['pending', 'approved'])
-    bookings_by_resource = defaultdict(list)
     now = utc_now_naive()
-    
-    # Filter bookings to only include future bookings or ongoing bookings
-    for booking in upcoming_bookings:
-        start_dt = parse_datetime(booking.start_datetime)
-        end_dt = parse_datetime(booking.end_datetime)
-        if not start_dt or not end_dt:
-            continue
-        # Only include bookings that haven't ended yet
-        if end_dt > now:
-            bookings_by_resource[booking.resource_id].append((start_dt, end_dt))
-
-    for resource_id, intervals in bookings_by_resource.items():
-        intervals.sort(key=lambda pair: pair[0])
 
     def calculate_next_available(resource, bookings):
         """
@@ -335,26 +335,51 @@ def list_resources():
             return False
         return user_has_role('staff', 'admin') or resource.owner_id == current_user.user_id
 
-    resources_with_context = []
-    top_rated_threshold = 4.5
-    for resource in resources:
-        intervals = bookings_by_resource.get(resource.resource_id, [])
-        next_dt, availability_status, availability_badge = calculate_next_available(resource, intervals)
-        label = format_next_available(next_dt)
-        stats = ReviewDAL.get_resource_rating_stats(resource.resource_id)
-        avg_rating = stats['avg_rating'] if stats and stats['avg_rating'] else 0
-        total_reviews = stats['total_reviews'] if stats else 0
-        resources_with_context.append({
-            'resource': resource,
-            'avg_rating': round(avg_rating, 1),
-            'total_reviews': total_reviews,
-            'is_top_rated': avg_rating >= top_rated_threshold and total_reviews >= 3,
-            'can_access': can_access_resource(resource),
-            'restriction_note': getattr(resource, 'restriction_note', None),
-            'next_available': label,
-            'availability_status': availability_status,
-            'availability_badge': availability_badge
-        })
+    resources_with_context = [{
+        'resource': resource,
+        'can_access': can_access_resource(resource),
+        'restriction_note': getattr(resource, 'restriction_note', None)
+    } for resource in resources]
+
+    def load_card_details():
+        """Availability and rating context for every card, keyed by resource_id."""
+        resource_ids = [resource.resource_id for resource in resources]
+        upcoming_bookings = BookingDAL.get_bookings_for_resources(resource_ids, statuses=['pending', 'approved'])
+        bookings_by_resource = defaultdict(list)
+
+        # Filter bookings to only include future bookings or ongoing bookings
+        for booking in upcoming_bookings:
+            start_dt = parse_datetime(booking.start_datetime)
+            end_dt = parse_datetime(booking.end_datetime)
+            if not start_dt or not end_dt:
+                continue
+            # Only include bookings that haven't ended yet
+            if end_dt > now:
+                bookings_by_resource[booking.resource_id].append((start_dt, end_dt))
+
+        for resource_id, intervals in bookings_by_resource.items():
+            intervals.sort(key=lambda pair: pair[0])
+
+        details = {}
+        top_rated_threshold = 4.5
+        for item in resources_with_context:
+            resource = item['resource']
+            intervals = bookings_by_resource.get(resource.resource_id, [])
+            next_dt, availability_status, availability_badge = calculate_next_available(resource, intervals)
+            label = format_next_available(next_dt)
+            stats = ReviewDAL.get_resource_rating_stats(resource.resource_id)
+            avg_rating = stats['avg_rating'] if stats and stats['avg_rating'] else 0
+            total_reviews = stats['total_reviews'] if stats else 0
+            details[resource.resource_id] = dict(
+                item,
+                avg_rating=round(avg_rating, 1),
+                total_reviews=total_reviews,
+                is_top_rated=avg_rating >= top_rated_threshold and total_reviews >= 3,
+                next_available=label,
+                availability_status=availability_status,
+                availability_badge=availability_badge
+            )
+        return details
 
     def build_query_url(overrides=None, removals=None, preserve_page=False):
         params = {k: v for k, v in args.items() if v}
@@ -441,6 +466,8 @@ def list_resources():
     return render_template(
         'resources/list.html',
         resources=resources_with_context,
+        # Cards come from the fragment cache; this only runs when one has to be rendered
+        card_details=deferred(load_card_details),
         categories=RESOURCE_CATEGORIES,
         selected_keyword=keyword,
         selected_category=category,
@@ -456,7 +483,15 @@ def list_resources():
         pagination=pagination
     )
 
+def _detail_version(resource_id):
+    """Resource, review and owner counters (the page shows the owner's name and role)."""
+    resource = ResourceDAL.get_resource_by_id(resource_id)
+    if not resource:
+        return None
+    return entity_versions('resources', 'reviews', UserDAL.version_key(resource.owner_id))
+
 @resource_bp.route('/<int:resource_id>')
+@conditional(_detail_version)
 def detail(resource_id):
     """Resource detail page"""
     resource, avg_rating, review_count = ResourceDAL.get_resource_with_avg_rating(resource_id)
@@ -470,8 +505,9 @@ def detail(resource_id):
         flash('Resource not found', 'danger')
         return redirect(url_for('resource.list_resources'))
     
-    reviews = ReviewDAL.get_reviews_by_resource(resource_id)
-    stats = ReviewDAL.get_resource_rating_stats(resource_id)
+    # Review queries only run when the cached review fragments have to be rebuilt
+    load_reviews = deferred(lambda: ReviewDAL.get_reviews_by_resource(resource_id))
+    review_stats = deferred(lambda: ReviewDAL.get_resource_rating_stats(resource_id))
     
     # Check if current user has reviewed
     has_reviewed = False
@@ -494,8 +530,8 @@ def detail(resource_id):
                          owner=owner,
                          avg_rating=avg_rating,
                          review_count=review_count,
-                         reviews=reviews,
-                         stats=stats,
+                         load_reviews=load_reviews,
+                         review_stats=review_stats,
                          has_reviewed=has_reviewed,
                          schedule_display=schedule_display,
                          booking_rules=booking_rules,
@@ -677,6 +713,7 @@ def create():
                 advance_booking_days=advance_val,
                 min_lead_time_hours=lead_time_val
             )
+            discard_failed_uploads(image_paths)
             flash('Resource created successfully!', 'success')
             return redirect(url_for('resource.detail', resource_id=resource.resource_id))
         except Exception as e:
@@ -780,6 +817,7 @@ def edit(resource_id):
                 is_restricted=is_restricted,
                 status=status
             )
+            discard_failed_uploads(image_paths)
             flash('Resource updated successfully!', 'success')
             if admin_override:
                 AdminLogDAL.record(
@@ -805,25 +843,30 @@ def delete_resource_files(resource):
     upload_dir = os.path.abspath(current_app.config['UPLOAD_FOLDER'])
     image_files = [img.strip() for img in resource.images.split(',') if img.strip()]
 
-    for filename in image_files:
+    for image in image_files:
         # Skip external URLs
-        if filename.startswith('http://') or filename.startswith('https://'):
+        if image.startswith('http://') or image.startswith('https://'):
             continue
 
-        file_path = os.path.abspath(os.path.join(upload_dir, filename))
-
-        # Security check: ensure file is within upload directory
-        if not file_path.startswith(upload_dir + os.sep):
-            current_app.logger.warning(f'Attempted to delete file outside upload directory: {filename}')
+        # Identical uploads share one set of files; keep them while referenced
+        if ResourceDAL.image_in_use(image, exclude_resource_id=resource.resource_id):
             continue
 
-        # Delete file if it exists
-        if os.path.exists(file_path):
-            try:
-                os.remove(file_path)
-                current_app.logger.info(f'Deleted file: {filename}')
-            except Exception as e:
-                current_app.logger.error(f'Failed to delete file {filename}: {e}')
+        for filename in generated_files(image):
+            file_path = os.path.abspath(os.path.join(upload_dir, filename))
+
+            # Security check: ensure file is within upload directory
+            if not file_path.startswith(upload_dir + os.sep):
+                current_app.logger.warning(f'Attempted to delete file outside upload directory: {filename}')
+                continue
+
+            # Delete file if it exists
+            if os.path.exists(file_path):
+                try:
+                    os.remove(file_path)
+                    current_app.logger.info(f'Deleted file: {filename}')
+                except Exception as e:
+                    current_app.logger.error(f'Failed to delete file {filename}: {e}')
 
 @resource_bp.route('/<int:resource_id>/delete', methods=['POST'])
 @login_required
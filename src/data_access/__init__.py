@@ -1,18 +1,20 @@
 """
 Data Access Layer initialization
 """
+import re
 import sqlite3
 from contextlib import contextmanager
 from sqlite3 import OperationalError
 from src.config import Config
+from src.data_access.query_profiler import connection_factory
 
 def get_db_connection():
-    """Create a database connection"""
+    """Create a database connection (profiled while a request profile is active)"""
     # Add timeout to handle database locks, especially when accessing over WSL
-    conn = sqlite3.connect(Config.DATABASE_PATH, timeout=30.0)
+    conn = sqlite3.connect(Config.DATABASE_PATH, timeout=30.0, factory=connection_factory())
     conn.row_factory = sqlite3.Row
-    # Enforce referential integrity for every connection
-    conn.execute('PRAGMA foreign_keys = ON')
+    # Enforce referential integrity for every connection (kept out of the query profile)
+    sqlite3.Connection.execute(conn, 'PRAGMA foreign_keys = ON')
     return conn
 
 @contextmanager
@@ -28,6 +30,207 @@ def get_db():
     finally:
         conn.close()
 
+# Day keys use '' when created_at is missing so those rows drop out of windowed trends.
+_DAY = "COALESCE(date({row}.created_at), '')"
+_CATEGORY = "COALESCE({row}.category, 'Uncategorized')"
+
+_ROLLUP_TRIGGERS = (
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_insert AFTER INSERT ON bookings
+    BEGIN
+        INSERT INTO booking_daily_rollup (day, status, total)
+        VALUES ({_DAY.format(row='NEW')}, NEW.status, 1)
+        ON CONFLICT (day, status) DO UPDATE SET total = total + 1;
+        INSERT INTO booking_department_rollup (department, total)
+        SELECT COALESCE(department, 'Unspecified'), 1 FROM users WHERE user_id = NEW.requester_id
+        ON CONFLICT (department) DO UPDATE SET total = total + 1;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_delete AFTER DELETE ON bookings
+    BEGIN
+        UPDATE booking_daily_rollup SET total = total - 1
+        WHERE day = {_DAY.format(row='OLD')} AND status = OLD.status;
+        UPDATE booking_department_rollup SET total = total - 1
+        WHERE department = (
+            SELECT COALESCE(department, 'Unspecified') FROM users WHERE user_id = OLD.requester_id
+        );
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_update AFTER UPDATE OF status, created_at ON bookings
+    WHEN OLD.status IS NOT NEW.status OR OLD.created_at IS NOT NEW.created_at
+    BEGIN
+        UPDATE booking_daily_rollup SET total = total - 1
+        WHERE day = {_DAY.format(row='OLD')} AND status = OLD.status;
+        INSERT INTO booking_daily_rollup (day, status, total)
+        VALUES ({_DAY.format(row='NEW')}, NEW.status, 1)
+        ON CONFLICT (day, status) DO UPDATE SET total = total + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_bookings_rollup_requester AFTER UPDATE OF requester_id ON bookings
+    WHEN OLD.requester_id IS NOT NEW.requester_id
+    BEGIN
+        UPDATE booking_department_rollup SET total = total - 1
+        WHERE department = (
+            SELECT COALESCE(department, 'Unspecified') FROM users WHERE user_id = OLD.requester_id
+        );
+        INSERT INTO booking_department_rollup (department, total)
+        SELECT COALESCE(department, 'Unspecified'), 1 FROM users WHERE user_id = NEW.requester_id
+        ON CONFLICT (department) DO UPDATE SET total = total + 1;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_users_rollup_insert AFTER INSERT ON users
+    BEGIN
+        INSERT INTO user_daily_rollup (day, role, total)
+        VALUES ({_DAY.format(row='NEW')}, NEW.role, 1)
+        ON CONFLICT (day, role) DO UPDATE SET total = total + 1;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_users_rollup_delete BEFORE DELETE ON users
+    BEGIN
+        UPDATE user_daily_rollup SET total = total - 1
+        WHERE day = {_DAY.format(row='OLD')} AND role = OLD.role;
+        UPDATE booking_department_rollup
+        SET total = total - (SELECT COUNT(*) FROM bookings WHERE requester_id = OLD.user_id)
+        WHERE department = COALESCE(OLD.department, 'Unspecified');
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_users_rollup_update AFTER UPDATE OF role, created_at ON users
+    WHEN OLD.role IS NOT NEW.role OR OLD.created_at IS NOT NEW.created_at
+    BEGIN
+        UPDATE user_daily_rollup SET total = total - 1
+        WHERE day = {_DAY.format(row='OLD')} AND role = OLD.role;
+        INSERT INTO user_daily_rollup (day, role, total)
+        VALUES ({_DAY.format(row='NEW')}, NEW.role, 1)
+        ON CONFLICT (day, role) DO UPDATE SET total = total + 1;
+    END
+    ''',
+    '''
+    CREATE TRIGGER IF NOT EXISTS trg_users_rollup_department AFTER UPDATE OF department ON users
+    WHEN OLD.department IS NOT NEW.department
+    BEGIN
+        UPDATE booking_department_rollup
+        SET total = total - (SELECT COUNT(*) FROM bookings WHERE requester_id = NEW.user_id)
+        WHERE department = COALESCE(OLD.department, 'Unspecified');
+        INSERT INTO booking_department_rollup (department, total)
+        SELECT COALESCE(NEW.department, 'Unspecified'), COUNT(*) FROM bookings WHERE requester_id = NEW.user_id
+        ON CONFLICT (department) DO UPDATE SET total = total + excluded.total;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_resources_rollup_insert AFTER INSERT ON resources
+    BEGIN
+        INSERT INTO resource_rollup (category, status, total)
+        VALUES ({_CATEGORY.format(row='NEW')}, NEW.status, 1)
+        ON CONFLICT (category, status) DO UPDATE SET total = total + 1;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_resources_rollup_delete AFTER DELETE ON resources
+    BEGIN
+        UPDATE resource_rollup SET total = total - 1
+        WHERE category = {_CATEGORY.format(row='OLD')} AND status = OLD.status;
+    END
+    ''',
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_resources_rollup_update AFTER UPDATE OF category, status ON resources
+    WHEN OLD.category IS NOT NEW.category OR OLD.status IS NOT NEW.status
+    BEGIN
+        UPDATE resource_rollup SET total = total - 1
+        WHERE category = {_CATEGORY.format(row='OLD')} AND status = OLD.status;
+        INSERT INTO resource_rollup (category, status, total)
+        VALUES ({_CATEGORY.format(row='NEW')}, NEW.status, 1)
+        ON CONFLICT (category, status) DO UPDATE SET total = total + 1;
+    END
+    ''',
+)
+
+# Integer (Unix epoch seconds) shadows of ISO timestamp columns. Stored text
+# mixes 'T' and ' ' separators, so range filters, sorts and month buckets used
+# to wrap the column in datetime()/strftime(), which no index can serve.
+# Triggers keep the shadows current on every write path; bulk loaders that
+# drop triggers call backfill_epoch_columns afterwards.
+EPOCH_COLUMNS = {
+    'bookings': (('start_datetime', 'start_epoch'), ('end_datetime', 'end_epoch'), ('created_at', 'created_epoch')),
+    'messages': (('timestamp', 'timestamp_epoch'),),
+    'notifications': (('created_at', 'created_epoch'),),
+    'resources': (('created_at', 'created_epoch'),),
+    'users': (('created_at', 'created_epoch'),),
+    'waitlist_entries': (('start_datetime', 'start_epoch'), ('end_datetime', 'end_epoch')),
+}
+_EPOCH = "CAST(strftime('%s', {column}) AS INTEGER)"
+
+_EPOCH_INDEXES = (
+    'CREATE INDEX IF NOT EXISTS idx_bookings_resource_epoch ON bookings (resource_id, start_epoch, end_epoch)',
+    'CREATE INDEX IF NOT EXISTS idx_bookings_status_created_epoch ON bookings (status, created_epoch)',
+    'CREATE INDEX IF NOT EXISTS idx_bookings_created_epoch ON bookings (created_epoch)',
+    'CREATE INDEX IF NOT EXISTS idx_messages_receiver_epoch ON messages (receiver_id, timestamp_epoch)',
+    'CREATE INDEX IF NOT EXISTS idx_notifications_user_epoch ON notifications (user_id, created_epoch)',
+    'CREATE INDEX IF NOT EXISTS idx_resources_owner_epoch ON resources (owner_id, status, created_epoch)',
+    'CREATE INDEX IF NOT EXISTS idx_users_created_epoch ON users (created_epoch)',
+    # Interval lookup for waitlist promotion; only active entries are ever searched
+    "CREATE INDEX IF NOT EXISTS idx_waitlist_active_interval ON waitlist_entries (resource_id, start_epoch, end_epoch) WHERE status = 'active'",
+)
+
+
+def _epoch_assignments(table, row='NEW'):
+    return ', '.join(
+        f"{shadow} = {_EPOCH.format(column=f'{row}.{column}' if row else column)}"
+        for column, shadow in EPOCH_COLUMNS[table]
+    )
+
+
+def _epoch_triggers():
+    for table, columns in EPOCH_COLUMNS.items():
+        sources = ', '.join(column for column, _ in columns)
+        yield f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_epoch_insert AFTER INSERT ON {table}
+            BEGIN
+                UPDATE {table} SET {_epoch_assignments(table)} WHERE rowid = NEW.rowid;
+            END
+        '''
+        yield f'''
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_epoch_update AFTER UPDATE OF {sources} ON {table}
+            BEGIN
+                UPDATE {table} SET {_epoch_assignments(table)} WHERE rowid = NEW.rowid;
+            END
+        '''
+
+
+def backfill_epoch_columns(cursor, tables=None):
+    """Fill epoch shadows left NULL by rows written while the sync triggers were absent."""
+    for table in tables or EPOCH_COLUMNS:
+        columns = EPOCH_COLUMNS.get(table)
+        if not columns:
+            continue
+        missing = ' OR '.join(f'({shadow} IS NULL AND {column} IS NOT NULL)' for column, shadow in columns)
+        cursor.execute(f'UPDATE {table} SET {_epoch_assignments(table, row=None)} WHERE {missing}')
+
+
+def drop_side_structures(cursor, tables):
+    """Drop secondary indexes and triggers on ``tables`` before a bulk load; returns their CREATE statements."""
+    placeholders = ', '.join('?' for _ in tables)
+    objects = cursor.execute(
+        f'''
+        SELECT type, name, sql FROM sqlite_master
+        WHERE type IN ('index', 'trigger') AND sql IS NOT NULL AND tbl_name IN ({placeholders})
+        ORDER BY type
+        ''',
+        tuple(tables)
+    ).fetchall()
+    for kind, name, _ in objects:
+        cursor.execute(f'DROP {kind.upper()} IF EXISTS "{name}"')
+    return [sql for _, _, sql in objects]
+
+_ROLLUP_TRIGGER_NAMES = tuple(
+    re.search(r'CREATE TRIGGER IF NOT EXISTS (\w+)', statement).group(1) for statement in _ROLLUP_TRIGGERS
+)
+
 def init_database():
     """Initialize database with schema"""
     with get_db() as conn:
@@ -306,6 +509,8 @@ def init_database():
             )
             cursor.execute('DROP TABLE notifications')
             cursor.execute('ALTER TABLE notifications_new RENAME TO notifications')
+        # Conditional GETs of the notification feed probe each user's newest row
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_notifications_user ON notifications (user_id, notification_id)')
 
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS user_notification_state (
@@ -344,5 +549,110 @@ def init_database():
             )
         ''')
 
+        # Write counters so process-level caches can detect changes made by other workers
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS entity_versions (
+                entity TEXT PRIMARY KEY,
+                version INTEGER NOT NULL DEFAULT 0,
+                updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+        # Concierge response cache (shared tier across worker processes)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS concierge_response_cache (
+                cache_key TEXT PRIMARY KEY,
+                model TEXT,
+                question TEXT NOT NULL,
+                answer TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_concierge_cache_expires ON concierge_response_cache (expires_at)')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS concierge_cache_citations (
+                cache_key TEXT NOT NULL,
+                resource_id INTEGER NOT NULL,
+                PRIMARY KEY (cache_key, resource_id),
+                FOREIGN KEY (cache_key) REFERENCES concierge_response_cache(cache_key) ON DELETE CASCADE
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_concierge_citations_resource ON concierge_cache_citations (resource_id)')
+
+        # Admin analytics rollups, maintained by triggers so every write path keeps them current
+        # Any missing trigger (first upgrade, or a bulk import of users/resources/bookings
+        # that died with its table's triggers dropped) means the rollups may have drifted
+        existing_triggers = {
+            row['name'] for row in cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        }
+        needs_rollup_backfill = any(name not in existing_triggers for name in _ROLLUP_TRIGGER_NAMES)
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS booking_daily_rollup (
+                day TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, status)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS booking_department_rollup (
+                department TEXT PRIMARY KEY,
+                total INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS user_daily_rollup (
+                day TEXT NOT NULL,
+                role TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (day, role)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS resource_rollup (
+                category TEXT NOT NULL,
+                status TEXT NOT NULL,
+                total INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, status)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_bookings_requester_id ON bookings (requester_id)')
+        for statement in _ROLLUP_TRIGGERS:
+            cursor.execute(statement)
+        if needs_rollup_backfill:
+            from src.data_access.analytics_rollup_dal import AnalyticsRollupDAL
+            AnalyticsRollupDAL.rebuild(cursor)
+
+        # Composite (sort column, id) indexes backing keyset pagination on admin listings
+        for statement in (
+            'CREATE INDEX IF NOT EXISTS idx_users_created_keyset ON users (created_at, user_id)',
+            'CREATE INDEX IF NOT EXISTS idx_users_name_keyset ON users (name, user_id)',
+            'CREATE INDEX IF NOT EXISTS idx_bookings_start_keyset ON bookings (start_datetime, booking_id)',
+            'CREATE INDEX IF NOT EXISTS idx_bookings_status_keyset ON bookings (status, start_datetime, booking_id)',
+            'CREATE INDEX IF NOT EXISTS idx_reviews_timestamp_keyset ON reviews (timestamp, review_id)',
+            "CREATE INDEX IF NOT EXISTS idx_reviews_flagged_keyset ON reviews (COALESCE(flagged_at, ''), review_id) WHERE is_flagged = 1",
+            "CREATE INDEX IF NOT EXISTS idx_messages_flagged_keyset ON messages (COALESCE(flagged_at, ''), message_id) WHERE is_flagged = 1",
+        ):
+            cursor.execute(statement)
+
+        # Epoch shadow columns: add, index, keep in sync, and backfill any table whose
+        # sync trigger was missing (first upgrade, or a bulk load that died midway)
+        needs_epoch_backfill = [
+            table for table in EPOCH_COLUMNS if f'trg_{table}_epoch_insert' not in existing_triggers
+        ]
+        for table, columns in EPOCH_COLUMNS.items():
+            for _, shadow in columns:
+                try:
+                    cursor.execute(f'ALTER TABLE {table} ADD COLUMN {shadow} INTEGER')
+                except OperationalError:
+                    pass
+        for statement in _EPOCH_INDEXES:
+            cursor.execute(statement)
+        for statement in _epoch_triggers():
+            cursor.execute(statement)
+        if needs_epoch_backfill:
+            backfill_epoch_columns(cursor, needs_epoch_backfill)
+
         conn.commit()
         print("[OK] Database initialized successfully")
@@ -0,0 +1,185 @@
+"""
+Analytics rollup Data Access Layer
+Reads the pre-aggregated tables that back the admin dashboard. Triggers keep
+them current on every insert/update/delete; ``rebuild`` recomputes them from
+the base tables (backfill and drift repair) and ``compact`` drops empty rows.
+"""
+from __future__ import annotations
+
+from typing import Dict, List
+
+from src.data_access import get_db
+
+
+_ROLLUP_TABLES = ('booking_daily_rollup', 'booking_department_rollup', 'user_daily_rollup', 'resource_rollup')
+
+
+class AnalyticsRollupDAL:
+    """Data access layer for admin dashboard rollups"""
+
+    @staticmethod
+    def rebuild(cursor=None) -> None:
+        """Recompute every rollup from the base tables, reusing the caller's cursor when given."""
+        if cursor is None:
+            with get_db() as conn:
+                AnalyticsRollupDAL.rebuild(conn.cursor())
+            return
+
+        for table in _ROLLUP_TABLES:
+            cursor.execute(f'DELETE FROM {table}')
+        cursor.execute('''
+            INSERT INTO booking_daily_rollup (day, status, total)
+            SELECT COALESCE(date(created_at), ''), status, COUNT(*)
+            FROM bookings
+            GROUP BY 1, 2
+        ''')
+        cursor.execute('''
+            INSERT INTO booking_department_rollup (department, total)
+            SELECT COALESCE(u.department, 'Unspecified'), COUNT(*)
+            FROM bookings b
+            JOIN users u ON b.requester_id = u.user_id
+            GROUP BY 1
+        ''')
+        cursor.execute('''
+            INSERT INTO user_daily_rollup (day, role, total)
+            SELECT COALESCE(date(created_at), ''), role, COUNT(*)
+            FROM users
+            GROUP BY 1, 2
+        ''')
+        cursor.execute('''
+            INSERT INTO resource_rollup (category, status, total)
+            SELECT COALESCE(category, 'Uncategorized'), status, COUNT(*)
+            FROM resources
+            GROUP BY 1, 2
+        ''')
+
+    @staticmethod
+    def compact() -> int:
+        """Delete rollup rows whose count has dropped to zero; returns rows removed."""
+        removed = 0
+        with get_db() as conn:
+            cursor = conn.cursor()
+            for table in _ROLLUP_TABLES:
+                cursor.execute(f'DELETE FROM {table} WHERE total <= 0')
+                removed += cursor.rowcount
+        return removed
+
+    @staticmethod
+    def user_role_counts() -> Dict[str, int]:
+        """Return total users per role."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT role, SUM(total) AS total FROM user_daily_rollup GROUP BY role')
+            rows = cursor.fetchall()
+        return {row['role']: row['total'] for row in rows}
+
+    @staticmethod
+    def resource_status_counts() -> Dict[str, int]:
+        """Return total resources per publication status."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT status, SUM(total) AS total FROM resource_rollup GROUP BY status')
+            rows = cursor.fetchall()
+        return {row['status']: row['total'] for row in rows}
+
+    @staticmethod
+    def category_distribution(limit=6) -> List[Dict]:
+        """Return counts of resources grouped by category."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT category, SUM(total) AS total
+                FROM resource_rollup
+                GROUP BY category
+                HAVING SUM(total) > 0
+                ORDER BY total DESC, category ASC
+                LIMIT ?
+                ''',
+                (limit,)
+            )
+            rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def booking_status_breakdown() -> List[Dict]:
+        """Return total bookings grouped by status for overview charts."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT status, SUM(total) AS total
+                FROM booking_daily_rollup
+                GROUP BY status
+                HAVING SUM(total) > 0
+                ORDER BY total DESC
+                '''
+            )
+            rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def summarize_by_department(limit=6) -> List[Dict]:
+        """Return aggregate booking counts grouped by requester department."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT department, total
+                FROM booking_department_rollup
+                WHERE total > 0
+                ORDER BY total DESC, department ASC
+                LIMIT ?
+                ''',
+                (limit,)
+            )
+            rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def monthly_booking_trend(months=6) -> List[Dict]:
+        """Return booking counts grouped by month for the provided window."""
+        window = max(1, int(months or 1))
+        offset = f'-{window - 1} months' if window > 1 else '0 months'
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT substr(day, 1, 7) AS month,
+                       SUM(total) AS total,
+                       SUM(CASE WHEN status = 'approved' THEN total ELSE 0 END) AS approved,
+                       SUM(CASE WHEN status = 'pending' THEN total ELSE 0 END) AS pending,
+                       SUM(CASE WHEN status = 'completed' THEN total ELSE 0 END) AS completed,
+                       SUM(CASE WHEN status = 'rejected' THEN total ELSE 0 END) AS rejected
+                FROM booking_daily_rollup
+                WHERE day >= date('now', 'start of month', ?)
+                GROUP BY month
+                HAVING SUM(total) > 0
+                ORDER BY month ASC
+                ''',
+                (offset,)
+            )
+            rows = cursor.fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def monthly_registration_trend(months=6) -> List[Dict]:
+        """Return monthly registration counts for the requested window."""
+        window = max(1, int(months or 1))
+        offset = f'-{window - 1} months' if window > 1 else '0 months'
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT substr(day, 1, 7) AS month,
+                       SUM(total) AS total
+                FROM user_daily_rollup
+                WHERE day >= date('now', 'start of month', ?)
+                GROUP BY month
+                HAVING SUM(total) > 0
+                ORDER BY month ASC
+                ''',
+                (offset,)
+            )
+            rows = cursor.fetchall()
+        return [dict(row) for row in rows]
@@ -4,7 +4,13 @@ Handles all database operations for bookings
 """
 from datetime import datetime
 from src.data_access import get_db
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
+from src.data_access.result_set import LazyResultSet
 from src.models.models import Booking
+from src.utils.datetime_helpers import to_epoch
+
+BOOKING_SORTS = {'start_datetime': 'b.start_datetime', 'created_at': 'b.created_at'}
 
 class BookingDAL:
     """Data access layer for booking operations"""
@@ -16,21 +22,27 @@ class BookingDAL:
             return value.isoformat()
         return value
     
+    @staticmethod
+    def insert_booking(cursor, resource_id, requester_id, start_datetime, end_datetime, status='pending', recurrence_rule=None):
+        """Insert a booking on the caller's transaction and return its id (the caller bumps the version)."""
+        cursor.execute('''
+            INSERT INTO bookings (resource_id, requester_id, start_datetime, end_datetime, status, recurrence_rule)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (resource_id, requester_id, BookingDAL._normalize_datetime(start_datetime),
+              BookingDAL._normalize_datetime(end_datetime), status, recurrence_rule))
+        return cursor.lastrowid
+
     @staticmethod
     def create_booking(resource_id, requester_id, start_datetime, end_datetime, status='pending', recurrence_rule=None):
         """Create a new booking"""
-        start_value = BookingDAL._normalize_datetime(start_datetime)
-        end_value = BookingDAL._normalize_datetime(end_datetime)
         with get_db() as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO bookings (resource_id, requester_id, start_datetime, end_datetime, status, recurrence_rule)
-                VALUES (?, ?, ?, ?, ?, ?)
-            ''', (resource_id, requester_id, start_value, end_value, status, recurrence_rule))
-            booking_id = cursor.lastrowid
+            booking_id = BookingDAL.insert_booking(cursor, resource_id, requester_id, start_datetime, end_datetime,
+                                                   status, recurrence_rule)
             row = cursor.execute('SELECT * FROM bookings WHERE booking_id = ?', (booking_id,)).fetchone()
+            EntityVersionDAL.bump('bookings', cursor)
         
-        return Booking(**dict(row)) if row else None
+        return Booking.from_row(row) if row else None
 
     @staticmethod
     def create_recurring_bookings(resource_id, requester_id, occurrences, status='pending', recurrence_rule=None):
@@ -48,7 +60,9 @@ class BookingDAL:
                 booking_id = cursor.lastrowid
                 row = cursor.execute('SELECT * FROM bookings WHERE booking_id = ?', (booking_id,)).fetchone()
                 if row:
-                    created.append(Booking(**dict(row)))
+                    created.append(Booking.from_row(row))
+            if created:
+                EntityVersionDAL.bump('bookings', cursor)
         return created
     
     @staticmethod
@@ -60,26 +74,24 @@ class BookingDAL:
             row = cursor.fetchone()
             
         if row:
-            return Booking(**dict(row))
+            return Booking.from_row(row)
         return None
     
     @staticmethod
     def check_booking_conflict(resource_id, start_datetime, end_datetime, exclude_booking_id=None):
         """Check if a booking conflicts with existing approved bookings"""
-        start_value = BookingDAL._normalize_datetime(start_datetime)
-        end_value = BookingDAL._normalize_datetime(end_datetime)
+        start_epoch, end_epoch = to_epoch(start_datetime), to_epoch(end_datetime)
+        if start_epoch is None or end_epoch is None:
+            raise ValueError('Booking start and end must be valid datetimes.')
         query = '''
             SELECT COUNT(*) as conflict_count
             FROM bookings
             WHERE resource_id = ?
             AND status IN ('pending', 'approved')
-            AND (
-                (start_datetime < ? AND end_datetime > ?)
-                OR (start_datetime < ? AND end_datetime > ?)
-                OR (start_datetime >= ? AND end_datetime <= ?)
-            )
+            AND start_epoch < ?
+            AND end_epoch > ?
         '''
-        params = [resource_id, end_value, start_value, end_value, start_value, start_value, end_value]
+        params = [resource_id, end_epoch, start_epoch]
         
         if exclude_booking_id:
             query += ' AND booking_id != ?'
@@ -92,35 +104,48 @@ class BookingDAL:
             
         return result['conflict_count'] > 0
     
+    @staticmethod
+    def get_busy_intervals(resource_id, start_epoch, end_epoch, cursor=None):
+        """(start_epoch, end_epoch) of pending/approved bookings on a resource overlapping the span."""
+        query = '''
+            SELECT start_epoch, end_epoch
+            FROM bookings
+            WHERE resource_id = ?
+              AND start_epoch < ?
+              AND end_epoch > ?
+              AND status IN ('pending', 'approved')
+        '''
+        params = (resource_id, end_epoch, start_epoch)
+        if cursor is not None:
+            rows = cursor.execute(query, params).fetchall()
+        else:
+            with get_db() as conn:
+                rows = conn.execute(query, params).fetchall()
+        return [(row['start_epoch'], row['end_epoch']) for row in rows]
+
     @staticmethod
     def get_bookings_by_requester(requester_id):
         """Get all bookings made by a user"""
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM bookings 
-                WHERE requester_id = ? 
-                ORDER BY start_datetime DESC
-            ''', (requester_id,))
-            rows = cursor.fetchall()
-            
-        return [Booking(**dict(row)) for row in rows]
+        return LazyResultSet(
+            Booking,
+            'SELECT * FROM bookings WHERE requester_id = ? ORDER BY start_datetime DESC, booking_id DESC',
+            (requester_id,)
+        )
     
     @staticmethod
     def get_bookings_by_resource(resource_id):
         """Get all bookings for a resource with requester names"""
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT b.*, u.name as requester_name
-                FROM bookings b
-                LEFT JOIN users u ON b.requester_id = u.user_id
-                WHERE b.resource_id = ?
-                ORDER BY b.start_datetime DESC
-            ''', (resource_id,))
-            rows = cursor.fetchall()
-
-        return [Booking(**dict(row)) for row in rows]
+        return LazyResultSet(
+            Booking,
+            '''
+            SELECT b.*, u.name as requester_name
+            FROM bookings b
+            LEFT JOIN users u ON b.requester_id = u.user_id
+            WHERE b.resource_id = ?
+            ORDER BY b.start_datetime DESC, b.booking_id DESC
+            ''',
+            (resource_id,)
+        )
 
     @staticmethod
     def get_bookings_for_resources(resource_ids, statuses=None):
@@ -144,7 +169,7 @@ class BookingDAL:
             cursor.execute(query, params)
             rows = cursor.fetchall()
 
-        return [Booking(**dict(row)) for row in rows]
+        return Booking.from_rows(rows)
 
     @staticmethod
     def get_bookings_for_owner(owner_id, statuses=None, limit=None, offset=0):
@@ -201,7 +226,7 @@ class BookingDAL:
             JOIN users u ON b.requester_id = u.user_id
             WHERE r.owner_id = ?
               AND b.status = 'pending'
-            ORDER BY datetime(b.created_at) DESC
+            ORDER BY b.created_epoch DESC, b.booking_id DESC
             LIMIT ?
         '''
 
@@ -240,22 +265,30 @@ class BookingDAL:
                 f"UPDATE bookings SET {' , '.join(set_clauses)} WHERE booking_id = ?",
                 params
             )
+            updated = cursor.rowcount > 0
+            if updated:
+                EntityVersionDAL.bump('bookings', cursor)
 
-        return cursor.rowcount > 0
+        return updated
     
     @staticmethod
-    def get_pending_bookings():
-        """Get all pending bookings for admin review"""
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
+    def get_pending_bookings(limit=None):
+        """Get pending bookings for admin review, oldest first"""
+        query = '''
                 SELECT * FROM bookings 
                 WHERE status = 'pending' 
                 ORDER BY created_at ASC
-            ''')
+            '''
+        params = []
+        if limit:
+            query += ' LIMIT ?'
+            params.append(limit)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
             rows = cursor.fetchall()
             
-        return [Booking(**dict(row)) for row in rows]
+        return Booking.from_rows(rows)
     
     @staticmethod
     def delete_booking(booking_id):
@@ -263,8 +296,11 @@ class BookingDAL:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM bookings WHERE booking_id = ?', (booking_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                EntityVersionDAL.bump('bookings', cursor)
             
-        return cursor.rowcount > 0
+        return deleted
 
     @staticmethod
     def summarize_by_department(limit=6):
@@ -295,14 +331,14 @@ class BookingDAL:
             cursor = conn.cursor()
             cursor.execute(
                 '''
-                SELECT strftime('%Y-%m', created_at) AS month,
+                SELECT strftime('%Y-%m', created_epoch, 'unixepoch') AS month,
                        COUNT(*) AS total,
                        SUM(CASE WHEN status = 'approved' THEN 1 ELSE 0 END) AS approved,
                        SUM(CASE WHEN status = 'pending' THEN 1 ELSE 0 END) AS pending,
                        SUM(CASE WHEN status = 'completed' THEN 1 ELSE 0 END) AS completed,
                        SUM(CASE WHEN status = 'rejected' THEN 1 ELSE 0 END) AS rejected
                 FROM bookings
-                WHERE created_at >= date('now', 'start of month', ?)
+                WHERE created_epoch >= CAST(strftime('%s', 'now', 'start of month', ?) AS INTEGER)
                 GROUP BY month
                 ORDER BY month ASC
                 ''',
@@ -378,6 +414,35 @@ class BookingDAL:
         result['decision_by_name'] = row['decision_by_name'] if 'decision_by_name' in row.keys() else None
         return result
 
+    @staticmethod
+    def page_bookings(status=None, search=None, sort='start_datetime', descending=True,
+                      limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+        """Keyset-paginated bookings with resource and user details for the admin console"""
+        wheres, params = [], []
+        if status:
+            wheres.append('b.status = ?')
+            params.append(status)
+        if search:
+            wheres.append('(LOWER(r.title) LIKE ? OR LOWER(u.name) LIKE ? OR LOWER(u.email) LIKE ?)')
+            term = f'%{search.strip().lower()}%'
+            params.extend([term, term, term])
+        sort = sort if sort in BOOKING_SORTS else 'start_datetime'
+        return fetch_keyset_page(
+            '''b.*,
+               r.title AS resource_title,
+               r.category,
+               r.owner_id AS owner_id,
+               u.name AS requester_name,
+               u.email AS requester_email,
+               reviewer.name AS decision_by_name''',
+            '''bookings b
+               JOIN resources r ON b.resource_id = r.resource_id
+               JOIN users u ON b.requester_id = u.user_id
+               LEFT JOIN users reviewer ON b.decision_by = reviewer.user_id''',
+            sort_column=BOOKING_SORTS[sort], id_column='b.booking_id', wheres=wheres, params=params,
+            descending=descending, limit=limit, after=after, before=before, sort=sort
+        )
+
     @staticmethod
     def get_bookings_with_details(status=None, limit=None, offset=0):
         """Get a list of bookings with associated resource and user information"""
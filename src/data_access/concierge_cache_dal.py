@@ -0,0 +1,89 @@
+"""
+Concierge response cache data operations.
+Backs the shared (cross-worker) tier of the concierge answer cache.
+"""
+from __future__ import annotations
+
+from typing import Iterable, Optional
+
+from src.data_access import get_db
+
+
+class ConciergeCacheDAL:
+    """Persist cached concierge answers and the resources they cite."""
+
+    @staticmethod
+    def get_entry(cache_key: str, now: float) -> Optional[dict]:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT cache_key, model, question, answer, created_at, expires_at
+                FROM concierge_response_cache
+                WHERE cache_key = ? AND expires_at > ?
+                ''',
+                (cache_key, now)
+            )
+            row = cursor.fetchone()
+            if not row:
+                return None
+            cursor.execute(
+                'SELECT resource_id FROM concierge_cache_citations WHERE cache_key = ?',
+                (cache_key,)
+            )
+            resource_ids = [citation['resource_id'] for citation in cursor.fetchall()]
+        entry = dict(row)
+        entry['resource_ids'] = resource_ids
+        return entry
+
+    @staticmethod
+    def upsert_entry(cache_key: str, *, model: Optional[str], question: str, answer: str,
+                     resource_ids: Iterable[int], created_at: float, expires_at: float) -> None:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                INSERT INTO concierge_response_cache (cache_key, model, question, answer, created_at, expires_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(cache_key)
+                DO UPDATE SET
+                    answer = excluded.answer,
+                    created_at = excluded.created_at,
+                    expires_at = excluded.expires_at
+                ''',
+                (cache_key, model, question, answer, created_at, expires_at)
+            )
+            cursor.execute('DELETE FROM concierge_cache_citations WHERE cache_key = ?', (cache_key,))
+            cursor.executemany(
+                'INSERT OR IGNORE INTO concierge_cache_citations (cache_key, resource_id) VALUES (?, ?)',
+                [(cache_key, resource_id) for resource_id in resource_ids if resource_id is not None]
+            )
+
+    @staticmethod
+    def invalidate_resource(resource_id: int) -> int:
+        """Drop every cached answer that cited the supplied resource."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                DELETE FROM concierge_response_cache
+                WHERE cache_key IN (
+                    SELECT cache_key FROM concierge_cache_citations WHERE resource_id = ?
+                )
+                ''',
+                (resource_id,)
+            )
+        return cursor.rowcount
+
+    @staticmethod
+    def purge_expired(now: float) -> int:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM concierge_response_cache WHERE expires_at <= ?', (now,))
+        return cursor.rowcount
+
+    @staticmethod
+    def clear() -> None:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('DELETE FROM concierge_response_cache')
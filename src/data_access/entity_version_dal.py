@@ -0,0 +1,56 @@
+"""
+Entity version counters.
+Every write to a tracked table bumps its counter so in-memory snapshots in
+any worker can tell cheaply whether they are stale.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable
+
+from src.data_access import get_db
+
+
+class EntityVersionDAL:
+    """Read and bump per-entity write counters."""
+
+    @staticmethod
+    def bump(entity: str, cursor=None) -> None:
+        """Increment the counter, reusing the caller's cursor to stay in its transaction."""
+        statement = '''
+            INSERT INTO entity_versions (entity, version, updated_at)
+            VALUES (?, 1, CURRENT_TIMESTAMP)
+            ON CONFLICT(entity)
+            DO UPDATE SET
+                version = version + 1,
+                updated_at = CURRENT_TIMESTAMP
+        '''
+        if cursor is not None:
+            cursor.execute(statement, (entity,))
+            return
+        with get_db() as conn:
+            conn.execute(statement, (entity,))
+
+    @staticmethod
+    def get_version(entity: str) -> int:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT version FROM entity_versions WHERE entity = ?', (entity,))
+            row = cursor.fetchone()
+        return row['version'] if row else 0
+
+    @staticmethod
+    def get_versions(entities: Iterable[str]) -> Dict[str, int]:
+        names = list(entities)
+        if not names:
+            return {}
+        placeholders = ','.join('?' for _ in names)
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f'SELECT entity, version FROM entity_versions WHERE entity IN ({placeholders})',
+                names
+            )
+            rows = cursor.fetchall()
+        versions = {name: 0 for name in names}
+        versions.update({row['entity']: row['version'] for row in rows})
+        return versions
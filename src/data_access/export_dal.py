@@ -0,0 +1,120 @@
+"""
+Export Data Access Layer
+Streams admin report rows straight off a SQLite cursor in fixed-size batches
+so exports of any size use constant memory.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from src.data_access import get_db
+
+
+EXPORT_BATCH_SIZE = 500
+
+BOOKING_EXPORT_COLUMNS = (
+    'booking_id', 'resource_id', 'resource_title', 'category', 'requester_id', 'requester_name',
+    'requester_email', 'start_datetime', 'end_datetime', 'status', 'decision_by_name',
+    'decision_notes', 'created_at'
+)
+USER_EXPORT_COLUMNS = (
+    'user_id', 'name', 'email', 'role', 'department', 'is_suspended', 'email_verified', 'created_at'
+)
+REVIEW_EXPORT_COLUMNS = (
+    'review_id', 'resource_id', 'resource_title', 'reviewer_id', 'reviewer_name', 'rating',
+    'comment', 'is_flagged', 'flag_reason', 'is_hidden', 'timestamp'
+)
+
+BOOKING_EXPORT_STATUSES = ('pending', 'approved', 'rejected', 'cancelled', 'completed')
+USER_EXPORT_STATUSES = ('active', 'suspended')
+REVIEW_EXPORT_STATUSES = ('visible', 'flagged', 'hidden')
+
+
+class ExportDAL:
+    """Data access layer for streaming admin exports"""
+
+    @staticmethod
+    def iter_query(query: str, params: Sequence = (), batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict]:
+        """Yield rows as dicts, pulling ``batch_size`` rows at a time from the cursor."""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+
+    @staticmethod
+    def _date_range(column: str, start_date: Optional[str], end_before: Optional[str]) -> Tuple[List[str], List]:
+        """Build WHERE clauses for ``start_date <= column < end_before`` (ISO date strings)."""
+        wheres, params = [], []
+        if start_date:
+            wheres.append(f'{column} >= ?')
+            params.append(start_date)
+        if end_before:
+            wheres.append(f'{column} < ?')
+            params.append(end_before)
+        return wheres, params
+
+    @staticmethod
+    def stream_bookings(status=None, start_date=None, end_before=None,
+                        batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict]:
+        """Stream bookings (filtered on start time) with resource and people details."""
+        wheres, params = ExportDAL._date_range('b.start_datetime', start_date, end_before)
+        if status:
+            wheres.append('b.status = ?')
+            params.append(status)
+        query = '''
+            SELECT b.booking_id, b.resource_id, r.title AS resource_title, r.category,
+                   b.requester_id, u.name AS requester_name, u.email AS requester_email,
+                   b.start_datetime, b.end_datetime, b.status,
+                   reviewer.name AS decision_by_name, b.decision_notes, b.created_at
+            FROM bookings b
+            JOIN resources r ON b.resource_id = r.resource_id
+            JOIN users u ON b.requester_id = u.user_id
+            LEFT JOIN users reviewer ON b.decision_by = reviewer.user_id
+        '''
+        if wheres:
+            query += ' WHERE ' + ' AND '.join(wheres)
+        query += ' ORDER BY b.booking_id ASC'
+        return ExportDAL.iter_query(query, params, batch_size)
+
+    @staticmethod
+    def stream_users(status=None, start_date=None, end_before=None,
+                     batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict]:
+        """Stream user accounts (filtered on registration date) without credentials."""
+        wheres, params = ExportDAL._date_range('created_at', start_date, end_before)
+        if status:
+            wheres.append('is_suspended = ?')
+            params.append(1 if status == 'suspended' else 0)
+        query = f'SELECT {", ".join(USER_EXPORT_COLUMNS)} FROM users'
+        if wheres:
+            query += ' WHERE ' + ' AND '.join(wheres)
+        query += ' ORDER BY user_id ASC'
+        return ExportDAL.iter_query(query, params, batch_size)
+
+    @staticmethod
+    def stream_reviews(status=None, start_date=None, end_before=None,
+                       batch_size: int = EXPORT_BATCH_SIZE) -> Iterator[Dict]:
+        """Stream reviews (filtered on submission date) with resource and reviewer names."""
+        wheres, params = ExportDAL._date_range('rv.timestamp', start_date, end_before)
+        if status == 'flagged':
+            wheres.append('rv.is_flagged = 1')
+        elif status == 'hidden':
+            wheres.append('rv.is_hidden = 1')
+        elif status == 'visible':
+            wheres.append('rv.is_hidden = 0')
+        query = '''
+            SELECT rv.review_id, rv.resource_id, res.title AS resource_title,
+                   rv.reviewer_id, u.name AS reviewer_name, rv.rating, rv.comment,
+                   rv.is_flagged, rv.flag_reason, rv.is_hidden, rv.timestamp
+            FROM reviews rv
+            JOIN resources res ON rv.resource_id = res.resource_id
+            JOIN users u ON rv.reviewer_id = u.user_id
+        '''
+        if wheres:
+            query += ' WHERE ' + ' AND '.join(wheres)
+        query += ' ORDER BY rv.review_id ASC'
+        return ExportDAL.iter_query(query, params, batch_size)
@@ -0,0 +1,350 @@
+"""
+Import Data Access Layer
+Bulk-loads users, resources and bookings from CSV / JSON Lines records.
+
+Records are validated a batch at a time against lookups loaded once up front,
+written with ``executemany`` and committed per batch. Secondary indexes and
+the rollup and epoch triggers on the target table are dropped for the duration
+of the load and recreated afterwards, followed by a single rollup rebuild and
+epoch backfill; should the process die mid-import, ``init_database`` recreates
+and refills them on the next start.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import sqlite3
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.data_access import backfill_epoch_columns, drop_side_structures, get_db
+from src.data_access.analytics_rollup_dal import AnalyticsRollupDAL
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.utils.importers import PasswordHasher, batched
+from src.utils.passwords import get_password_executor
+from src.utils.validators import Validator
+
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 50
+
+_TRUE_VALUES = {'1', 'true', 'yes', 'y', 't'}
+_FALSE_VALUES = {'0', 'false', 'no', 'n', 'f', ''}
+
+
+class RecordError(ValueError):
+    """A single input record failed validation."""
+
+
+@dataclass
+class ImportReport:
+    """Outcome of one bulk import run."""
+    dataset: str
+    read: int = 0
+    inserted: int = 0
+    rejected: int = 0
+    errors: List[Tuple[int, str]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+    dry_run: bool = False
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.read / self.elapsed_seconds if self.elapsed_seconds > 0 else 0.0
+
+    def reject(self, line_number: int, message: str) -> None:
+        self.rejected += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line_number, message))
+
+
+def _text(record: Dict, key: str, max_len: int = 1000, required: bool = False) -> Optional[str]:
+    value = record.get(key)
+    if value is None or (isinstance(value, str) and not value.strip()):
+        if required:
+            raise RecordError(f'{key} is required')
+        return None
+    value = str(value).strip()
+    if len(value) > max_len:
+        raise RecordError(f'{key} must not exceed {max_len} characters')
+    return value
+
+
+def _integer(record: Dict, key: str, default=None, minimum: int = 0) -> Optional[int]:
+    value = record.get(key)
+    if value is None or value == '':
+        return default
+    valid, result = Validator.validate_integer(value, min_val=minimum, field_name=key)
+    if not valid:
+        raise RecordError(result)
+    return result
+
+
+def _flag(record: Dict, key: str, default: bool = False) -> int:
+    value = record.get(key)
+    if value is None:
+        return int(default)
+    if isinstance(value, bool):
+        return int(value)
+    text = str(value).strip().lower()
+    if text in _TRUE_VALUES:
+        return 1
+    if text in _FALSE_VALUES:
+        return 0
+    raise RecordError(f'{key} must be true or false')
+
+
+def _choice(record: Dict, key: str, choices: Tuple[str, ...], default: str) -> str:
+    value = (_text(record, key) or default).lower()
+    if value not in choices:
+        raise RecordError(f"{key} must be one of: {', '.join(choices)}")
+    return value
+
+
+def _datetime(record: Dict, key: str) -> str:
+    value = _text(record, key, required=True)
+    valid, result = Validator.validate_datetime(value, field_name=key)
+    if not valid:
+        raise RecordError(result)
+    return result.isoformat()
+
+
+class _Loader:
+    """Validation and insert statement for one dataset."""
+    table = ''
+    insert_sql = ''
+
+    def prepare(self, cursor) -> None:
+        """Load the lookups validation needs; called once per import."""
+
+    def validate(self, record: Dict) -> tuple:
+        raise NotImplementedError
+
+    def finalize(self, rows: List[tuple]) -> List[tuple]:
+        """Last step before insert, applied to a whole batch of valid rows."""
+        return rows
+
+    @staticmethod
+    def _load_user_lookup(cursor) -> Dict[str, int]:
+        cursor.execute('SELECT user_id, lower(email) AS email FROM users')
+        return {row['email']: row['user_id'] for row in cursor.fetchall()}
+
+    @staticmethod
+    def _resolve_user(record: Dict, lookup: Dict[str, int], ids, prefix: str) -> int:
+        email = _text(record, f'{prefix}_email')
+        if email:
+            user_id = lookup.get(email.lower())
+            if user_id is None:
+                raise RecordError(f'No user with {prefix}_email {email}')
+            return user_id
+        user_id = _integer(record, f'{prefix}_id', minimum=1)
+        if user_id is None:
+            raise RecordError(f'{prefix}_email or {prefix}_id is required')
+        if user_id not in ids:
+            raise RecordError(f'No user with {prefix}_id {user_id}')
+        return user_id
+
+
+class _PlainPassword(str):
+    """Marks a password that still needs hashing."""
+
+
+class _UserLoader(_Loader):
+    table = 'users'
+    insert_sql = '''
+        INSERT INTO users (name, email, password_hash, role, department, email_verified)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+
+    def __init__(self, hasher: PasswordHasher):
+        self.hasher = hasher
+        self.seen_emails = set()
+
+    def prepare(self, cursor) -> None:
+        self.seen_emails = set(self._load_user_lookup(cursor))
+
+    def validate(self, record: Dict) -> tuple:
+        name = _text(record, 'name', max_len=100, required=True)
+        email = _text(record, 'email', max_len=254, required=True).lower()
+        if not Validator.validate_email(email):
+            raise RecordError(f'Invalid email address: {email}')
+        if email in self.seen_emails:
+            raise RecordError(f'Email already registered: {email}')
+
+        password_hash = _text(record, 'password_hash')
+        password = None
+        if password_hash:
+            if not password_hash.startswith('$2'):
+                raise RecordError('password_hash must be a bcrypt hash')
+        else:
+            password = _text(record, 'password', max_len=128)
+            valid, message = Validator.validate_password(password)
+            if not valid:
+                raise RecordError(message if password else 'password or password_hash is required')
+
+        role = _choice(record, 'role', ('student', 'staff', 'admin'), 'student')
+        department = _text(record, 'department', max_len=100)
+        email_verified = _flag(record, 'email_verified', default=True)
+        self.seen_emails.add(email)
+        # Plain passwords ride in the hash slot until finalize() hashes the batch
+        return (name, email, password_hash or _PlainPassword(password), role, department, email_verified)
+
+    def finalize(self, rows: List[tuple]) -> List[tuple]:
+        pending = [index for index, row in enumerate(rows) if isinstance(row[2], _PlainPassword)]
+        hashes = self.hasher.hash_many([str(rows[index][2]) for index in pending])
+        for index, password_hash in zip(pending, hashes):
+            row = rows[index]
+            rows[index] = row[:2] + (password_hash,) + row[3:]
+        return rows
+
+
+class _ResourceLoader(_Loader):
+    table = 'resources'
+    insert_sql = '''
+        INSERT INTO resources (owner_id, title, description, category, location, capacity,
+                               equipment, availability_rules, is_restricted, status,
+                               availability_schedule, min_booking_minutes, max_booking_minutes,
+                               booking_increment_minutes, buffer_minutes, advance_booking_days,
+                               min_lead_time_hours)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    def prepare(self, cursor) -> None:
+        self.users = self._load_user_lookup(cursor)
+        self.user_ids = set(self.users.values())
+
+    def validate(self, record: Dict) -> tuple:
+        owner_id = self._resolve_user(record, self.users, self.user_ids, 'owner')
+        min_minutes = _integer(record, 'min_booking_minutes', 30, minimum=15)
+        max_minutes = _integer(record, 'max_booking_minutes', 480, minimum=15)
+        if max_minutes < min_minutes:
+            raise RecordError('max_booking_minutes must be at least min_booking_minutes')
+        return (
+            owner_id,
+            _text(record, 'title', max_len=200, required=True),
+            _text(record, 'description', max_len=5000),
+            _text(record, 'category', max_len=100),
+            _text(record, 'location', max_len=200),
+            _integer(record, 'capacity', minimum=1),
+            _text(record, 'equipment', max_len=1000),
+            _text(record, 'availability_rules', max_len=1000),
+            _flag(record, 'is_restricted'),
+            _choice(record, 'status', ('draft', 'published', 'archived'), 'draft'),
+            _text(record, 'availability_schedule', max_len=5000),
+            min_minutes,
+            max_minutes,
+            _integer(record, 'booking_increment_minutes', 30, minimum=5),
+            _integer(record, 'buffer_minutes', 0),
+            _integer(record, 'advance_booking_days', 90, minimum=1),
+            _integer(record, 'min_lead_time_hours', 0),
+        )
+
+
+class _BookingLoader(_Loader):
+    table = 'bookings'
+    insert_sql = '''
+        INSERT INTO bookings (resource_id, requester_id, start_datetime, end_datetime, status, recurrence_rule)
+        VALUES (?, ?, ?, ?, ?, ?)
+    '''
+
+    def prepare(self, cursor) -> None:
+        self.users = self._load_user_lookup(cursor)
+        self.user_ids = set(self.users.values())
+        cursor.execute('SELECT resource_id FROM resources')
+        self.resource_ids = {row['resource_id'] for row in cursor.fetchall()}
+
+    def validate(self, record: Dict) -> tuple:
+        resource_id = _integer(record, 'resource_id', minimum=1)
+        if resource_id is None:
+            raise RecordError('resource_id is required')
+        if resource_id not in self.resource_ids:
+            raise RecordError(f'No resource with resource_id {resource_id}')
+        requester_id = self._resolve_user(record, self.users, self.user_ids, 'requester')
+        start_value = _datetime(record, 'start_datetime')
+        end_value = _datetime(record, 'end_datetime')
+        if end_value <= start_value:
+            raise RecordError('end_datetime must be after start_datetime')
+        status = _choice(record, 'status', ('pending', 'approved', 'rejected', 'cancelled', 'completed'), 'pending')
+        return (resource_id, requester_id, start_value, end_value, status, _text(record, 'recurrence_rule'))
+
+
+IMPORT_DATASETS = ('users', 'resources', 'bookings')
+
+
+class ImportDAL:
+    """Data access layer for bulk imports"""
+
+    @staticmethod
+    def _loader(dataset: str, hasher: PasswordHasher) -> _Loader:
+        if dataset == 'users':
+            return _UserLoader(hasher)
+        if dataset == 'resources':
+            return _ResourceLoader()
+        if dataset == 'bookings':
+            return _BookingLoader()
+        raise ValueError(f'Unknown import dataset: {dataset}')
+
+    @staticmethod
+    def _insert_batch(conn, loader: _Loader, batch: List[Tuple[int, tuple]], report: ImportReport) -> None:
+        """Insert a validated batch; on a constraint error retry row by row to isolate it."""
+        rows = loader.finalize([row for _, row in batch])
+        cursor = conn.cursor()
+        try:
+            cursor.executemany(loader.insert_sql, rows)
+            conn.commit()
+            report.inserted += len(rows)
+            return
+        except sqlite3.IntegrityError:
+            conn.rollback()
+        for (line_number, _), row in zip(batch, rows):
+            try:
+                cursor.execute(loader.insert_sql, row)
+                report.inserted += 1
+            except sqlite3.IntegrityError as exc:
+                report.reject(line_number, str(exc))
+        conn.commit()
+
+    @staticmethod
+    def import_records(dataset: str, records: Iterable[Tuple[int, Dict]], *,
+                       batch_size: int = IMPORT_BATCH_SIZE, workers: Optional[int] = None,
+                       defer_indexes: bool = True, dry_run: bool = False) -> ImportReport:
+        """
+        Validate and insert ``(line number, record)`` pairs for ``dataset``.
+
+        Invalid records are counted and reported, never inserted; valid ones
+        are written even when others fail. ``dry_run`` validates only.
+        """
+        report = ImportReport(dataset=dataset, dry_run=dry_run)
+        started = time.perf_counter()
+        with PasswordHasher(0 if dry_run else workers, rounds=get_password_executor().rounds) as hasher, get_db() as conn:
+            loader = ImportDAL._loader(dataset, hasher)
+            loader.prepare(conn.cursor())
+            deferred = []
+            if defer_indexes and not dry_run:
+                deferred = drop_side_structures(conn.cursor(), (loader.table,))
+                conn.commit()
+            try:
+                for chunk in batched(records, max(1, batch_size)):
+                    valid = []
+                    for line_number, record in chunk:
+                        report.read += 1
+                        try:
+                            if record.get('_error'):
+                                raise RecordError(record['_error'])
+                            valid.append((line_number, loader.validate(record)))
+                        except RecordError as exc:
+                            report.reject(line_number, str(exc))
+                    if valid and not dry_run:
+                        ImportDAL._insert_batch(conn, loader, valid, report)
+            finally:
+                if not dry_run:
+                    cursor = conn.cursor()
+                    for statement in deferred:
+                        cursor.execute(statement)
+                    if deferred and report.inserted:
+                        # Rollup and epoch triggers were off while rows went in
+                        AnalyticsRollupDAL.rebuild(cursor)
+                        backfill_epoch_columns(cursor, [loader.table])
+                    if loader.table in ('resources', 'bookings') and report.inserted:
+                        EntityVersionDAL.bump(loader.table, cursor)
+                    conn.commit()
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
@@ -4,11 +4,32 @@ Handles all database operations for messages
 """
 from typing import List, Dict
 from src.data_access import get_db
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
 from src.models.models import Message
 
 class MessageDAL:
     """Data access layer for message operations"""
 
+    @staticmethod
+    def thread_version_key(thread_id):
+        """entity_versions key bumped when a thread's visible messages change"""
+        return f'thread:{int(thread_id)}'
+
+    @staticmethod
+    def inbox_version_key(user_id):
+        """entity_versions key bumped when messages addressed to a user change"""
+        return f'inbox:{int(user_id)}'
+
+    @staticmethod
+    def _bump_versions(cursor, message_id):
+        row = cursor.execute(
+            'SELECT thread_id, receiver_id FROM messages WHERE message_id = ?', (message_id,)
+        ).fetchone()
+        if row:
+            EntityVersionDAL.bump(MessageDAL.thread_version_key(row['thread_id']), cursor)
+            EntityVersionDAL.bump(MessageDAL.inbox_version_key(row['receiver_id']), cursor)
+
     @staticmethod
     def _build_thread_key(user_a, user_b, resource_id=None):
         """Generate a stable thread key for two participants and optional resource"""
@@ -48,6 +69,7 @@ class MessageDAL:
                 VALUES (?, ?, ?, ?)
             ''', (thread_id, sender_id, receiver_id, content))
             message_id = cursor.lastrowid
+            MessageDAL._bump_versions(cursor, message_id)
             
         return MessageDAL.get_message_by_id(message_id)
 
@@ -69,7 +91,7 @@ class MessageDAL:
             row = cursor.fetchone()
             
         if row:
-            return Message(**dict(row))
+            return Message.from_row(row)
         return None
     
     @staticmethod
@@ -89,7 +111,7 @@ class MessageDAL:
             cursor.execute(query, tuple(params))
             rows = cursor.fetchall()
             
-        return [Message(**dict(row)) for row in rows]
+        return Message.from_rows(rows)
     
     @staticmethod
     def get_user_threads(user_id):
@@ -137,7 +159,7 @@ class MessageDAL:
                 JOIN users sender ON sender.user_id = m.sender_id
                 LEFT JOIN resources res ON res.resource_id = mt.resource_id
                 WHERE m.receiver_id = ? AND m.is_hidden = 0
-                ORDER BY datetime(m.timestamp) DESC
+                ORDER BY m.timestamp_epoch DESC, m.message_id DESC
                 LIMIT ?
                 ''',
                 (user_id, limit)
@@ -151,6 +173,7 @@ class MessageDAL:
         """Delete a message"""
         with get_db() as conn:
             cursor = conn.cursor()
+            MessageDAL._bump_versions(cursor, message_id)
             cursor.execute('DELETE FROM messages WHERE message_id = ?', (message_id,))
             
         return cursor.rowcount > 0
@@ -202,7 +225,37 @@ class MessageDAL:
                 ''', (message_id,))
             else:
                 cursor.execute('UPDATE messages SET is_hidden = 0 WHERE message_id = ?', (message_id,))
-        return cursor.rowcount > 0
+            changed = cursor.rowcount > 0
+            if changed:
+                MessageDAL._bump_versions(cursor, message_id)
+        return changed
+
+    @staticmethod
+    def page_flagged_messages(limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+        """Keyset-paginated moderation queue of flagged messages, newest flag first"""
+        return fetch_keyset_page(
+            '''m.*,
+               sender.name AS sender_name,
+               receiver.name AS receiver_name,
+               res.title AS resource_title,
+               mt.resource_id,
+               mt.thread_id''',
+            '''messages m
+               JOIN users sender ON m.sender_id = sender.user_id
+               JOIN users receiver ON m.receiver_id = receiver.user_id
+               JOIN message_threads mt ON m.thread_id = mt.thread_id
+               LEFT JOIN resources res ON mt.resource_id = res.resource_id''',
+            sort_column="COALESCE(m.flagged_at, '')", id_column='m.message_id',
+            wheres=['m.is_flagged = 1'], limit=limit, after=after, before=before, sort='flagged_at'
+        )
+
+    @staticmethod
+    def count_flagged_messages():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) AS total FROM messages WHERE is_flagged = 1')
+            row = cursor.fetchone()
+        return row['total'] if row else 0
 
     @staticmethod
     def get_flagged_messages():
@@ -29,7 +29,7 @@ class NotificationDAL:
                        created_at
                 FROM notifications
                 WHERE user_id = ?
-                ORDER BY datetime(created_at) DESC
+                ORDER BY created_epoch DESC, notification_id DESC
                 LIMIT ?
                 ''',
                 (user_id, limit)
@@ -60,6 +60,25 @@ class NotificationDAL:
         except ValueError:
             return None
 
+    @staticmethod
+    def get_feed_marker(user_id: int) -> tuple:
+        """Newest notification id and last-seen time, read in one indexed lookup."""
+        if not user_id:
+            return (None, None)
+
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT (SELECT MAX(notification_id) FROM notifications WHERE user_id = ?) AS newest_id,
+                       (SELECT last_seen_at FROM user_notification_state WHERE user_id = ?) AS last_seen_at
+                ''',
+                (user_id, user_id)
+            )
+            row = cursor.fetchone()
+
+        return (row['newest_id'], row['last_seen_at'])
+
     @staticmethod
     def update_last_seen(user_id: int, timestamp: datetime):
         """Upsert the last seen timestamp for a user."""
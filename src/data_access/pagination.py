@@ -0,0 +1,121 @@
+"""
+Keyset (seek) pagination helpers shared by the admin listing queries.
+
+Pages are addressed by an opaque cursor holding the ``(sort value, id)`` of a
+boundary row instead of an OFFSET, so fetching page 1,000 costs the same as
+page 1 as long as an index covers ``(sort column, id)``.
+"""
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass, field
+import json
+from typing import Dict, List, Optional, Sequence
+
+from src.data_access import get_db
+
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+
+@dataclass
+class KeysetPage:
+    """One page of rows plus the cursors needed to move forwards or backwards."""
+    items: List[Dict]
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
+    sort: str = ''
+    descending: bool = True
+    filters: Dict[str, object] = field(default_factory=dict)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __bool__(self) -> bool:
+        return bool(self.items)
+
+
+def encode_cursor(sort_value, row_id) -> str:
+    payload = json.dumps([sort_value, row_id], separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(payload).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token: Optional[str]):
+    """Return ``(sort value, id)`` or None for a missing or malformed cursor."""
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, TypeError):
+        return None
+    return sort_value, row_id
+
+
+def clamp_page_size(value, default: int = DEFAULT_PAGE_SIZE) -> int:
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        return default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def fetch_keyset_page(columns: str, from_sql: str, *, sort_column: str, id_column: str,
+                      wheres: Sequence[str] = (), params: Sequence = (), descending: bool = True,
+                      limit: int = DEFAULT_PAGE_SIZE, after: Optional[str] = None,
+                      before: Optional[str] = None, sort: str = '') -> KeysetPage:
+    """
+    Run ``SELECT columns FROM from_sql`` one page at a time.
+
+    ``sort_column`` must be non-null for every row; ``id_column`` breaks ties.
+    Pass ``after`` (a page's ``next_cursor``) to go forward or ``before`` (its
+    ``prev_cursor``) to go back.
+    """
+    clauses = list(wheres)
+    values = list(params)
+    backwards = before is not None and decode_cursor(before) is not None
+    boundary = decode_cursor(before if backwards else after)
+    # Walking backwards flips the scan direction; rows are re-reversed below
+    scan_descending = descending != backwards
+    if boundary is not None:
+        operator = '<' if scan_descending else '>'
+        clauses.append(f'({sort_column}, {id_column}) {operator} (?, ?)')
+        values.extend(boundary)
+
+    order = 'DESC' if scan_descending else 'ASC'
+    query = f'SELECT {columns}, {sort_column} AS _page_sort, {id_column} AS _page_id FROM {from_sql}'
+    if clauses:
+        query += ' WHERE ' + ' AND '.join(clauses)
+    query += f' ORDER BY {sort_column} {order}, {id_column} {order} LIMIT ?'
+    values.append(limit + 1)
+
+    with get_db() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, values)
+        rows = [dict(row) for row in cursor.fetchall()]
+
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if backwards:
+        rows.reverse()
+
+    def cursor_for(row):
+        return encode_cursor(row['_page_sort'], row['_page_id'])
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if backwards:
+            next_cursor = cursor_for(rows[-1])
+            prev_cursor = cursor_for(rows[0]) if has_more else None
+        else:
+            next_cursor = cursor_for(rows[-1]) if has_more else None
+            prev_cursor = cursor_for(rows[0]) if boundary is not None else None
+
+    for row in rows:
+        row.pop('_page_sort', None)
+        row.pop('_page_id', None)
+    return KeysetPage(rows, next_cursor, prev_cursor, sort=sort, descending=descending)
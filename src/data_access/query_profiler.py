@@ -0,0 +1,205 @@
+"""
+Per-request SQL profiling.
+
+While a ``QueryProfile`` is active in the current context, ``get_db_connection``
+opens connections with ``ProfiledConnection``. Its cursors time every
+``execute``/``executemany`` together with the fetches that follow, so a SELECT
+is charged for the rows it actually streams. Statements are grouped by their
+normalized shape (literals and IN-lists folded to ``?``), and those groups
+drive the slow-query list and the N+1 detector. Outside a profile,
+connections are plain ``sqlite3.Connection`` objects with no overhead.
+"""
+from __future__ import annotations
+
+from contextvars import ContextVar
+from functools import lru_cache
+import logging
+import re
+import sqlite3
+import time
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'(?<![\w.])-?\d+(?:\.\d+)?\b')
+_SPACE = re.compile(r'\s+')
+
+_active: ContextVar[Optional['QueryProfile']] = ContextVar('query_profile', default=None)
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """Collapse whitespace and fold literals so repeated statements share one shape."""
+    shape = _STRING.sub('?', sql)
+    shape = _NUMBER.sub('?', shape)
+    shape = _IN_LIST.sub('IN (?)', shape)
+    return _SPACE.sub(' ', shape).strip()
+
+
+class QueryProfile:
+    """Timings for every statement issued while the profile is active."""
+
+    def __init__(self) -> None:
+        self.started = time.perf_counter()
+        self.connections = 0
+        # One [shape, seconds] pair per execution; fetches add to the last one
+        self.statements: List[list] = []
+
+    def record(self, sql: str, seconds: float) -> list:
+        entry = [normalize_sql(sql), seconds]
+        self.statements.append(entry)
+        return entry
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def db_seconds(self) -> float:
+        return sum(entry[1] for entry in self.statements)
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return time.perf_counter() - self.started
+
+    def slowest(self, limit: int = 5, threshold_ms: float = 0.0) -> List[Dict]:
+        ranked = sorted(self.statements, key=lambda entry: entry[1], reverse=True)
+        return [
+            {'sql': shape, 'ms': round(seconds * 1000.0, 3)}
+            for shape, seconds in ranked[:limit]
+            if seconds * 1000.0 >= threshold_ms
+        ]
+
+    def repeated(self, threshold: int) -> List[Dict]:
+        """Statement shapes run at least ``threshold`` times (likely N+1 loops)."""
+        groups: Dict[str, list] = {}
+        for shape, seconds in self.statements:
+            group = groups.setdefault(shape, [0, 0.0])
+            group[0] += 1
+            group[1] += seconds
+        return [
+            {'sql': shape, 'count': count, 'ms': round(seconds * 1000.0, 3)}
+            for shape, (count, seconds) in sorted(groups.items(), key=lambda item: -item[1][0])
+            if count >= threshold
+        ]
+
+    def summary(self, *, slow_ms: float, n_plus_one: int, top: int = 5) -> Dict:
+        return {
+            'queries': self.query_count,
+            'connections': self.connections,
+            'db_ms': round(self.db_seconds * 1000.0, 3),
+            'total_ms': round(self.elapsed_seconds * 1000.0, 3),
+            'slow_queries': self.slowest(top, threshold_ms=slow_ms),
+            'n_plus_one': self.repeated(n_plus_one),
+        }
+
+
+class ProfiledCursor(sqlite3.Cursor):
+    """Cursor that charges execute and fetch time to the active profile."""
+
+    _entry: Optional[list] = None
+
+    def execute(self, sql, parameters=()):
+        started = time.perf_counter()
+        try:
+            return super().execute(sql, parameters)
+        finally:
+            self._record(sql, started)
+
+    def executemany(self, sql, seq_of_parameters):
+        started = time.perf_counter()
+        try:
+            return super().executemany(sql, seq_of_parameters)
+        finally:
+            self._record(sql, started)
+
+    def fetchone(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchone()
+        finally:
+            self._charge(started)
+
+    def fetchmany(self, size=None):
+        started = time.perf_counter()
+        try:
+            return super().fetchmany(self.arraysize if size is None else size)
+        finally:
+            self._charge(started)
+
+    def fetchall(self):
+        started = time.perf_counter()
+        try:
+            return super().fetchall()
+        finally:
+            self._charge(started)
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            return super().__next__()
+        finally:
+            self._charge(started)
+
+    def _record(self, sql: str, started: float) -> None:
+        profile = _active.get()
+        if profile is not None:
+            self._entry = profile.record(sql, time.perf_counter() - started)
+
+    def _charge(self, started: float) -> None:
+        if self._entry is not None:
+            self._entry[1] += time.perf_counter() - started
+
+
+class ProfiledConnection(sqlite3.Connection):
+    """Connection whose shortcut ``execute`` methods go through ``ProfiledCursor``."""
+
+    def cursor(self, factory=ProfiledCursor):
+        return super().cursor(factory)
+
+    def execute(self, sql, parameters=()):
+        return self.cursor().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        return self.cursor().executemany(sql, seq_of_parameters)
+
+
+def start_profile() -> QueryProfile:
+    """Begin profiling the current context (one request), replacing any previous profile."""
+    profile = QueryProfile()
+    _active.set(profile)
+    return profile
+
+
+def stop_profile() -> Optional[QueryProfile]:
+    profile = _active.get()
+    _active.set(None)
+    return profile
+
+
+def current_profile() -> Optional[QueryProfile]:
+    return _active.get()
+
+
+def connection_factory():
+    """``sqlite3.connect`` factory for new connections in the current context."""
+    profile = _active.get()
+    if profile is None:
+        return sqlite3.Connection
+    profile.connections += 1
+    return ProfiledConnection
+
+
+def server_timing(summary: Dict) -> str:
+    """``Server-Timing`` header value for a profile summary."""
+    metrics = [
+        f'db;dur={summary["db_ms"]:.2f};desc="{summary["queries"]} queries"',
+        f'app;dur={summary["total_ms"]:.2f}',
+    ]
+    if summary['slow_queries']:
+        metrics.append(f'db-slowest;dur={summary["slow_queries"][0]["ms"]:.2f}')
+    if summary['n_plus_one']:
+        metrics.append(f'db-repeated;desc="{summary["n_plus_one"][0]["count"]}x same statement"')
+    return ', '.join(metrics)
@@ -4,7 +4,26 @@ Handles all database operations for resources
 """
 from datetime import datetime, timedelta, timezone
 from src.data_access import get_db
+from src.data_access.concierge_cache_dal import ConciergeCacheDAL
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
+from src.data_access.result_set import LazyResultSet
 from src.models.models import Resource
+from src.utils.datetime_helpers import to_epoch
+
+RESOURCE_SORTS = {'created_at': 'r.created_at', 'title': 'r.title'}
+
+
+def _invalidate_concierge_answers(resource_id):
+    """Cached concierge answers that cited this resource are now stale (local LRU and shared tier)"""
+    from src.services.concierge_cache import get_response_cache
+
+    cache = get_response_cache()
+    if cache is not None:
+        cache.invalidate_resource(resource_id)
+    else:
+        ConciergeCacheDAL.invalidate_resource(resource_id)
+
 
 class ResourceDAL:
     """Data access layer for resource operations"""
@@ -32,6 +51,7 @@ class ResourceDAL:
                   booking_increment_minutes, buffer_minutes, advance_booking_days,
                   min_lead_time_hours))
             resource_id = cursor.lastrowid
+            EntityVersionDAL.bump('resources', cursor)
 
         return ResourceDAL.get_resource_by_id(resource_id)
     
@@ -44,8 +64,20 @@ class ResourceDAL:
             row = cursor.fetchone()
             
         if row:
-            return Resource(**dict(row))
+            return Resource.from_row(row)
         return None
+
+    @staticmethod
+    def get_resources_by_ids(resource_ids):
+        """Map ``resource_id -> Resource`` for the given ids in one query; missing ids are left out."""
+        ids = sorted({resource_id for resource_id in resource_ids if resource_id})
+        if not ids:
+            return {}
+        with get_db() as conn:
+            rows = conn.execute(
+                f'SELECT * FROM resources WHERE resource_id IN ({",".join("?" for _ in ids)})', ids
+            ).fetchall()
+        return {resource.resource_id: resource for resource in Resource.from_rows(rows)}
     
     @staticmethod
     def get_all_resources(status='published', limit=None, offset=0):
@@ -63,18 +95,9 @@ class ResourceDAL:
             query += ' WHERE status = ?'
             params.append(status)
 
-        query += ' ORDER BY created_at DESC'
+        query += ' ORDER BY created_at DESC, resource_id DESC'
 
-        if limit:
-            query += ' LIMIT ? OFFSET ?'
-            params.extend([limit, offset])
-        
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute(query, params)
-            rows = cursor.fetchall()
-            
-        return [Resource(**dict(row)) for row in rows]
+        return LazyResultSet(Resource, query, params, limit=limit or None, offset=offset)
     
     @staticmethod
     def search_resources(keyword=None, category=None, location=None, status='published',
@@ -120,18 +143,16 @@ class ResourceDAL:
             params.append(min_capacity)
 
         if available_start and available_end:
+            start_epoch, end_epoch = to_epoch(available_start), to_epoch(available_end)
+            if start_epoch is None or end_epoch is None:
+                raise ValueError('Availability window must be valid datetimes.')
             wheres.append('r.resource_id NOT IN ('
                           'SELECT resource_id FROM bookings '
                           'WHERE status IN ("pending", "approved") '
-                          'AND ((start_datetime < ? AND end_datetime > ?) '
-                               'OR (start_datetime < ? AND end_datetime > ?) '
-                               'OR (start_datetime >= ? AND end_datetime <= ?))'
+                          'AND start_epoch < ? '
+                          'AND end_epoch > ?'
                           ')')
-            params.extend([
-                available_end, available_start,
-                available_end, available_start,
-                available_start, available_end
-            ])
+            params.extend([end_epoch, start_epoch])
 
         # Handle sort options that require joins
         needs_booking_join = sort == 'most_booked'
@@ -201,21 +222,9 @@ class ResourceDAL:
                 count_row = cursor.fetchone()
                 total_count = count_row['total'] if count_row else 0
             
-        # Filter out extra fields (booking_count, avg_rating, review_count) before creating Resource objects
-        resource_fields = {
-            'resource_id', 'owner_id', 'title', 'description', 'category', 'location',
-            'capacity', 'images', 'equipment', 'availability_rules', 'is_restricted',
-            'status', 'created_at', 'availability_schedule', 'min_booking_minutes',
-            'max_booking_minutes', 'booking_increment_minutes', 'buffer_minutes',
-            'advance_booking_days', 'min_lead_time_hours'
-        }
-        resources = []
-        for row in rows:
-            row_dict = dict(row)
-            # Remove extra fields that aren't part of Resource model
-            resource_dict = {k: v for k, v in row_dict.items() if k in resource_fields}
-            resources.append(Resource(**resource_dict))
-        
+        # The row mapper skips aggregate columns (booking_count, avg_rating, review_count)
+        resources = Resource.from_rows(rows)
+
         if include_total:
             return resources, total_count
         return resources
@@ -223,16 +232,11 @@ class ResourceDAL:
     @staticmethod
     def get_resources_by_owner(owner_id):
         """Get all resources owned by a user"""
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute('''
-                SELECT * FROM resources 
-                WHERE owner_id = ? 
-                ORDER BY created_at DESC
-            ''', (owner_id,))
-            rows = cursor.fetchall()
-            
-        return [Resource(**dict(row)) for row in rows]
+        return LazyResultSet(
+            Resource,
+            'SELECT * FROM resources WHERE owner_id = ? ORDER BY created_at DESC, resource_id DESC',
+            (owner_id,)
+        )
 
     @staticmethod
     def get_recently_published_by_owner(owner_id, days=30, limit=3):
@@ -240,8 +244,7 @@ class ResourceDAL:
         if not owner_id:
             return []
 
-        cutoff = datetime.now(timezone.utc) - timedelta(days=days)
-        cutoff_str = cutoff.replace(tzinfo=None).strftime('%Y-%m-%d %H:%M:%S')
+        cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
 
         with get_db() as conn:
             cursor = conn.cursor()
@@ -251,15 +254,15 @@ class ResourceDAL:
                 FROM resources
                 WHERE owner_id = ?
                   AND status = 'published'
-                  AND datetime(created_at) >= datetime(?)
-                ORDER BY datetime(created_at) DESC
+                  AND created_epoch >= ?
+                ORDER BY created_epoch DESC, resource_id DESC
                 LIMIT ?
                 ''',
-                (owner_id, cutoff_str, limit)
+                (owner_id, cutoff, limit)
             )
             rows = cursor.fetchall()
 
-        return [Resource(**dict(row)) for row in rows]
+        return Resource.from_rows(rows)
     
     @staticmethod
     def update_resource(resource_id, **kwargs):
@@ -281,8 +284,13 @@ class ResourceDAL:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute(f'UPDATE resources SET {set_clause} WHERE resource_id = ?', values)
+            updated = cursor.rowcount > 0
+            if updated:
+                EntityVersionDAL.bump('resources', cursor)
 
-        return cursor.rowcount > 0
+        if updated:
+            _invalidate_concierge_answers(resource_id)
+        return updated
     
     @staticmethod
     def delete_resource(resource_id):
@@ -290,8 +298,13 @@ class ResourceDAL:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM resources WHERE resource_id = ?', (resource_id,))
-            
-        return cursor.rowcount > 0
+            deleted = cursor.rowcount > 0
+            if deleted:
+                EntityVersionDAL.bump('resources', cursor)
+
+        if deleted:
+            _invalidate_concierge_answers(resource_id)
+        return deleted
     
     @staticmethod
     def get_resource_with_avg_rating(resource_id):
@@ -310,11 +323,8 @@ class ResourceDAL:
             row = cursor.fetchone()
             
         if row:
-            resource_dict = dict(row)
-            avg_rating = resource_dict.pop('avg_rating', 0)
-            review_count = resource_dict.pop('review_count', 0)
-            resource = Resource(**resource_dict)
-            return resource, round(avg_rating, 1), review_count
+            resource = Resource.from_row(row)
+            return resource, round(row['avg_rating'] or 0, 1), row['review_count']
         return None, 0, 0
 
     @staticmethod
@@ -336,6 +346,29 @@ class ResourceDAL:
             rows = cursor.fetchall()
         return [dict(row) for row in rows]
 
+    @staticmethod
+    def page_resources(status=None, search=None, category=None, sort='created_at', descending=True,
+                       limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+        """Keyset-paginated resource listing (with owner details) for the admin console"""
+        wheres, params = [], []
+        if status:
+            wheres.append('r.status = ?')
+            params.append(status)
+        if category:
+            wheres.append('r.category = ?')
+            params.append(category)
+        if search:
+            wheres.append('(LOWER(r.title) LIKE ? OR LOWER(r.location) LIKE ?)')
+            term = f'%{search.strip().lower()}%'
+            params.extend([term, term])
+        sort = sort if sort in RESOURCE_SORTS else 'created_at'
+        return fetch_keyset_page(
+            'r.*, o.name AS owner_name, o.email AS owner_email',
+            'resources r LEFT JOIN users o ON r.owner_id = o.user_id',
+            sort_column=RESOURCE_SORTS[sort], id_column='r.resource_id', wheres=wheres, params=params,
+            descending=descending, limit=limit, after=after, before=before, sort=sort
+        )
+
     @staticmethod
     def count_resources(status=None):
         """Return total number of resources with optional status filtering."""
@@ -368,4 +401,39 @@ class ResourceDAL:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM resources WHERE title = ?', (title,))
             row = cursor.fetchone()
-        return Resource(**dict(row)) if row else None
+        return Resource.from_row(row) if row else None
+
+    @staticmethod
+    def remove_image(image_name):
+        """Drop ``image_name`` from every resource's image list; returns the ids that listed it"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            rows = cursor.execute(
+                "SELECT resource_id, images FROM resources WHERE ',' || REPLACE(COALESCE(images, ''), ' ', '') || ',' LIKE ?",
+                (f'%,{image_name},%',)
+            ).fetchall()
+            for row in rows:
+                remaining = [image.strip() for image in row['images'].split(',') if image.strip() not in ('', image_name)]
+                cursor.execute(
+                    'UPDATE resources SET images = ? WHERE resource_id = ?',
+                    (','.join(remaining) or None, row['resource_id'])
+                )
+            if rows:
+                EntityVersionDAL.bump('resources', cursor)
+        return [row['resource_id'] for row in rows]
+
+    @staticmethod
+    def image_in_use(image_name, exclude_resource_id=None):
+        """True when another resource lists ``image_name`` (uploads are deduplicated by content)"""
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                '''
+                SELECT 1 FROM resources
+                WHERE resource_id != ?
+                  AND ',' || REPLACE(COALESCE(images, ''), ' ', '') || ',' LIKE ?
+                LIMIT 1
+                ''',
+                (exclude_resource_id or 0, f'%,{image_name},%')
+            )
+            return cursor.fetchone() is not None
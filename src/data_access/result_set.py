@@ -0,0 +1,126 @@
+"""
+Lazy, sequence-like result sets for DAL list queries.
+
+A ``LazyResultSet`` holds a SELECT rather than its rows. ``len()`` runs a
+COUNT, slicing adds LIMIT/OFFSET, and iteration reads one LIMIT/OFFSET window
+of ``batch_size`` rows at a time, each on its own short-lived connection, so
+only one batch of rows is in memory and no read cursor (with its shared
+lock) stays open while the loop body runs. Loop bodies may therefore write
+to the database, and an abandoned loop holds no connection; a body that
+adds or removes rows matching the query shifts the later windows, so take a
+``list()`` first in that case. The query's ORDER BY must end in a unique
+column, or rows that tie could land in two windows or in none. A completed iteration of up to
+``RESULT_CACHE_ROWS`` models is kept, so templates that loop over the same
+list several times query once.
+"""
+from __future__ import annotations
+
+from typing import Iterator, List, Optional, Sequence
+
+from src.data_access import get_db
+
+
+RESULT_BATCH_SIZE = 200
+RESULT_CACHE_ROWS = 1000
+
+
+class LazyResultSet:
+    """Read-only sequence of models backed by an un-LIMITed ``SELECT``."""
+
+    def __init__(self, model, query: str, params: Sequence = (), *, limit: Optional[int] = None,
+                 offset: int = 0, batch_size: int = RESULT_BATCH_SIZE):
+        self.model = model
+        self.query = query
+        self.params = tuple(params)
+        self.limit = limit
+        self.offset = max(offset or 0, 0)
+        self.batch_size = max(1, batch_size)
+        self._rows: Optional[List] = None
+        self._count: Optional[int] = None
+
+    def _sql(self):
+        if self.limit is None and not self.offset:
+            return self.query, self.params
+        limit = -1 if self.limit is None else self.limit
+        return f'{self.query} LIMIT ? OFFSET ?', self.params + (limit, self.offset)
+
+    def __len__(self) -> int:
+        if self._rows is not None:
+            return len(self._rows)
+        if self._count is None:
+            query, params = self._sql()
+            with get_db() as conn:
+                row = conn.execute(f'SELECT COUNT(*) FROM ({query})', params).fetchone()
+            self._count = row[0]
+        return self._count
+
+    def __bool__(self) -> bool:
+        if self._rows is not None:
+            return bool(self._rows)
+        if self._count is not None:
+            return self._count > 0
+        return bool(self._window(0, 1))
+
+    def __iter__(self) -> Iterator:
+        if self._rows is not None:
+            return iter(self._rows)
+        return self._stream()
+
+    def _stream(self) -> Iterator:
+        kept: Optional[List] = []
+        position = 0
+        while self.limit is None or position < self.limit:
+            size = self.batch_size if self.limit is None else min(self.batch_size, self.limit - position)
+            with get_db() as conn:
+                rows = conn.execute(
+                    f'{self.query} LIMIT ? OFFSET ?', self.params + (size, self.offset + position)
+                ).fetchall()
+            batch = self.model.from_rows(rows)
+            if kept is not None:
+                kept.extend(batch)
+                if len(kept) > RESULT_CACHE_ROWS:
+                    kept = None
+            yield from batch
+            position += len(rows)
+            if len(rows) < size:
+                break
+        if kept is not None:
+            self._rows = kept
+
+    def _window(self, start: int, stop: Optional[int]) -> List:
+        """Fetch rows ``[start:stop]`` of this result with LIMIT/OFFSET."""
+        if self.limit is not None:
+            stop = self.limit if stop is None else min(stop, self.limit)
+        if stop is not None and stop <= start:
+            return []
+        window = LazyResultSet(
+            self.model, self.query, self.params,
+            limit=None if stop is None else stop - start,
+            offset=self.offset + start, batch_size=self.batch_size
+        )
+        return list(window)
+
+    def __getitem__(self, key):
+        if self._rows is not None:
+            return self._rows[key]
+        if isinstance(key, slice):
+            start, stop, step = key.start or 0, key.stop, key.step
+            if start < 0 or (stop is not None and stop < 0) or step not in (None, 1):
+                return list(self)[key]
+            return self._window(start, stop)
+        index = key + len(self) if key < 0 else key
+        items = self._window(index, index + 1) if index >= 0 else []
+        if not items:
+            raise IndexError('result set index out of range')
+        return items[0]
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, (LazyResultSet, list, tuple)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        state = f'{len(self._rows)} rows' if self._rows is not None else 'unevaluated'
+        return f'<LazyResultSet {self.model.__name__} ({state})>'
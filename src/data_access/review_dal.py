@@ -3,8 +3,16 @@ Review Data Access Layer
 Handles all database operations for reviews
 """
 from src.data_access import get_db
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
 from src.models.models import Review
 
+REVIEW_SORTS = {'timestamp': 'rv.timestamp', 'rating': 'rv.rating'}
+_REVIEW_COLUMNS = 'rv.*, res.title AS resource_title, u.name AS reviewer_name'
+_REVIEW_FROM = '''reviews rv
+    JOIN resources res ON rv.resource_id = res.resource_id
+    JOIN users u ON rv.reviewer_id = u.user_id'''
+
 class ReviewDAL:
     """Data access layer for review operations"""
     
@@ -18,6 +26,7 @@ class ReviewDAL:
                 VALUES (?, ?, ?, ?)
             ''', (resource_id, reviewer_id, rating, comment))
             review_id = cursor.lastrowid
+            EntityVersionDAL.bump('reviews', cursor)
             
         return ReviewDAL.get_review_by_id(review_id)
     
@@ -30,7 +39,7 @@ class ReviewDAL:
             row = cursor.fetchone()
             
         if row:
-            return Review(**dict(row))
+            return Review.from_row(row)
         return None
     
     @staticmethod
@@ -61,7 +70,7 @@ class ReviewDAL:
             ''', (reviewer_id,))
             rows = cursor.fetchall()
             
-        return [Review(**dict(row)) for row in rows]
+        return Review.from_rows(rows)
     
     @staticmethod
     def user_has_reviewed(resource_id, reviewer_id):
@@ -83,8 +92,11 @@ class ReviewDAL:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute('DELETE FROM reviews WHERE review_id = ?', (review_id,))
+            deleted = cursor.rowcount > 0
+            if deleted:
+                EntityVersionDAL.bump('reviews', cursor)
             
-        return cursor.rowcount > 0
+        return deleted
     
     @staticmethod
     def get_resource_rating_stats(resource_id):
@@ -107,6 +119,45 @@ class ReviewDAL:
         
         return dict(row) if row else None
 
+    @staticmethod
+    def page_reviews(status=None, search=None, sort='timestamp', descending=True,
+                     limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+        """Keyset-paginated reviews with reviewer and resource context"""
+        wheres, params = [], []
+        if status == 'flagged':
+            wheres.append('rv.is_flagged = 1')
+        elif status == 'hidden':
+            wheres.append('rv.is_hidden = 1')
+        elif status == 'visible':
+            wheres.append('rv.is_hidden = 0')
+        if search:
+            wheres.append('(LOWER(res.title) LIKE ? OR LOWER(u.name) LIKE ? OR LOWER(rv.comment) LIKE ?)')
+            term = f'%{search.strip().lower()}%'
+            params.extend([term, term, term])
+        sort = sort if sort in REVIEW_SORTS else 'timestamp'
+        return fetch_keyset_page(
+            _REVIEW_COLUMNS, _REVIEW_FROM,
+            sort_column=REVIEW_SORTS[sort], id_column='rv.review_id', wheres=wheres, params=params,
+            descending=descending, limit=limit, after=after, before=before, sort=sort
+        )
+
+    @staticmethod
+    def page_flagged_reviews(limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+        """Keyset-paginated moderation queue of flagged reviews, newest flag first"""
+        return fetch_keyset_page(
+            _REVIEW_COLUMNS, _REVIEW_FROM,
+            sort_column="COALESCE(rv.flagged_at, '')", id_column='rv.review_id',
+            wheres=['rv.is_flagged = 1'], limit=limit, after=after, before=before, sort='flagged_at'
+        )
+
+    @staticmethod
+    def count_flagged_reviews():
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT COUNT(*) AS total FROM reviews WHERE is_flagged = 1')
+            row = cursor.fetchone()
+        return row['total'] if row else 0
+
     @staticmethod
     def get_all_reviews(limit=None, offset=0):
         """Fetch all reviews with reviewer and resource context"""
@@ -144,7 +195,10 @@ class ReviewDAL:
                     flagged_at = CURRENT_TIMESTAMP
                 WHERE review_id = ?
             ''', (reason, flagged_by, review_id))
-        return cursor.rowcount > 0
+            flagged = cursor.rowcount > 0
+            if flagged:
+                EntityVersionDAL.bump('reviews', cursor)
+        return flagged
 
     @staticmethod
     def clear_review_flag(review_id):
@@ -159,7 +213,10 @@ class ReviewDAL:
                     flagged_at = NULL
                 WHERE review_id = ?
             ''', (review_id,))
-        return cursor.rowcount > 0
+            cleared = cursor.rowcount > 0
+            if cleared:
+                EntityVersionDAL.bump('reviews', cursor)
+        return cleared
 
     @staticmethod
     def set_review_hidden(review_id, hidden=True):
@@ -178,7 +235,10 @@ class ReviewDAL:
                 ''', (review_id,))
             else:
                 cursor.execute('UPDATE reviews SET is_hidden = 0 WHERE review_id = ?', (review_id,))
-        return cursor.rowcount > 0
+            changed = cursor.rowcount > 0
+            if changed:
+                EntityVersionDAL.bump('reviews', cursor)
+        return changed
 
     @staticmethod
     def get_flagged_reviews():
@@ -2,18 +2,34 @@
 User Data Access Layer
 Handles all database operations for users
 """
-import bcrypt
 from sqlite3 import OperationalError
 from src.data_access import get_db
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.message_dal import MessageDAL
+from src.data_access.pagination import DEFAULT_PAGE_SIZE, fetch_keyset_page
+from src.data_access.result_set import LazyResultSet
 from src.models.models import User
+from src.utils.passwords import get_password_executor
+
+USER_SORTS = {'created_at': 'created_at', 'name': 'name', 'email': 'email'}
 
 class UserDAL:
     """Data access layer for user operations"""
+
+    @staticmethod
+    def version_key(user_id):
+        """entity_versions key bumped by every write to one user row"""
+        return f'user:{int(user_id)}'
+
+    @staticmethod
+    def _bump_version(cursor, user_id):
+        if cursor.rowcount:
+            EntityVersionDAL.bump(UserDAL.version_key(user_id), cursor)
     
     @staticmethod
     def create_user(name, email, password, role='student', department=None, email_verified=True):
         """Create a new user with hashed password"""
-        password_hash = bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+        password_hash = get_password_executor().hash(password)
         
         with get_db() as conn:
             cursor = conn.cursor()
@@ -34,9 +50,23 @@ class UserDAL:
             row = cursor.fetchone()
             
         if row:
-            return User(**dict(row))
+            return User.from_row(row)
         return None
     
+    @staticmethod
+    def get_users_by_ids(user_ids, cursor=None):
+        """Map ``user_id -> User`` for the given ids in one query; missing ids are left out."""
+        ids = sorted({user_id for user_id in user_ids if user_id})
+        if not ids:
+            return {}
+        query = f'SELECT * FROM users WHERE user_id IN ({",".join("?" for _ in ids)})'
+        if cursor is not None:
+            rows = cursor.execute(query, ids).fetchall()
+        else:
+            with get_db() as conn:
+                rows = conn.execute(query, ids).fetchall()
+        return {user.user_id: user for user in User.from_rows(rows)}
+
     @staticmethod
     def get_user_by_email(email):
         """Get user by email"""
@@ -46,16 +76,34 @@ class UserDAL:
             row = cursor.fetchone()
             
         if row:
-            return User(**dict(row))
+            return User.from_row(row)
         return None
     
     @staticmethod
     def verify_password(email, password):
-        """Verify user password and return user if valid"""
+        """Verify user password and return user if valid.
+
+        Hashes stored at a different work factor than ``BCRYPT_ROUNDS`` are
+        upgraded transparently while the plaintext is at hand.
+        """
         user = UserDAL.get_user_by_email(email)
-        if user and bcrypt.checkpw(password.encode('utf-8'), user.password_hash.encode('utf-8')):
-            return user
-        return None
+        if not user:
+            return None
+        hasher = get_password_executor()
+        if not hasher.check(password, user.password_hash):
+            return None
+        if hasher.needs_rehash(user.password_hash):
+            password_hash = hasher.hash(password)
+            with get_db() as conn:
+                cursor = conn.cursor()
+                # Only replace the hash we verified, in case it changed meanwhile
+                cursor.execute(
+                    'UPDATE users SET password_hash = ? WHERE user_id = ? AND password_hash = ?',
+                    (password_hash, user.user_id, user.password_hash)
+                )
+                UserDAL._bump_version(cursor, user.user_id)
+            user.password_hash = password_hash
+        return user
     
     @staticmethod
     def update_user(user_id, **kwargs):
@@ -72,19 +120,39 @@ class UserDAL:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute(f'UPDATE users SET {set_clause} WHERE user_id = ?', values)
+            updated = cursor.rowcount > 0
+            UserDAL._bump_version(cursor, user_id)
             
-        return cursor.rowcount > 0
+        return updated
     
     @staticmethod
-    def get_all_users():
-        """Get all users"""
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute('SELECT * FROM users ORDER BY created_at DESC')
-            rows = cursor.fetchall()
-            
-        return [User(**dict(row)) for row in rows]
+    def get_all_users(limit=None):
+        """Get all users, newest first"""
+        return LazyResultSet(User, 'SELECT * FROM users ORDER BY created_at DESC, user_id DESC', limit=limit or None)
     
+    @staticmethod
+    def page_users(search=None, role=None, status=None, sort='created_at', descending=True,
+                   limit=DEFAULT_PAGE_SIZE, after=None, before=None):
+        """Keyset-paginated user listing for the admin console"""
+        wheres, params = [], []
+        if search:
+            wheres.append('(LOWER(name) LIKE ? OR LOWER(email) LIKE ?)')
+            term = f'%{search.strip().lower()}%'
+            params.extend([term, term])
+        if role:
+            wheres.append('role = ?')
+            params.append(role)
+        if status in ('active', 'suspended'):
+            wheres.append('is_suspended = ?')
+            params.append(1 if status == 'suspended' else 0)
+        sort = sort if sort in USER_SORTS else 'created_at'
+        return fetch_keyset_page(
+            'user_id, name, email, role, department, is_suspended, email_verified, created_at',
+            'users',
+            sort_column=USER_SORTS[sort], id_column='user_id', wheres=wheres, params=params,
+            descending=descending, limit=limit, after=after, before=before, sort=sort
+        )
+
     @staticmethod
     def delete_user(user_id):
         """Delete a user and all related data (cascading delete)"""
@@ -137,6 +205,8 @@ class UserDAL:
             # 6. Delete bookings where user is requester
             try:
                 cursor.execute('DELETE FROM bookings WHERE requester_id = ?', (user_id,))
+                if cursor.rowcount:
+                    EntityVersionDAL.bump('bookings', cursor)
             except OperationalError:
                 pass
             
@@ -146,6 +216,8 @@ class UserDAL:
                     DELETE FROM bookings 
                     WHERE resource_id IN (SELECT resource_id FROM resources WHERE owner_id = ?)
                 ''', (user_id,))
+                if cursor.rowcount:
+                    EntityVersionDAL.bump('bookings', cursor)
             except OperationalError:
                 pass
             
@@ -164,17 +236,27 @@ class UserDAL:
                     DELETE FROM reviews 
                     WHERE resource_id IN (SELECT resource_id FROM resources WHERE owner_id = ?)
                 ''', (user_id,))
+                if cursor.rowcount:
+                    EntityVersionDAL.bump('reviews', cursor)
             except OperationalError:
                 pass
             
             # 10. Delete reviews where user is reviewer (for resources not owned by user)
             try:
                 cursor.execute('DELETE FROM reviews WHERE reviewer_id = ?', (user_id,))
+                if cursor.rowcount:
+                    EntityVersionDAL.bump('reviews', cursor)
             except OperationalError:
                 pass
             
             # 11. Delete messages (references threads, but threads will be deleted)
             try:
+                cursor.execute('''
+                    SELECT DISTINCT thread_id, receiver_id FROM messages WHERE sender_id = ? OR receiver_id = ?
+                ''', (user_id, user_id))
+                for row in cursor.fetchall():
+                    EntityVersionDAL.bump(MessageDAL.thread_version_key(row['thread_id']), cursor)
+                    EntityVersionDAL.bump(MessageDAL.inbox_version_key(row['receiver_id']), cursor)
                 cursor.execute('DELETE FROM messages WHERE sender_id = ? OR receiver_id = ?', (user_id, user_id))
             except OperationalError:
                 pass
@@ -188,13 +270,17 @@ class UserDAL:
             # 13. Delete resources owned by user (now safe since all dependent records are deleted)
             try:
                 cursor.execute('DELETE FROM resources WHERE owner_id = ?', (user_id,))
+                if cursor.rowcount:
+                    EntityVersionDAL.bump('resources', cursor)
             except OperationalError:
                 pass
             
             # 14. Finally, delete the user
             cursor.execute('DELETE FROM users WHERE user_id = ?', (user_id,))
+            deleted = cursor.rowcount > 0
+            UserDAL._bump_version(cursor, user_id)
             
-        return cursor.rowcount > 0
+        return deleted
 
     @staticmethod
     def set_suspension(user_id, is_suspended):
@@ -203,7 +289,9 @@ class UserDAL:
         with get_db() as conn:
             cursor = conn.cursor()
             cursor.execute('UPDATE users SET is_suspended = ? WHERE user_id = ?', (value, user_id))
-        return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            UserDAL._bump_version(cursor, user_id)
+        return updated
 
     @staticmethod
     def mark_email_verified(user_id):
@@ -220,7 +308,9 @@ class UserDAL:
                 ''',
                 (user_id,)
             )
-        return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            UserDAL._bump_version(cursor, user_id)
+        return updated
 
     @staticmethod
     def count_users(role=None):
@@ -254,10 +344,10 @@ class UserDAL:
             cursor = conn.cursor()
             cursor.execute(
                 '''
-                SELECT strftime('%Y-%m', created_at) AS month,
+                SELECT strftime('%Y-%m', created_epoch, 'unixepoch') AS month,
                        COUNT(*) AS total
                 FROM users
-                WHERE created_at >= date('now', 'start of month', ?)
+                WHERE created_epoch >= CAST(strftime('%s', 'now', 'start of month', ?) AS INTEGER)
                 GROUP BY month
                 ORDER BY month ASC
                 ''',
@@ -275,7 +365,9 @@ class UserDAL:
                 'UPDATE users SET verification_token = ?, verification_token_expiry = ? WHERE user_id = ?',
                 (token, expiry, user_id)
             )
-        return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            UserDAL._bump_version(cursor, user_id)
+        return updated
 
     @staticmethod
     def verify_email_by_token(token):
@@ -311,8 +403,9 @@ class UserDAL:
                     ''',
                     (user_id,)
                 )
+                UserDAL._bump_version(cursor, user_id)
                 conn.commit()
-                return User(**dict(row))
+                return User.from_row(row)
 
         return None
 
@@ -328,7 +421,7 @@ class UserDAL:
             row = cursor.fetchone()
 
         if row:
-            return User(**dict(row))
+            return User.from_row(row)
         return None
 
     @staticmethod
@@ -345,4 +438,6 @@ class UserDAL:
                 ''',
                 (token, expiry, user_id)
             )
-        return cursor.rowcount > 0
+            updated = cursor.rowcount > 0
+            UserDAL._bump_version(cursor, user_id)
+        return updated
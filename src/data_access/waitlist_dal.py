@@ -33,7 +33,7 @@ class WaitlistDAL:
             )
             entry_id = cursor.lastrowid
             row = cursor.execute('SELECT * FROM waitlist_entries WHERE entry_id = ?', (entry_id,)).fetchone()
-        return WaitlistEntry(**dict(row)) if row else None
+        return WaitlistEntry.from_row(row) if row else None
 
     @staticmethod
     def get_entry(entry_id):
@@ -41,7 +41,7 @@ class WaitlistDAL:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM waitlist_entries WHERE entry_id = ?', (entry_id,))
             row = cursor.fetchone()
-        return WaitlistEntry(**dict(row)) if row else None
+        return WaitlistEntry.from_row(row) if row else None
 
     @staticmethod
     def get_entries_for_resource(resource_id, statuses=None):
@@ -57,7 +57,27 @@ class WaitlistDAL:
             cursor = conn.cursor()
             cursor.execute(query, params)
             rows = cursor.fetchall()
-        return [WaitlistEntry(**dict(row)) for row in rows]
+        return WaitlistEntry.from_rows(rows)
+
+    @staticmethod
+    def get_active_overlapping(resource_id, start_epoch=None, end_epoch=None, cursor=None):
+        """
+        Active entries for a resource whose slot overlaps ``[start_epoch, end_epoch)``,
+        oldest first. Served by the partial interval index on active entries;
+        without bounds the whole active queue is returned.
+        """
+        query = "SELECT * FROM waitlist_entries WHERE resource_id = ? AND status = 'active'"
+        params = [resource_id]
+        if start_epoch is not None and end_epoch is not None:
+            query += ' AND start_epoch < ? AND end_epoch > ?'
+            params.extend([end_epoch, start_epoch])
+        query += ' ORDER BY created_at ASC, entry_id ASC'
+        if cursor is not None:
+            rows = cursor.execute(query, params).fetchall()
+        else:
+            with get_db() as conn:
+                rows = conn.execute(query, params).fetchall()
+        return WaitlistEntry.from_rows(rows)
 
     @staticmethod
     def get_entries_by_requester(requester_id, statuses=None):
@@ -73,7 +93,7 @@ class WaitlistDAL:
             cursor = conn.cursor()
             cursor.execute(query, params)
             rows = cursor.fetchall()
-        return [WaitlistEntry(**dict(row)) for row in rows]
+        return WaitlistEntry.from_rows(rows)
 
     @staticmethod
     def has_active_entry(resource_id, requester_id, start_datetime, end_datetime):
@@ -98,34 +118,38 @@ class WaitlistDAL:
         return bool(row and row['total'])
 
     @staticmethod
-    def mark_promoted(entry_id, booking_id):
-        """Update an entry once it has been converted into a booking."""
+    def _execute(cursor, statement, params):
+        """Run a write on the caller's cursor, or in its own transaction; returns the rowcount."""
+        if cursor is not None:
+            return cursor.execute(statement, params).rowcount
         with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                UPDATE waitlist_entries
-                SET status = 'promoted',
-                    booking_id = ?,
-                    processed_at = CURRENT_TIMESTAMP
-                WHERE entry_id = ?
-                ''',
-                (booking_id, entry_id)
-            )
-        return cursor.rowcount > 0
+            return conn.execute(statement, params).rowcount
 
     @staticmethod
-    def cancel_entry(entry_id):
+    def mark_promoted(entry_id, booking_id, cursor=None):
+        """Update an entry once it has been converted into a booking."""
+        return WaitlistDAL._execute(
+            cursor,
+            '''
+            UPDATE waitlist_entries
+            SET status = 'promoted',
+                booking_id = ?,
+                processed_at = CURRENT_TIMESTAMP
+            WHERE entry_id = ?
+            ''',
+            (booking_id, entry_id)
+        ) > 0
+
+    @staticmethod
+    def cancel_entry(entry_id, cursor=None):
         """Soft-cancel a waitlist entry."""
-        with get_db() as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                '''
-                UPDATE waitlist_entries
-                SET status = 'cancelled',
-                    processed_at = CURRENT_TIMESTAMP
-                WHERE entry_id = ? AND status = 'active'
-                ''',
-                (entry_id,)
-            )
-        return cursor.rowcount > 0
+        return WaitlistDAL._execute(
+            cursor,
+            '''
+            UPDATE waitlist_entries
+            SET status = 'cancelled',
+                processed_at = CURRENT_TIMESTAMP
+            WHERE entry_id = ? AND status = 'active'
+            ''',
+            (entry_id,)
+        ) > 0
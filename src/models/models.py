@@ -3,11 +3,98 @@ Database models for Campus Resource Hub
 This file defines the schema structure
 """
 
+import inspect
 from datetime import datetime
+from operator import itemgetter
+from threading import Lock
 from flask_login import UserMixin
 
-class User(UserMixin):
+
+class RowMapper:
+    """
+    Builds model instances from ``sqlite3.Row`` objects.
+
+    The column-to-argument plan is worked out once per query shape (the tuple
+    of column names a query returns) and cached, so hydrating a result set is
+    one positional constructor call per row instead of ``Model(**dict(row))``.
+    Columns the model has no argument for (aggregates, joined names) are
+    skipped; like ``dict(row)``, the last column wins when a name repeats.
+    """
+
+    def __init__(self, model):
+        params = list(inspect.signature(model.__init__).parameters.values())[1:]
+        self.model = model
+        self.fields = tuple(param.name for param in params)
+        self.defaults = tuple(param.default for param in params)
+        self._plans = {}
+        self._lock = Lock()
+
+    def plan(self, columns):
+        """Return a callable turning a row of this shape into constructor args."""
+        plan = self._plans.get(columns)
+        if plan is None:
+            plan = self._compile(columns)
+            with self._lock:
+                self._plans[columns] = plan
+        return plan
+
+    def _compile(self, columns):
+        positions = {name: index for index, name in enumerate(columns)}
+        indices = [positions.get(name) for name in self.fields]
+        # Trailing arguments the query does not supply keep their defaults
+        while indices and indices[-1] is None:
+            indices.pop()
+        if not indices:
+            return lambda row: ()
+        if indices == list(range(len(columns))):
+            return tuple
+        if None not in indices:
+            getter = itemgetter(*indices)
+            return getter if len(indices) > 1 else (lambda row: (getter(row),))
+        pairs = tuple(zip(indices, self.defaults))
+        return lambda row: tuple(default if index is None else row[index] for index, default in pairs)
+
+    def one(self, row):
+        return self.model(*self.plan(tuple(row.keys()))(row))
+
+    def many(self, rows):
+        if not rows:
+            return []
+        plan = self.plan(tuple(rows[0].keys()))
+        model = self.model
+        return [model(*plan(row)) for row in rows]
+
+
+class RowModel:
+    """Base for models hydrated straight from query rows."""
+    __slots__ = ()
+
+    @classmethod
+    def _mapper(cls):
+        mapper = cls.__dict__.get('_row_mapper')
+        if mapper is None:
+            mapper = RowMapper(cls)
+            cls._row_mapper = mapper
+        return mapper
+
+    @classmethod
+    def from_row(cls, row):
+        """Build one instance from a ``sqlite3.Row``."""
+        return cls._mapper().one(row)
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build instances for a list of rows that share one query shape."""
+        return cls._mapper().many(rows)
+
+
+class User(UserMixin, RowModel):
     """User model representing students, staff, and admins"""
+    # UserMixin declares no slots, so instances keep an (empty) __dict__
+    __slots__ = ('user_id', 'name', 'email', 'password_hash', 'role', 'profile_image', 'department',
+                 'created_at', 'is_suspended', 'email_verified', 'verification_token',
+                 'verification_token_expiry')
+
     def __init__(self, user_id=None, name=None, email=None, password_hash=None,
                  role='student', profile_image=None, department=None, created_at=None,
                  is_suspended=0, email_verified=0, verification_token=None,
@@ -46,8 +133,14 @@ class User(UserMixin):
         }
 
 
-class Resource:
+class Resource(RowModel):
     """Resource model for campus resources"""
+    __slots__ = ('resource_id', 'owner_id', 'title', 'description', 'category', 'location',
+                 'capacity', 'images', 'equipment', 'availability_rules', 'is_restricted', 'status',
+                 'created_at', 'availability_schedule', 'min_booking_minutes',
+                 'max_booking_minutes', 'booking_increment_minutes', 'buffer_minutes',
+                 'advance_booking_days', 'min_lead_time_hours')
+
     def __init__(self, resource_id=None, owner_id=None, title=None, description=None,
                  category=None, location=None, capacity=None, images=None,
                  equipment=None, availability_rules=None, is_restricted=0,
@@ -102,8 +195,12 @@ class Resource:
         }
 
 
-class Booking:
+class Booking(RowModel):
     """Booking model for resource reservations"""
+    __slots__ = ('booking_id', 'resource_id', 'requester_id', 'start_datetime', 'end_datetime',
+                 'status', 'recurrence_rule', 'created_at', 'updated_at', 'decision_notes',
+                 'decision_by', 'decision_timestamp', 'requester_name')
+
     def __init__(self, booking_id=None, resource_id=None, requester_id=None,
                  start_datetime=None, end_datetime=None, status='pending',
                  recurrence_rule=None, created_at=None, updated_at=None,
@@ -141,8 +238,11 @@ class Booking:
         }
 
 
-class Message:
+class Message(RowModel):
     """Message model for user communication"""
+    __slots__ = ('message_id', 'thread_id', 'sender_id', 'receiver_id', 'content', 'timestamp',
+                 'is_flagged', 'flag_reason', 'flagged_by', 'flagged_at', 'is_hidden')
+
     def __init__(self, message_id=None, thread_id=None, sender_id=None,
                  receiver_id=None, content=None, timestamp=None, is_flagged=0,
                  flag_reason=None, flagged_by=None, flagged_at=None, is_hidden=0):
@@ -175,8 +275,11 @@ class Message:
         }
 
 
-class Review:
+class Review(RowModel):
     """Review model for resource ratings"""
+    __slots__ = ('review_id', 'resource_id', 'reviewer_id', 'rating', 'comment', 'timestamp',
+                 'is_flagged', 'flag_reason', 'flagged_by', 'flagged_at', 'is_hidden')
+
     def __init__(self, review_id=None, resource_id=None, reviewer_id=None,
                  rating=None, comment=None, timestamp=None, is_flagged=0,
                  flag_reason=None, flagged_by=None, flagged_at=None, is_hidden=0):
@@ -209,8 +312,11 @@ class Review:
         }
 
 
-class WaitlistEntry:
+class WaitlistEntry(RowModel):
     """Waitlist model for tracking demand on fully booked resources"""
+    __slots__ = ('entry_id', 'resource_id', 'requester_id', 'start_datetime', 'end_datetime',
+                 'status', 'recurrence_rule', 'created_at', 'processed_at', 'booking_id')
+
     def __init__(
         self,
         entry_id=None,
@@ -0,0 +1,174 @@
+"""
+Two-tier response cache for the AI Resource Concierge.
+
+Answers are kept in a per-process LRU for millisecond lookups and mirrored to
+SQLite so every worker shares the same warm set. Keys combine the normalized
+question, the retrieved context and the model name, so edits to a cited
+resource change the key; writes through ResourceDAL also purge this process's
+LRU and the shared tier.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, Optional, Sequence
+
+from flask import current_app, has_app_context
+
+from src.config import Config
+from src.data_access.concierge_cache_dal import ConciergeCacheDAL
+
+logger = logging.getLogger(__name__)
+
+
+class ConciergeResponseCache:
+    """Thread-safe TTL + LRU cache with a SQLite-backed shared tier."""
+
+    def __init__(self, *, max_entries: int = 256, ttl_seconds: int = 3600,
+                 use_shared_tier: bool = True) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self.use_shared_tier = use_shared_tier
+        self._entries: 'OrderedDict[str, Dict]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    # Key construction -------------------------------------------------------
+
+    @staticmethod
+    def normalize_question(question: str, stop_words: Iterable[str] = ()) -> str:
+        """Collapse casing, punctuation and filler words; word order still matters."""
+        stop = set(stop_words)
+        tokens = re.findall(r'[a-z0-9]+', (question or '').lower())
+        meaningful = [token for token in tokens if token not in stop]
+        return ' '.join(meaningful or tokens)
+
+    @staticmethod
+    def build_key(*, normalized_question: str, resource_ids: Sequence[int],
+                  doc_keys: Sequence[str], model: Optional[str],
+                  context_block: str = '', mode: str = 'resource') -> str:
+        payload = json.dumps({
+            'q': normalized_question,
+            'resources': list(resource_ids),
+            'docs': list(doc_keys),
+            'model': model or '',
+            'mode': mode,
+            # Digest of the rendered context so edits to a cited resource
+            # produce a new key even in workers that missed the invalidation.
+            'context': hashlib.sha256(context_block.encode('utf-8')).hexdigest()
+        }, sort_keys=True)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    # Lookups ----------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if entry['expires_at'] > now:
+                    self._entries.move_to_end(key)
+                    return entry['answer']
+                del self._entries[key]
+
+        if not self.use_shared_tier:
+            return None
+
+        try:
+            shared = ConciergeCacheDAL.get_entry(key, now)
+        except sqlite3.Error as exc:
+            logger.warning('Concierge cache lookup failed: %s', exc)
+            return None
+        if not shared:
+            return None
+
+        self._remember(key, shared['answer'], shared['resource_ids'], shared['expires_at'])
+        return shared['answer']
+
+    def set(self, key: str, answer: str, *, question: str = '', model: Optional[str] = None,
+            resource_ids: Iterable[int] = ()) -> None:
+        if not answer:
+            return
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        cited = [resource_id for resource_id in resource_ids if resource_id is not None]
+        self._remember(key, answer, cited, expires_at)
+
+        if not self.use_shared_tier:
+            return
+        try:
+            ConciergeCacheDAL.upsert_entry(
+                key,
+                model=model,
+                question=question,
+                answer=answer,
+                resource_ids=cited,
+                created_at=now,
+                expires_at=expires_at
+            )
+        except sqlite3.Error as exc:
+            logger.warning('Concierge cache write failed: %s', exc)
+
+    # Invalidation -----------------------------------------------------------
+
+    def invalidate_resource(self, resource_id: int) -> None:
+        """Forget local answers that cited the resource and purge the shared tier."""
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if resource_id in entry['resource_ids']]
+            for key in stale:
+                del self._entries[key]
+        if self.use_shared_tier:
+            try:
+                ConciergeCacheDAL.invalidate_resource(resource_id)
+            except sqlite3.Error as exc:
+                logger.warning('Concierge cache invalidation failed: %s', exc)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    # Internal helpers -------------------------------------------------------
+
+    def _remember(self, key: str, answer: str, resource_ids: Iterable[int], expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = {
+                'answer': answer,
+                'resource_ids': frozenset(resource_ids),
+                'expires_at': expires_at
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+_shared_cache: Optional[ConciergeResponseCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_response_cache() -> Optional[ConciergeResponseCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _shared_cache
+    if not _config_value('CONCIERGE_CACHE_ENABLED', True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = ConciergeResponseCache(
+                max_entries=int(_config_value('CONCIERGE_CACHE_MAX_ENTRIES', 256)),
+                ttl_seconds=int(_config_value('CONCIERGE_CACHE_TTL', 3600))
+            )
+        return _shared_cache
+
+
+def _config_value(name: str, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
@@ -9,13 +9,13 @@ import logging
 import os
 from pathlib import Path
 import re
-from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
 
 from flask import current_app, has_app_context
 
 from src.config import Config
-from src.data_access import get_db
-from src.data_access.resource_dal import ResourceDAL
+from src.services.concierge_cache import ConciergeResponseCache, get_response_cache
+from src.services.concierge_snapshot import IndexedResource, get_snapshot
 from src.services.llm_client import LocalLLMClient, LocalLLMUnavailableError
 
 
@@ -57,13 +57,16 @@ class ConciergeService:
         try:
             self.llm_client = llm_client or LocalLLMClient.from_app_config()
             if self.llm_client:
-                self.logger.info('LLM client initialized: %s/%s at %s', 
-                               self.llm_client.provider, self.llm_client.model, self.llm_client.base_url)
+                self.logger.info('LLM client initialized: %s/%s at %s',
+                                 getattr(self.llm_client, 'provider', None),
+                                 getattr(self.llm_client, 'model', None),
+                                 getattr(self.llm_client, 'base_url', None))
             else:
                 self.logger.info('LLM client not configured (LOCAL_LLM_BASE_URL not set)')
         except Exception as exc:
             self.logger.warning('Failed to initialize LLM client: %s', exc)
             self.llm_client = None
+        self.response_cache = get_response_cache()
 
     # Public API --------------------------------------------------------------
 
@@ -71,6 +74,68 @@ class ConciergeService:
                category: Optional[str] = None,
                published_only: bool = True) -> Dict:
         """Return an AI-assisted response for the supplied natural language question."""
+        prepared = self._prepare(question, category=category, published_only=published_only)
+
+        llm_answer, llm_error, cache_hit = self._cached_llm_answer(
+            prepared['question'], prepared['context_block'], prepared['resources'],
+            prepared['doc_chunks'], is_greeting=prepared['is_greeting']
+        )
+        return self._build_result(prepared, llm_answer, llm_error, cache_hit)
+
+    def stream_answer(self, question: str, *,
+                      category: Optional[str] = None,
+                      published_only: bool = True) -> Iterator[Tuple[str, Dict]]:
+        """
+        Yield ``(event, payload)`` pairs while the answer is generated.
+
+        Emits one ``context`` event with the retrieved resources, ``token``
+        events as the local LLM produces text, and a final ``done`` event
+        carrying the same payload ``answer`` would have returned.
+        """
+        prepared = self._prepare(question, category=category, published_only=published_only)
+        yield 'context', {
+            'question': prepared['question'],
+            'resources': self._serialized_resources(prepared),
+            'doc_snippets': [self._serialize_chunk(chunk) for chunk in prepared['doc_chunks']]
+        }
+
+        llm_answer, llm_error, cache_hit = None, None, False
+        cache_key = self._cache_key(prepared)
+        if cache_key:
+            llm_answer = self.response_cache.get(cache_key)
+            cache_hit = llm_answer is not None
+
+        if llm_answer is not None:
+            yield 'token', {'text': llm_answer}
+        elif not self.llm_client:
+            llm_error = 'Local AI runtime is not configured.'
+        else:
+            fragments: List[str] = []
+            messages = self._build_messages(
+                prepared['question'], prepared['context_block'], is_greeting=prepared['is_greeting']
+            )
+            # Clients without streaming support still answer, just in one chunk
+            stream_chat = getattr(self.llm_client, 'stream_chat', None)
+            try:
+                chunks = stream_chat(messages) if stream_chat else [self.llm_client.chat(messages)]
+                for fragment in chunks:
+                    fragments.append(fragment)
+                    yield 'token', {'text': fragment}
+            except LocalLLMUnavailableError as exc:
+                self.logger.warning('Local AI stream unavailable: %s', exc)
+                llm_error = str(exc)
+
+            if fragments:
+                llm_answer = self._format_response(''.join(fragments))
+                if llm_error is None and cache_key:
+                    self._store_cached_answer(cache_key, prepared, llm_answer)
+
+        yield 'done', self._build_result(prepared, llm_answer, llm_error, cache_hit)
+
+    # Pipeline helpers --------------------------------------------------------
+
+    def _prepare(self, question: str, *, category: Optional[str], published_only: bool) -> Dict:
+        """Validate the question and gather the retrieval context shared by answer/stream."""
         cleaned = (question or '').strip()
         if not cleaned:
             raise ValueError('Question must not be empty.')
@@ -86,6 +151,7 @@ class ConciergeService:
         resources = []
         doc_chunks = []
         if not is_greeting:
+            get_snapshot().ensure_fresh()
             resources = self._resource_matches(cleaned, keywords, category=category, published_only=published_only)
             doc_chunks = self._context_matches(keywords)
         
@@ -93,27 +159,42 @@ class ConciergeService:
         stats = {} if is_greeting else self._build_insights()
         context_block = self._format_context_block(resources, doc_chunks, {})  # Empty stats to skip in context
 
-        llm_answer, llm_error = self._call_llm(cleaned, context_block, is_greeting=is_greeting)
-        
+        return {
+            'question': cleaned,
+            'is_greeting': is_greeting,
+            'resources': resources,
+            'doc_chunks': doc_chunks,
+            'stats': stats,
+            'context_block': context_block
+        }
+
+    def _build_result(self, prepared: Dict, llm_answer: Optional[str],
+                      llm_error: Optional[str], cache_hit: bool) -> Dict:
         # Use personalized fallback for greetings
-        if is_greeting and not llm_answer:
+        if prepared['is_greeting'] and not llm_answer:
             fallback = "Hello! 👋 I'm your Campus Resource Concierge, and I'm here to help you find the perfect study spaces, maker labs, equipment, and event venues around IU Bloomington. What can I help you discover today?"
         else:
-            fallback = self._compose_fallback(resources, doc_chunks, stats)
+            fallback = self._compose_fallback(prepared['resources'], prepared['doc_chunks'], prepared['stats'])
         
         answer = llm_answer or fallback
 
         return {
-            'question': cleaned,
+            'question': prepared['question'],
             'answer': answer,
-            'resources': [self._serialize_resource(resource) for resource in resources] if not is_greeting else [],
-            'doc_snippets': [self._serialize_chunk(chunk) for chunk in doc_chunks],
-            'stats': stats,
+            'resources': self._serialized_resources(prepared),
+            'doc_snippets': [self._serialize_chunk(chunk) for chunk in prepared['doc_chunks']],
+            'stats': prepared['stats'],
             'used_llm': llm_answer is not None,
             'llm_error': llm_error,
-            'context_block': context_block
+            'cache_hit': cache_hit,
+            'context_block': prepared['context_block']
         }
 
+    def _serialized_resources(self, prepared: Dict) -> List[Dict]:
+        if prepared['is_greeting']:
+            return []
+        return [self._serialize_resource(resource) for resource in prepared['resources']]
+
     # Retrieval helpers -------------------------------------------------------
 
     def _context_matches(self, keywords: Sequence[str]) -> List[ContextChunk]:
@@ -157,23 +238,24 @@ class ConciergeService:
                     detected_category = cat
                     break
 
-        # Optimized: Use the full question for a single search instead of multiple term searches
-        # This reduces database queries from up to 5 to just 1-2
+        # Retrieval runs against the in-memory snapshot (same filters as
+        # ResourceDAL.search_resources), so no queries are issued per question.
+        snapshot = get_snapshot()
         if filtered_terms:
             # First, try searching with category filter if detected
-            rows = ResourceDAL.search_resources(
+            rows = snapshot.search(
                 keyword=question,  # Use full question for better context matching
                 category=detected_category,  # Use detected category to filter results
                 status=status_filter,
-                per_page=self.MAX_RESOURCES * 4,  # Get more candidates in one query
-                page=1
-            ) or []
+                limit=self.MAX_RESOURCES * 4  # Get more candidates in one pass
+            )
             
             # Score all results at once with minimum threshold
-            for resource in rows:
+            for entry in rows:
+                resource = entry.resource
                 if resource.resource_id in scored:
                     continue
-                score = self._score_resource(resource, filtered_terms)
+                score = self._score_entry(entry, filtered_terms)
                 # Only include resources with meaningful relevance (minimum threshold)
                 if score >= 1.0:  # Require at least some relevance
                     scored[resource.resource_id] = (score, resource)
@@ -182,22 +264,21 @@ class ConciergeService:
             # This handles cases like "podcast room" where title matches but category might not
             if detected_category and len(scored) < 2:
                 # Check if we have strong title matches that might be in different categories
-                rows_no_category = ResourceDAL.search_resources(
+                rows_no_category = snapshot.search(
                     keyword=question,
                     category=None,  # Search all categories
                     status=status_filter,
-                    per_page=self.MAX_RESOURCES * 6,
-                    page=1
-                ) or []
+                    limit=self.MAX_RESOURCES * 6
+                )
                 
-                for resource in rows_no_category:
+                for entry in rows_no_category:
+                    resource = entry.resource
                     if resource.resource_id in scored:
                         continue
-                    score = self._score_resource(resource, filtered_terms)
+                    score = self._score_entry(entry, filtered_terms)
                     # For title-based matches, be more lenient if title matches strongly
-                    title = (getattr(resource, 'title', None) or '').lower()
                     has_strong_title_match = any(
-                        keyword in title and len(keyword) >= 4 
+                        keyword in entry.title and len(keyword) >= 4 
                         for keyword in filtered_terms
                     )
                     # Include if strong title match (even if category doesn't match) or good overall score
@@ -219,24 +300,80 @@ class ConciergeService:
                 return [resource for _, resource in ranked[: self.MAX_RESOURCES]]
 
         # Fallback: get some resources if no matches
-        fallback = ResourceDAL.search_resources(
+        fallback = snapshot.search(
             keyword=None,
             category=category,
             status=status_filter,
-            per_page=self.MAX_RESOURCES,
-            page=1
+            limit=self.MAX_RESOURCES
         )
-        return fallback or []
+        return [entry.resource for entry in fallback]
 
     # Prompt + completion helpers --------------------------------------------
 
+    def _cached_llm_answer(self, question: str, context_block: str, resources: Sequence,
+                           doc_chunks: Sequence[ContextChunk], *,
+                           is_greeting: bool = False) -> Tuple[Optional[str], Optional[str], bool]:
+        """Serve repeat questions from the response cache before consulting the LLM."""
+        prepared = {
+            'question': question,
+            'context_block': context_block,
+            'resources': resources,
+            'doc_chunks': doc_chunks,
+            'is_greeting': is_greeting
+        }
+        cache_key = self._cache_key(prepared)
+        if cache_key:
+            cached = self.response_cache.get(cache_key)
+            if cached is not None:
+                self.logger.info('Concierge cache hit for question: %s', question[:50])
+                return cached, None, True
+
+        answer, error = self._call_llm(question, context_block, is_greeting=is_greeting)
+        if answer and cache_key:
+            self._store_cached_answer(cache_key, prepared, answer)
+        return answer, error, False
+
+    def _cache_key(self, prepared: Dict) -> Optional[str]:
+        if not self.llm_client or self.response_cache is None:
+            return None
+        return ConciergeResponseCache.build_key(
+            normalized_question=ConciergeResponseCache.normalize_question(prepared['question'], self.STOP_WORDS),
+            resource_ids=[getattr(resource, 'resource_id', None) for resource in prepared['resources']],
+            doc_keys=[f'{chunk.source}#{chunk.heading}' for chunk in prepared['doc_chunks']],
+            model=getattr(self.llm_client, 'model', None),
+            context_block=prepared['context_block'],
+            mode='greeting' if prepared['is_greeting'] else 'resource'
+        )
+
+    def _store_cached_answer(self, cache_key: str, prepared: Dict, answer: str) -> None:
+        self.response_cache.set(
+            cache_key,
+            answer,
+            question=prepared['question'],
+            model=getattr(self.llm_client, 'model', None),
+            resource_ids=[getattr(resource, 'resource_id', None) for resource in prepared['resources']]
+        )
+
     def _call_llm(self, question: str, context_block: str, *, is_greeting: bool = False) -> Tuple[Optional[str], Optional[str]]:
         if not self.llm_client:
             self.logger.info('LLM client not available - using fallback summary')
             return None, 'Local AI runtime is not configured.'
 
         self.logger.info('Calling LLM with question: %s', question[:50])
-        
+        messages = self._build_messages(question, context_block, is_greeting=is_greeting)
+
+        try:
+            answer = self.llm_client.chat(messages)
+            self.logger.info('LLM response received (length: %d)', len(answer))
+            # Clean up and format the response
+            answer = self._format_response(answer)
+            return answer, None
+        except LocalLLMUnavailableError as exc:
+            self.logger.warning('Local AI unavailable: %s', exc)
+            return None, str(exc)
+
+    @staticmethod
+    def _build_messages(question: str, context_block: str, *, is_greeting: bool = False) -> List[Dict]:
         if is_greeting:
             # Friendly greeting response with personality
             system_prompt = (
@@ -266,21 +403,11 @@ class ConciergeService:
             )
             user_prompt = f"{question.strip()}\n\nCONTEXT:\n{context_block.strip()}"
         
-        messages = [
+        return [
             {'role': 'system', 'content': system_prompt},
             {'role': 'user', 'content': user_prompt}
         ]
 
-        try:
-            answer = self.llm_client.chat(messages)
-            self.logger.info('LLM response received (length: %d)', len(answer))
-            # Clean up and format the response
-            answer = self._format_response(answer)
-            return answer, None
-        except LocalLLMUnavailableError as exc:
-            self.logger.warning('Local AI unavailable: %s', exc)
-            return None, str(exc)
-
     def _compose_fallback(self, resources: Sequence, doc_chunks: Sequence[ContextChunk],
                           stats: Dict) -> str:
         """Compose a well-formatted fallback response when LLM is unavailable."""
@@ -357,29 +484,11 @@ class ConciergeService:
         """Build lightweight insights - only essential stats to reduce query overhead."""
         # Only get most requested (most useful for fallback), skip others for speed
         return {
-            'most_requested': self._most_requested_resources(limit=2),  # Reduced from 3
+            'most_requested': get_snapshot().most_requested(limit=2),  # Reduced from 3
             'category_counts': [],  # Skip - not critical for responses
             'total_resources': 0  # Skip - not critical for responses
         }
 
-    @staticmethod
-    def _most_requested_resources(limit: int = 3) -> List[Dict[str, object]]:
-        query = '''
-            SELECT r.resource_id,
-                   r.title,
-                   COUNT(b.booking_id) AS total
-            FROM bookings b
-            JOIN resources r ON r.resource_id = b.resource_id
-            WHERE b.status IN ('pending', 'approved', 'completed')
-            GROUP BY r.resource_id, r.title
-            ORDER BY total DESC
-            LIMIT ?
-        '''
-        with get_db() as conn:
-            cursor = conn.cursor()
-            rows = cursor.execute(query, (limit,)).fetchall()
-        return [dict(row) for row in rows]
-
     # Serialization helpers --------------------------------------------------
 
     @staticmethod
@@ -532,12 +641,13 @@ class ConciergeService:
                 score += 0.5
         return score
 
-    def _score_resource(self, resource, keywords: Sequence[str]) -> float:
+    @staticmethod
+    def _score_entry(entry: IndexedResource, keywords: Sequence[str]) -> float:
         """Score a resource based on keyword relevance with category weighting."""
         score = 0.0
-        category = (getattr(resource, 'category', None) or '').lower()
-        title = (getattr(resource, 'title', None) or '').lower()
-        description = (getattr(resource, 'description', None) or '').lower()
+        category = entry.category
+        title = entry.title
+        description = entry.description
         
         # Category matching gets highest weight (most important for relevance)
         for keyword in keywords:
@@ -561,8 +671,8 @@ class ConciergeService:
                 score += 1.0
         
         # Equipment and location get lower weight
-        equipment = (getattr(resource, 'equipment', None) or '').lower()
-        location = (getattr(resource, 'location', None) or '').lower()
+        equipment = entry.equipment
+        location = entry.location
         for keyword in keywords:
             if keyword in equipment:
                 score += 0.5
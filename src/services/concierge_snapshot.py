@@ -0,0 +1,170 @@
+"""
+In-memory catalog snapshot used by the AI Resource Concierge.
+
+Holds every resource with pre-lowered search fields plus the booking insights,
+so retrieval and scoring run in memory. Callers invoke ``ensure_fresh`` once
+per question: a single primary-key lookup of the ``resources`` write counter
+(bumped by every ResourceDAL write). The snapshot reloads when that counter
+moves or after CONCIERGE_SNAPSHOT_TTL seconds.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import logging
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from src.config import Config
+from src.data_access import get_db
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.models.models import Resource
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class IndexedResource:
+    """A resource plus the lowercase fields the concierge matches against."""
+    resource: Resource
+    title: str
+    description: str
+    equipment: str
+    location: str
+    category: str
+
+    @classmethod
+    def from_resource(cls, resource: Resource) -> 'IndexedResource':
+        title = (resource.title or '').lower()
+        description = (resource.description or '').lower()
+        equipment = (resource.equipment or '').lower()
+        location = (resource.location or '').lower()
+        category = (resource.category or '').lower()
+        return cls(resource, title, description, equipment, location, category)
+
+
+class ConciergeSnapshot:
+    """Periodically refreshed, thread-safe view of the catalog and insights."""
+
+    INSIGHT_LIMIT = 3
+
+    def __init__(self, *, ttl_seconds: int = 300) -> None:
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._entries: Tuple[IndexedResource, ...] = tuple()
+        self._most_requested: List[Dict[str, object]] = []
+        self._version: Optional[int] = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    # Queries ----------------------------------------------------------------
+
+    def search(self, *, keyword: Optional[str] = None, category: Optional[str] = None,
+               status: Optional[str] = 'published', limit: Optional[int] = None) -> List[IndexedResource]:
+        """
+        Mirror ResourceDAL.search_resources' keyword/category/status filters.
+
+        Matches are returned newest first, like the SQL ``ORDER BY created_at DESC``.
+        """
+        self._ensure_loaded()
+        keyword_value = keyword.strip().lower() if keyword else None
+        category_value = category.strip() if category else None
+        matches: List[IndexedResource] = []
+        for entry in self._entries:
+            resource = entry.resource
+            if status is not None and resource.status != status:
+                continue
+            if category_value and resource.category != category_value:
+                continue
+            if keyword_value and not (
+                keyword_value in entry.title
+                or keyword_value in entry.description
+                or keyword_value in entry.equipment
+            ):
+                continue
+            matches.append(entry)
+            if limit and len(matches) >= limit:
+                break
+        return matches
+
+    def most_requested(self, limit: int = 3) -> List[Dict[str, object]]:
+        self._ensure_loaded()
+        return [dict(item) for item in self._most_requested[:limit]]
+
+    # Refresh ----------------------------------------------------------------
+
+    def ensure_fresh(self) -> None:
+        """Reload when the TTL lapsed or another write bumped the resources counter."""
+        try:
+            version = EntityVersionDAL.get_version('resources')
+        except sqlite3.Error as exc:
+            logger.warning('Concierge snapshot version check failed: %s', exc)
+            version = self._version
+        now = time.monotonic()
+        if self._is_current(version, now):
+            return
+        with self._lock:
+            if self._is_current(version, now):
+                return
+            self._entries = tuple(IndexedResource.from_resource(resource) for resource in self._load_resources())
+            self._most_requested = self._load_most_requested(self.INSIGHT_LIMIT)
+            self._version = version
+            self._loaded_at = now
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded_at <= 0:
+            self.ensure_fresh()
+
+    def _is_current(self, version: Optional[int], now: float) -> bool:
+        return (
+            self._loaded_at > 0
+            and version == self._version
+            and now - self._loaded_at < self.ttl_seconds
+        )
+
+    @staticmethod
+    def _load_resources() -> Iterable[Resource]:
+        with get_db() as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT * FROM resources ORDER BY created_at DESC')
+            rows = cursor.fetchall()
+        return Resource.from_rows(rows)
+
+    @staticmethod
+    def _load_most_requested(limit: int) -> List[Dict[str, object]]:
+        query = '''
+            SELECT r.resource_id,
+                   r.title,
+                   COUNT(b.booking_id) AS total
+            FROM bookings b
+            JOIN resources r ON r.resource_id = b.resource_id
+            WHERE b.status IN ('pending', 'approved', 'completed')
+            GROUP BY r.resource_id, r.title
+            ORDER BY total DESC
+            LIMIT ?
+        '''
+        with get_db() as conn:
+            cursor = conn.cursor()
+            rows = cursor.execute(query, (limit,)).fetchall()
+        return [dict(row) for row in rows]
+
+
+_shared_snapshot: Optional[ConciergeSnapshot] = None
+_shared_lock = threading.Lock()
+
+
+def get_snapshot() -> ConciergeSnapshot:
+    """Return the process-wide catalog snapshot."""
+    global _shared_snapshot
+    with _shared_lock:
+        if _shared_snapshot is None:
+            _shared_snapshot = ConciergeSnapshot(ttl_seconds=int(_config_value('CONCIERGE_SNAPSHOT_TTL', 300)))
+        return _shared_snapshot
+
+
+def _config_value(name: str, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
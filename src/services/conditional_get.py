@@ -0,0 +1,77 @@
+"""
+Conditional GET (ETag / If-None-Match) for read-heavy views.
+
+    @conditional(lambda resource_id: entity_versions('resources', 'reviews'))
+
+``version`` receives the view's URL arguments and returns cheap values that
+change whenever the response would: entity_versions counters, MAX(id)
+probes, a clock bucket for relative times. The ETag is a hash of those
+values, the full URL and the viewer. A request whose If-None-Match matches
+gets an empty 304 before the view (and its DAL work) runs. Returning None
+skips the check, so missing or forbidden objects get the view's usual
+404/403/redirect.
+
+Pages that extend layout.html keep ``nav=True`` so the notification dropdown
+in the navbar is covered by the ETag. Requests with flashed messages waiting
+are always rendered, otherwise the flash would be lost behind a 304.
+"""
+from __future__ import annotations
+
+from functools import wraps
+import hashlib
+from typing import Callable, Iterable, Optional
+
+from flask import current_app, make_response, request, session
+from flask_login import current_user
+
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.services.notification_center import NotificationCenter
+
+
+def entity_versions(*entities: str) -> tuple:
+    """Current counters for ``entities``, read in one query."""
+    return tuple(sorted(EntityVersionDAL.get_versions(entities).items()))
+
+
+def etag_for(*parts) -> str:
+    return hashlib.sha1(repr(parts).encode('utf-8')).hexdigest()
+
+
+def _viewer(nav: bool) -> tuple:
+    # Rendered forms carry a CSRF token derived from the session's raw token
+    csrf = session.get('csrf_token')
+    if not current_user.is_authenticated:
+        return ('anonymous', csrf)
+    viewer = (current_user.user_id, current_user.role, current_user.name, current_user.email, csrf)
+    if nav:
+        viewer += (NotificationCenter.version_for_user(current_user),)
+    return viewer
+
+
+def conditional(version: Callable[..., Optional[Iterable]], *, nav: bool = True):
+    """Answer If-None-Match with 304 when ``version`` says nothing has changed."""
+    def decorator(view):
+        @wraps(view)
+        def wrapped(*args, **kwargs):
+            if (request.method not in ('GET', 'HEAD')
+                    or not current_app.config.get('CONDITIONAL_GET_ENABLED', True)
+                    or session.get('_flashes')):
+                return view(*args, **kwargs)
+            parts = version(**kwargs)
+            if parts is None:
+                return view(*args, **kwargs)
+
+            tag = etag_for(request.full_path, tuple(parts), _viewer(nav))
+            if request.if_none_match.contains_weak(tag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(tag, weak=True)
+            # Browsers may store the page but must revalidate it on every use
+            response.headers['Cache-Control'] = 'private, no-cache'
+            response.vary.add('Cookie')
+            return response
+        return wrapped
+    return decorator
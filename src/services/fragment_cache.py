@@ -0,0 +1,260 @@
+"""
+Fragment cache for expensive template sections.
+
+    {% cache ('resource-card', resource.resource_id), 60, ['resources', 'bookings'] %}
+        ...
+    {% endcache %}
+
+The key is any value with a stable ``repr`` (strings, numbers, tuples of
+them). It must capture everything the fragment depends on besides the
+tagged data, such as the viewer's access level. A ``None`` key renders the
+body without caching it. ``ttl`` is in seconds
+(``None`` uses FRAGMENT_CACHE_TTL). Tags name ``entity_versions`` counters.
+DAL writes bump ``resources``, ``bookings`` and ``reviews``, and the stored
+key includes the current version of every tag. A write therefore makes
+every fragment tagged with it miss on the next render, without tracking
+which fragments exist. Tag versions are read once per request.
+
+Entries live in a per-process LRU. When FRAGMENT_CACHE_STORE_PATH is set,
+a SQLite file shared by all workers sits behind it, so one worker's render
+serves the others. Fragments must not contain per-session values (CSRF
+tokens, flash messages); keep forms outside the cached block.
+
+Views pair this with ``deferred`` so the queries that feed a fragment only
+run when it actually has to be rendered.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional, Protocol, Tuple
+
+from flask import current_app, g, has_app_context, has_request_context
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from src.config import Config
+from src.data_access.entity_version_dal import EntityVersionDAL
+
+logger = logging.getLogger(__name__)
+
+Entry = Tuple[str, float]  # (html, expires_at as time.time())
+
+
+class FragmentBackend(Protocol):
+    def get(self, key: str) -> Optional[Entry]: ...
+
+    def set(self, key: str, html: str, expires_at: float) -> None: ...
+
+    def clear(self) -> None: ...
+
+
+class MemoryFragmentBackend:
+    """Bounded LRU of rendered fragments for this process."""
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self._entries: 'OrderedDict[str, Entry]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[1] <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, html: str, expires_at: float) -> None:
+        with self._lock:
+            self._entries[key] = (html, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteFragmentBackend:
+    """Fragments shared by every worker through a small SQLite file."""
+
+    PRUNE_EVERY = 200
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS fragment_cache (
+                    key TEXT PRIMARY KEY,
+                    html TEXT NOT NULL,
+                    expires_at REAL NOT NULL
+                )
+            ''')
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT html, expires_at FROM fragment_cache WHERE key = ? AND expires_at > ?',
+                (key, time.time())
+            ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def set(self, key: str, html: str, expires_at: float) -> None:
+        self._writes += 1
+        with self._connect() as conn:
+            conn.execute('''
+                INSERT INTO fragment_cache (key, html, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT (key) DO UPDATE SET html = excluded.html, expires_at = excluded.expires_at
+            ''', (key, html, expires_at))
+            if self._writes % self.PRUNE_EVERY == 0:
+                conn.execute('DELETE FROM fragment_cache WHERE expires_at <= ?', (time.time(),))
+
+    def clear(self) -> None:
+        with self._connect() as conn:
+            conn.execute('DELETE FROM fragment_cache')
+
+
+class TieredFragmentBackend:
+    """Local LRU in front of a shared tier; shared hits are copied into the LRU."""
+
+    def __init__(self, local: FragmentBackend, shared: FragmentBackend) -> None:
+        self.local = local
+        self.shared = shared
+
+    def get(self, key: str) -> Optional[Entry]:
+        entry = self.local.get(key)
+        if entry is not None:
+            return entry
+        try:
+            entry = self.shared.get(key)
+        except sqlite3.Error as exc:
+            logger.warning('Shared fragment cache read failed: %s', exc)
+            return None
+        if entry is not None:
+            self.local.set(key, *entry)
+        return entry
+
+    def set(self, key: str, html: str, expires_at: float) -> None:
+        self.local.set(key, html, expires_at)
+        try:
+            self.shared.set(key, html, expires_at)
+        except sqlite3.Error as exc:
+            logger.warning('Shared fragment cache write failed: %s', exc)
+
+    def clear(self) -> None:
+        self.local.clear()
+        self.shared.clear()
+
+
+class FragmentCache:
+    """Looks fragments up by key plus tag versions and renders them on a miss."""
+
+    def __init__(self, backend: FragmentBackend, *, default_ttl: int = 300) -> None:
+        self.backend = backend
+        self.default_ttl = max(1, int(default_ttl))
+        self.hits = 0
+        self.misses = 0
+
+    def fetch(self, key, ttl: Optional[int], tags: Optional[Iterable[str]], render: Callable[[], str]) -> Markup:
+        tags = sorted(set(tags or ()))
+        versions = _tag_versions(tags)
+        digest = hashlib.sha1(repr((key, [(tag, versions[tag]) for tag in tags])).encode('utf-8')).hexdigest()
+        entry = self.backend.get(digest)
+        if entry is not None:
+            self.hits += 1
+            return Markup(entry[0])
+        self.misses += 1
+        html = render()
+        self.backend.set(digest, str(html), time.time() + (int(ttl) if ttl else self.default_ttl))
+        return Markup(html)
+
+
+def _tag_versions(tags: Iterable[str]) -> Dict[str, int]:
+    """Versions for ``tags``, read from the database at most once per request."""
+    tags = list(tags)
+    if not tags:
+        return {}
+    if not has_request_context():
+        return EntityVersionDAL.get_versions(tags)
+    known = g.setdefault('fragment_tag_versions', {})
+    missing = [tag for tag in tags if tag not in known]
+    if missing:
+        known.update(EntityVersionDAL.get_versions(missing))
+    return {tag: known[tag] for tag in tags}
+
+
+class FragmentCacheExtension(Extension):
+    """``{% cache key[, ttl[, tags]] %}...{% endcache %}``"""
+
+    tags = {'cache'}
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        for _ in range(2):
+            args.append(parser.parse_expression() if parser.stream.skip_if('comma') else nodes.Const(None))
+        body = parser.parse_statements(('name:endcache',), drop_needle=True)
+        return nodes.CallBlock(self.call_method('_render', args), [], [], body).set_lineno(lineno)
+
+    def _render(self, key, ttl, tags, caller):
+        cache = get_fragment_cache()
+        if cache is None or key is None:
+            return caller()
+        return cache.fetch(key, ttl, tags, caller)
+
+
+class deferred:
+    """Zero-argument loader that runs at most once, and only if a template calls it."""
+
+    def __init__(self, load: Callable[[], object]) -> None:
+        self._load = load
+        self._lock = threading.Lock()
+        self._loaded = False
+        self._value = None
+
+    def __call__(self):
+        with self._lock:
+            if not self._loaded:
+                self._value = self._load()
+                self._loaded = True
+            return self._value
+
+
+_shared_cache: Optional[FragmentCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_fragment_cache() -> Optional[FragmentCache]:
+    """Return the process-wide fragment cache, or None when FRAGMENT_CACHE_ENABLED is off."""
+    global _shared_cache
+    if not _config_value('FRAGMENT_CACHE_ENABLED', True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            backend: FragmentBackend = MemoryFragmentBackend(int(_config_value('FRAGMENT_CACHE_MAX_ENTRIES', 512)))
+            store_path = _config_value('FRAGMENT_CACHE_STORE_PATH', None)
+            if store_path:
+                backend = TieredFragmentBackend(backend, SQLiteFragmentBackend(store_path))
+            _shared_cache = FragmentCache(backend, default_ttl=int(_config_value('FRAGMENT_CACHE_TTL', 300)))
+        return _shared_cache
+
+
+def _config_value(name: str, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
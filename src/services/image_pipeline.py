@@ -0,0 +1,316 @@
+"""
+Background image pipeline for resource uploads.
+
+The upload request only hashes the bytes and writes them to a private
+staging folder. A worker thread then decodes the image with Pillow,
+applies the EXIF orientation, re-encodes it without EXIF/GPS metadata and
+writes WebP and JPEG ``thumb``/``medium`` variants next to it in
+UPLOAD_FOLDER. Every file is named after the SHA-256 of the uploaded bytes,
+so the same photo uploaded twice is stored once and each URL is safe to
+cache forever.
+
+Files appear in UPLOAD_FOLDER atomically, and the sanitized original is
+written last, so its presence means the image is ready. Staged files left
+over from a crash are picked up again on the next start. An upload Pillow
+cannot process is removed from every resource that lists it, so the
+resource does not show a placeholder forever.
+"""
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+from typing import Callable, Dict, List, Optional, Set
+
+from flask import current_app, has_app_context, url_for
+
+from src.config import Config
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.resource_dal import ResourceDAL
+
+logger = logging.getLogger(__name__)
+
+IMAGE_VARIANTS = {'thumb': 640, 'medium': 1280}
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 4}),
+    'jpg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+ORIGINAL_FORMATS = {
+    'jpg': ('JPEG', {'quality': 90, 'optimize': True}),
+    'png': ('PNG', {'optimize': True}),
+    'gif': ('GIF', {}),
+}
+HASHED_NAME = re.compile(r'^([0-9a-f]{32})\.(jpg|png|gif)$')
+GENERATED_FILE = re.compile(r'^[0-9a-f]{32}(-(%s)\.(%s)|\.(jpg|png|gif))$' % (
+    '|'.join(IMAGE_VARIANTS), '|'.join(VARIANT_FORMATS)
+))
+
+
+def normalize_extension(filename: str) -> str:
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    return 'jpg' if extension == 'jpeg' else extension
+
+
+def content_name(data: bytes, filename: str) -> str:
+    """``<first 32 hex chars of sha256>.<ext>`` for the uploaded bytes."""
+    return f'{hashlib.sha256(data).hexdigest()[:32]}.{normalize_extension(filename)}'
+
+
+def is_pipeline_image(name: str) -> bool:
+    return bool(HASHED_NAME.match(name or ''))
+
+
+def is_generated_file(filename: str) -> bool:
+    """True for any original or variant file the pipeline writes."""
+    return bool(GENERATED_FILE.match(filename or ''))
+
+
+def variant_name(name: str, variant: str, fmt: str = 'webp') -> str:
+    digest = HASHED_NAME.match(name).group(1)
+    return f'{digest}-{variant}.{fmt}'
+
+
+def generated_files(name: str) -> List[str]:
+    """Every file the pipeline writes for ``name``, original included."""
+    if not is_pipeline_image(name):
+        return [name]
+    return [name] + [
+        variant_name(name, variant, fmt)
+        for variant in IMAGE_VARIANTS
+        for fmt in VARIANT_FORMATS
+    ]
+
+
+def _save_atomic(image, path: str, fmt: str, options: Dict) -> None:
+    partial = f'{path}.part'
+    image.save(partial, format=fmt, **options)
+    os.replace(partial, path)
+
+
+def _flatten(image):
+    """RGB copy for JPEG output; transparent areas become white."""
+    from PIL import Image
+
+    if image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info):
+        rgba = image.convert('RGBA')
+        background = Image.new('RGB', rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.getchannel('A'))
+        return background
+    return image.convert('RGB')
+
+
+def process_image(staged_path: str, upload_dir: str, name: str) -> bool:
+    """Write the sanitized original and its variants; False when the file is not a usable image."""
+    from PIL import Image, ImageOps
+
+    extension = HASHED_NAME.match(name).group(2)
+    try:
+        with Image.open(staged_path) as source:
+            animated = getattr(source, 'is_animated', False)
+            source.seek(0)
+            image = ImageOps.exif_transpose(source)
+            image.load()
+    except Exception as exc:  # Pillow raises a wide range of decoder errors
+        logger.warning('Discarding upload %s: %s', name, exc)
+        return False
+
+    base = image if image.mode in ('RGB', 'RGBA') else image.convert('RGBA' if image.has_transparency_data else 'RGB')
+    for variant, box in IMAGE_VARIANTS.items():
+        resized = base.copy()
+        resized.thumbnail((box, box), Image.Resampling.LANCZOS)
+        for fmt, (pil_format, options) in VARIANT_FORMATS.items():
+            output = _flatten(resized) if pil_format == 'JPEG' else resized
+            _save_atomic(output, os.path.join(upload_dir, variant_name(name, variant, fmt)), pil_format, options)
+
+    target = os.path.join(upload_dir, name)
+    if animated:
+        # Re-encoding would drop frames; GIFs carry no EXIF to strip
+        shutil.copyfile(staged_path, f'{target}.part')
+        os.replace(f'{target}.part', target)
+    else:
+        pil_format, options = ORIGINAL_FORMATS[extension]
+        original = _flatten(image) if pil_format == 'JPEG' else image
+        if pil_format == 'JPEG' and image.info.get('icc_profile'):
+            options = dict(options, icc_profile=image.info['icc_profile'])
+        _save_atomic(original, target, pil_format, options)
+    return True
+
+
+class ImagePipeline:
+    """Stage uploads on the request thread and process them on a small worker pool."""
+
+    def __init__(self, *, upload_dir: str, staging_dir: str, workers: int = 1,
+                 on_ready: Optional[Callable[[str], None]] = None,
+                 on_failed: Optional[Callable[[str], None]] = None) -> None:
+        self.upload_dir = os.path.abspath(upload_dir)
+        self.staging_dir = os.path.abspath(staging_dir)
+        self.workers = max(1, int(workers))
+        self.on_ready = on_ready
+        self.on_failed = on_failed
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending: Dict[str, Future] = {}
+        self._failed: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def stage(self, data: bytes, filename: str) -> str:
+        """Queue ``data`` for processing and return its content-hashed name."""
+        name = content_name(data, filename)
+        if not is_pipeline_image(name):
+            raise ValueError('Unsupported image type.')
+        if os.path.exists(os.path.join(self.upload_dir, name)):
+            return name  # Identical upload already processed
+        with self._lock:
+            self._failed.discard(name)
+        os.makedirs(self.staging_dir, exist_ok=True)
+        staged = os.path.join(self.staging_dir, name)
+        if not os.path.exists(staged):
+            with open(f'{staged}.part', 'wb') as handle:
+                handle.write(data)
+            os.replace(f'{staged}.part', staged)
+        self._submit(name)
+        return name
+
+    def resume_pending(self) -> int:
+        """Requeue files staged by a previous process that never finished them."""
+        try:
+            names = [name for name in os.listdir(self.staging_dir) if is_pipeline_image(name)]
+        except FileNotFoundError:
+            return 0
+        for name in names:
+            self._submit(name)
+        return len(names)
+
+    def pending(self) -> Set[str]:
+        with self._lock:
+            return set(self._pending)
+
+    def failed(self, names) -> List[str]:
+        """The entries of ``names`` this process could not turn into an image."""
+        with self._lock:
+            return [name for name in names if name in self._failed]
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued images are processed (tests, CLI tools); False on timeout."""
+        with self._lock:
+            futures = list(self._pending.values())
+        return not wait(futures, timeout=timeout).not_done
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def _submit(self, name: str) -> None:
+        with self._lock:
+            if name in self._pending:
+                return
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='image-pipeline')
+            self._pending[name] = self._executor.submit(self._run, name)
+
+    def _run(self, name: str) -> None:
+        staged = os.path.join(self.staging_dir, name)
+        try:
+            if os.path.exists(staged) and not os.path.exists(os.path.join(self.upload_dir, name)):
+                os.makedirs(self.upload_dir, exist_ok=True)
+                if process_image(staged, self.upload_dir, name):
+                    if self.on_ready is not None:
+                        self.on_ready(name)
+                else:
+                    self._fail(name)
+        except Exception:
+            logger.exception('Image pipeline failed for %s', name)
+            self._fail(name)
+        finally:
+            try:
+                os.remove(staged)
+            except FileNotFoundError:
+                pass
+            with self._lock:
+                self._pending.pop(name, None)
+
+
+    def _fail(self, name: str) -> None:
+        # Recorded before the callback runs, so a request that saves the name
+        # afterwards sees it in failed() and the callback covers anything saved before
+        with self._lock:
+            self._failed.add(name)
+        if self.on_failed is not None:
+            try:
+                self.on_failed(name)
+            except Exception:
+                logger.exception('Could not discard failed upload %s', name)
+
+
+def discard_failed_image(name: str) -> List[int]:
+    """Remove an unprocessable upload from the resources that list it."""
+    resource_ids = ResourceDAL.remove_image(name)
+    for resource_id in resource_ids:
+        logger.warning('Removed unprocessable upload %s from resource %s', name, resource_id)
+    return resource_ids
+
+
+_shared_pipeline: Optional[ImagePipeline] = None
+_shared_lock = threading.Lock()
+
+
+def get_image_pipeline() -> ImagePipeline:
+    """Return the process-wide pipeline for the configured upload folders."""
+    global _shared_pipeline
+    with _shared_lock:
+        if _shared_pipeline is None:
+            _shared_pipeline = ImagePipeline(
+                upload_dir=_config_value('UPLOAD_FOLDER'),
+                staging_dir=_config_value('IMAGE_STAGING_FOLDER'),
+                workers=int(_config_value('IMAGE_PIPELINE_WORKERS') or 1),
+                # Pages cached while the image was still processing showed a placeholder
+                on_ready=lambda name: EntityVersionDAL.bump('resources'),
+                on_failed=discard_failed_image
+            )
+        return _shared_pipeline
+
+
+def reset_image_pipeline() -> None:
+    """Finish queued work and forget the pipeline (used by tests and reloads)."""
+    global _shared_pipeline
+    with _shared_lock:
+        pipeline, _shared_pipeline = _shared_pipeline, None
+    if pipeline is not None:
+        pipeline.shutdown()
+
+
+def resource_image_url(name: str, variant: Optional[str] = None, fmt: str = 'webp') -> Optional[str]:
+    """
+    URL for one entry of ``Resource.images``.
+
+    Pipeline images resolve to the requested variant, or to None while they
+    are still queued so templates can show the placeholder. Sample images
+    and uploads stored before the pipeline keep their original paths.
+    """
+    name = (name or '').strip()
+    if not name:
+        return None
+    if name.startswith(('http://', 'https://')):
+        return name
+    if '/' in name:
+        return url_for('static', filename=name)
+    if is_pipeline_image(name):
+        if not os.path.exists(os.path.join(_config_value('UPLOAD_FOLDER'), name)):
+            return None
+        if variant in IMAGE_VARIANTS and fmt in VARIANT_FORMATS:
+            return url_for('static', filename='uploads/' + variant_name(name, variant, fmt))
+        return url_for('static', filename='uploads/' + name)
+    # Pre-pipeline uploads carry a YYYYMMDD_HHMMSS_ prefix; anything else is a bundled sample image
+    folder = 'uploads/' if len(name) > 15 and name[8:9] == '_' else 'images/'
+    return url_for('static', filename=folder + name)
+
+
+def _config_value(name: str):
+    if has_app_context():
+        return current_app.config.get(name, getattr(Config, name, None))
+    return getattr(Config, name, None)
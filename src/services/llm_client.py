@@ -3,14 +3,19 @@ Local LLM client that supports Ollama and LM Studio style chat endpoints.
 """
 from __future__ import annotations
 
+import json
 import logging
-from typing import List, Optional
+import threading
+import time
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional
 
-import requests
 from flask import current_app, has_app_context
 
 from src.config import Config
 
+if TYPE_CHECKING:  # pragma: no cover - annotations only
+    import requests
+
 ChatMessage = List[dict]
 
 
@@ -18,6 +23,111 @@ class LocalLLMUnavailableError(RuntimeError):
     """Raised when the configured local LLM cannot fulfill the request."""
 
 
+class LocalLLMBusyError(LocalLLMUnavailableError):
+    """Raised when every generation slot is taken so callers can fall back fast."""
+
+
+class LocalLLMCircuitOpenError(LocalLLMUnavailableError):
+    """Raised while the runtime is skipped after repeated timeouts."""
+
+
+class CircuitBreaker:
+    """Skip the runtime for a cooldown window after consecutive timeouts."""
+
+    def __init__(self, *, failure_threshold: int = 3, cooldown_seconds: float = 30.0) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.cooldown_seconds = max(0.0, float(cooldown_seconds))
+        self._failures = 0
+        self._open_until = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            return time.monotonic() < self._open_until
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        # After the cooldown the failure count is kept, so a single failed
+        # trial request re-opens the breaker immediately (half-open state).
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.failure_threshold:
+                self._open_until = time.monotonic() + self.cooldown_seconds
+
+
+class RuntimeGate:
+    """Concurrency limit and circuit breaker shared by every client of one runtime."""
+
+    def __init__(self, *, max_concurrency: int, queue_timeout: float,
+                 failure_threshold: int, cooldown_seconds: float) -> None:
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.queue_timeout = max(0.0, float(queue_timeout))
+        self.slots = threading.BoundedSemaphore(self.max_concurrency)
+        self.breaker = CircuitBreaker(
+            failure_threshold=failure_threshold,
+            cooldown_seconds=cooldown_seconds
+        )
+
+    def acquire(self) -> None:
+        if self.breaker.is_open:
+            raise LocalLLMCircuitOpenError(
+                'Local AI is paused after repeated timeouts; showing a quick summary instead.'
+            )
+        if not self.slots.acquire(timeout=self.queue_timeout):
+            raise LocalLLMBusyError('Local AI is busy right now; showing a quick summary instead.')
+
+    def release(self) -> None:
+        self.slots.release()
+
+
+_session: Optional[requests.Session] = None
+_runtime_gates: Dict[str, RuntimeGate] = {}
+_state_lock = threading.Lock()
+
+# requests/urllib3 are imported on the first LLM call so app startup does not pay for them
+_requests = None
+
+
+def _ensure_requests():
+    """Import ``requests`` on first use and return the module."""
+    global _requests
+    if _requests is None:
+        import requests
+        import requests.adapters
+
+        _requests = requests
+    return _requests
+
+
+def get_http_session(pool_size: int = 10) -> requests.Session:
+    """Return the process-wide session so LLM calls reuse keep-alive connections."""
+    global _session
+    with _state_lock:
+        if _session is None:
+            requests = _ensure_requests()
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=max(1, int(pool_size)))
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            _session = session
+        return _session
+
+
+def reset_runtime_state() -> None:
+    """Drop pooled connections, slots and breaker state (used by tests and reloads)."""
+    global _session
+    with _state_lock:
+        if _session is not None:
+            _session.close()
+        _session = None
+        _runtime_gates.clear()
+
+
 class LocalLLMClient:
     """
     Thin abstraction for local LLM runtimes such as Ollama or LM Studio.
@@ -27,12 +137,20 @@ class LocalLLMClient:
     """
 
     def __init__(self, *, base_url: str, model: str, provider: str,
-                 api_key: Optional[str] = None, timeout: int = 30) -> None:
+                 api_key: Optional[str] = None, timeout: int = 30,
+                 max_concurrency: int = 4, queue_timeout: float = 0.25,
+                 breaker_threshold: int = 3, breaker_cooldown: float = 30.0,
+                 pool_size: int = 10) -> None:
         self.base_url = (base_url or '').rstrip('/')
         self.model = model
         self.provider = (provider or 'ollama').lower()
         self.api_key = api_key
         self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.pool_size = pool_size
 
     # Construction helpers -------------------------------------------------
 
@@ -53,9 +171,29 @@ class LocalLLMClient:
             model=model,
             provider=provider,
             api_key=api_key,
-            timeout=timeout
+            timeout=timeout,
+            max_concurrency=int(_config_value('LOCAL_LLM_MAX_CONCURRENCY') or 4),
+            queue_timeout=float(_config_value('LOCAL_LLM_QUEUE_TIMEOUT') or 0.25),
+            breaker_threshold=int(_config_value('LOCAL_LLM_BREAKER_THRESHOLD') or 3),
+            breaker_cooldown=float(_config_value('LOCAL_LLM_BREAKER_COOLDOWN') or 30),
+            pool_size=int(_config_value('LOCAL_LLM_POOL_SIZE') or 10)
         )
 
+    @property
+    def gate(self) -> RuntimeGate:
+        """Shared slots/breaker for this runtime (one per base URL per process)."""
+        with _state_lock:
+            gate = _runtime_gates.get(self.base_url)
+            if gate is None:
+                gate = RuntimeGate(
+                    max_concurrency=self.max_concurrency,
+                    queue_timeout=self.queue_timeout,
+                    failure_threshold=self.breaker_threshold,
+                    cooldown_seconds=self.breaker_cooldown
+                )
+                _runtime_gates[self.base_url] = gate
+            return gate
+
     # Chat API --------------------------------------------------------------
 
     def chat(self, messages: ChatMessage) -> str:
@@ -70,31 +208,78 @@ class LocalLLMClient:
         if not messages:
             raise ValueError('messages cannot be empty')
 
+        gate = self.gate
+        gate.acquire()
+        try:
+            if self.provider == 'ollama':
+                return self._chat_via_ollama(messages)
+
+            # Treat LM Studio and other OpenAI-compatible runtimes the same way
+            return self._chat_via_openai(messages)
+        finally:
+            gate.release()
+
+    def stream_chat(self, messages: ChatMessage) -> Iterator[str]:
+        """
+        Stream a chat completion, yielding content fragments as they arrive.
+
+        Errors raised before the first fragment surface as
+        ``LocalLLMUnavailableError`` so callers can fall back cleanly.
+        """
+        if not messages:
+            raise ValueError('messages cannot be empty')
+
         if self.provider == 'ollama':
-            return self._chat_via_ollama(messages)
+            return self._gated_stream(self._stream_via_ollama, messages)
+        return self._gated_stream(self._stream_via_openai, messages)
 
-        # Treat LM Studio and other OpenAI-compatible runtimes the same way
-        return self._chat_via_openai(messages)
+    def _gated_stream(self, producer, messages: ChatMessage) -> Iterator[str]:
+        # Hold the generation slot until the stream is exhausted or closed
+        gate = self.gate
+        gate.acquire()
+        try:
+            yield from producer(messages)
+        finally:
+            gate.release()
 
     # Provider implementations ---------------------------------------------
 
-    def _chat_via_ollama(self, messages: ChatMessage) -> str:
-        endpoint = f'{self.base_url}/api/chat'
-        payload = {
+    def _ollama_payload(self, messages: ChatMessage, *, stream: bool) -> dict:
+        return {
             'model': self.model,
             'messages': messages,
-            'stream': False,
+            'stream': stream,
             'options': {
                 'num_predict': 200,  # Reduced for faster responses while maintaining quality
                 'temperature': 0.5,  # Slightly higher for more natural, conversational tone
             }
         }
+
+    def _openai_payload(self, messages: ChatMessage, *, stream: bool) -> dict:
+        return {
+            'model': self.model,
+            'stream': stream,
+            'temperature': 0.5,  # Slightly higher for more natural, conversational tone
+            'max_tokens': 200,  # Reduced for faster responses while maintaining quality
+            'messages': messages
+        }
+
+    def _openai_headers(self) -> dict:
+        headers = {'Content-Type': 'application/json'}
+        if self.api_key:
+            headers['Authorization'] = f'Bearer {self.api_key}'
+        return headers
+
+    @property
+    def _openai_provider_name(self) -> str:
+        return 'LM Studio' if self.provider == 'lmstudio' else 'local OpenAI-compatible'
+
+    def _chat_via_ollama(self, messages: ChatMessage) -> str:
+        endpoint = f'{self.base_url}/api/chat'
+        payload = self._ollama_payload(messages, stream=False)
         self._log_debug('Posting prompt to Ollama', payload_summary=_safe_prompt_preview(messages))
 
-        try:
-            response = requests.post(endpoint, json=payload, timeout=self.timeout)
-        except requests.RequestException as exc:
-            raise LocalLLMUnavailableError(f'Ollama runtime not reachable: {exc}') from exc
+        response = self._post('Ollama', endpoint, payload)
 
         if response.status_code >= 500:
             raise LocalLLMUnavailableError('Ollama responded with a server error.')
@@ -113,24 +298,13 @@ class LocalLLMClient:
 
     def _chat_via_openai(self, messages: ChatMessage) -> str:
         endpoint = f'{self.base_url}/v1/chat/completions'
-        payload = {
-            'model': self.model,
-            'stream': False,
-            'temperature': 0.5,  # Slightly higher for more natural, conversational tone
-            'max_tokens': 200,  # Reduced for faster responses while maintaining quality
-            'messages': messages
-        }
-        headers = {'Content-Type': 'application/json'}
-        if self.api_key:
-            headers['Authorization'] = f'Bearer {self.api_key}'
+        payload = self._openai_payload(messages, stream=False)
+        headers = self._openai_headers()
 
-        provider_name = 'LM Studio' if self.provider == 'lmstudio' else 'local OpenAI-compatible'
+        provider_name = self._openai_provider_name
         self._log_debug(f'Posting prompt to {provider_name}', payload_summary=_safe_prompt_preview(messages))
 
-        try:
-            response = requests.post(endpoint, json=payload, headers=headers, timeout=self.timeout)
-        except requests.RequestException as exc:
-            raise LocalLLMUnavailableError(f'{provider_name} runtime not reachable: {exc}') from exc
+        response = self._post(provider_name, endpoint, payload, headers=headers)
 
         if response.status_code >= 500:
             raise LocalLLMUnavailableError(f'{provider_name} returned a server error.')
@@ -146,6 +320,97 @@ class LocalLLMClient:
             raise LocalLLMUnavailableError(f'{provider_name} returned an empty response.')
         return (choices[0].get('message') or {}).get('content', '').strip()
 
+    def _stream_via_ollama(self, messages: ChatMessage) -> Iterator[str]:
+        """Consume Ollama's newline-delimited JSON stream."""
+        endpoint = f'{self.base_url}/api/chat'
+        payload = self._ollama_payload(messages, stream=True)
+        self._log_debug('Streaming prompt to Ollama', payload_summary=_safe_prompt_preview(messages))
+        response = self._open_stream('Ollama', endpoint, payload)
+        requests = _ensure_requests()
+
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line:
+                    continue
+                try:
+                    event = json.loads(line)
+                except ValueError:
+                    continue
+                if event.get('error'):
+                    raise LocalLLMUnavailableError(f"Ollama stream failed: {event['error']}")
+                fragment = (event.get('message') or {}).get('content') or ''
+                if fragment:
+                    yield fragment
+                if event.get('done'):
+                    break
+        except requests.RequestException as exc:
+            self.gate.breaker.record_failure()
+            raise LocalLLMUnavailableError(f'Ollama stream interrupted: {exc}') from exc
+        finally:
+            response.close()
+
+    def _stream_via_openai(self, messages: ChatMessage) -> Iterator[str]:
+        """Consume an OpenAI-compatible server-sent event stream."""
+        endpoint = f'{self.base_url}/v1/chat/completions'
+        payload = self._openai_payload(messages, stream=True)
+        provider_name = self._openai_provider_name
+        self._log_debug(f'Streaming prompt to {provider_name}', payload_summary=_safe_prompt_preview(messages))
+        response = self._open_stream(provider_name, endpoint, payload, headers=self._openai_headers())
+        requests = _ensure_requests()
+
+        try:
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith('data:'):
+                    continue
+                data = line[len('data:'):].strip()
+                if data == '[DONE]':
+                    break
+                try:
+                    event = json.loads(data)
+                except ValueError:
+                    continue
+                choices = event.get('choices') or []
+                if not choices:
+                    continue
+                fragment = (choices[0].get('delta') or {}).get('content') or ''
+                if fragment:
+                    yield fragment
+        except requests.RequestException as exc:
+            self.gate.breaker.record_failure()
+            raise LocalLLMUnavailableError(f'{provider_name} stream interrupted: {exc}') from exc
+        finally:
+            response.close()
+
+    def _post(self, provider_name: str, endpoint: str, payload: dict, *,
+              headers: Optional[dict] = None, stream: bool = False) -> requests.Response:
+        """POST through the pooled session, feeding timeouts into the circuit breaker."""
+        session = get_http_session(self.pool_size)
+        requests = _ensure_requests()
+        try:
+            response = session.post(endpoint, json=payload, headers=headers,
+                                    timeout=self.timeout, stream=stream)
+        except (requests.Timeout, requests.ConnectionError) as exc:
+            self.gate.breaker.record_failure()
+            raise LocalLLMUnavailableError(f'{provider_name} runtime not reachable: {exc}') from exc
+        except requests.RequestException as exc:
+            raise LocalLLMUnavailableError(f'{provider_name} runtime not reachable: {exc}') from exc
+
+        self.gate.breaker.record_success()
+        return response
+
+    def _open_stream(self, provider_name: str, endpoint: str, payload: dict, *,
+                     headers: Optional[dict] = None) -> requests.Response:
+        response = self._post(provider_name, endpoint, payload, headers=headers, stream=True)
+
+        if response.status_code >= 400:
+            response.close()
+            if response.status_code >= 500:
+                raise LocalLLMUnavailableError(f'{provider_name} responded with a server error.')
+            raise LocalLLMUnavailableError(
+                f'{provider_name} rejected the request ({response.status_code}).'
+            )
+        return response
+
     # Logging ---------------------------------------------------------------
 
     def _log_debug(self, message: str, *, payload_summary: Optional[str] = None) -> None:
@@ -5,8 +5,10 @@ Aggregates actionable updates for the navbar notification badge.
 from __future__ import annotations
 
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+import time
+from typing import Dict, List, Optional, Tuple
 from flask import url_for
+from src.data_access.entity_version_dal import EntityVersionDAL
 from src.data_access.notification_dal import NotificationDAL
 from src.data_access.message_dal import MessageDAL
 from src.data_access.booking_dal import BookingDAL
@@ -43,6 +45,18 @@ class NotificationCenter:
         builder = cls(user)
         return builder._build(limit or cls.DEFAULT_LIMIT)
 
+    @classmethod
+    def version_for_user(cls, user) -> Tuple:
+        """Cheap values that change whenever build_for_user's payload would."""
+        if not user or not getattr(user, 'user_id', None):
+            return ()
+        entities = [MessageDAL.inbox_version_key(user.user_id)]
+        if user.role in ('staff', 'admin'):
+            entities += ['bookings', 'resources']
+        versions = EntityVersionDAL.get_versions(entities)
+        # time_display is relative ("5m ago"), so the payload also moves every minute
+        return (NotificationDAL.get_feed_marker(user.user_id), sorted(versions.items()), int(time.time() // 60))
+
     def _build(self, limit: int) -> Dict:
         feed: List[Dict] = []
         feed.extend(self._system_notifications())
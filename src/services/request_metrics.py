@@ -0,0 +1,293 @@
+"""
+Request latency metrics in the Prometheus text format.
+
+Every request updates a per-process registry: a latency histogram, a
+request counter by status and an error counter (5xx or unhandled
+exception), all labelled by blueprint and endpoint, plus an in-flight
+gauge. The samples are already cumulative, so combining workers is a plain
+sum.
+
+Under gunicorn each worker keeps its own registry. When
+METRICS_STORE_PATH is set, workers upsert their samples into a small
+SQLite file (at most once every METRICS_FLUSH_INTERVAL seconds) and
+``/metrics`` sums them. Rows are keyed by a random id per worker process,
+not its pid, so a recycled worker that gets a dead one's pid starts its own
+rows. A worker is dead once its pid is gone or a newer worker has
+registered the same pid; on the next scrape its counters are folded into a
+single ``retired`` row and its own rows deleted, so totals never go
+backwards and the table does not grow with every recycled worker. Gauges
+only count workers that are still alive.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+import uuid
+
+from flask import current_app, has_app_context
+
+from src.config import Config
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRIC_FAMILIES = {
+    'campus_hub_http_request_duration_seconds': ('histogram', 'Request latency by blueprint and endpoint.'),
+    'campus_hub_http_requests_total': ('counter', 'Requests handled, by status code.'),
+    'campus_hub_http_request_errors_total': ('counter', 'Requests that ended in a 5xx or an unhandled exception.'),
+    'campus_hub_http_requests_in_flight': ('gauge', 'Requests currently being handled.'),
+}
+GAUGES = {name for name, (kind, _) in METRIC_FAMILIES.items() if kind == 'gauge'}
+RETIRED_WORKER = 'retired'
+
+Labels = Tuple[Tuple[str, str], ...]
+SampleKey = Tuple[str, Labels]
+
+
+def _labels(**pairs) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in pairs.items()))
+
+
+def _format_le(bound: float) -> str:
+    return '+Inf' if bound == float('inf') else repr(float(bound))
+
+
+class MetricsRegistry:
+    """Thread-safe map of Prometheus sample -> value for this process."""
+
+    def __init__(self, buckets: Iterable[float] = LATENCY_BUCKETS) -> None:
+        self.buckets = tuple(sorted(buckets)) + (float('inf'),)
+        self.pid = os.getpid()
+        self.worker_id = uuid.uuid4().hex
+        self._samples: Dict[SampleKey, float] = {}
+        self._dirty: set = set()
+        self._lock = threading.Lock()
+
+    def _add(self, name: str, labels: Labels, amount: float) -> None:
+        key = (name, labels)
+        self._samples[key] = self._samples.get(key, 0.0) + amount
+        self._dirty.add(key)
+
+    def request_started(self, blueprint: str, endpoint: str) -> None:
+        with self._lock:
+            self._add('campus_hub_http_requests_in_flight', _labels(blueprint=blueprint, endpoint=endpoint), 1)
+
+    def request_finished(self, blueprint: str, endpoint: str, method: str, status: int, seconds: float) -> None:
+        base = dict(blueprint=blueprint, endpoint=endpoint, method=method)
+        first_bucket = bisect_left(self.buckets, seconds)
+        with self._lock:
+            self._add('campus_hub_http_requests_in_flight', _labels(blueprint=blueprint, endpoint=endpoint), -1)
+            self._add('campus_hub_http_requests_total', _labels(status=status, **base), 1)
+            if status >= 500:
+                self._add('campus_hub_http_request_errors_total', _labels(**base), 1)
+            for bound in self.buckets[first_bucket:]:
+                self._add('campus_hub_http_request_duration_seconds_bucket', _labels(le=_format_le(bound), **base), 1)
+            self._add('campus_hub_http_request_duration_seconds_sum', _labels(**base), seconds)
+            self._add('campus_hub_http_request_duration_seconds_count', _labels(**base), 1)
+
+    def samples(self) -> Dict[SampleKey, float]:
+        with self._lock:
+            return dict(self._samples)
+
+    def take_dirty(self) -> Dict[SampleKey, float]:
+        with self._lock:
+            dirty = {key: self._samples[key] for key in self._dirty}
+            self._dirty.clear()
+            return dirty
+
+
+class SQLiteMetricsStore:
+    """Shared sample table so any worker can answer a scrape for all of them."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode = WAL')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS metric_workers (
+                    worker_id TEXT PRIMARY KEY,
+                    pid INTEGER NOT NULL
+                )
+            ''')
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS metric_samples (
+                    worker_id TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    labels TEXT NOT NULL,
+                    value REAL NOT NULL,
+                    PRIMARY KEY (worker_id, name, labels)
+                )
+            ''')
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5.0)
+
+    def write(self, worker_id: str, pid: int, samples: Dict[SampleKey, float]) -> None:
+        if not samples:
+            return
+        rows = [(worker_id, name, json.dumps(labels), value) for (name, labels), value in samples.items()]
+        with self._connect() as conn:
+            conn.execute('INSERT OR IGNORE INTO metric_workers (worker_id, pid) VALUES (?, ?)', (worker_id, pid))
+            conn.executemany('''
+                INSERT INTO metric_samples (worker_id, name, labels, value) VALUES (?, ?, ?, ?)
+                ON CONFLICT (worker_id, name, labels) DO UPDATE SET value = excluded.value
+            ''', rows)
+
+    def aggregate(self) -> Dict[SampleKey, float]:
+        """Retire exited workers, then sum every remaining row."""
+        with self._connect() as conn:
+            # Serialize scrapes so two of them cannot fold the same worker twice
+            conn.execute('BEGIN IMMEDIATE')
+            newest_by_pid: Dict[int, str] = {}
+            workers = conn.execute('SELECT worker_id, pid FROM metric_workers ORDER BY rowid').fetchall()
+            for worker_id, pid in workers:
+                newest_by_pid[pid] = worker_id
+            live = {worker_id for pid, worker_id in newest_by_pid.items() if _pid_alive(pid)}
+            dead = [worker_id for worker_id, _ in workers if worker_id not in live]
+            if dead:
+                self._retire(conn, dead)
+            rows = conn.execute('SELECT name, labels, value FROM metric_samples').fetchall()
+        totals: Dict[SampleKey, float] = {}
+        for name, labels, value in rows:
+            key = (name, tuple(tuple(pair) for pair in json.loads(labels)))
+            totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    @staticmethod
+    def _retire(conn: sqlite3.Connection, worker_ids: List[str]) -> None:
+        """Add the workers' counters to the retired row and drop everything they wrote."""
+        workers = ','.join('?' for _ in worker_ids)
+        gauges = ','.join('?' for _ in GAUGES)
+        conn.execute(f'''
+            INSERT INTO metric_samples (worker_id, name, labels, value)
+            SELECT ?, name, labels, SUM(value) FROM metric_samples
+            WHERE worker_id IN ({workers}) AND name NOT IN ({gauges})
+            GROUP BY name, labels
+            ON CONFLICT (worker_id, name, labels) DO UPDATE SET value = value + excluded.value
+        ''', (RETIRED_WORKER, *worker_ids, *sorted(GAUGES)))
+        conn.execute(f'DELETE FROM metric_samples WHERE worker_id IN ({workers})', worker_ids)
+        conn.execute(f'DELETE FROM metric_workers WHERE worker_id IN ({workers})', worker_ids)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _family(sample_name: str) -> str:
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix) and sample_name[:-len(suffix)] in METRIC_FAMILIES:
+            return sample_name[:-len(suffix)]
+    return sample_name
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def render_prometheus(samples: Dict[SampleKey, float]) -> str:
+    """Prometheus text exposition (version 0.0.4) for the given samples."""
+    by_family: Dict[str, List[Tuple[str, Labels, float]]] = {name: [] for name in METRIC_FAMILIES}
+    for (name, labels), value in samples.items():
+        by_family.setdefault(_family(name), []).append((name, labels, value))
+
+    lines: List[str] = []
+    for family, entries in by_family.items():
+        kind, help_text = METRIC_FAMILIES.get(family, ('untyped', ''))
+        lines.append(f'# HELP {family} {help_text}')
+        lines.append(f'# TYPE {family} {kind}')
+        for name, labels, value in sorted(entries, key=_sort_key):
+            label_text = ','.join(f'{key}="{_escape(val)}"' for key, val in labels)
+            rendered = repr(float(value)) if value != int(value) else str(int(value))
+            lines.append(f'{name}{{{label_text}}} {rendered}' if label_text else f'{name} {rendered}')
+    return '\n'.join(lines) + '\n'
+
+
+def _sort_key(entry):
+    name, labels, _ = entry
+    plain = tuple(pair for pair in labels if pair[0] != 'le')
+    le = dict(labels).get('le')
+    order = float('inf') if le == '+Inf' else float(le) if le is not None else -1.0
+    return plain, name, order
+
+
+class RequestMetrics:
+    """Process registry plus the optional shared store, flushed on a timer."""
+
+    def __init__(self, *, store_path: Optional[str] = None, flush_interval: float = 1.0) -> None:
+        self.store = SQLiteMetricsStore(store_path) if store_path else None
+        self.flush_interval = max(0.0, float(flush_interval))
+        self.registry = MetricsRegistry()
+        self._last_flush = 0.0
+        self._flush_lock = threading.Lock()
+
+    def _current_registry(self) -> MetricsRegistry:
+        # A registry inherited across fork (gunicorn --preload) belongs to the parent
+        if self.registry.pid != os.getpid():
+            self.registry = MetricsRegistry(self.registry.buckets[:-1])
+        return self.registry
+
+    def request_started(self, blueprint: str, endpoint: str) -> None:
+        self._current_registry().request_started(blueprint, endpoint)
+
+    def request_finished(self, blueprint: str, endpoint: str, method: str, status: int, seconds: float) -> None:
+        self._current_registry().request_finished(blueprint, endpoint, method, status, seconds)
+        if self.store is not None and time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.store is None:
+            return
+        with self._flush_lock:
+            registry = self._current_registry()
+            try:
+                self.store.write(registry.worker_id, registry.pid, registry.take_dirty())
+            except sqlite3.Error as exc:
+                logger.warning('Could not flush request metrics: %s', exc)
+            self._last_flush = time.monotonic()
+
+    def render(self) -> str:
+        if self.store is None:
+            return render_prometheus(self._current_registry().samples())
+        self.flush()
+        try:
+            return render_prometheus(self.store.aggregate())
+        except sqlite3.Error as exc:
+            logger.warning('Falling back to per-worker metrics: %s', exc)
+            return render_prometheus(self._current_registry().samples())
+
+
+_shared_metrics: Optional[RequestMetrics] = None
+_shared_lock = threading.Lock()
+
+
+def get_request_metrics() -> Optional[RequestMetrics]:
+    """Return the process-wide metrics, or None when METRICS_ENABLED is off."""
+    global _shared_metrics
+    if not _config_value('METRICS_ENABLED', True):
+        return None
+    with _shared_lock:
+        if _shared_metrics is None:
+            _shared_metrics = RequestMetrics(
+                store_path=_config_value('METRICS_STORE_PATH', None),
+                flush_interval=float(_config_value('METRICS_FLUSH_INTERVAL', 1.0))
+            )
+        return _shared_metrics
+
+
+def _config_value(name: str, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
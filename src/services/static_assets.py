@@ -0,0 +1,177 @@
+"""
+Content-hashed static asset URLs and precompressed variants.
+
+``url_for('static', filename=...)`` gains ``?v=<hash of the file>``. An
+asset's URL changes only when its bytes do, so browsers may cache it as
+immutable for a year. Each file is hashed the first time it is linked and
+the hash is kept for the life of the process. With ``auto_reload`` (every
+environment except production) the file's mtime is checked, so edits show
+up without a restart. Uploads are skipped because their names are already
+content hashes.
+
+Run ``python -m src.services.static_assets`` at build or deploy time. It
+writes ``.gz`` files, plus ``.br`` files when the optional ``brotli``
+package is installed, next to CSS, JS and SVG assets. The static route
+serves these to clients that accept the encoding.
+"""
+from __future__ import annotations
+
+import argparse
+import gzip
+import hashlib
+import mimetypes
+import os
+import sys
+import threading
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from flask import current_app, request, send_from_directory
+from werkzeug.security import safe_join
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.svg', '.json', '.map', '.txt')
+MIN_COMPRESS_BYTES = 1024
+# Preferred first when the client accepts both
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+SKIPPED_FOLDERS = ('uploads',)
+
+_brotli = None  # brotli module once imported, False when unavailable
+
+
+def _load_brotli():
+    global _brotli
+    if _brotli is None:
+        try:
+            import brotli
+            _brotli = brotli
+        except ImportError:
+            _brotli = False
+    return _brotli or None
+
+
+def _skipped(filename: str) -> bool:
+    return filename.replace('\\', '/').split('/', 1)[0] in SKIPPED_FOLDERS
+
+
+class AssetManifest:
+    """Lazily computed ``filename -> short content hash`` map for the static folder."""
+
+    def __init__(self, static_folder: str, *, auto_reload: bool = False) -> None:
+        self.static_folder = os.path.abspath(static_folder)
+        self.auto_reload = auto_reload
+        self._versions: Dict[str, Tuple[int, int, str]] = {}
+        self._lock = threading.Lock()
+
+    def version(self, filename: str) -> Optional[str]:
+        """Hash for ``filename``, or None for uploads and files that do not exist."""
+        if not filename or _skipped(filename):
+            return None
+        cached = self._versions.get(filename)
+        if cached is not None and not self.auto_reload:
+            return cached[2]
+
+        path = safe_join(self.static_folder, filename)
+        try:
+            stat = os.stat(path) if path else None
+        except OSError:
+            stat = None
+        if stat is None or not os.path.isfile(path):
+            return None
+        if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, 'rb') as handle:
+            for chunk in iter(lambda: handle.read(65536), b''):
+                digest.update(chunk)
+        version = digest.hexdigest()[:12]
+        with self._lock:
+            self._versions[filename] = (stat.st_mtime_ns, stat.st_size, version)
+        return version
+
+
+def _precompressed(filename: str) -> Optional[Tuple[str, str]]:
+    """(encoding, variant filename) of a fresh precompressed copy the client accepts."""
+    if not filename.endswith(COMPRESSIBLE_EXTENSIONS):
+        return None
+    source = safe_join(current_app.static_folder, filename)
+    if not source or not os.path.isfile(source):
+        return None
+    source_mtime = os.path.getmtime(source)
+    for encoding, suffix in ENCODINGS:
+        if not request.accept_encodings[encoding]:
+            continue
+        variant = source + suffix
+        # A variant older than its source is left over from a previous build
+        if os.path.isfile(variant) and os.path.getmtime(variant) >= source_mtime:
+            return encoding, filename + suffix
+    return None
+
+
+def send_static_asset(filename: str):
+    """Static view that prefers a precompressed copy when the client accepts one."""
+    app = current_app._get_current_object()
+    match = _precompressed(filename)
+    if match is None:
+        response = app.send_static_file(filename)
+    else:
+        encoding, variant = match
+        response = send_from_directory(
+            app.static_folder, variant,
+            mimetype=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+            download_name=os.path.basename(filename),
+            max_age=app.get_send_file_max_age(filename)
+        )
+        response.headers['Content-Encoding'] = encoding
+    if filename.endswith(COMPRESSIBLE_EXTENSIONS):
+        response.vary.add('Accept-Encoding')
+    return response
+
+
+def iter_compressible(static_folder: str) -> Iterator[str]:
+    for root, dirs, files in os.walk(static_folder):
+        if os.path.relpath(root, static_folder) == '.':
+            dirs[:] = [name for name in dirs if name not in SKIPPED_FOLDERS]
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and os.path.getsize(path) >= MIN_COMPRESS_BYTES:
+                yield path
+
+
+def precompress(static_folder: str) -> List[Tuple[str, int, Dict[str, int]]]:
+    """Write .gz/.br next to every compressible asset; returns (path, size, {encoding: size})."""
+    brotli = _load_brotli()
+    report = []
+    for path in iter_compressible(static_folder):
+        with open(path, 'rb') as handle:
+            data = handle.read()
+        variants = {'gzip': gzip.compress(data, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variants['br'] = brotli.compress(data, quality=11)
+        sizes = {}
+        for encoding, suffix in ENCODINGS:
+            if encoding not in variants:
+                continue
+            with open(f'{path}{suffix}.part', 'wb') as handle:
+                handle.write(variants[encoding])
+            os.replace(f'{path}{suffix}.part', path + suffix)
+            sizes[encoding] = len(variants[encoding])
+        report.append((path, len(data), sizes))
+    return report
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Precompress static CSS/JS/SVG assets (gzip, plus brotli when installed).')
+    parser.add_argument('--static-folder', default=os.path.join(os.path.dirname(os.path.dirname(__file__)), 'static'))
+    args = parser.parse_args(argv)
+
+    report = precompress(args.static_folder)
+    for path, size, sizes in report:
+        detail = ', '.join(f'{encoding} {compressed:,} B' for encoding, compressed in sizes.items())
+        print(f'{os.path.relpath(path, args.static_folder)}: {size:,} B -> {detail}')
+    if _load_brotli() is None:
+        print('brotli is not installed; wrote gzip variants only', file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""
+Per-process cache of the users Flask-Login loads on every request.
+
+Each entry records the user's write counter from ``entity_versions`` (the
+``user:<id>`` key, bumped by every UserDAL write to that row). A request
+checks that counter with a single primary-key lookup and reuses the cached
+object while it matches. Suspensions, profile edits, verification and
+deletion therefore take effect on the next request in every worker, and
+the full ``SELECT *`` plus model hydration only runs after a change or once
+USER_CACHE_TTL has passed.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional, Tuple
+
+from flask import current_app, has_app_context
+
+from src.config import Config
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.user_dal import UserDAL
+from src.models.models import User
+
+logger = logging.getLogger(__name__)
+
+
+class UserCache:
+    """Bounded LRU of ``user_id -> (user, version, loaded_at)``."""
+
+    def __init__(self, *, max_entries: int = 1024, ttl_seconds: int = 300) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.ttl_seconds = max(1, int(ttl_seconds))
+        self._entries: 'OrderedDict[int, Tuple[User, int, float]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def load(self, user_id: int) -> Optional[User]:
+        try:
+            version = EntityVersionDAL.get_version(UserDAL.version_key(user_id))
+        except sqlite3.Error as exc:
+            logger.warning('User cache version check failed: %s', exc)
+            return UserDAL.get_user_by_id(user_id)
+
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry and entry[1] == version and now - entry[2] < self.ttl_seconds:
+                self._entries.move_to_end(user_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+
+        # Read after the version so a concurrent write can only make the entry stale, never wrong
+        user = UserDAL.get_user_by_id(user_id)
+        with self._lock:
+            if user is None:
+                self._entries.pop(user_id, None)
+                return None
+            self._entries[user_id] = (user, version, now)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return user
+
+    def invalidate(self, user_id: Optional[int] = None) -> None:
+        with self._lock:
+            if user_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(user_id, None)
+
+
+_shared_cache: Optional[UserCache] = None
+_shared_lock = threading.Lock()
+
+
+def get_user_cache() -> Optional[UserCache]:
+    """Return the process-wide cache, or None when caching is disabled."""
+    global _shared_cache
+    if not _config_value('USER_CACHE_ENABLED', True):
+        return None
+    with _shared_lock:
+        if _shared_cache is None:
+            _shared_cache = UserCache(
+                max_entries=int(_config_value('USER_CACHE_MAX_ENTRIES', 1024)),
+                ttl_seconds=int(_config_value('USER_CACHE_TTL', 300))
+            )
+        return _shared_cache
+
+
+def load_user(user_id: int) -> Optional[User]:
+    """Flask-Login loader: cached when enabled, a plain primary-key read otherwise."""
+    cache = get_user_cache()
+    if cache is None:
+        return UserDAL.get_user_by_id(user_id)
+    return cache.load(user_id)
+
+
+def _config_value(name: str, default):
+    if has_app_context():
+        return current_app.config.get(name, default)
+    return getattr(Config, name, default)
@@ -0,0 +1,160 @@
+"""
+Waitlist promotion engine.
+
+When a booking is cancelled or rejected, only waitlist entries that overlap
+the freed interval can have become bookable. ``promote_freed_interval``
+looks those up through the partial ``(resource_id, start_epoch, end_epoch)``
+index on active entries. It loads the resource's pending and approved
+bookings over the candidates' span once, then walks the candidates oldest
+first, checking each against those busy intervals in memory. Every slot it
+promotes is added to the busy set, so later entries for the same time stay
+queued.
+
+Bookings, waitlist updates and the notification rows are written in one
+``BEGIN IMMEDIATE`` transaction, so two promotions for the same slot cannot
+interleave. Notification emails go out after the response has been sent.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from typing import Iterable, List, Tuple
+
+from src.data_access import get_db
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.entity_version_dal import EntityVersionDAL
+from src.data_access.user_dal import UserDAL
+from src.data_access.waitlist_dal import WaitlistDAL
+from src.utils.datetime_helpers import humanize_datetime, to_epoch
+from src.utils.notifications import NotificationService
+
+
+class BusyIntervals:
+    """Disjoint, sorted half-open ``[start, end)`` epoch intervals with O(log n) overlap checks."""
+
+    def __init__(self, intervals: Iterable[Tuple[int, int]] = ()) -> None:
+        self._starts: List[int] = []
+        self._ends: List[int] = []
+        for start, end in sorted(intervals):
+            self.add(start, end)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        index = bisect_right(self._starts, start)
+        if index and self._ends[index - 1] > start:
+            return True
+        return index < len(self._starts) and self._starts[index] < end
+
+    def add(self, start: int, end: int) -> None:
+        # Merge with every interval that overlaps or touches [start, end)
+        first = bisect_left(self._ends, start)
+        last = bisect_right(self._starts, end)
+        if first < last:
+            start = min(start, self._starts[first])
+            end = max(end, self._ends[last - 1])
+        self._starts[first:last] = [start]
+        self._ends[first:last] = [end]
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+
+@dataclass
+class PromotionResult:
+    promoted: List[Tuple[int, int]] = field(default_factory=list)  # (entry_id, booking_id)
+    cancelled: List[int] = field(default_factory=list)  # entries whose requester no longer exists
+    notification_ids: List[int] = field(default_factory=list)
+
+
+def promote_freed_interval(resource, start=None, end=None) -> PromotionResult:
+    """
+    Promote waitlist entries on ``resource`` that overlap the freed ``[start, end)``.
+
+    ``start``/``end`` are datetimes or stored ISO strings; without them every
+    active entry for the resource is considered. Notifications are queued
+    and handed to ``NotificationService.dispatch_queued`` once the
+    transaction commits.
+    """
+    result = PromotionResult()
+    if not resource:
+        return result
+    freed = (None, None)
+    if start is not None and end is not None:
+        freed = (to_epoch(start), to_epoch(end))
+        if None in freed:
+            return result
+
+    with get_db() as conn:
+        conn.execute('BEGIN IMMEDIATE')
+        cursor = conn.cursor()
+        candidates = []
+        for entry in WaitlistDAL.get_active_overlapping(resource.resource_id, *freed, cursor=cursor):
+            entry_start, entry_end = to_epoch(entry.start_datetime), to_epoch(entry.end_datetime)
+            if entry_start is not None and entry_end is not None:
+                candidates.append((entry, entry_start, entry_end))
+        if not candidates:
+            return result
+
+        span_start = min(entry_start for _, entry_start, _ in candidates)
+        span_end = max(entry_end for _, _, entry_end in candidates)
+        busy = BusyIntervals(BookingDAL.get_busy_intervals(resource.resource_id, span_start, span_end, cursor=cursor))
+        requesters = UserDAL.get_users_by_ids([entry.requester_id for entry, _, _ in candidates], cursor=cursor)
+
+        for entry, entry_start, entry_end in candidates:
+            if busy.overlaps(entry_start, entry_end):
+                continue
+            requester = requesters.get(entry.requester_id)
+            if requester is None:
+                WaitlistDAL.cancel_entry(entry.entry_id, cursor=cursor)
+                result.cancelled.append(entry.entry_id)
+                continue
+
+            status = 'pending' if _requires_manual_approval(resource, requester) else 'approved'
+            booking_id = BookingDAL.insert_booking(
+                cursor, resource.resource_id, requester.user_id,
+                entry.start_datetime, entry.end_datetime, status, entry.recurrence_rule
+            )
+            WaitlistDAL.mark_promoted(entry.entry_id, booking_id, cursor=cursor)
+            busy.add(entry_start, entry_end)
+            result.promoted.append((entry.entry_id, booking_id))
+            result.notification_ids.extend(_queue_notifications(cursor, resource, requester, entry, status))
+
+        if result.promoted:
+            EntityVersionDAL.bump('bookings', cursor)
+
+    NotificationService.dispatch_queued(result.notification_ids)
+    return result
+
+
+def _requires_manual_approval(resource, requester) -> bool:
+    return bool(
+        resource.is_restricted and
+        resource.owner_id != requester.user_id and
+        requester.role != 'admin'
+    )
+
+
+def _queue_notifications(cursor, resource, requester, entry, status) -> List[int]:
+    window = f'{humanize_datetime(entry.start_datetime)} – {humanize_datetime(entry.end_datetime)}'
+    queued = [NotificationService.queue_notification(
+        cursor,
+        requester.user_id,
+        'Waitlist slot available',
+        (
+            f'Good news! Your waitlist request for "{resource.title}" '
+            f'on {window} has been '
+            f'{"confirmed" if status == "approved" else "converted to a pending request"}. '
+            'Visit your dashboard to review the details.'
+        )
+    )]
+    if resource.owner_id != requester.user_id:
+        queued.append(NotificationService.queue_notification(
+            cursor,
+            resource.owner_id,
+            'Waitlist booking confirmed' if status == 'approved' else 'Waitlist request awaiting review',
+            (
+                f'The waitlist entry for "{resource.title}" requested by {requester.name or f"User #{requester.user_id}"} '
+                f'({window}) '
+                f'has been {"automatically approved" if status == "approved" else "queued for your review"}.'
+            )
+        ))
+    return queued
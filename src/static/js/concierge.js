@@ -0,0 +1,151 @@
+// Campus Resource Hub - streaming concierge answers
+// Progressive enhancement: without fetch streaming the form posts normally.
+
+document.addEventListener('DOMContentLoaded', initConciergeStreaming);
+
+function initConciergeStreaming() {
+    const form = document.getElementById('concierge-form');
+    const live = document.getElementById('concierge-live');
+    if (!form || !live || !window.fetch || !window.ReadableStream || !window.TextDecoder) {
+        return;
+    }
+
+    const answerEl = live.querySelector('[data-live-answer]');
+    const resourcesEl = live.querySelector('[data-live-resources]');
+    const errorEl = live.querySelector('[data-live-error]');
+    const badgeEl = live.querySelector('[data-live-badge]');
+    const submitBtn = form.querySelector('button[type="submit"]');
+
+    form.addEventListener('submit', event => {
+        const question = (form.querySelector('[name="question"]')?.value || '').trim();
+        if (!question) {
+            return;
+        }
+        event.preventDefault();
+
+        document.querySelectorAll('[data-server-answer]').forEach(el => el.remove());
+        live.classList.remove('d-none');
+        answerEl.textContent = '';
+        resourcesEl.innerHTML = '';
+        errorEl.classList.add('d-none');
+        badgeEl.classList.add('d-none');
+        if (submitBtn) submitBtn.disabled = true;
+
+        let streamedText = '';
+        const handlers = {
+            context: payload => renderResources(resourcesEl, payload.resources || []),
+            token: payload => {
+                streamedText += payload.text || '';
+                answerEl.textContent = streamedText;
+            },
+            done: payload => {
+                answerEl.innerHTML = renderAnswer(payload.answer || streamedText);
+                badgeEl.classList.toggle('d-none', !payload.used_llm);
+                if (payload.llm_error && payload.llm_error !== 'Local AI runtime is not configured.') {
+                    errorEl.textContent = payload.llm_error;
+                    errorEl.classList.remove('d-none');
+                }
+            },
+            error: payload => {
+                errorEl.textContent = payload.message || 'The concierge is unavailable right now.';
+                errorEl.classList.remove('d-none');
+            }
+        };
+
+        fetch(form.dataset.streamUrl, {
+            method: 'POST',
+            body: new FormData(form),
+            headers: { Accept: 'text/event-stream' }
+        })
+            .then(resp => {
+                if (!resp.ok || !resp.body) {
+                    return Promise.reject(resp.status);
+                }
+                return readEventStream(resp.body, handlers);
+            })
+            .catch(error => {
+                console.warn('Concierge stream failed, submitting normally', error);
+                form.submit();
+            })
+            .finally(() => {
+                if (submitBtn) submitBtn.disabled = false;
+            });
+    });
+}
+
+function readEventStream(body, handlers) {
+    const reader = body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    const dispatch = block => {
+        let eventName = 'message';
+        const dataLines = [];
+        block.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                eventName = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+        const handler = handlers[eventName];
+        if (!handler || !dataLines.length) return;
+        try {
+            handler(JSON.parse(dataLines.join('\n')));
+        } catch (err) {
+            console.warn('Malformed concierge event', err);
+        }
+    };
+
+    const pump = () => reader.read().then(({ done, value }) => {
+        if (value) {
+            buffer += decoder.decode(value, { stream: true });
+            let boundary = buffer.indexOf('\n\n');
+            while (boundary !== -1) {
+                dispatch(buffer.slice(0, boundary));
+                buffer = buffer.slice(boundary + 2);
+                boundary = buffer.indexOf('\n\n');
+            }
+        }
+        if (done) {
+            if (buffer.trim()) dispatch(buffer);
+            return undefined;
+        }
+        return pump();
+    });
+    return pump();
+}
+
+function renderAnswer(text) {
+    return escapeConciergeHtml(text)
+        .replace(/\*\*(.+?)\*\*/g, '<strong>$1</strong>')
+        .replace(/\n/g, '<br>');
+}
+
+function renderResources(container, resources) {
+    container.innerHTML = resources.map(resource => `
+        <div class="col-md-6">
+            <a href="/resources/${encodeURIComponent(resource.resource_id)}" class="text-decoration-none">
+                <div class="card h-100 border hover-shadow" style="border-radius: 0.75rem;">
+                    <div class="card-body">
+                        <div class="d-flex justify-content-between align-items-start mb-2">
+                            <h5 class="card-title h6 mb-0 fw-semibold">${escapeConciergeHtml(resource.title)}</h5>
+                            <span class="badge bg-light text-dark border">${escapeConciergeHtml(resource.category || 'General')}</span>
+                        </div>
+                        ${resource.location ? `<span class="small text-muted"><i class="bi bi-geo-alt me-1"></i>${escapeConciergeHtml(resource.location)}</span>` : ''}
+                    </div>
+                </div>
+            </a>
+        </div>
+    `).join('');
+}
+
+function escapeConciergeHtml(value) {
+    if (value === null || value === undefined) return '';
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
@@ -612,8 +612,7 @@ function initProgressiveImageLoading() {
                 if (img.hasAttribute('data-lazy-bg')) {
                     loadBackgroundImage(img, img.dataset.lazyBg);
                 } else if (img.tagName === 'IMG' && img.dataset.src) {
-                    img.src = img.dataset.src;
-                    img.removeAttribute('data-src');
+                    loadDeferredImage(img);
                 }
 
                 observer.unobserve(img);
@@ -628,6 +627,19 @@ function initProgressiveImageLoading() {
     lazyImages.forEach(img => imageObserver.observe(img));
 }
 
+function loadDeferredImage(img) {
+    // Promote <picture> WebP sources before the <img> fallback so the browser picks the best format
+    const picture = img.closest('picture');
+    if (picture) {
+        picture.querySelectorAll('source[data-srcset]').forEach(source => {
+            source.srcset = source.dataset.srcset;
+            source.removeAttribute('data-srcset');
+        });
+    }
+    img.src = img.dataset.src;
+    img.removeAttribute('data-src');
+}
+
 function initCarouselLazyLoading() {
     // Load carousel images on slide change for better performance
     const carousel = document.querySelector('#resourceCarousel');
@@ -635,8 +647,7 @@ function initCarouselLazyLoading() {
 
     const loadImage = (img) => {
         if (img.dataset.src && !img.src) {
-            img.src = img.dataset.src;
-            img.removeAttribute('data-src');
+            loadDeferredImage(img);
         }
     };
 
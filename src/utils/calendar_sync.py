@@ -5,30 +5,17 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timezone
-from typing import Dict, Optional, Tuple
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
 from zoneinfo import ZoneInfo
 
-try:
-    from google.oauth2.credentials import Credentials
-    from google_auth_oauthlib.flow import Flow
-    from google.auth.transport.requests import Request
-    from googleapiclient.discovery import build
-    from googleapiclient.errors import HttpError
-    GOOGLE_LIB_ERROR = None
-except ModuleNotFoundError as exc:  # pragma: no cover - exercised when deps missing
-    Credentials = None  # type: ignore[assignment]
-    Flow = None  # type: ignore[assignment]
-    Request = None  # type: ignore[assignment]
-    build = None  # type: ignore[assignment]
-
-    class HttpError(Exception):  # type: ignore[misc]
-        """Fallback HttpError when Google libs are unavailable."""
-
-    GOOGLE_LIB_ERROR = exc
-
 from src.config import Config
 from src.utils.datetime_helpers import parse_datetime
 
+if TYPE_CHECKING:  # pragma: no cover - annotations only
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import Flow
+
 
 GOOGLE_PROVIDER = 'google'
 CALENDAR_EVENT_COLOR = '4'  # Google Calendar blue
@@ -38,12 +25,30 @@ class CalendarSyncError(RuntimeError):
     """Custom exception for calendar failures."""
 
 
-def _ensure_google_libs():
-    if GOOGLE_LIB_ERROR is not None:
-        raise CalendarSyncError(
-            'Google client libraries are not installed. '
-            'Run "pip install google-auth google-auth-oauthlib google-api-python-client".'
+# The Google client stack takes a noticeable share of startup, so it is only
+# imported the first time a calendar feature actually needs it.
+_google_libs: Optional[SimpleNamespace] = None
+
+
+def _ensure_google_libs() -> SimpleNamespace:
+    """Import the Google client libraries on first use and return them."""
+    global _google_libs
+    if _google_libs is None:
+        try:
+            from google.oauth2.credentials import Credentials
+            from google_auth_oauthlib.flow import Flow
+            from google.auth.transport.requests import Request
+            from googleapiclient.discovery import build
+            from googleapiclient.errors import HttpError
+        except ModuleNotFoundError as exc:
+            raise CalendarSyncError(
+                'Google client libraries are not installed. '
+                'Run "pip install google-auth google-auth-oauthlib google-api-python-client".'
+            ) from exc
+        _google_libs = SimpleNamespace(
+            Credentials=Credentials, Flow=Flow, Request=Request, build=build, HttpError=HttpError
         )
+    return _google_libs
 
 
 def _localize(dt_value, tz_name: str):
@@ -70,7 +75,7 @@ def _escape_ics(value) -> str:
 
 def build_google_flow(redirect_uri: str, state: Optional[str] = None) -> Flow:
     """Prepare an OAuth flow for Google Calendar."""
-    _ensure_google_libs()
+    google = _ensure_google_libs()
     if not Config.GOOGLE_CLIENT_ID or not Config.GOOGLE_CLIENT_SECRET:
         raise CalendarSyncError('Google OAuth is not configured. Please set client credentials.')
 
@@ -82,16 +87,16 @@ def build_google_flow(redirect_uri: str, state: Optional[str] = None) -> Flow:
             "token_uri": "https://oauth2.googleapis.com/token",
         }
     }
-    flow = Flow.from_client_config(client_config, scopes=Config.GOOGLE_CALENDAR_SCOPES, state=state)
+    flow = google.Flow.from_client_config(client_config, scopes=Config.GOOGLE_CALENDAR_SCOPES, state=state)
     flow.redirect_uri = redirect_uri
     return flow
 
 
 def credentials_from_record(record: dict) -> Credentials:
-    _ensure_google_libs()
+    google = _ensure_google_libs()
     if not record:
         raise CalendarSyncError('No stored credentials were found.')
-    return Credentials.from_authorized_user_info(json.loads(record['credentials_json']))
+    return google.Credentials.from_authorized_user_info(json.loads(record['credentials_json']))
 
 
 def serialize_credentials(credentials: Credentials) -> str:
@@ -100,9 +105,9 @@ def serialize_credentials(credentials: Credentials) -> str:
 
 
 def refresh_credentials(credentials: Credentials) -> Credentials:
-    _ensure_google_libs()
+    google = _ensure_google_libs()
     if credentials.expired and credentials.refresh_token:
-        credentials.refresh(Request())
+        credentials.refresh(google.Request())
     if not credentials.valid and not credentials.refresh_token:
         raise CalendarSyncError('Stored credentials are no longer valid. Please reconnect Google Calendar.')
     return credentials
@@ -153,16 +158,16 @@ def build_google_event_payload(booking: dict, tz_name: str) -> Dict:
 
 def sync_booking_to_google(credentials: Credentials, booking: dict, tz_name: str, event_id: Optional[str] = None) -> Tuple[str, Optional[str]]:
     """Create or update an event in the user's Google Calendar."""
-    _ensure_google_libs()
+    google = _ensure_google_libs()
     refreshed = refresh_credentials(credentials)
     try:
-        service = build('calendar', 'v3', credentials=refreshed, cache_discovery=False)
+        service = google.build('calendar', 'v3', credentials=refreshed, cache_discovery=False)
         event_body = build_google_event_payload(booking, tz_name)
         if event_id:
             event = service.events().update(calendarId='primary', eventId=event_id, body=event_body).execute()
         else:
             event = service.events().insert(calendarId='primary', body=event_body).execute()
-    except HttpError as exc:
+    except google.HttpError as exc:
         raise CalendarSyncError(f'Google Calendar API error: {exc}') from exc
     return event.get('id'), event.get('htmlLink')
 
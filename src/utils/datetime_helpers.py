@@ -1,43 +1,112 @@
-"""Shared datetime utilities for calendars and booking summaries."""
+"""Shared datetime utilities for calendars and booking summaries.
+
+Values are stored as naive UTC ISO strings and shown in ``Config.TIMEZONE``.
+Timezone objects are looked up once per name, and ISO strings are parsed and
+localized through small LRU caches: a list page renders the same few hundred
+timestamps over and over, so repeated values cost a dict lookup. The cached
+datetimes are immutable and safe to share.
+"""
 from __future__ import annotations
 
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
 import calendar
-from typing import Iterable, Optional
+from typing import Iterable, List, Optional
+from zoneinfo import ZoneInfo
+
+from src.config import Config
+
+UTC = timezone.utc
+PARSE_CACHE_SIZE = 4096
+
+
+@lru_cache(maxsize=None)
+def get_timezone(name: str) -> tzinfo:
+    """Return the ``ZoneInfo`` for ``name``, built once per process."""
+    return ZoneInfo(name)
+
+
+def local_timezone() -> tzinfo:
+    """Display timezone (``Config.TIMEZONE``), read on each call so overrides apply."""
+    return get_timezone(Config.TIMEZONE)
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def parse_iso(value: str) -> Optional[datetime]:
+    """Parse the ISO formats stored in the database; None when ``value`` is not one."""
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _localize_iso(value: str, tz_name: str) -> Optional[datetime]:
+    dt = parse_iso(value)
+    if dt is None:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=UTC)
+    return dt.astimezone(get_timezone(tz_name))
+
+
+def to_local(value) -> Optional[datetime]:
+    """Convert a datetime or ISO string (naive means UTC) to an aware local datetime."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value.astimezone(local_timezone())
+    if isinstance(value, str):
+        return _localize_iso(value, Config.TIMEZONE)
+    return None
+
+
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _format_iso(value: str, tz_name: str, fmt: str) -> Optional[str]:
+    dt = _localize_iso(value, tz_name)
+    return dt.strftime(fmt) if dt else None
+
+
+def format_local(value, fmt: str = '%B %d, %Y %I:%M %p') -> Optional[str]:
+    """``to_local(value).strftime(fmt)``, or None when ``value`` cannot be parsed."""
+    if isinstance(value, str):
+        return _format_iso(value, Config.TIMEZONE, fmt)
+    dt = to_local(value)
+    return dt.strftime(fmt) if dt else None
+
+
+def to_epoch(value) -> Optional[int]:
+    """Whole Unix seconds for a datetime or stored ISO string (naive means UTC), as the epoch columns hold."""
+    dt = value if isinstance(value, datetime) else parse_iso(str(value))
+    if dt is None:
+        return None
+    return calendar.timegm(dt.utctimetuple() if dt.tzinfo else dt.timetuple())
+
+
+def parse_many(values: Iterable) -> List[Optional[datetime]]:
+    """``parse_datetime`` over a column of values, parsing each distinct string once."""
+    return [value if isinstance(value, datetime) else parse_iso(str(value)) for value in values]
 
 
 def utc_now_naive() -> datetime:
     """Return current UTC time as a naive datetime (legacy compatibility)."""
-    return datetime.now(timezone.utc).replace(tzinfo=None)
+    return datetime.now(UTC).replace(tzinfo=None)
 
 
 def local_to_utc(dt: datetime) -> datetime:
     """Convert local time (Bloomington, IN) to UTC naive datetime for database storage."""
-    from zoneinfo import ZoneInfo
-    from src.config import Config
-
     # If already has timezone info, convert to UTC
     if dt.tzinfo is not None:
-        return dt.astimezone(ZoneInfo('UTC')).replace(tzinfo=None)
+        return dt.astimezone(UTC).replace(tzinfo=None)
 
     # Otherwise, assume it's in local timezone
-    local_tz = ZoneInfo(Config.TIMEZONE)
-    dt_local = dt.replace(tzinfo=local_tz)
-    return dt_local.astimezone(ZoneInfo('UTC')).replace(tzinfo=None)
+    dt_local = dt.replace(tzinfo=local_timezone())
+    return dt_local.astimezone(UTC).replace(tzinfo=None)
 
 
 def utc_to_local(dt: datetime) -> datetime:
     """Convert UTC naive datetime to local timezone (Bloomington, IN)."""
-    from zoneinfo import ZoneInfo
-    from src.config import Config
-
-    # If naive, assume it's UTC
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=ZoneInfo('UTC'))
-
-    # Convert to local timezone
-    local_tz = ZoneInfo(Config.TIMEZONE)
-    return dt.astimezone(local_tz)
+    return to_local(dt)
 
 
 def build_booking_calendar(bookings: Iterable, month_token: Optional[str] = None):
@@ -91,26 +160,8 @@ def build_booking_calendar(bookings: Iterable, month_token: Optional[str] = None
 
 def humanize_datetime(value) -> str:
     """Render datetime objects or ISO strings into human-friendly text in local timezone."""
-    from zoneinfo import ZoneInfo
-    from src.config import Config
-    
-    if isinstance(value, datetime):
-        dt_obj = value
-    else:
-        try:
-            dt_obj = datetime.fromisoformat(str(value))
-        except ValueError:
-            return str(value)
-    
-    # If datetime is naive (from database), assume it's UTC and convert to local
-    if dt_obj.tzinfo is None:
-        dt_obj = dt_obj.replace(tzinfo=ZoneInfo('UTC'))
-    
-    # Convert to local timezone for display
-    local_tz = ZoneInfo(Config.TIMEZONE)
-    dt_local = dt_obj.astimezone(local_tz)
-    
-    return dt_local.strftime('%B %d, %Y %I:%M %p')
+    text = format_local(value if isinstance(value, datetime) else str(value))
+    return str(value) if text is None else text
 
 
 def describe_recurrence(rule: Optional[str]):
@@ -142,24 +193,8 @@ def parse_datetime(value, convert_to_local=False):
     Returns:
         datetime object (naive UTC by default, or timezone-aware local if convert_to_local=True)
     """
-    if isinstance(value, datetime):
-        dt = value
-    else:
-        try:
-            dt = datetime.fromisoformat(str(value))
-        except ValueError:
-            return None
-    
     if convert_to_local:
-        from zoneinfo import ZoneInfo
-        from src.config import Config
-        
-        # If naive, assume it's UTC
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=ZoneInfo('UTC'))
-        
-        # Convert to local timezone
-        local_tz = ZoneInfo(Config.TIMEZONE)
-        return dt.astimezone(local_tz)
-    
-    return dt
+        return to_local(value if isinstance(value, datetime) else str(value))
+    if isinstance(value, datetime):
+        return value
+    return parse_iso(str(value))
@@ -0,0 +1,54 @@
+"""Row encoders for streaming CSV / JSON Lines downloads."""
+from __future__ import annotations
+
+import csv
+import io
+import json
+from typing import Dict, Iterable, Iterator, Sequence
+
+# Flush encoded output to the client roughly every this many rows
+ROWS_PER_CHUNK = 200
+
+EXPORT_MIMETYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+def iter_csv(rows: Iterable[Dict], columns: Sequence[str]) -> Iterator[str]:
+    """Yield a header line then CSV-encoded rows in small chunks."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=list(columns), extrasaction='ignore')
+    writer.writeheader()
+    pending = 0
+    for row in rows:
+        writer.writerow(row)
+        pending += 1
+        if pending >= ROWS_PER_CHUNK:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
+            pending = 0
+    remainder = buffer.getvalue()
+    if remainder:
+        yield remainder
+
+
+def iter_jsonl(rows: Iterable[Dict], columns: Sequence[str]) -> Iterator[str]:
+    """Yield one JSON object per line, restricted to ``columns``."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps({column: row.get(column) for column in columns}, default=str))
+        if len(lines) >= ROWS_PER_CHUNK:
+            yield '\n'.join(lines) + '\n'
+            lines = []
+    if lines:
+        yield '\n'.join(lines) + '\n'
+
+
+def iter_export(rows: Iterable[Dict], columns: Sequence[str], fmt: str) -> Iterator[str]:
+    if fmt == 'csv':
+        return iter_csv(rows, columns)
+    if fmt == 'jsonl':
+        return iter_jsonl(rows, columns)
+    raise ValueError(f'Unsupported export format: {fmt}')
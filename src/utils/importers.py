@@ -0,0 +1,105 @@
+"""Record readers and password hashing for bulk CSV / JSON Lines imports."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import csv
+from itertools import islice, repeat
+import json
+import os
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from src.utils.passwords import DEFAULT_ROUNDS, hash_password
+
+IMPORT_FORMATS = ('csv', 'jsonl')
+
+
+def detect_format(path: str, fmt: Optional[str] = None) -> str:
+    """Return ``fmt`` or infer it from the file extension."""
+    fmt = (fmt or os.path.splitext(path)[1].lstrip('.')).lower()
+    if fmt == 'json':
+        fmt = 'jsonl'
+    if fmt not in IMPORT_FORMATS:
+        raise ValueError(f'Unsupported import format: {fmt or path}')
+    return fmt
+
+
+def iter_csv_records(handle) -> Iterator[Tuple[int, Dict]]:
+    """Yield ``(line number, row dict)`` pairs; blank cells become None."""
+    reader = csv.DictReader(handle)
+    for row in reader:
+        record = {
+            (key or '').strip(): (value.strip() or None) if isinstance(value, str) else value
+            for key, value in row.items()
+        }
+        yield reader.line_num, record
+
+
+def iter_jsonl_records(handle) -> Iterator[Tuple[int, Dict]]:
+    """Yield ``(line number, object)`` pairs, skipping blank lines."""
+    for line_number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as exc:
+            record = {'_error': f'Invalid JSON: {exc.msg}'}
+        if not isinstance(record, dict):
+            record = {'_error': 'Each line must be a JSON object'}
+        yield line_number, record
+
+
+def iter_records(path: str, fmt: Optional[str] = None) -> Iterator[Tuple[int, Dict]]:
+    fmt = detect_format(path, fmt)
+    with open(path, newline='' if fmt == 'csv' else None, encoding='utf-8-sig') as handle:
+        if fmt == 'csv':
+            yield from iter_csv_records(handle)
+        else:
+            yield from iter_jsonl_records(handle)
+
+
+def batched(iterable: Iterable, size: int) -> Iterator[List]:
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+class PasswordHasher:
+    """
+    Hash batches of passwords, fanning bcrypt out over worker processes.
+
+    ``workers=0`` hashes in-process, which is also the fallback when the
+    platform refuses to start a process pool.
+    """
+
+    def __init__(self, workers: Optional[int] = None, rounds: int = DEFAULT_ROUNDS):
+        self.workers = (os.cpu_count() or 1) if workers is None else max(0, workers)
+        self.rounds = rounds
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def hash_many(self, passwords: Sequence[str]) -> List[str]:
+        if not passwords:
+            return []
+        if self.workers and self._executor is None:
+            try:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers)
+            except (OSError, PermissionError):
+                self.workers = 0
+        if not self._executor:
+            return [hash_password(password, self.rounds) for password in passwords]
+        chunksize = max(1, len(passwords) // (self.workers * 4))
+        return list(self._executor.map(hash_password, passwords, repeat(self.rounds), chunksize=chunksize))
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
@@ -2,7 +2,7 @@
 Notification utilities
 Provides a simple way to persist and (optionally) send outbound emails.
 """
-from flask import current_app
+from flask import after_this_request, current_app, has_request_context
 
 from src.data_access import get_db
 from src.data_access.user_dal import UserDAL
@@ -44,6 +44,68 @@ class NotificationService:
         # Also log to stdout to aid developers during local testing
         print(f"[Notification::{channel}] → User {user_id} | {subject}\n{body}\n")
 
+    @staticmethod
+    def queue_notification(cursor, user_id, subject, body, channel='email'):
+        """Record a pending notification on the caller's transaction; deliver it with ``dispatch_queued``."""
+        cursor.execute(
+            '''
+            INSERT INTO notifications (user_id, channel, subject, body, status)
+            VALUES (?, ?, ?, ?, 'pending')
+            ''',
+            (user_id, channel, subject, body)
+        )
+        return cursor.lastrowid
+
+    @staticmethod
+    def dispatch_queued(notification_ids):
+        """Deliver queued notifications after the current response is sent (at once outside a request)."""
+        notification_ids = list(notification_ids)
+        if not notification_ids:
+            return
+        if not has_request_context():
+            NotificationService.deliver_queued(notification_ids)
+            return
+
+        app = current_app._get_current_object()
+
+        @after_this_request
+        def deliver_after_response(response):
+            def deliver():
+                with app.app_context():
+                    NotificationService.deliver_queued(notification_ids)
+            response.call_on_close(deliver)
+            return response
+
+    @staticmethod
+    def deliver_queued(notification_ids):
+        """Send pending notifications by email (when enabled) and record the delivery status."""
+        ids = list(notification_ids)
+        if not ids:
+            return
+        with get_db() as conn:
+            rows = conn.execute(
+                f'''
+                SELECT notification_id, user_id, channel, subject, body
+                FROM notifications
+                WHERE status = 'pending' AND notification_id IN ({",".join("?" for _ in ids)})
+                ''',
+                ids
+            ).fetchall()
+
+        statuses = []
+        for row in rows:
+            delivery_status = 'sent'
+            if row['channel'] == 'email':
+                delivered, attempted = NotificationService._deliver_email(
+                    user_id=row['user_id'], subject=row['subject'], body=row['body']
+                )
+                delivery_status = ('sent' if delivered else 'error') if attempted else 'logged'
+            statuses.append((delivery_status, row['notification_id']))
+            print(f"[Notification::{row['channel']}] → User {row['user_id']} | {row['subject']}\n{row['body']}\n")
+
+        with get_db() as conn:
+            conn.executemany('UPDATE notifications SET status = ? WHERE notification_id = ?', statuses)
+
     @staticmethod
     def _deliver_email(user_id, subject, body, recipient_email=None):
         """Deliver an email if SMTP is configured for the application.
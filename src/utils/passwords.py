@@ -0,0 +1,150 @@
+"""
+bcrypt hashing and verification off the request thread.
+
+Every hash or check goes through one process-wide ``PasswordExecutor``. The
+executor caps how many calls can be queued or running at once, and it runs
+bcrypt in a small process pool when ``PASSWORD_HASH_WORKERS`` is set.
+Requests beyond ``PASSWORD_HASH_MAX_PENDING`` wait up to
+``PASSWORD_HASH_QUEUE_TIMEOUT`` seconds and then fail fast with
+``PasswordHasherBusyError``, so login storms cannot stall every worker.
+"""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import threading
+from typing import Optional
+
+import bcrypt
+from flask import current_app, has_app_context
+
+from src.config import Config
+
+DEFAULT_ROUNDS = 12
+MIN_ROUNDS, MAX_ROUNDS = 4, 31
+
+
+class PasswordHasherBusyError(RuntimeError):
+    """Raised when the hashing queue stays full for longer than the queue timeout."""
+
+
+def hash_password(password: str, rounds: int = DEFAULT_ROUNDS) -> str:
+    """Return a bcrypt hash of ``password`` at the given work factor."""
+    salt = bcrypt.gensalt(rounds=min(MAX_ROUNDS, max(MIN_ROUNDS, int(rounds))))
+    return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+
+
+def check_password(password: str, password_hash: str) -> bool:
+    """Constant-time comparison of ``password`` against a stored bcrypt hash."""
+    try:
+        return bcrypt.checkpw(password.encode('utf-8'), password_hash.encode('utf-8'))
+    except ValueError:
+        # Malformed or legacy hash in the table: treat as a failed login
+        return False
+
+
+def hash_rounds(password_hash: str) -> Optional[int]:
+    """Read the work factor out of a ``$2b$12$...`` hash (None if unparseable)."""
+    parts = (password_hash or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(password_hash: str, rounds: int) -> bool:
+    return hash_rounds(password_hash) != int(rounds)
+
+
+class PasswordExecutor:
+    """
+    Bounded bcrypt executor.
+
+    ``workers=0`` runs bcrypt on the calling thread but still caps
+    concurrency, so a burst of logins queues here and not in every
+    request thread at once. The pool uses ``spawn`` so the children never
+    inherit the server's threads or open SQLite handles.
+    """
+
+    def __init__(self, *, rounds: int = DEFAULT_ROUNDS, workers: int = 0,
+                 max_pending: int = 32, queue_timeout: float = 5.0) -> None:
+        self.rounds = min(MAX_ROUNDS, max(MIN_ROUNDS, int(rounds)))
+        self.workers = max(0, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.queue_timeout = max(0.0, float(queue_timeout))
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def hash(self, password: str) -> str:
+        return self._run(hash_password, password, self.rounds)
+
+    def check(self, password: str, password_hash: str) -> bool:
+        return self._run(check_password, password, password_hash)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        return needs_rehash(password_hash, self.rounds)
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            raise PasswordHasherBusyError('Sign-in is busy right now; please try again in a moment.')
+        try:
+            pool = self._executor()
+            if pool is None:
+                return func(*args)
+            return pool.submit(func, *args).result()
+        finally:
+            self._slots.release()
+
+    def _executor(self) -> Optional[ProcessPoolExecutor]:
+        if not self.workers:
+            return None
+        with self._lock:
+            if self._pool is None:
+                try:
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context('spawn')
+                    )
+                except (OSError, PermissionError):
+                    # Sandboxed hosts without process support hash inline instead
+                    self.workers = 0
+            return self._pool
+
+    def shutdown(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
+
+
+_executor: Optional[PasswordExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_password_executor() -> PasswordExecutor:
+    """Return the process-wide executor, built from the active config on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = PasswordExecutor(
+                rounds=int(_config_value('BCRYPT_ROUNDS') or DEFAULT_ROUNDS),
+                workers=int(_config_value('PASSWORD_HASH_WORKERS') or 0),
+                max_pending=int(_config_value('PASSWORD_HASH_MAX_PENDING') or 32),
+                queue_timeout=float(_config_value('PASSWORD_HASH_QUEUE_TIMEOUT') or 5.0)
+            )
+        return _executor
+
+
+def reset_password_executor() -> None:
+    """Shut down the pool so the next call re-reads config (used by tests and reloads)."""
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = None
+
+
+def _config_value(name: str):
+    if has_app_context():
+        return current_app.config.get(name, getattr(Config, name, None))
+    return getattr(Config, name, None)
@@ -4,7 +4,20 @@ Server-side validation for all user inputs
 """
 import re
 from datetime import datetime
-import bleach
+
+# bleach is only needed by the form handlers that sanitize, so it is imported on first use
+_bleach = None
+
+
+def _ensure_bleach():
+    """Import ``bleach`` on first use and return the module."""
+    global _bleach
+    if _bleach is None:
+        import bleach
+
+        _bleach = bleach
+    return _bleach
+
 
 class Validator:
     """Input validation utilities"""
@@ -58,19 +71,13 @@ class Validator:
     def validate_datetime(datetime_str, field_name="Date/Time"):
         """Validate datetime string and convert from local timezone to UTC"""
         try:
-            from zoneinfo import ZoneInfo
-            from src.config import Config
+            from src.utils.datetime_helpers import local_to_utc
 
             # Parse the datetime string (from datetime-local input)
             dt = datetime.fromisoformat(datetime_str.replace('Z', '+00:00'))
 
-            # If datetime is naive (no timezone info from form), assume it's in local timezone
-            if dt.tzinfo is None:
-                local_tz = ZoneInfo(Config.TIMEZONE)
-                dt = dt.replace(tzinfo=local_tz)
-
-            # Convert to UTC and make naive for database storage
-            utc_dt = dt.astimezone(ZoneInfo('UTC')).replace(tzinfo=None)
+            # Naive form input is local time; convert to naive UTC for database storage
+            utc_dt = local_to_utc(dt)
             return True, utc_dt
         except (ValueError, AttributeError):
             return False, f"{field_name} must be a valid date and time"
@@ -176,6 +183,8 @@ class Validator:
         if not text:
             return ""
 
+        bleach = _ensure_bleach()
+
         # Use bleach to strip all HTML tags and attributes
         # This is the safest approach for user-generated content
         cleaned = bleach.clean(
@@ -200,6 +209,8 @@ class Validator:
             # Safe tags that don't allow script execution
             allowed_tags = ['p', 'br', 'strong', 'em', 'u', 'ol', 'ul', 'li']
 
+        bleach = _ensure_bleach()
+
         # Safe attributes (none by default for maximum security)
         allowed_attributes = {}
 
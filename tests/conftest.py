@@ -5,6 +5,10 @@ import pytest
 from src.app import create_app
 from src.config import Config
 from src.data_access import init_database
+from src.services import concierge_cache, concierge_snapshot, fragment_cache, request_metrics, user_cache
+from src.services.image_pipeline import reset_image_pipeline
+from src.services.llm_client import reset_runtime_state
+from src.utils.passwords import reset_password_executor
 
 
 @pytest.fixture(autouse=True)
@@ -13,14 +17,26 @@ def temp_db(tmp_path, monkeypatch):
     db_path = tmp_path / 'test.db'
     monkeypatch.setattr(Config, 'DATABASE_PATH', str(db_path))
     monkeypatch.setattr(Config, 'EMAIL_VERIFICATION_ENABLED', False)
+    monkeypatch.setattr(Config, 'SEED_SAMPLE_DATA', True)
 
     # Ensure upload folder exists for operations that rely on it
     upload_dir = tmp_path / 'uploads'
     upload_dir.mkdir(exist_ok=True)
     monkeypatch.setattr(Config, 'UPLOAD_FOLDER', str(upload_dir))
+    monkeypatch.setattr(Config, 'IMAGE_STAGING_FOLDER', str(tmp_path / 'upload-staging'))
 
     init_database()
+    # Process-level caches must not leak answers between isolated databases
+    monkeypatch.setattr(concierge_cache, '_shared_cache', None)
+    monkeypatch.setattr(concierge_snapshot, '_shared_snapshot', None)
+    monkeypatch.setattr(user_cache, '_shared_cache', None)
+    monkeypatch.setattr(request_metrics, '_shared_metrics', None)
+    monkeypatch.setattr(fragment_cache, '_shared_cache', None)
+    reset_runtime_state()
+    reset_password_executor()
+    reset_image_pipeline()
     yield
+    reset_image_pipeline()
 
     if os.path.exists(db_path):
         os.remove(db_path)
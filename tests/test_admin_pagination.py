@@ -0,0 +1,85 @@
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.pagination import decode_cursor, encode_cursor
+from src.data_access.user_dal import UserDAL
+
+
+def _login_admin(client):
+    client.post('/auth/login', data={'email': 'admin@iu.edu', 'password': 'AdminPass1!'}, follow_redirects=True)
+
+
+def _create_users(count):
+    for index in range(count):
+        UserDAL.create_user(
+            name=f'Paged User {index:02d}',
+            email=f'paged{index:02d}@iu.edu',
+            password='StrongPass1',
+            role='student',
+            department='Informatics'
+        )
+
+
+def test_cursor_round_trip_and_garbage():
+    token = encode_cursor('2025-01-01 10:00:00', 42)
+    assert decode_cursor(token) == ('2025-01-01 10:00:00', 42)
+    assert decode_cursor('not-a-cursor') is None
+    assert decode_cursor(None) is None
+
+
+def test_keyset_pages_cover_every_row_once_in_both_directions(app):
+    _create_users(23)
+    expected = [u['user_id'] for u in UserDAL.page_users(search='paged user', sort='name', descending=False, limit=100)]
+    assert len(expected) == 23
+
+    seen, pages, after = [], [], None
+    while True:
+        page = UserDAL.page_users(search='paged user', sort='name', descending=False, limit=5, after=after)
+        pages.append(page)
+        seen.extend(row['user_id'] for row in page)
+        if not page.next_cursor:
+            break
+        after = page.next_cursor
+    assert seen == expected
+    assert pages[0].prev_cursor is None
+
+    back = UserDAL.page_users(search='paged user', sort='name', descending=False, limit=5,
+                              before=pages[-1].prev_cursor)
+    assert [row['user_id'] for row in back] == [row['user_id'] for row in pages[-2]]
+
+
+def test_booking_pages_respect_status_filter(app):
+    page = BookingDAL.page_bookings(status='approved', limit=4)
+    total = len(BookingDAL.get_bookings_with_details(status='approved'))
+
+    assert len(page) == min(4, total)
+    assert {row['status'] for row in page} == {'approved'}
+    assert 'requester_email' in page.items[0]
+    assert bool(page.next_cursor) == (total > 4)
+
+
+def test_admin_listing_pages_render_with_pager(client):
+    _create_users(30)
+    _login_admin(client)
+
+    resp = client.get('/admin/users?q=paged&sort=name&dir=asc&per_page=10')
+    body = resp.get_data(as_text=True)
+    assert resp.status_code == 200
+    assert 'Paged User 00' in body and 'Paged User 10' not in body
+    assert 'rel="next"' in body
+
+    next_href = body.split('rel="next"')[0].rsplit('href="', 1)[1].split('"', 1)[0].replace('&amp;', '&')
+    second = client.get(next_href).get_data(as_text=True)
+    assert 'Paged User 10' in second and 'Paged User 00' not in second
+    assert 'rel="prev"' in second
+
+    for url in ('/admin/resources?status=published', '/admin/bookings?sort=created_at',
+                '/admin/reviews?status=flagged', '/admin/reports?per_page=2'):
+        assert client.get(url).status_code == 200
+
+
+def test_moderation_queue_pagers_use_separate_cursors(client):
+    _login_admin(client)
+
+    body = client.get('/admin/reports?per_page=2').get_data(as_text=True)
+
+    assert 'review_after=' in body
+    assert 'message_after=' in body
@@ -0,0 +1,94 @@
+from datetime import datetime, timedelta
+
+from src.data_access.analytics_rollup_dal import AnalyticsRollupDAL
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+
+
+def _live_aggregates():
+    return {
+        'booking_trend': BookingDAL.monthly_booking_trend(months=6),
+        'user_trend': UserDAL.monthly_registration_trend(months=6),
+        'booking_status': sorted((row['status'], row['total']) for row in BookingDAL.booking_status_breakdown()),
+        'departments': sorted((row['department'], row['total']) for row in BookingDAL.summarize_by_department(limit=50)),
+        'categories': sorted((row['category'], row['total']) for row in ResourceDAL.category_distribution(limit=50)),
+    }
+
+
+def _rollup_aggregates():
+    return {
+        'booking_trend': AnalyticsRollupDAL.monthly_booking_trend(months=6),
+        'user_trend': AnalyticsRollupDAL.monthly_registration_trend(months=6),
+        'booking_status': sorted((row['status'], row['total']) for row in AnalyticsRollupDAL.booking_status_breakdown()),
+        'departments': sorted((row['department'], row['total']) for row in AnalyticsRollupDAL.summarize_by_department(limit=50)),
+        'categories': sorted((row['category'], row['total']) for row in AnalyticsRollupDAL.category_distribution(limit=50)),
+    }
+
+
+def test_rollups_track_writes_through_triggers(app):
+    assert _rollup_aggregates() == _live_aggregates()
+
+    user = UserDAL.create_user(name='Rollup Tester', email='rollup@iu.edu', password='StrongPass1',
+                               role='staff', department='Physics')
+    resource = ResourceDAL.create_resource(
+        owner_id=user.user_id, title='Rollup Lab', description='Lab for rollup checks.',
+        category='Lab Equipment', location='Swain Hall', status='draft'
+    )
+    start = datetime.now() + timedelta(days=3)
+    booking = BookingDAL.create_booking(resource.resource_id, user.user_id, start, start + timedelta(hours=1))
+    assert _rollup_aggregates() == _live_aggregates()
+
+    BookingDAL.update_booking_status(booking.booking_id, 'approved')
+    UserDAL.update_user(user.user_id, department='Astronomy', role='student')
+    ResourceDAL.update_resource(resource.resource_id, status='published', category='Study Room')
+    assert _rollup_aggregates() == _live_aggregates()
+
+    UserDAL.delete_user(user.user_id)
+    assert _rollup_aggregates() == _live_aggregates()
+    assert AnalyticsRollupDAL.user_role_counts() == {
+        role: len([u for u in UserDAL.get_all_users() if u.role == role]) for role in ('student', 'staff', 'admin')
+    }
+
+
+def test_rollup_rebuild_and_compact_match_live_aggregates(app):
+    expected = _live_aggregates()
+    AnalyticsRollupDAL.rebuild()
+    assert _rollup_aggregates() == expected
+
+    resource = ResourceDAL.get_all_resources(status='draft', limit=1)[0]
+    ResourceDAL.delete_resource(resource.resource_id)
+    assert AnalyticsRollupDAL.compact() >= 0
+    assert AnalyticsRollupDAL.resource_status_counts() == {
+        status: ResourceDAL.count_resources(status=status)
+        for status in ('draft', 'published', 'archived')
+        if ResourceDAL.count_resources(status=status)
+    }
+
+
+def test_admin_dashboard_renders_from_rollups(client):
+    client.post('/auth/login', data={'email': 'admin@iu.edu', 'password': 'AdminPass1!'}, follow_redirects=True)
+
+    resp = client.get('/admin/')
+
+    assert resp.status_code == 200
+    total_users = sum(AnalyticsRollupDAL.user_role_counts().values())
+    assert f'<strong>{total_users}</strong>'.encode() in resp.data
+
+
+def test_init_database_rebuilds_rollups_after_interrupted_user_import(app):
+    from src.data_access import get_db, init_database
+
+    # An import that crashes mid-load leaves the users triggers dropped
+    with get_db() as conn:
+        conn.execute('DROP TRIGGER trg_users_rollup_insert')
+        conn.execute('DROP TRIGGER trg_users_rollup_department')
+        conn.execute(
+            "INSERT INTO users (name, email, password_hash, role, department) "
+            "VALUES ('Imported', 'imported@iu.edu', 'x', 'staff', 'Geology')"
+        )
+    assert _rollup_aggregates() != _live_aggregates()
+
+    init_database()
+
+    assert _rollup_aggregates() == _live_aggregates()
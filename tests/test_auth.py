@@ -1,8 +1,11 @@
 import bcrypt
 import sqlite3
+import threading
 import pytest
 
+from src.config import Config
 from src.data_access.user_dal import UserDAL
+from src.utils import passwords
 
 
 def test_create_user_hashes_password(temp_db):
@@ -38,3 +41,73 @@ def test_duplicate_email_rejected(temp_db):
             role='student',
             department='Business'
         )
+
+
+def test_login_rehashes_when_work_factor_changes(temp_db, monkeypatch):
+    """A successful login upgrades hashes stored at an outdated bcrypt cost."""
+    monkeypatch.setattr(Config, 'BCRYPT_ROUNDS', 4)
+    passwords.reset_password_executor()
+    user = UserDAL.create_user(name='Legacy Cost', email='legacy@iu.edu', password='SecurePass1')
+    assert passwords.hash_rounds(user.password_hash) == 4
+
+    monkeypatch.setattr(Config, 'BCRYPT_ROUNDS', 5)
+    passwords.reset_password_executor()
+    assert UserDAL.verify_password('legacy@iu.edu', 'WrongPass1') is None
+    assert UserDAL.get_user_by_id(user.user_id).password_hash == user.password_hash
+
+    verified = UserDAL.verify_password('legacy@iu.edu', 'SecurePass1')
+    stored = UserDAL.get_user_by_id(user.user_id).password_hash
+    assert verified.password_hash == stored
+    assert passwords.hash_rounds(stored) == 5
+    assert bcrypt.checkpw(b'SecurePass1', stored.encode('utf-8'))
+
+
+def test_password_executor_pool_and_bounded_queue():
+    """Pooled hashing matches inline bcrypt and a full queue fails fast."""
+    pooled = passwords.PasswordExecutor(rounds=4, workers=1)
+    try:
+        hashed = pooled.hash('SecurePass1')
+        assert pooled.check('SecurePass1', hashed)
+        assert not pooled.check('WrongPass1', hashed)
+        assert not pooled.check('SecurePass1', 'not-a-bcrypt-hash')
+    finally:
+        pooled.shutdown()
+
+    started, release = threading.Event(), threading.Event()
+    busy = passwords.PasswordExecutor(rounds=4, max_pending=1, queue_timeout=0)
+    holder = threading.Thread(target=busy._run, args=(lambda: started.set() or release.wait(),))
+    holder.start()
+    started.wait()
+    try:
+        with pytest.raises(passwords.PasswordHasherBusyError):
+            busy.hash('SecurePass1')
+    finally:
+        release.set()
+        holder.join()
+    assert busy.check('SecurePass1', busy.hash('SecurePass1'))
+
+
+def test_cached_user_loader_sees_suspension_on_next_request(client):
+    """Authenticated requests reuse the cached user until a write bumps its counter."""
+    from src.services.user_cache import get_user_cache
+
+    user = UserDAL.create_user(name='Cached User', email='cached@iu.edu', password='SecurePass1')
+    client.post('/auth/login', data={'email': 'cached@iu.edu', 'password': 'SecurePass1'})
+    cache = get_user_cache()
+
+    assert client.get('/dashboard').status_code == 200
+    hits = cache.hits
+    assert client.get('/dashboard').status_code == 200
+    assert cache.hits > hits
+
+    UserDAL.update_user(user.user_id, name='Renamed User')
+    assert 'Renamed User' in client.get('/dashboard').get_data(as_text=True)
+
+    UserDAL.set_suspension(user.user_id, True)
+    response = client.get('/dashboard')
+    assert response.status_code == 302
+    assert '/auth/login' in response.headers['Location']
+
+    UserDAL.set_suspension(user.user_id, False)
+    UserDAL.delete_user(user.user_id)
+    assert cache.load(user.user_id) is None
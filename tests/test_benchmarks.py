@@ -0,0 +1,86 @@
+from benchmarks.concierge_benchmark import STAGES, percentile, run_benchmark
+from benchmarks.datetime_benchmark import run_benchmark as run_datetime_benchmark
+from benchmarks.load_test import compare_reports, run_benchmark as run_load_test
+from benchmarks.login_benchmark import run_benchmark as run_login_benchmark
+from benchmarks.model_hydration_benchmark import run_benchmark as run_hydration_benchmark
+from benchmarks.startup_benchmark import run_benchmark as run_startup_benchmark
+from src.config import Config
+
+
+def test_percentile_uses_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_concierge_benchmark_reports_stage_percentiles(app):
+    app.config.update(CONCIERGE_CACHE_ENABLED=False)
+    questions = ['Which spaces support 3D printing?', 'Where can I find a quiet study room?']
+
+    report = run_benchmark(app, questions, iterations=2, concurrency=2, llm_latency_ms=5)
+
+    assert report['requests'] == 4
+    assert report['throughput_rps'] > 0
+    assert set(report['stages']) == set(STAGES)
+    assert report['stages']['llm']['p50'] >= 5
+    assert report['stages']['total']['p99'] >= report['stages']['llm']['p99']
+
+
+def test_hydration_benchmark_reports_slotted_savings():
+    report = run_hydration_benchmark(Config.DATABASE_PATH, rows=500, repeat=1, tables=['resources', 'reviews'])
+
+    assert set(report['models']) == {'Resource', 'Review'}
+    for stats in report['models'].values():
+        assert stats['slotted']['bytes'] < stats['legacy']['bytes']
+        assert stats['slotted']['seconds'] > 0
+
+
+def test_startup_benchmark_reports_phases_without_eager_integrations(tmp_path):
+    report = run_startup_benchmark(runs=1, workdir=str(tmp_path))
+
+    assert report['runs'] == 1
+    assert report['import_ms']['median'] > 0
+    assert report['factory_ms']['median'] > 0
+    assert report['deferred_loaded'] == []
+
+
+def test_login_benchmark_compares_inline_and_pooled_hashing():
+    report = run_login_benchmark(users=2, logins=4, threads=2, workers=1, rounds=4)
+
+    assert set(report['modes']) == {'inline', 'pooled'}
+    assert report['modes']['pooled']['workers'] == 1
+    for mode in report['modes'].values():
+        assert mode['logins_per_second'] > 0
+        assert mode['login_ms']['p95'] >= mode['login_ms']['p50'] > 0
+    assert Config.BCRYPT_ROUNDS == 12
+
+
+def test_load_test_runs_every_flow_and_flags_regressions():
+    report = run_load_test(users=40, resources=8, bookings=200, virtual_users=2, iterations=12, seed=3)
+
+    assert report['dataset']['bookings'] == 200
+    assert report['flows']['login']['count'] == 2
+    assert report['errors'] == 0 and report['throughput_rps'] > 0
+    for flow in report['flows'].values():
+        assert flow['p99'] >= flow['p95'] >= flow['p50'] > 0
+    assert report['flows']['browse']['queries_per_request'] > 0
+    assert Config.BCRYPT_ROUNDS == 12
+
+    slower = {
+        'throughput_rps': report['throughput_rps'] / 2,
+        'flows': {name: dict(flow, p95=flow['p95'] * 2) for name, flow in report['flows'].items()},
+    }
+    assert compare_reports(report, report) == []
+    problems = compare_reports(report, slower)
+    assert problems[0].startswith('throughput fell')
+    assert len(problems) == 1 + len(report['flows'])
+
+
+def test_datetime_benchmark_renders_identically_in_every_mode():
+    report = run_datetime_benchmark(values=400, distinct=20, repeat=1)
+
+    assert set(report['modes']) == {'legacy', 'cached'}
+    for stats in report['modes'].values():
+        assert stats['matches'] and stats['values_per_second'] > 0
@@ -129,3 +129,43 @@ def test_waitlist_promotion_after_cancellation(temp_db):
     refreshed_entry = WaitlistDAL.get_entry(entry.entry_id)
     assert refreshed_entry.status == 'promoted'
     assert refreshed_entry.booking_id == promoted_bookings[0].booking_id
+
+
+def test_promotion_only_touches_the_freed_interval_and_queues_notifications(client):
+    from src.data_access import get_db
+    from src.services.waitlist_promotion import BusyIntervals
+
+    owner = _create_user('Owner Four', 'owner4@iu.edu')
+    first, second, later = (_create_user(f'Waiter {n}', f'waiter{n}@iu.edu') for n in range(3))
+    resource = _create_resource(owner.user_id)
+    start = datetime(2031, 3, 5, 14, 0)
+    end = start + timedelta(hours=2)
+
+    blocking = BookingDAL.create_booking(resource.resource_id, owner.user_id, start, end, status='approved')
+    BookingDAL.create_booking(resource.resource_id, owner.user_id, start + timedelta(days=1),
+                              end + timedelta(days=1), status='approved')
+    early = WaitlistDAL.create_entry(resource.resource_id, first.user_id, start, end)
+    overlapping = WaitlistDAL.create_entry(resource.resource_id, second.user_id, start + timedelta(hours=1), end)
+    next_day = WaitlistDAL.create_entry(resource.resource_id, later.user_id,
+                                        start + timedelta(days=1), end + timedelta(days=1))
+
+    with client.session_transaction() as session:
+        session['_user_id'] = str(owner.user_id)
+        session['_fresh'] = True
+    response = client.post(f'/bookings/{blocking.booking_id}/cancel')
+    assert response.status_code == 302
+    response.close()  # Queued emails go out once the response is closed
+
+    # The oldest entry takes the slot; the one overlapping it and the next-day one stay queued
+    assert WaitlistDAL.get_entry(early.entry_id).status == 'promoted'
+    assert WaitlistDAL.get_entry(overlapping.entry_id).status == 'active'
+    assert WaitlistDAL.get_entry(next_day.entry_id).status == 'active'
+    with get_db() as conn:
+        rows = conn.execute(
+            "SELECT user_id, status FROM notifications WHERE subject LIKE 'Waitlist%' ORDER BY notification_id"
+        ).fetchall()
+    assert [(row['user_id'], row['status']) for row in rows] == [(first.user_id, 'logged'), (owner.user_id, 'logged')]
+
+    busy = BusyIntervals([(10, 20), (30, 40)])
+    busy.add(20, 30)
+    assert len(busy) == 1 and busy.overlaps(39, 50) and not busy.overlaps(40, 50) and not busy.overlaps(0, 10)
@@ -28,12 +28,12 @@ def test_concierge_service_calls_local_llm(app, monkeypatch):
         def json(self):
             return self._payload
 
-    def fake_post(url, json=None, headers=None, timeout=None):
+    def fake_post(session, url, json=None, headers=None, timeout=None, stream=False):
         called['url'] = url
         called['payload'] = json
         return FakeResponse()
 
-    monkeypatch.setattr('requests.post', fake_post)
+    monkeypatch.setattr('requests.Session.post', fake_post)
 
     with _app_context(app):
         service = ConciergeService()
@@ -62,3 +62,138 @@ def test_concierge_service_falls_back_when_llm_unavailable(app, monkeypatch):
     assert result['used_llm'] is False
     assert 'fallback' in result['answer'].lower()
     assert result['llm_error'] == 'Ollama runtime not reachable'
+
+
+def _counting_client(answer='Cached answer'):
+    calls = {'count': 0}
+
+    class CountingClient:
+        model = 'llama3.1'
+
+        def chat(self, messages):
+            calls['count'] += 1
+            return answer
+
+    return CountingClient(), calls
+
+
+def test_concierge_serves_repeat_questions_from_cache(app, monkeypatch):
+    """Equivalent questions should reuse the cached LLM answer."""
+    client, calls = _counting_client('Try the quiet study rooms in Wells Library.')
+    monkeypatch.setattr('src.services.llm_client.LocalLLMClient.from_app_config', lambda: client)
+
+    with _app_context(app):
+        first = ConciergeService().answer('Where can I study quietly?')
+        second = ConciergeService().answer('where can i study   QUIETLY')
+
+    assert calls['count'] == 1
+    assert first['cache_hit'] is False
+    assert second['cache_hit'] is True
+    assert second['used_llm'] is True
+    assert second['answer'] == first['answer']
+
+
+def test_concierge_cache_shared_tier_survives_process_cache_reset(app, monkeypatch):
+    """A fresh worker should find answers persisted by another worker."""
+    from src.services import concierge_cache
+
+    client, calls = _counting_client()
+    monkeypatch.setattr('src.services.llm_client.LocalLLMClient.from_app_config', lambda: client)
+
+    with _app_context(app):
+        ConciergeService().answer('Which spaces support 3D printing?')
+        monkeypatch.setattr(concierge_cache, '_shared_cache', None)
+        result = ConciergeService().answer('Which spaces support 3D printing?')
+
+    assert calls['count'] == 1
+    assert result['cache_hit'] is True
+
+
+def test_concierge_cache_invalidated_when_cited_resource_changes(app, monkeypatch):
+    """Updating a cited resource must force a fresh LLM call."""
+    from src.data_access.resource_dal import ResourceDAL
+
+    client, calls = _counting_client()
+    monkeypatch.setattr('src.services.llm_client.LocalLLMClient.from_app_config', lambda: client)
+
+    with _app_context(app):
+        first = ConciergeService().answer('Which spaces support 3D printing?')
+        cited_id = first['resources'][0]['resource_id']
+        ResourceDAL.update_resource(cited_id, capacity=99)
+        second = ConciergeService().answer('Which spaces support 3D printing?')
+
+    assert calls['count'] == 2
+    assert second['cache_hit'] is False
+
+
+def test_resource_writes_purge_the_process_cache(app):
+    """ResourceDAL writes go through the service cache, so the local LRU forgets cited answers too."""
+    from src.data_access.resource_dal import ResourceDAL
+    from src.services.concierge_cache import ConciergeResponseCache, get_response_cache
+
+    with _app_context(app):
+        cache = get_response_cache()
+        cache.set('cited', 'answer', resource_ids=[1])
+        ResourceDAL.update_resource(1, capacity=42)
+        assert 'cited' not in cache._entries
+
+    normalize = ConciergeResponseCache.normalize_question
+    stop = ConciergeService.STOP_WORDS
+    assert normalize('Can I book the lab?', stop) == normalize('can i book THE lab', stop) == 'book lab'
+    assert normalize('Move lab to studio', stop) != normalize('Move studio to lab', stop)
+
+
+def test_concierge_cache_lru_and_ttl():
+    """The in-process tier should evict least-recently-used and expired entries."""
+    from src.services.concierge_cache import ConciergeResponseCache
+
+    cache = ConciergeResponseCache(max_entries=2, ttl_seconds=60, use_shared_tier=False)
+    cache.set('a', 'answer a', resource_ids=[1])
+    cache.set('b', 'answer b', resource_ids=[2])
+    assert cache.get('a') == 'answer a'
+    cache.set('c', 'answer c', resource_ids=[3])
+
+    assert cache.get('b') is None
+    assert cache.get('a') == 'answer a'
+
+    cache.invalidate_resource(3)
+    assert cache.get('c') is None
+
+    cache._entries['a']['expires_at'] = 0
+    assert cache.get('a') is None
+
+
+def test_concierge_snapshot_mirrors_resource_search(app):
+    """In-memory retrieval must return what ResourceDAL.search_resources would."""
+    from src.data_access.resource_dal import ResourceDAL
+    from src.services.concierge_snapshot import ConciergeSnapshot
+
+    snapshot = ConciergeSnapshot(ttl_seconds=60)
+    for keyword, category in [(None, None), ('study', None), ('lab', 'Lab Equipment'), ('printing', None)]:
+        expected = ResourceDAL.search_resources(keyword=keyword, category=category, per_page=50)
+        actual = snapshot.search(keyword=keyword, category=category, limit=50)
+        assert [entry.resource.resource_id for entry in actual] == [r.resource_id for r in expected]
+
+
+def test_concierge_snapshot_refreshes_on_resource_writes_and_ttl(app):
+    """Resource writes bump the version counter; idle snapshots expire after the TTL."""
+    from src.data_access.resource_dal import ResourceDAL
+    from src.services.concierge_snapshot import ConciergeSnapshot
+
+    snapshot = ConciergeSnapshot(ttl_seconds=60)
+    target = snapshot.search(limit=1)[0].resource
+    ResourceDAL.update_resource(target.resource_id, title='Snapshot Refresh Studio')
+
+    snapshot.ensure_fresh()
+    assert [entry.resource.resource_id for entry in snapshot.search(keyword='snapshot refresh')] == [target.resource_id]
+
+    # Writes that bypass the DAL are only picked up once the TTL lapses
+    from src.data_access import get_db
+    with get_db() as conn:
+        conn.execute("UPDATE resources SET title = 'Raw SQL Title' WHERE resource_id = ?", (target.resource_id,))
+    snapshot.ensure_fresh()
+    assert snapshot.search(keyword='raw sql title') == []
+
+    snapshot._loaded_at -= 61
+    snapshot.ensure_fresh()
+    assert len(snapshot.search(keyword='raw sql title')) == 1
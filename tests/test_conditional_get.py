@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.message_dal import MessageDAL
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.review_dal import ReviewDAL
+from src.data_access.user_dal import UserDAL
+
+
+def _login(client, user_id):
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+
+
+def _revalidate(client, path, etag):
+    return client.get(path, headers={'If-None-Match': etag})
+
+
+def test_pages_answer_304_until_their_data_changes(client, monkeypatch):
+    first = client.get('/resources/')
+    assert first.status_code == 200 and first.headers['Cache-Control'] == 'private, no-cache'
+    etag = first.headers['ETag']
+
+    calls = []
+    original = BookingDAL.get_bookings_for_resources
+    monkeypatch.setattr(BookingDAL, 'get_bookings_for_resources',
+                        staticmethod(lambda *args, **kwargs: calls.append(args) or original(*args, **kwargs)))
+    repeat = _revalidate(client, '/resources/', etag)
+    assert repeat.status_code == 304 and repeat.data == b'' and calls == []
+    assert _revalidate(client, '/resources/?category=Study%20Room', etag).status_code == 200
+
+    start = datetime.now() + timedelta(days=2)
+    BookingDAL.create_booking(1, 4, start, start + timedelta(hours=1))
+    assert _revalidate(client, '/resources/', etag).status_code == 200
+
+    detail = client.get('/resources/1')
+    etag = detail.headers['ETag']
+    assert _revalidate(client, '/resources/1', etag).status_code == 304
+    ReviewDAL.create_review(1, 4, 5, 'Bright and quiet.')
+    changed = _revalidate(client, '/resources/1', etag)
+    assert changed.status_code == 200 and b'Bright and quiet.' in changed.data
+
+    # Renaming the owner changes the page too
+    etag = changed.headers['ETag']
+    UserDAL.update_user(ResourceDAL.get_resource_by_id(1).owner_id, name='Renamed Owner')
+    renamed = _revalidate(client, '/resources/1', etag)
+    assert renamed.status_code == 200 and b'Renamed Owner' in renamed.data
+
+    # A missing resource redirects as before and never gets an ETag
+    missing = client.get('/resources/99999')
+    assert missing.status_code == 302 and 'ETag' not in missing.headers
+
+
+def test_feeds_revalidate_per_viewer(client):
+    thread = MessageDAL.get_thread_by_id(1)
+    member, other = thread['owner_id'], thread['participant_id']
+    _login(client, member)
+
+    path = '/messages/thread/1/messages/feed'
+    etag = client.get(path).headers['ETag']
+    assert _revalidate(client, path, etag).status_code == 304
+    MessageDAL.create_message(other, member, 'Are you still coming?', thread_id=1)
+    fresh = _revalidate(client, path, etag)
+    assert fresh.status_code == 200 and b'Are you still coming?' in fresh.data
+
+    feed = client.get('/notifications/feed')
+    etag = feed.headers['ETag']
+    assert _revalidate(client, '/notifications/feed', etag).status_code == 304
+    client.post('/notifications/ack')
+    assert _revalidate(client, '/notifications/feed', etag).status_code == 200
+
+    # Someone outside the thread still gets a 403 rather than a 304
+    outsider = next(user_id for user_id in range(1, 20) if user_id not in (member, other))
+    _login(client, outsider)
+    denied = _revalidate(client, path, fresh.headers['ETag'])
+    assert denied.status_code == 403 and 'ETag' not in denied.headers
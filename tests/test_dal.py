@@ -1,8 +1,13 @@
 from datetime import datetime
 
+import pytest
+
+from src.data_access import get_db
 from src.data_access.booking_dal import BookingDAL
 from src.data_access.resource_dal import ResourceDAL
+from src.data_access.result_set import LazyResultSet
 from src.data_access.user_dal import UserDAL
+from src.models.models import Resource
 
 
 def create_user(email='owner@iu.edu', name='Owner'):
@@ -36,6 +41,9 @@ def test_resource_dal_crud(temp_db):
     fetched = ResourceDAL.get_resource_by_id(created.resource_id)
     assert fetched.title == 'Campus Auditorium'
     assert fetched.is_restricted is True
+    by_id = ResourceDAL.get_resources_by_ids([created.resource_id, created.resource_id, 999999])
+    assert list(by_id) == [created.resource_id]
+    assert by_id[created.resource_id].title == 'Campus Auditorium'
 
     ResourceDAL.update_resource(created.resource_id, status='published', capacity=300)
     updated = ResourceDAL.get_resource_by_id(created.resource_id)
@@ -234,3 +242,147 @@ def test_booking_analytics_helpers(temp_db):
     owner_usage = BookingDAL.summarize_owner_resources(staff.user_id)
     assert owner_usage[0]['title'] == 'Analytics Lab'
     assert owner_usage[0]['total'] == 2
+
+
+def test_row_mapper_matches_dict_construction(temp_db):
+    owner = create_user()
+    resource = ResourceDAL.create_resource(
+        owner_id=owner.user_id,
+        title='Maker Space',
+        description='Prototyping lab.',
+        category='Lab Equipment',
+        location='Luddy Hall',
+        capacity=12,
+        is_restricted=True,
+        status='published'
+    )
+
+    with get_db() as conn:
+        rows = conn.execute(
+            'SELECT r.*, 3 AS booking_count, 4.5 AS avg_rating FROM resources r'
+        ).fetchall()
+        partial = conn.execute('SELECT title, resource_id FROM resources').fetchone()
+
+    hydrated = Resource.from_rows(rows)
+    assert len(hydrated) == 1
+    assert hydrated[0].to_dict() == ResourceDAL.get_resource_by_id(resource.resource_id).to_dict()
+    assert hydrated[0].is_restricted is True
+    assert not hasattr(hydrated[0], '__dict__')
+
+    # Columns the query does not return fall back to constructor defaults
+    sparse = Resource.from_row(partial)
+    assert (sparse.resource_id, sparse.title, sparse.status) == (resource.resource_id, 'Maker Space', 'draft')
+
+
+def test_lazy_result_set_counts_slices_and_streams(temp_db):
+    owner = create_user()
+    for index in range(7):
+        ResourceDAL.create_resource(
+            owner_id=owner.user_id,
+            title=f'Room {index}',
+            description='Study room.',
+            category='Study Room',
+            location='Library',
+            status='published'
+        )
+
+    owned = ResourceDAL.get_resources_by_owner(owner.user_id)
+    with get_db() as conn:
+        ordered = Resource.from_rows(conn.execute(
+            'SELECT * FROM resources WHERE owner_id = ? ORDER BY created_at DESC, resource_id DESC', (owner.user_id,)
+        ).fetchall())
+    assert len(ordered) == 7
+    assert len(owned) == 7
+    assert [r.resource_id for r in owned[:3]] == [r.resource_id for r in ordered[:3]]
+    assert [r.resource_id for r in owned[2:4]] == [r.resource_id for r in ordered[2:4]]
+    assert owned[-1].resource_id == ordered[-1].resource_id
+    assert [r.resource_id for r in owned] == [r.resource_id for r in ordered]
+    assert owned[:0] == []
+
+    limited = ResourceDAL.get_all_resources(status='published', limit=5, offset=4)
+    assert len(limited) == 3
+    assert [r.resource_id for r in limited[1:]] == [r.resource_id for r in ordered[5:]]
+    assert not ResourceDAL.get_resources_by_owner(owner.user_id + 999)
+
+    streamed = LazyResultSet(
+        Resource, 'SELECT * FROM resources WHERE owner_id = ? ORDER BY created_at DESC, resource_id DESC',
+        (owner.user_id,), batch_size=3
+    )
+    assert [r.resource_id for r in streamed] == [r.resource_id for r in ordered]
+
+
+def test_lazy_result_set_allows_writes_inside_the_loop(temp_db, monkeypatch):
+    owner = create_user()
+    with get_db() as conn:
+        conn.executemany(
+            "INSERT INTO resources (owner_id, title, status) VALUES (?, ?, 'published')",
+            [(owner.user_id, f'Bulk Room {index}') for index in range(250)]
+        )
+
+    # More rows than one batch: every write must go through without 'database is locked'
+    for resource in ResourceDAL.get_all_resources(status='published'):
+        ResourceDAL.update_resource(resource.resource_id, capacity=4)
+    assert {r.capacity for r in ResourceDAL.get_all_resources(status='published')} == {4}
+
+    # Rows are read one batch per query, and results over RESULT_CACHE_ROWS are not kept
+    batches = []
+    from_rows = Resource.from_rows
+    monkeypatch.setattr(Resource, 'from_rows', lambda rows: batches.append(len(rows)) or from_rows(rows))
+    monkeypatch.setattr('src.data_access.result_set.RESULT_CACHE_ROWS', 200)
+    lazy = LazyResultSet(Resource, 'SELECT * FROM resources ORDER BY resource_id', batch_size=100)
+    assert len(list(lazy)) == 250
+    assert batches == [100, 100, 50]
+    assert repr(lazy).endswith('(unevaluated)>')
+
+    # An abandoned iteration leaves no connection (and no lock) behind
+    abandoned = iter(ResourceDAL.get_all_resources(status='published'))
+    next(abandoned)
+    ResourceDAL.update_resource(resource.resource_id, capacity=6)
+
+
+def test_epoch_shadow_columns_stay_in_sync_and_backfill(temp_db):
+    from datetime import timedelta
+    from src.data_access import init_database
+    from src.data_access.notification_dal import NotificationDAL
+
+    owner = create_user()
+    resource = ResourceDAL.create_resource(owner_id=owner.user_id, title='Epoch Lab', description='Lab.',
+                                           category='Lab Equipment', location='Swain', status='published')
+    requester = create_user(email='requester@iu.edu', name='Requester')
+    start = datetime(2030, 5, 1, 14, 0)
+    booking = BookingDAL.create_booking(resource.resource_id, requester.user_id, start, start + timedelta(hours=2))
+
+    def epochs():
+        with get_db() as conn:
+            return tuple(conn.execute(
+                'SELECT start_epoch, end_epoch FROM bookings WHERE booking_id = ?', (booking.booking_id,)
+            ).fetchone())
+
+    assert epochs() == (1903874400, 1903881600)
+    # Text with a ' ' separator sorts before 'T'; the epoch range check does not care
+    assert BookingDAL.check_booking_conflict(resource.resource_id, '2030-05-01 15:00:00', '2030-05-01 16:00:00')
+    assert not BookingDAL.check_booking_conflict(resource.resource_id, '2030-05-01 16:00:00', '2030-05-01 17:00:00')
+    # Unparseable bounds are an error, never a silent "no conflict"
+    with pytest.raises(ValueError):
+        BookingDAL.check_booking_conflict(resource.resource_id, 'tomorrow at noon', '2030-05-01 17:00:00')
+    with pytest.raises(ValueError):
+        ResourceDAL.search_resources(available_start='2030-05-01 15:00:00', available_end='soon')
+    with get_db() as conn:
+        conn.execute("UPDATE bookings SET start_datetime = '2030-05-01 15:00:00' WHERE booking_id = ?",
+                     (booking.booking_id,))
+    assert epochs() == (1903878000, 1903881600)
+
+    # Mixed stored formats still come back newest first
+    with get_db() as conn:
+        conn.executemany(
+            "INSERT INTO notifications (user_id, channel, subject, body, status, created_at) VALUES (?, 'email', ?, 'b', 'logged', ?)",
+            [(owner.user_id, 'older', '2030-01-01T23:00:00'), (owner.user_id, 'newer', '2030-01-02 01:00:00')]
+        )
+    assert [row['subject'] for row in NotificationDAL.get_recent_notifications(owner.user_id)][:2] == ['newer', 'older']
+
+    # A database from before the shadow columns existed is backfilled on startup
+    with get_db() as conn:
+        conn.execute('DROP TRIGGER trg_bookings_epoch_insert')
+        conn.execute('UPDATE bookings SET start_epoch = NULL, end_epoch = NULL, created_epoch = NULL')
+    init_database()
+    assert epochs() == (1903878000, 1903881600)
@@ -0,0 +1,93 @@
+from datetime import date
+import sqlite3
+
+from benchmarks.data_generator import generate_dataset, term_weight
+from src.config import Config
+from src.data_access import init_database
+
+TODAY = date(2026, 6, 1)
+
+
+def _schema_objects(conn):
+    return set(conn.execute("SELECT type, name FROM sqlite_master WHERE type IN ('index', 'trigger')"))
+
+
+def _bookings_per_day(conn, first, last):
+    total = conn.execute(
+        'SELECT COUNT(*) FROM bookings WHERE substr(start_datetime, 1, 10) BETWEEN ? AND ?', (first, last)
+    ).fetchone()[0]
+    return total / ((date.fromisoformat(last) - date.fromisoformat(first)).days + 1)
+
+
+def test_generator_shapes_bookings_and_restores_the_schema(temp_db):
+    conn = sqlite3.connect(Config.DATABASE_PATH)
+    before = _schema_objects(conn)
+    existing = conn.execute('SELECT COUNT(*) FROM bookings').fetchone()[0]
+
+    report = generate_dataset(users=400, resources=50, bookings=8000, threads=60, reviews=300,
+                              seed=7, today=TODAY)
+
+    assert report['rows']['bookings'] == 8000 and report['rows']['message_threads'] == 60
+    assert _schema_objects(conn) == before
+    assert conn.execute('PRAGMA foreign_key_check').fetchall() == []
+    rollup_total = conn.execute('SELECT SUM(total) FROM booking_daily_rollup').fetchone()[0]
+    assert rollup_total == existing + 8000
+
+    # Zipfian popularity: the busiest tenth of resources takes most of the bookings
+    counts = [row[0] for row in conn.execute('''
+        SELECT COUNT(*) FROM bookings b JOIN users u ON u.user_id = b.requester_id
+        WHERE u.email LIKE '%@synthetic.iu.edu' GROUP BY b.resource_id ORDER BY 1 DESC
+    ''')]
+    assert sum(counts[:5]) > 0.5 * sum(counts)
+
+    # Finals week is busier than spring break, weekdays busier than weekends
+    assert term_weight(date(2026, 4, 28)) > term_weight(date(2026, 3, 17))
+    assert _bookings_per_day(conn, '2026-04-27', '2026-05-01') > 2 * _bookings_per_day(conn, '2026-03-16', '2026-03-20')
+    weekend, weekday = conn.execute('''
+        SELECT SUM(strftime('%w', substr(start_datetime, 1, 10)) IN ('0', '6')),
+               SUM(strftime('%w', substr(start_datetime, 1, 10)) IN ('2', '3'))
+        FROM bookings
+    ''').fetchone()
+    assert weekday > weekend
+
+    series = conn.execute('''
+        SELECT recurrence_rule, COUNT(*), COUNT(DISTINCT substr(start_datetime, 12)),
+               MAX(julianday(start_datetime)) - MIN(julianday(start_datetime))
+        FROM bookings WHERE recurrence_rule LIKE 'FREQ=WEEKLY;COUNT=%'
+        GROUP BY resource_id, requester_id, recurrence_rule, created_at
+    ''').fetchall()
+    assert series
+    for rule, occurrences, clock_times, span_days in series:
+        assert occurrences == int(rule.rsplit('=', 1)[1]) and clock_times == 1
+        assert span_days == 7 * (occurrences - 1)
+
+    assert conn.execute('''
+        SELECT COUNT(*) FROM message_threads t
+        WHERE NOT EXISTS (SELECT 1 FROM messages m WHERE m.thread_id = t.thread_id)
+    ''').fetchone()[0] == 0
+    assert {row[0] for row in conn.execute('SELECT DISTINCT rating FROM reviews')} <= {1, 2, 3, 4, 5}
+
+    # Keyset pagination on the admin booking list stays on its index at this size
+    plan = ' '.join(row[3] for row in conn.execute('''
+        EXPLAIN QUERY PLAN SELECT * FROM bookings
+        WHERE status = 'pending' AND (start_datetime, booking_id) > ('2026-06-01', 0)
+        ORDER BY start_datetime, booking_id LIMIT 25
+    '''))
+    assert 'idx_bookings_status_keyset' in plan
+    conn.close()
+
+
+def test_generator_is_reproducible_for_a_seed(tmp_path, monkeypatch):
+    snapshots = []
+    for name in ('first.db', 'second.db'):
+        monkeypatch.setattr(Config, 'DATABASE_PATH', str(tmp_path / name))
+        init_database()
+        generate_dataset(users=120, resources=12, bookings=900, threads=10, reviews=30, seed=11, today=TODAY)
+        conn = sqlite3.connect(Config.DATABASE_PATH)
+        snapshots.append([
+            conn.execute('SELECT * FROM bookings ORDER BY booking_id').fetchall(),
+            conn.execute('SELECT * FROM messages ORDER BY message_id').fetchall(),
+            conn.execute('SELECT resource_id, reviewer_id, rating FROM reviews ORDER BY review_id').fetchall(),
+        ])
+        conn.close()
+    assert snapshots[0] == snapshots[1]
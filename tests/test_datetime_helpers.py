@@ -0,0 +1,32 @@
+from datetime import datetime, timezone
+
+from src.config import Config
+from src.utils import datetime_helpers
+from src.utils.datetime_helpers import (
+    humanize_datetime,
+    parse_datetime,
+    parse_many,
+    to_local,
+)
+
+
+def test_cached_conversions_match_zoneinfo_and_follow_timezone_changes(app, monkeypatch):
+    stored = '2025-01-15 17:30:00'
+    local = to_local(stored)
+    assert (local.hour, local.utcoffset().total_seconds()) == (12, -5 * 3600)
+    assert to_local(stored) is local  # Second lookup is served from the cache
+    assert to_local(datetime(2025, 1, 15, 17, 30)) == local
+    assert parse_datetime(stored, convert_to_local=True) == local
+    assert humanize_datetime(stored) == 'January 15, 2025 12:30 PM'
+    assert humanize_datetime('not a date') == 'not a date'
+
+    with app.test_request_context():
+        render = app.jinja_env.from_string('{{ value|datetime_format }}|{{ bad|datetime_format }}')
+        assert render.render(value='2025-07-04T16:00:00Z', bad='soon') == 'July 04, 2025 at 12:00 PM|soon'
+
+    assert to_local(datetime(2025, 1, 15, 17, 30, tzinfo=timezone.utc)) == local
+    assert parse_many([stored, 'garbage']) == [datetime(2025, 1, 15, 17, 30), None]
+
+    monkeypatch.setattr(Config, 'TIMEZONE', 'Europe/London')
+    assert to_local(stored).hour == 17
+    assert datetime_helpers.get_timezone.cache_info().currsize >= 2
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.export_dal import ExportDAL
+from src.data_access.user_dal import UserDAL
+
+
+def _login_admin(client):
+    client.post('/auth/login', data={'email': 'admin@iu.edu', 'password': 'AdminPass1!'}, follow_redirects=True)
+
+
+def test_booking_csv_export_streams_all_rows(client):
+    _login_admin(client)
+
+    resp = client.get('/admin/exports/bookings.csv')
+
+    assert resp.status_code == 200
+    assert resp.mimetype == 'text/csv'
+    assert resp.is_streamed
+    assert 'attachment; filename=bookings-export-' in resp.headers['Content-Disposition']
+    rows = list(csv.DictReader(io.StringIO(resp.get_data(as_text=True))))
+    assert len(rows) == len(BookingDAL.get_bookings_with_details())
+    assert rows[0]['booking_id'] == str(min(int(row['booking_id']) for row in rows))
+
+
+def test_export_filters_by_status_and_date_range(client):
+    _login_admin(client)
+    bookings = BookingDAL.get_bookings_with_details(status='approved')
+    day = bookings[0]['start_datetime'][:10]
+
+    resp = client.get(f'/admin/exports/bookings.jsonl?status=approved&start={day}&end={day}')
+
+    assert resp.mimetype == 'application/x-ndjson'
+    exported = [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+    expected = [b for b in bookings if b['start_datetime'][:10] == day]
+    assert len(exported) == len(expected) > 0
+    assert {row['status'] for row in exported} == {'approved'}
+
+
+def test_user_export_omits_credentials(client):
+    _login_admin(client)
+
+    body = client.get('/admin/exports/users.jsonl').get_data(as_text=True)
+
+    exported = [json.loads(line) for line in body.splitlines()]
+    assert len(exported) == len(UserDAL.get_all_users())
+    assert 'password_hash' not in exported[0]
+    assert 'verification_token' not in exported[0]
+
+
+def test_export_rejects_bad_filters(client):
+    _login_admin(client)
+
+    resp = client.get('/admin/exports/reviews.csv?start=10/01/2025', follow_redirects=True)
+
+    assert b'YYYY-MM-DD' in resp.data
+
+
+def test_export_reads_cursor_in_batches(app, monkeypatch):
+    from contextlib import contextmanager
+
+    from src.data_access import export_dal, get_db
+
+    batch_sizes = []
+
+    class TrackingCursor:
+        def __init__(self, cursor):
+            self._cursor = cursor
+
+        def execute(self, *args):
+            return self._cursor.execute(*args)
+
+        def fetchmany(self, size):
+            batch_sizes.append(size)
+            return self._cursor.fetchmany(size)
+
+    class TrackingConnection:
+        def __init__(self, conn):
+            self._conn = conn
+
+        def cursor(self):
+            return TrackingCursor(self._conn.cursor())
+
+    @contextmanager
+    def tracking_db():
+        with get_db() as conn:
+            yield TrackingConnection(conn)
+
+    monkeypatch.setattr(export_dal, 'get_db', tracking_db)
+
+    rows = list(ExportDAL.stream_bookings(batch_size=7))
+
+    assert len(rows) == len(BookingDAL.get_bookings_with_details())
+    assert set(batch_sizes) == {7}
+    # one fetch per full or partial batch plus the final empty fetch
+    assert len(batch_sizes) == -(-len(rows) // 7) + 1
@@ -0,0 +1,88 @@
+import re
+from datetime import datetime, timedelta
+
+from src.data_access.booking_dal import BookingDAL
+from src.data_access.review_dal import ReviewDAL
+from src.services.fragment_cache import (
+    FragmentCache,
+    MemoryFragmentBackend,
+    SQLiteFragmentBackend,
+    TieredFragmentBackend,
+    get_fragment_cache,
+)
+
+_CSRF_INPUT = re.compile(r'name="csrf_token" value="([^"]+)"')
+
+
+def _counts():
+    cache = get_fragment_cache()
+    return cache.hits, cache.misses
+
+
+def test_pages_reuse_fragments_until_a_tagged_write(client, monkeypatch):
+    calls = []
+    original_stats = ReviewDAL.get_resource_rating_stats
+
+    def counting_stats(resource_id):
+        calls.append(resource_id)
+        return original_stats(resource_id)
+
+    monkeypatch.setattr(ReviewDAL, 'get_resource_rating_stats', staticmethod(counting_stats))
+
+    first = client.get('/').get_data(as_text=True)
+    assert calls and 'Popular this week' in first
+    calls.clear()
+    assert client.get('/').get_data(as_text=True).count('resource-card--glass') == first.count('resource-card--glass')
+    assert calls == []  # Cache hit skips the featured grid's rating queries
+
+    ReviewDAL.create_review(1, 4, 5, 'Quiet and well lit.')
+    client.get('/')
+    assert calls  # The review bumped the 'reviews' tag
+
+    client.get('/resources/')
+    _, misses = _counts()
+    client.get('/resources/')
+    assert _counts()[1] == misses
+
+    start = datetime.now() + timedelta(days=3)
+    BookingDAL.create_booking(1, 4, start, start + timedelta(hours=1))
+    client.get('/resources/')
+    assert _counts()[1] > misses
+
+
+def test_review_forms_stay_per_session(app):
+    ReviewDAL.create_review(1, 4, 4, 'Great whiteboards.')
+    pages = []
+    for user_id in (3, 5):
+        with app.test_client() as client:
+            with client.session_transaction() as session:
+                session['_user_id'] = str(user_id)
+                session['_fresh'] = True
+            pages.append(client.get('/resources/1').get_data(as_text=True))
+
+    hits, _ = _counts()
+    assert hits > 0  # Second viewer got the review bodies from the cache
+    assert all('Great whiteboards.' in page for page in pages)
+    first_tokens, second_tokens = (set(_CSRF_INPUT.findall(page)) for page in pages)
+    assert first_tokens and second_tokens and not first_tokens & second_tokens
+
+
+def test_shared_tier_serves_other_workers(tmp_path):
+    path = str(tmp_path / 'fragments.db')
+    renders = []
+
+    def render():
+        renders.append(1)
+        return '<p>fragment</p>'
+
+    first = FragmentCache(TieredFragmentBackend(MemoryFragmentBackend(), SQLiteFragmentBackend(path)))
+    second = FragmentCache(TieredFragmentBackend(MemoryFragmentBackend(), SQLiteFragmentBackend(path)))
+    assert first.fetch(('card', 1), 60, [], render) == '<p>fragment</p>'
+    assert second.fetch(('card', 1), 60, [], render) == '<p>fragment</p>'
+    assert len(renders) == 1 and second.hits == 1
+
+    bounded = FragmentCache(MemoryFragmentBackend(max_entries=1))
+    bounded.fetch('a', 60, [], render)
+    bounded.fetch('b', 60, [], render)
+    bounded.fetch('a', 60, [], render)  # 'a' was evicted by the LRU bound
+    assert len(renders) == 4
@@ -0,0 +1,124 @@
+import io
+import os
+
+from PIL import Image
+
+from src.config import Config
+from src.data_access.resource_dal import ResourceDAL
+from src.data_access.user_dal import UserDAL
+from src.services.image_pipeline import (
+    IMAGE_VARIANTS, ImagePipeline, get_image_pipeline, resource_image_url, variant_name
+)
+
+
+def _jpeg_with_metadata(width=1600, height=800, orientation=6):
+    exif = Image.Exif()
+    exif[0x0112] = orientation           # Orientation: rotate 90 CW on display
+    exif[0x010F] = 'Campus Camera Co.'   # Make
+    buffer = io.BytesIO()
+    Image.new('RGB', (width, height), (200, 30, 30)).save(buffer, 'JPEG', exif=exif)
+    return buffer.getvalue()
+
+
+def test_pipeline_strips_metadata_and_writes_variants(tmp_path):
+    upload_dir, staging_dir = tmp_path / 'uploads', tmp_path / 'staging'
+    pipeline = ImagePipeline(upload_dir=str(upload_dir), staging_dir=str(staging_dir))
+    data = _jpeg_with_metadata()
+    try:
+        name = pipeline.stage(data, 'IMG_0001.JPEG')
+        assert pipeline.stage(data, 'copy-of-photo.jpg') == name
+        assert name.endswith('.jpg') and len(name) == 36
+        assert pipeline.wait(timeout=30)
+
+        with Image.open(upload_dir / name) as original:
+            assert original.size == (800, 1600)
+            assert not original.getexif()
+        for variant, box in IMAGE_VARIANTS.items():
+            with Image.open(upload_dir / variant_name(name, variant, 'webp')) as webp:
+                assert webp.format == 'WEBP'
+                assert max(webp.size) == box and webp.size[0] < webp.size[1]
+            with Image.open(upload_dir / variant_name(name, variant, 'jpg')) as jpeg:
+                assert jpeg.format == 'JPEG' and not jpeg.getexif()
+        assert os.listdir(staging_dir) == []
+
+        # Not an image despite the extension: staged, rejected, nothing published
+        bogus = pipeline.stage(b'not really a png', 'diagram.png')
+        assert pipeline.wait(timeout=30)
+        assert not (upload_dir / bogus).exists()
+        assert os.listdir(staging_dir) == []
+    finally:
+        pipeline.shutdown()
+
+
+def test_pipeline_resumes_files_staged_before_a_restart(tmp_path):
+    staging_dir = tmp_path / 'staging'
+    staging_dir.mkdir()
+    buffer = io.BytesIO()
+    Image.new('RGBA', (300, 200), (0, 120, 255, 128)).save(buffer, 'PNG')
+    name = 'ab' * 16 + '.png'
+    (staging_dir / name).write_bytes(buffer.getvalue())
+
+    pipeline = ImagePipeline(upload_dir=str(tmp_path / 'uploads'), staging_dir=str(staging_dir))
+    try:
+        assert pipeline.resume_pending() == 1
+        assert pipeline.wait(timeout=30)
+    finally:
+        pipeline.shutdown()
+    assert (tmp_path / 'uploads' / name).exists()
+    assert (tmp_path / 'uploads' / variant_name(name, 'thumb', 'jpg')).exists()
+
+
+def test_resource_upload_serves_hashed_thumbnails(app, client):
+    owner = UserDAL.create_user(name='Photo Owner', email='photos@iu.edu', password='StrongPass1', role='staff')
+    client.post('/auth/login', data={'email': 'photos@iu.edu', 'password': 'StrongPass1'})
+    data = _jpeg_with_metadata()
+    form = {
+        'title': 'Photo Studio', 'description': 'Bright studio space.', 'category': 'Event Space',
+        'location': 'Fine Arts', 'capacity': '10', 'status': 'published', 'schedule_template': 'business',
+    }
+
+    for title in ('Photo Studio', 'Photo Studio Annex'):
+        response = client.post(
+            '/resources/create',
+            data=dict(form, title=title, images=(io.BytesIO(data), 'studio.jpg')),
+            content_type='multipart/form-data'
+        )
+        assert response.status_code == 302
+    first, second = ResourceDAL.get_resources_by_owner(owner.user_id)
+    assert first.images == second.images
+    with app.test_request_context():
+        assert get_image_pipeline().wait(timeout=30)
+        thumb_url = resource_image_url(first.images, 'thumb')
+    assert thumb_url.endswith(variant_name(first.images, 'thumb', 'webp'))
+    assert thumb_url.encode() in client.get('/resources/').data
+
+    upload_dir = Config.UPLOAD_FOLDER
+    assert len(os.listdir(upload_dir)) == 1 + len(IMAGE_VARIANTS) * 2
+
+    # Deduplicated files survive until the last resource using them is deleted
+    client.post(f'/resources/{first.resource_id}/delete')
+    assert os.path.exists(os.path.join(upload_dir, second.images))
+    client.post(f'/resources/{second.resource_id}/delete')
+    assert os.listdir(upload_dir) == []
+
+
+def test_unreadable_upload_is_removed_from_the_resource(app, client, caplog):
+    owner = UserDAL.create_user(name='Scan Owner', email='scans@iu.edu', password='StrongPass1', role='staff')
+    client.post('/auth/login', data={'email': 'scans@iu.edu', 'password': 'StrongPass1'})
+    response = client.post(
+        '/resources/create',
+        data={
+            'title': 'Scan Lab', 'description': 'Document scanners.', 'category': 'Lab Equipment',
+            'location': 'Wells Library', 'capacity': '4', 'status': 'published', 'schedule_template': 'business',
+            'images': [(io.BytesIO(_jpeg_with_metadata()), 'scanner.jpg'), (io.BytesIO(b'not a png'), 'broken.png')],
+        },
+        content_type='multipart/form-data'
+    )
+    assert response.status_code == 302
+    with app.test_request_context():
+        assert get_image_pipeline().wait(timeout=30)
+
+    resource, = ResourceDAL.get_resources_by_owner(owner.user_id)
+    assert resource.images.endswith('.jpg') and ',' not in resource.images
+    assert any(str(resource.resource_id) in record.getMessage() for record in caplog.records
+               if record.levelname == 'WARNING' and record.name == 'src.services.image_pipeline')
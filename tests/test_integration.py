@@ -161,3 +161,16 @@ def test_resource_description_sanitized(app, client):
     assert resp.status_code == 200
     assert b'<script>' not in resp.data
     assert b'Safe description.' in resp.data
+
+
+def test_sample_content_is_opt_in(monkeypatch):
+    from src.app import create_app
+    from src.config import Config
+
+    monkeypatch.setattr(Config, 'SEED_SAMPLE_DATA', False)
+    app = create_app()
+    assert UserDAL.get_user_by_email('admin@iu.edu') is None
+
+    result = app.test_cli_runner().invoke(args=['seed-sample-data'])
+    assert result.exit_code == 0, result.output
+    assert UserDAL.get_user_by_email('admin@iu.edu') is not None
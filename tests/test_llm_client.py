@@ -0,0 +1,212 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.services.llm_client import LocalLLMClient, LocalLLMUnavailableError
+
+
+STREAM_TOKENS = ['Try ', 'the **Wells ', 'Library** ', 'study suite.']
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    """Minimal Ollama + OpenAI-compatible streaming server."""
+
+    def log_message(self, *args):  # keep pytest output quiet
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        payload = json.loads(self.rfile.read(length) or b'{}')
+        self.server.requests.append((self.path, payload))
+
+        if self.server.fail:
+            self.send_response(503)
+            self.end_headers()
+            return
+
+        if self.path == '/api/chat':
+            self._stream_ollama()
+        elif self.path == '/v1/chat/completions':
+            self._stream_openai()
+        else:
+            self.send_response(404)
+            self.end_headers()
+
+    def _stream_ollama(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson')
+        self.end_headers()
+        for token in STREAM_TOKENS:
+            event = {'message': {'role': 'assistant', 'content': token}, 'done': False}
+            self.wfile.write((json.dumps(event) + '\n').encode('utf-8'))
+            self.wfile.flush()
+        self.wfile.write((json.dumps({'message': {'content': ''}, 'done': True}) + '\n').encode('utf-8'))
+
+    def _stream_openai(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.end_headers()
+        for token in STREAM_TOKENS:
+            event = {'choices': [{'delta': {'content': token}, 'index': 0}]}
+            self.wfile.write(f'data: {json.dumps(event)}\n\n'.encode('utf-8'))
+            self.wfile.flush()
+        self.wfile.write(b'data: [DONE]\n\n')
+
+
+@pytest.fixture
+def fake_llm_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeLLMHandler)
+    server.requests = []
+    server.fail = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def _base_url(server):
+    host, port = server.server_address
+    return f'http://{host}:{port}'
+
+
+@pytest.mark.parametrize('provider, path', [
+    ('ollama', '/api/chat'),
+    ('openai', '/v1/chat/completions'),
+])
+def test_stream_chat_yields_tokens(fake_llm_server, provider, path):
+    client = LocalLLMClient(base_url=_base_url(fake_llm_server), model='llama3.1', provider=provider, timeout=5)
+
+    fragments = list(client.stream_chat([{'role': 'user', 'content': 'Where can I study?'}]))
+
+    assert fragments == STREAM_TOKENS
+    requested_path, payload = fake_llm_server.requests[0]
+    assert requested_path == path
+    assert payload['stream'] is True
+
+
+def test_stream_chat_raises_when_server_errors(fake_llm_server):
+    fake_llm_server.fail = True
+    client = LocalLLMClient(base_url=_base_url(fake_llm_server), model='llama3.1', provider='ollama', timeout=5)
+
+    with pytest.raises(LocalLLMUnavailableError):
+        list(client.stream_chat([{'role': 'user', 'content': 'hello'}]))
+
+
+def test_concierge_stream_endpoint_emits_sse(app, client, fake_llm_server):
+    app.config.update(
+        LOCAL_LLM_BASE_URL=_base_url(fake_llm_server),
+        LOCAL_LLM_PROVIDER='ollama',
+        LOCAL_LLM_TIMEOUT=5
+    )
+
+    response = client.post('/concierge/stream', data={'question': 'Where can I study quietly?'})
+
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    body = response.get_data(as_text=True)
+    events = [block for block in body.split('\n\n') if block.strip()]
+    names = [block.splitlines()[0].split(': ', 1)[1] for block in events]
+    assert names[0] == 'context'
+    assert names.count('token') == len(STREAM_TOKENS)
+    assert names[-1] == 'done'
+
+    done = json.loads(events[-1].splitlines()[1].split(': ', 1)[1])
+    assert done['used_llm'] is True
+    assert done['answer'] == ''.join(STREAM_TOKENS)
+
+
+def test_concierge_stream_endpoint_rejects_empty_question(client):
+    response = client.post('/concierge/stream', data={'question': '   '})
+
+    body = response.get_data(as_text=True)
+    assert body.startswith('event: error')
+
+
+def test_chat_reuses_pooled_session(monkeypatch):
+    from src.services import llm_client
+
+    sessions = []
+
+    class FakeResponse:
+        status_code = 200
+
+        def json(self):
+            return {'message': {'content': 'ok'}}
+
+    def fake_post(session, url, **kwargs):
+        sessions.append(session)
+        return FakeResponse()
+
+    monkeypatch.setattr('requests.Session.post', fake_post)
+    client = LocalLLMClient(base_url='http://llm.pool.test', model='llama3.1', provider='ollama')
+
+    client.chat([{'role': 'user', 'content': 'one'}])
+    client.chat([{'role': 'user', 'content': 'two'}])
+
+    assert len(sessions) == 2
+    assert sessions[0] is sessions[1] is llm_client.get_http_session()
+
+
+def test_chat_reports_busy_when_slots_exhausted():
+    from src.services.llm_client import LocalLLMBusyError
+
+    client = LocalLLMClient(base_url='http://llm.busy.test', model='llama3.1', provider='ollama',
+                            max_concurrency=1, queue_timeout=0)
+    client.gate.acquire()
+    try:
+        with pytest.raises(LocalLLMBusyError):
+            client.chat([{'role': 'user', 'content': 'hello'}])
+    finally:
+        client.gate.release()
+
+
+def test_circuit_breaker_skips_llm_after_repeated_timeouts(monkeypatch):
+    import requests
+
+    from src.services.llm_client import LocalLLMCircuitOpenError
+
+    attempts = {'count': 0}
+
+    def timing_out_post(session, url, **kwargs):
+        attempts['count'] += 1
+        raise requests.Timeout('read timed out')
+
+    monkeypatch.setattr('requests.Session.post', timing_out_post)
+    client = LocalLLMClient(base_url='http://llm.breaker.test', model='llama3.1', provider='ollama',
+                            breaker_threshold=2, breaker_cooldown=60)
+    messages = [{'role': 'user', 'content': 'hello'}]
+
+    for _ in range(2):
+        with pytest.raises(LocalLLMUnavailableError):
+            client.chat(messages)
+    with pytest.raises(LocalLLMCircuitOpenError):
+        client.chat(messages)
+
+    assert attempts['count'] == 2
+
+
+def test_concierge_falls_back_quickly_when_llm_busy(app, monkeypatch):
+    from src.services.concierge_service import ConciergeService
+
+    app.config.update(
+        LOCAL_LLM_BASE_URL='http://llm.concierge-busy.test',
+        LOCAL_LLM_MAX_CONCURRENCY=1,
+        LOCAL_LLM_QUEUE_TIMEOUT=0.01
+    )
+
+    with app.app_context():
+        service = ConciergeService()
+        service.llm_client.gate.acquire()
+        try:
+            result = service.answer('Which spaces support 3D printing?')
+        finally:
+            service.llm_client.gate.release()
+
+    assert result['used_llm'] is False
+    assert 'busy' in result['llm_error']
+    assert result['answer'].startswith('I found')
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+
+from src.services.request_metrics import RequestMetrics, SQLiteMetricsStore, _labels
+
+
+def test_metrics_endpoint_reports_per_endpoint_histograms(client):
+    client.get('/')
+    client.get('/accessibility/')
+    client.get('/definitely-not-a-page')
+
+    response = client.get('/metrics')
+    assert response.status_code == 200
+    assert response.content_type.startswith('text/plain; version=0.0.4')
+    body = response.get_data(as_text=True)
+
+    assert '# TYPE campus_hub_http_request_duration_seconds histogram' in body
+    assert 'campus_hub_http_requests_total{blueprint="app",endpoint="index",method="GET",status="200"} 1' in body
+    assert 'blueprint="accessibility"' in body
+    assert 'campus_hub_http_requests_total{blueprint="app",endpoint="unmatched",method="GET",status="404"} 1' in body
+    assert ('campus_hub_http_request_duration_seconds_bucket'
+            '{blueprint="app",endpoint="index",le="+Inf",method="GET"} 1') in body
+    assert 'campus_hub_http_request_duration_seconds_count{blueprint="app",endpoint="index",method="GET"} 1' in body
+    assert 'campus_hub_http_requests_in_flight{blueprint="app",endpoint="index"} 0' in body
+    assert 'endpoint="metrics.export"' not in body
+
+    remote = client.get('/metrics', environ_base={'REMOTE_ADDR': '203.0.113.9'})
+    assert remote.status_code == 404
+
+
+def test_csrf_rejected_requests_are_counted_and_timed(app, client):
+    app.config['WTF_CSRF_ENABLED'] = True
+
+    response = client.post('/auth/login', data={'email': 'admin@iu.edu', 'password': 'AdminPass1!'})
+
+    assert response.status_code == 400
+    assert response.headers['Server-Timing'].startswith('db;dur=')
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'campus_hub_http_requests_total{blueprint="auth",endpoint="auth.login",method="POST",status="400"} 1' in body
+
+
+def test_metrics_count_unhandled_errors(app, client):
+    app.config['PROPAGATE_EXCEPTIONS'] = False
+
+    @app.route('/boom')
+    def boom():
+        raise RuntimeError('boom')
+
+    assert client.get('/boom').status_code == 500
+    body = client.get('/metrics').get_data(as_text=True)
+    assert 'campus_hub_http_request_errors_total{blueprint="app",endpoint="boom",method="GET"} 1' in body
+
+
+def test_shared_store_sums_workers_and_drops_dead_gauges(tmp_path):
+    path = str(tmp_path / 'metrics.db')
+    metrics = RequestMetrics(store_path=path, flush_interval=0)
+    metrics.request_started('resource', 'resource.list_resources')
+    metrics.request_finished('resource', 'resource.list_resources', 'GET', 200, 0.02)
+
+    labels = _labels(blueprint='resource', endpoint='resource.list_resources', method='GET', status=200)
+    in_flight = _labels(blueprint='resource', endpoint='resource.list_resources')
+    store = SQLiteMetricsStore(path)
+    # A live sibling worker with one request in flight, and a worker that has exited
+    store.write('sibling', os.getppid(), {
+        ('campus_hub_http_requests_total', labels): 2,
+        ('campus_hub_http_requests_in_flight', in_flight): 1,
+    })
+    store.write('exited', 2 ** 30, {
+        ('campus_hub_http_requests_total', labels): 4,
+        ('campus_hub_http_requests_in_flight', in_flight): 3,
+    })
+
+    body = metrics.render()
+    assert ('campus_hub_http_requests_total'
+            '{blueprint="resource",endpoint="resource.list_resources",method="GET",status="200"} 7') in body
+    assert 'campus_hub_http_requests_in_flight{blueprint="resource",endpoint="resource.list_resources"} 1' in body
+    assert ('campus_hub_http_request_duration_seconds_bucket'
+            '{blueprint="resource",endpoint="resource.list_resources",le="0.01",method="GET"} 0') not in body
+    assert ('campus_hub_http_request_duration_seconds_bucket'
+            '{blueprint="resource",endpoint="resource.list_resources",le="0.025",method="GET"} 1') in body
+
+
+def test_shared_store_retires_workers_whose_pid_was_reused(tmp_path):
+    store = SQLiteMetricsStore(str(tmp_path / 'metrics.db'))
+    labels = _labels(blueprint='app', endpoint='index', method='GET', status=200)
+    key = ('campus_hub_http_requests_total', labels)
+    pid = os.getpid()
+
+    store.write('recycled', pid, {key: 100})
+    store.write('exited', 2 ** 30, {key: 5})
+    assert store.aggregate()[key] == 105
+    # A fresh worker that inherits the old worker's pid
+    store.write('replacement', pid, {key: 1})
+    assert store.aggregate()[key] == 106
+    assert store.aggregate()[key] == 106
+
+    with sqlite3.connect(store.path) as conn:
+        assert conn.execute('SELECT worker_id FROM metric_workers').fetchall() == [('replacement',)]
+        assert sorted(conn.execute('SELECT worker_id, value FROM metric_samples')) == [
+            ('replacement', 1.0), ('retired', 105.0)
+        ]
@@ -0,0 +1,63 @@
+import json
+import logging
+
+from src.data_access import get_db, query_profiler
+from src.data_access.user_dal import UserDAL
+
+
+def test_normalize_sql_folds_literals_and_in_lists():
+    shape = query_profiler.normalize_sql(
+        "SELECT *  FROM users\n WHERE role = 'staff' AND user_id IN (?, ?, ?) LIMIT 10"
+    )
+    assert shape == 'SELECT * FROM users WHERE role = ? AND user_id IN (?) LIMIT ?'
+
+
+def test_profile_counts_statements_and_flags_repeats(temp_db):
+    users = [UserDAL.create_user(name=f'User {i}', email=f'user{i}@iu.edu', password='StrongPass1') for i in range(4)]
+
+    profile = query_profiler.start_profile()
+    try:
+        for user in users:
+            UserDAL.get_user_by_id(user.user_id)
+        with get_db() as conn:
+            rows = conn.execute('SELECT * FROM users WHERE user_id IN (?, ?)', (1, 2)).fetchall()
+    finally:
+        assert query_profiler.stop_profile() is profile
+    assert len(rows) == 2
+
+    summary = profile.summary(slow_ms=0, n_plus_one=3, top=2)
+    assert summary['queries'] == 5
+    assert summary['connections'] == 5
+    assert len(summary['slow_queries']) == 2
+    assert summary['n_plus_one'] == [
+        {'sql': 'SELECT * FROM users WHERE user_id = ?', 'count': 4, 'ms': summary['n_plus_one'][0]['ms']}
+    ]
+    # Outside a profile, connections are plain sqlite3 connections
+    with get_db() as conn:
+        assert type(conn).__name__ == 'Connection'
+
+
+def test_requests_report_server_timing_and_log_repeats(app, client, caplog):
+    app.config.update(QUERY_N_PLUS_ONE_THRESHOLD=2, QUERY_SLOW_MS=10_000)
+
+    with caplog.at_level(logging.INFO, logger='src.data_access.query_profiler'):
+        response = client.get('/')
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=') and 'queries"' in timing and 'app;dur=' in timing
+    record = json.loads(caplog.records[-1].getMessage())
+    assert record['event'] == 'request_sql' and record['endpoint'] == 'index'
+    assert record['queries'] >= 1 and record['slow_queries'] == []
+    # The featured grid looks up rating stats once per resource
+    assert record['n_plus_one'] and caplog.records[-1].levelno == logging.WARNING
+    assert query_profiler.current_profile() is None
+
+    with caplog.at_level(logging.INFO, logger='src.data_access.query_profiler'):
+        caplog.clear()
+        remote = client.get('/', environ_base={'REMOTE_ADDR': '203.0.113.9'})
+    # Remote clients still get profiled, but never see the timings
+    assert 'Server-Timing' not in remote.headers
+    assert json.loads(caplog.records[-1].getMessage())['event'] == 'request_sql'
+
+    app.config.update(QUERY_PROFILER_ENABLED=False)
+    assert 'Server-Timing' not in client.get('/').headers
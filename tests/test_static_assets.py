@@ -0,0 +1,55 @@
+import gzip
+import os
+import re
+import time
+
+from flask import url_for
+
+from src.services.static_assets import AssetManifest, precompress
+
+
+def test_static_urls_are_fingerprinted_and_cached_forever(app, client):
+    html = client.get('/').get_data(as_text=True)
+    css_url = re.search(r'href="(/static/css/style\.css\?v=[0-9a-f]{12})"', html).group(1)
+    assert css_url in client.get('/accessibility/').get_data(as_text=True)  # Stable across requests
+
+    versioned = client.get(css_url)
+    assert versioned.headers['Cache-Control'] == 'public, max-age=31536000, immutable'
+    assert 'Accept-Encoding' in versioned.headers['Vary']
+    stale = client.get('/static/css/style.css?v=000000000000')
+    assert 'immutable' not in stale.headers.get('Cache-Control', '')
+
+    with app.test_request_context():
+        assert url_for('static', filename='uploads/abc.webp') == '/static/uploads/abc.webp'
+        assert url_for('static', filename='css/missing.css') == '/static/css/missing.css'
+
+
+def test_manifest_tracks_edits_and_precompressed_copies_are_served(app, client, tmp_path):
+    static = tmp_path / 'static'
+    (static / 'css').mkdir(parents=True)
+    asset = static / 'css' / 'site.css'
+    asset.write_text('body { color: #990000; }\n' * 200)
+
+    manifest = AssetManifest(str(static), auto_reload=True)
+    first = manifest.version('css/site.css')
+    asset.write_text('body { color: #243142; }\n' * 200)
+    os.utime(asset, (1_700_000_000, 1_700_000_000))  # Same size, so only the mtime gives the edit away
+    assert manifest.version('css/site.css') not in (None, first)
+
+    report = precompress(str(static))
+    assert [os.path.basename(path) for path, _, _ in report] == ['site.css']
+    app.static_folder = str(static)
+
+    compressed = client.get('/static/css/site.css', headers={'Accept-Encoding': 'gzip, deflate'})
+    assert compressed.headers['Content-Encoding'] == 'gzip'
+    assert compressed.mimetype == 'text/css'
+    assert gzip.decompress(compressed.data) == asset.read_bytes()
+
+    plain = client.get('/static/css/site.css')
+    assert 'Content-Encoding' not in plain.headers and plain.data == asset.read_bytes()
+
+    # A source edited after the build must not be shadowed by its old .gz
+    asset.write_text('body { color: #000; }\n' * 200)
+    os.utime(asset, (time.time() + 60, time.time() + 60))
+    fresh = client.get('/static/css/site.css', headers={'Accept-Encoding': 'gzip'})
+    assert 'Content-Encoding' not in fresh.headers and fresh.data == asset.read_bytes()